@@ -1,15 +1,27 @@
 #!/usr/bin/env python3
 """Amplitude 데이터를 Excel로 내보내기"""
 
+import json
 import os
+import sys
+from pathlib import Path
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.rule import ColorScaleRule
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
 from openpyxl.utils import get_column_letter
 from datetime import datetime
 
 # 내보내기 폴더 설정
 EXPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports")
 
+# scripts/ 의 공용 모듈 (이벤트 집계 등) 사용
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+from daily_metrics import stickiness  # noqa: E402
+from subscription_state import net_new  # noqa: E402
+from report_snapshot import read_snapshot, snapshot_path, write_snapshot  # noqa: E402
+from stage_profiler import PROFILER, stage  # noqa: E402
+
 # 데이터 정의 (Amplitude에서 가져온 데이터 - 2026-07-13 업데이트, 글로벌 기준 / 마지막 미완성주(07-13) 제외)
 WAU_DATA = {
     "dates": ["2026-01-26","2026-02-02","2026-02-09","2026-02-16","2026-02-23","2026-03-02","2026-03-09","2026-03-16","2026-03-23","2026-03-30","2026-04-06","2026-04-13","2026-04-20","2026-04-27","2026-05-04","2026-05-11","2026-05-18","2026-05-25","2026-06-01","2026-06-08","2026-06-15","2026-06-22","2026-06-29","2026-07-06"],
@@ -59,34 +71,151 @@ BORDER = Border(
     bottom=Side(style='thin')
 )
 
-def create_workbook():
+# 코호트 시트 제목
+RETENTION_TITLE = "Weekly Retention (Cohort Analysis)"
+CONVERSION_TITLE = "Membership Conversion (Cohort Analysis)"
+
+# 리텐션 시트 도움말
+RETENTION_HELP_TEXTS = [
+    "[ 읽는 방법 ]",
+    "• 각 행은 특정 주에 처음 방문한 사용자 그룹(코호트)입니다.",
+    "• Week 0: 첫 방문 주에 활동한 사용자 수 (항상 100%)",
+    "• Week 1, 2, 3...: 첫 방문 후 1주, 2주, 3주 뒤에 다시 돌아온 사용자 수",
+    "• Overall 행: 전체 코호트의 평균 리텐션율",
+    "",
+    "예) Dec 22, 2025 코호트가 Week 2에 306명 → 12월 22일 주에 처음 온 465명 중 306명(65.8%)이 2주 후에도 활동"
+]
+
+# 멤버십 전환 시트 도움말
+CONVERSION_HELP_TEXTS = [
+    "[ 읽는 방법 ]",
+    "• 각 행은 특정 주에 처음 방문한 사용자 그룹(코호트)이고, Users는 코호트 신규 사용자 수입니다.",
+    "• Week 0, 1, 2...: 첫 방문 후 해당 주까지 멤버십을 구독(Action - Subscribe Membership)한 누적 사용자 수",
+    "• Overall 행: 해당 주차까지 관측된 코호트 전체의 누적 전환율",
+    "",
+    "예) Jun 01, 2026 코호트가 Week 4에 12명 → 6월 1일 주에 처음 온 사용자 중 12명이 4주 안에 구독"
+]
+
+# 일간 지표 시트 헤더 (HTML 리포트 파서가 컬럼 순서를 그대로 사용)
+DAILY_HEADERS = ["Date", "DAU", "7-Day Active", "28-Day Active", "DAU / 7-Day", "DAU / 28-Day"]
+DAYS_ACTIVE_HEADERS = ["Days Active", "L7 Users", "L28 Users"]
+
+# WAU 단면 시트 제목 (컬럼은 큐브의 WAU_CUTS 순서 그대로 "단면: 묶음")
+SEGMENTS_TITLE = "WAU by Segment (Country / Platform / New vs Returning)"
+
+# MRR 시트 헤더 (MRR / 구독자 수는 기간 마지막 시점, 나머지는 기간 동안의 MRR 변화량)
+MRR_HEADERS = ["Date", "MRR", "Subscribers", "New MRR", "Expansion MRR", "Contraction MRR", "Churned MRR", "Net New MRR"]
+MRR_WIDTHS = [('A', 15), ('B', 14), ('C', 12), ('D', 12), ('E', 15), ('F', 17), ('G', 14), ('H', 14)]
+
+# write-only 모드용 공유(named) 스타일 - 셀마다 스타일 객체를 만들지 않고 이름으로 참조
+NAMED_STYLES = [
+    NamedStyle(name="report_header", fill=HEADER_FILL, font=HEADER_FONT, border=BORDER,
+               alignment=Alignment(horizontal='center')),
+    NamedStyle(name="report_cell", border=BORDER),
+    NamedStyle(name="report_title", font=Font(bold=True, size=14)),
+    NamedStyle(name="report_title_large", font=Font(bold=True, size=16)),
+    NamedStyle(name="report_meta", font=Font(italic=True, color="666666")),
+    NamedStyle(name="report_help_title", font=Font(bold=True, color="4472C4")),
+    NamedStyle(name="report_help_text", font=Font(color="666666")),
+]
+
+# 리텐션 히트맵 (조건부 서식: 코호트 행마다 0 → Week 0 값)
+RETENTION_HEATMAP_COLORS = ("FFFFFF", "4472C4")
+
+def default_metrics():
+    """하드코딩된 (Amplitude UI에서 옮겨 적은) 지표 묶음"""
+    return {
+        "wau": WAU_DATA,
+        # 한국 / 한국 외 양쪽에서 활동한 사용자가 있으므로 합집합 기준 전체는 같은 주의 WAU (두 값의 합이 아님)
+        "wau_by_region": dict(WAU_BY_REGION_DATA, total=WAU_DATA["values"]),
+        "nau": NAU_DATA,
+        "retention": RETENTION_DATA,
+    }
+
+def create_workbook(metrics=None, write_only=False):
+    """지표 묶음으로 워크북 생성
+
+    Args:
+        metrics: {"wau", "wau_by_region", "nau", "retention"} 딕셔너리 (없으면 하드코딩 데이터)
+            + 선택: "daily" (일별 원본 이벤트로 집계한 경우 Daily Active / Days Active 시트 추가)
+            + 선택: "conversion" (저장소로 집계한 경우 Membership Conversion 시트 추가, RETENTION_DATA 형식 표)
+            + 선택: "revenue" ({"weekly", "daily"} 구독 MRR - MRR / MRR Daily 시트 추가)
+            + 선택: "segments" (큐브 WAU 단면 표 {"dates", "columns", "rows"} - WAU Segments 시트 추가)
+        write_only: True면 행 단위 스트리밍 + 공유 스타일로 생성 (수년치 시트도 메모리 일정)
+    """
+    if metrics is None:
+        metrics = default_metrics()
+
+    if write_only:
+        return create_write_only_workbook(metrics)
+
     wb = Workbook()
 
     # Summary 시트
-    ws_summary = wb.active
-    ws_summary.title = "Summary"
-    create_summary_sheet(ws_summary)
+    with stage("sheet_summary"):
+        ws_summary = wb.active
+        ws_summary.title = "Summary"
+        create_summary_sheet(ws_summary, metrics)
 
     # WAU 시트
-    ws_wau = wb.create_sheet("WAU")
-    create_timeseries_sheet(ws_wau, "Weekly Active Users (WAU)", WAU_DATA)
+    with stage("sheet_wau"):
+        ws_wau = wb.create_sheet("WAU")
+        create_timeseries_sheet(ws_wau, "Weekly Active Users (WAU)", metrics["wau"])
 
     # WAU 지역별 시트 (한국 vs 한국 외)
-    ws_wau_region = wb.create_sheet("WAU by Region")
-    create_region_sheet(ws_wau_region, "WAU by Region (Korea vs Non-Korea)", WAU_BY_REGION_DATA)
+    with stage("sheet_wau_by_region"):
+        ws_wau_region = wb.create_sheet("WAU by Region")
+        create_region_sheet(ws_wau_region, "WAU by Region (Korea vs Non-Korea)", metrics["wau_by_region"])
 
     # NAU 시트
-    ws_nau = wb.create_sheet("NAU")
-    create_timeseries_sheet(ws_nau, "Weekly New Active Users (NAU)", NAU_DATA)
+    with stage("sheet_nau"):
+        ws_nau = wb.create_sheet("NAU")
+        create_timeseries_sheet(ws_nau, "Weekly New Active Users (NAU)", metrics["nau"])
 
     # Retention 시트
-    ws_retention = wb.create_sheet("Weekly Retention")
-    create_retention_sheet(ws_retention, RETENTION_DATA)
+    with stage("sheet_retention"):
+        ws_retention = wb.create_sheet("Weekly Retention")
+        create_retention_sheet(ws_retention, metrics["retention"])
+
+    # WAU 단면 시트 (국가 / 플랫폼 / 신규·기존 - 큐브 조회 결과)
+    if metrics.get("segments"):
+        with stage("sheet_segments"):
+            create_cut_sheet(wb.create_sheet("WAU Segments"), SEGMENTS_TITLE, metrics["segments"])
+
+    # 일간 지표 시트 (DAU / 최근 7일·28일 활성 / L7·L28)
+    if metrics.get("daily"):
+        with stage("sheet_daily"):
+            create_daily_sheet(wb.create_sheet("Daily Active"), metrics["daily"])
+            create_days_active_sheet(wb.create_sheet("Days Active"), metrics["daily"])
+
+    # 코호트별 멤버십 전환 시트
+    if metrics.get("conversion"):
+        with stage("sheet_conversion"):
+            create_retention_sheet(wb.create_sheet("Membership Conversion"), metrics["conversion"],
+                                   CONVERSION_TITLE, CONVERSION_HELP_TEXTS)
+
+    # 멤버십 MRR 시트 (주별 / 일별)
+    if metrics.get("revenue"):
+        with stage("sheet_revenue"):
+            create_mrr_sheet(wb.create_sheet("MRR"), "Weekly MRR (Membership)", metrics["revenue"]["weekly"])
+            create_mrr_sheet(wb.create_sheet("MRR Daily"), "Daily MRR (Membership)", metrics["revenue"]["daily"])
 
     return wb
 
-def create_summary_sheet(ws):
+def overall_week1_retention(retention_data):
+    """리텐션 표의 Overall Retained % 행에서 Week 1 값 ('58.61%')"""
+    for row in retention_data:
+        if len(row) > 4 and row[1] == "Overall" and row[2] == "Retained %":
+            return row[4]
+    return "-"
+
+def create_summary_sheet(ws, metrics=None):
     """Summary 시트 생성"""
+    if metrics is None:
+        metrics = default_metrics()
+    wau_values = metrics["wau"]["values"]
+    nau_values = metrics["nau"]["values"]
+
     ws['A1'] = "Amplitude Report Summary"
     ws['A1'].font = Font(bold=True, size=16)
     ws.merge_cells('A1:D1')
@@ -104,8 +233,8 @@ def create_summary_sheet(ws):
         cell.alignment = Alignment(horizontal='center')
 
     # WAU
-    latest_wau = WAU_DATA["values"][-1]
-    prev_wau = WAU_DATA["values"][-2]
+    latest_wau = wau_values[-1]
+    prev_wau = wau_values[-2] if len(wau_values) >= 2 else 0
     wau_change = ((latest_wau - prev_wau) / prev_wau * 100) if prev_wau else 0
 
     ws.cell(row=5, column=1, value="WAU").border = BORDER
@@ -114,8 +243,8 @@ def create_summary_sheet(ws):
     ws.cell(row=5, column=4, value=f"{wau_change:+.1f}%").border = BORDER
 
     # NAU
-    latest_nau = NAU_DATA["values"][-1]
-    prev_nau = NAU_DATA["values"][-2]
+    latest_nau = nau_values[-1]
+    prev_nau = nau_values[-2] if len(nau_values) >= 2 else 0
     nau_change = ((latest_nau - prev_nau) / prev_nau * 100) if prev_nau else 0
 
     ws.cell(row=6, column=1, value="NAU").border = BORDER
@@ -125,7 +254,7 @@ def create_summary_sheet(ws):
 
     # Week 1 Retention
     ws.cell(row=7, column=1, value="Week 1 Retention").border = BORDER
-    ws.cell(row=7, column=2, value="58.61%").border = BORDER
+    ws.cell(row=7, column=2, value=overall_week1_retention(metrics["retention"])).border = BORDER
     ws.cell(row=7, column=3, value="-").border = BORDER
     ws.cell(row=7, column=4, value="-").border = BORDER
 
@@ -159,13 +288,37 @@ def create_timeseries_sheet(ws, title, data):
     ws.column_dimensions['A'].width = 15
     ws.column_dimensions['B'].width = 12
 
+def region_headers(data):
+    """지역별 WAU 시트 헤더 - 합집합 기준 전체("total")가 없으면 비중 / 전체 열은 뺀다"""
+    headers = ["Date", "South Korea", "Non-Korea"]
+    if data.get("total"):
+        headers += ["Non-Korea %", "Total"]
+    return headers
+
+
+def region_rows(data):
+    """지역별 WAU 시트 행
+
+    한 주에 한국/한국 외 양쪽에서 활동한 사용자가 있으므로 비중의 분모는 합집합 기준 전체("total")이고,
+    전체가 없을 때 한국 + 한국 외로 대신하지 않는다 (중복 집계).
+    """
+    totals = data.get("total")
+    for i, (date, kr, non_kr) in enumerate(zip(data["dates"], data["korea"], data["non_korea"])):
+        if not totals:
+            yield [date, kr, non_kr]
+            continue
+        total = totals[i]
+        share = (non_kr / total * 100) if total else 0
+        yield [date, kr, non_kr, f"{share:.2f}%", total]
+
+
 def create_region_sheet(ws, title, data):
     """지역별 비교 시계열 시트 생성 (한국 vs 한국 외)"""
     ws['A1'] = title
     ws['A1'].font = Font(bold=True, size=14)
-    ws.merge_cells('A1:D1')
+    ws.merge_cells('A1:E1')
 
-    headers = ["Date", "South Korea", "Non-Korea", "Non-Korea %"]
+    headers = region_headers(data)
     for col, header in enumerate(headers, 1):
         cell = ws.cell(row=3, column=col, value=header)
         cell.fill = HEADER_FILL
@@ -173,35 +326,21 @@ def create_region_sheet(ws, title, data):
         cell.border = BORDER
         cell.alignment = Alignment(horizontal='center')
 
-    for row, (date, kr, non_kr) in enumerate(zip(data["dates"], data["korea"], data["non_korea"]), 4):
-        total = kr + non_kr
-        share = (non_kr / total * 100) if total else 0
-        ws.cell(row=row, column=1, value=date).border = BORDER
-        ws.cell(row=row, column=2, value=kr).border = BORDER
-        ws.cell(row=row, column=3, value=non_kr).border = BORDER
-        ws.cell(row=row, column=4, value=f"{share:.2f}%").border = BORDER
+    for row, values in enumerate(region_rows(data), 4):
+        for col, value in enumerate(values, 1):
+            ws.cell(row=row, column=col, value=value).border = BORDER
 
-    for col, width in [('A', 15), ('B', 14), ('C', 14), ('D', 14)]:
+    for col, width in [('A', 15), ('B', 14), ('C', 14), ('D', 14), ('E', 14)]:
         ws.column_dimensions[col].width = width
 
 
-def create_retention_sheet(ws, data):
-    """리텐션 시트 생성"""
-    ws['A1'] = "Weekly Retention (Cohort Analysis)"
+def create_retention_sheet(ws, data, title=RETENTION_TITLE, help_texts=RETENTION_HELP_TEXTS):
+    """리텐션 시트 생성 (같은 모양의 코호트 표인 멤버십 전환 시트도 title / help_texts만 바꿔 사용)"""
+    ws['A1'] = title
     ws['A1'].font = Font(bold=True, size=14)
     ws.merge_cells('A1:F1')
 
     # 도움말 섹션
-    help_texts = [
-        "[ 읽는 방법 ]",
-        "• 각 행은 특정 주에 처음 방문한 사용자 그룹(코호트)입니다.",
-        "• Week 0: 첫 방문 주에 활동한 사용자 수 (항상 100%)",
-        "• Week 1, 2, 3...: 첫 방문 후 1주, 2주, 3주 뒤에 다시 돌아온 사용자 수",
-        "• Overall 행: 전체 코호트의 평균 리텐션율",
-        "",
-        "예) Dec 22, 2025 코호트가 Week 2에 306명 → 12월 22일 주에 처음 온 465명 중 306명(65.8%)이 2주 후에도 활동"
-    ]
-
     help_start_row = 3
     for i, text in enumerate(help_texts):
         cell = ws.cell(row=help_start_row + i, column=1, value=text)
@@ -229,18 +368,477 @@ def create_retention_sheet(ws, data):
     for i in range(4, 21):
         ws.column_dimensions[get_column_letter(i)].width = 10
 
+def daily_rows(data):
+    """Daily Active 시트 행 - 날짜, DAU, 7일 / 28일 활성, stickiness(DAU / 기간 활성)"""
+    sticky_7d = stickiness(data["dau"], data["active_7d"])
+    sticky_28d = stickiness(data["dau"], data["active_28d"])
+    for row in zip(data["dates"], data["dau"], data["active_7d"], data["active_28d"], sticky_7d, sticky_28d):
+        yield list(row[:4]) + [f"{row[4]:.2f}%", f"{row[5]:.2f}%"]
+
+def days_active_rows(data):
+    """Days Active 시트 행 - 활동일 수, L7 사용자 수, L28 사용자 수 (L7은 7일까지만)"""
+    for k in range(1, len(data["l28"]) + 1):
+        yield [k, data["l7"][k - 1] if k <= len(data["l7"]) else None, data["l28"][k - 1]]
+
+def create_daily_sheet(ws, data):
+    """일간 활성 지표 시트 생성"""
+    ws['A1'] = "Daily Active Users (DAU, 7-Day / 28-Day Active, Stickiness)"
+    ws['A1'].font = Font(bold=True, size=14)
+    ws.merge_cells('A1:F1')
+
+    for col, header in enumerate(DAILY_HEADERS, 1):
+        cell = ws.cell(row=3, column=col, value=header)
+        cell.fill = HEADER_FILL
+        cell.font = HEADER_FONT
+        cell.border = BORDER
+        cell.alignment = Alignment(horizontal='center')
+
+    for row, values in enumerate(daily_rows(data), 4):
+        for col, value in enumerate(values, 1):
+            ws.cell(row=row, column=col, value=value).border = BORDER
+
+    for col, width in [('A', 15), ('B', 10), ('C', 14), ('D', 14), ('E', 13), ('F', 13)]:
+        ws.column_dimensions[col].width = width
+
+def create_days_active_sheet(ws, data):
+    """L7 / L28 (마지막 날 기준 최근 7일 / 28일 중 활동일 수 분포) 시트 생성"""
+    ws['A1'] = f"Days Active in Last 7 / 28 Days (as of {data['dates'][-1]})"
+    ws['A1'].font = Font(bold=True, size=14)
+    ws.merge_cells('A1:C1')
+
+    for col, header in enumerate(DAYS_ACTIVE_HEADERS, 1):
+        cell = ws.cell(row=3, column=col, value=header)
+        cell.fill = HEADER_FILL
+        cell.font = HEADER_FONT
+        cell.border = BORDER
+        cell.alignment = Alignment(horizontal='center')
+
+    for row, values in enumerate(days_active_rows(data), 4):
+        for col, value in enumerate(values, 1):
+            ws.cell(row=row, column=col, value=value).border = BORDER
+
+    for col, width in [('A', 12), ('B', 12), ('C', 12)]:
+        ws.column_dimensions[col].width = width
+
+def create_cut_sheet(ws, title, table):
+    """단면 표 시트 생성 (Date + 단면 컬럼들) - 새 단면은 큐브 설정만 바꾸면 컬럼으로 추가된다"""
+    headers = ["Date"] + table["columns"]
+    last_col = get_column_letter(len(headers))
+    ws['A1'] = title
+    ws['A1'].font = Font(bold=True, size=14)
+    ws.merge_cells(f'A1:{last_col}1')
+
+    for col, header in enumerate(headers, 1):
+        cell = ws.cell(row=3, column=col, value=header)
+        cell.fill = HEADER_FILL
+        cell.font = HEADER_FONT
+        cell.border = BORDER
+        cell.alignment = Alignment(horizontal='center')
+
+    for row, values in enumerate(table["rows"], 4):
+        for col, value in enumerate(values, 1):
+            ws.cell(row=row, column=col, value=value).border = BORDER
+
+    ws.column_dimensions['A'].width = 15
+    for i in range(2, len(headers) + 1):
+        ws.column_dimensions[get_column_letter(i)].width = 18
+
+def mrr_rows(data):
+    """MRR 시트 행 - 기간, MRR, 구독자 수, new / expansion / contraction / churned, net new"""
+    yield from zip(data["dates"], data["mrr"], data["subscribers"], data["new"], data["expansion"],
+                   data["contraction"], data["churned"], net_new(data))
+
+def create_mrr_sheet(ws, title, data):
+    """멤버십 MRR 시트 생성"""
+    ws['A1'] = title
+    ws['A1'].font = Font(bold=True, size=14)
+    ws.merge_cells('A1:H1')
+
+    for col, header in enumerate(MRR_HEADERS, 1):
+        cell = ws.cell(row=3, column=col, value=header)
+        cell.fill = HEADER_FILL
+        cell.font = HEADER_FONT
+        cell.border = BORDER
+        cell.alignment = Alignment(horizontal='center')
+
+    for row, values in enumerate(mrr_rows(data), 4):
+        for col, value in enumerate(values, 1):
+            ws.cell(row=row, column=col, value=value).border = BORDER
+
+    for col, width in MRR_WIDTHS:
+        ws.column_dimensions[col].width = width
+
+def create_write_only_workbook(metrics):
+    """write-only 워크북 생성 - 시트 배치는 create_workbook()과 동일 (HTML 리포트 파서 호환)"""
+    wb = Workbook(write_only=True)
+    for style in NAMED_STYLES:
+        wb.add_named_style(style)
+
+    write_summary_sheet(wb.create_sheet("Summary"), metrics)
+    write_timeseries_sheet(wb.create_sheet("WAU"), "Weekly Active Users (WAU)", metrics["wau"])
+    write_region_sheet(wb.create_sheet("WAU by Region"), "WAU by Region (Korea vs Non-Korea)", metrics["wau_by_region"])
+    write_timeseries_sheet(wb.create_sheet("NAU"), "Weekly New Active Users (NAU)", metrics["nau"])
+    write_retention_sheet(wb.create_sheet("Weekly Retention"), metrics["retention"])
+    if metrics.get("segments"):
+        write_cut_sheet(wb.create_sheet("WAU Segments"), SEGMENTS_TITLE, metrics["segments"])
+    if metrics.get("daily"):
+        write_daily_sheet(wb.create_sheet("Daily Active"), metrics["daily"])
+        write_days_active_sheet(wb.create_sheet("Days Active"), metrics["daily"])
+    if metrics.get("conversion"):
+        write_retention_sheet(wb.create_sheet("Membership Conversion"), metrics["conversion"],
+                              CONVERSION_TITLE, CONVERSION_HELP_TEXTS)
+    if metrics.get("revenue"):
+        write_mrr_sheet(wb.create_sheet("MRR"), "Weekly MRR (Membership)", metrics["revenue"]["weekly"])
+        write_mrr_sheet(wb.create_sheet("MRR Daily"), "Daily MRR (Membership)", metrics["revenue"]["daily"])
+    return wb
+
+def _styled_row(ws, values, style):
+    """값 목록 -> 같은 named style을 공유하는 WriteOnlyCell 목록"""
+    cells = []
+    for value in values:
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style
+        cells.append(cell)
+    return cells
+
+def _set_widths(ws, widths):
+    # write-only 시트는 행을 쓰기 전에 컬럼 너비를 정해야 한다
+    for col, width in widths:
+        ws.column_dimensions[col].width = width
+
+def write_summary_sheet(ws, metrics):
+    """Summary 시트 (write-only)"""
+    _set_widths(ws, [('A', 18), ('B', 15), ('C', 15), ('D', 12)])
+    ws.append(_styled_row(ws, ["Amplitude Report Summary"], "report_title_large"))
+    ws.merged_cells.add('A1:D1')
+    ws.append(_styled_row(ws, [f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"], "report_meta"))
+    ws.append([])
+    ws.append(_styled_row(ws, ["Metric", "Latest Value", "Previous Week", "Change"], "report_header"))
+
+    for name, values in [("WAU", metrics["wau"]["values"]), ("NAU", metrics["nau"]["values"])]:
+        latest = values[-1]
+        prev = values[-2] if len(values) >= 2 else 0
+        change = ((latest - prev) / prev * 100) if prev else 0
+        ws.append(_styled_row(ws, [name, latest, prev, f"{change:+.1f}%"], "report_cell"))
+    ws.append(_styled_row(ws, ["Week 1 Retention", overall_week1_retention(metrics["retention"]), "-", "-"], "report_cell"))
+
+def write_timeseries_sheet(ws, title, data):
+    """시계열 데이터 시트 (write-only)"""
+    _set_widths(ws, [('A', 15), ('B', 12)])
+    ws.append(_styled_row(ws, [title], "report_title"))
+    ws.merged_cells.add('A1:B1')
+    ws.append([])
+    ws.append(_styled_row(ws, ["Date", "Value"], "report_header"))
+    for date, value in zip(data["dates"], data["values"]):
+        ws.append(_styled_row(ws, [date, value], "report_cell"))
+
+def write_region_sheet(ws, title, data):
+    """지역별 비교 시계열 시트 (write-only)"""
+    _set_widths(ws, [('A', 15), ('B', 14), ('C', 14), ('D', 14), ('E', 14)])
+    ws.append(_styled_row(ws, [title], "report_title"))
+    ws.merged_cells.add('A1:E1')
+    ws.append([])
+    ws.append(_styled_row(ws, region_headers(data), "report_header"))
+    for values in region_rows(data):
+        ws.append(_styled_row(ws, values, "report_cell"))
+
+def write_retention_sheet(ws, data, title=RETENTION_TITLE, help_texts=RETENTION_HELP_TEXTS):
+    """리텐션 시트 (write-only) - 코호트 칸 색은 셀 스타일 대신 행별 조건부 서식(color scale)"""
+    n_cols = max(len(row) for row in data)
+    _set_widths(ws, [('A', 14), ('B', 14), ('C', 10)] + [(get_column_letter(i), 10) for i in range(4, max(21, n_cols + 1))])
+    ws.append(_styled_row(ws, [title], "report_title"))
+    ws.merged_cells.add('A1:F1')
+    ws.append([])
+
+    help_start_row = 3
+    for i, text in enumerate(help_texts):
+        ws.append(_styled_row(ws, [text], "report_help_title" if i == 0 else "report_help_text"))
+        ws.merged_cells.add(f'A{help_start_row + i}:G{help_start_row + i}')
+    ws.append([])
+
+    data_start_row = help_start_row + len(help_texts) + 1
+    start_color, end_color = RETENTION_HEATMAP_COLORS
+    for row_idx, row_data in enumerate(data, data_start_row):
+        ws.append(_styled_row(ws, row_data, "report_header" if row_idx == data_start_row else "report_cell"))
+        if row_idx > data_start_row and row_data[1] != "Overall" and len(row_data) > 4:
+            week_range = f"D{row_idx}:{get_column_letter(len(row_data))}{row_idx}"
+            ws.conditional_formatting.add(week_range, ColorScaleRule(
+                start_type='num', start_value=0, start_color=start_color,
+                end_type='max', end_color=end_color,
+            ))
+
+def write_daily_sheet(ws, data):
+    """일간 활성 지표 시트 (write-only)"""
+    _set_widths(ws, [('A', 15), ('B', 10), ('C', 14), ('D', 14), ('E', 13), ('F', 13)])
+    ws.append(_styled_row(ws, ["Daily Active Users (DAU, 7-Day / 28-Day Active, Stickiness)"], "report_title"))
+    ws.merged_cells.add('A1:F1')
+    ws.append([])
+    ws.append(_styled_row(ws, DAILY_HEADERS, "report_header"))
+    for values in daily_rows(data):
+        ws.append(_styled_row(ws, values, "report_cell"))
+
+def write_days_active_sheet(ws, data):
+    """L7 / L28 시트 (write-only)"""
+    _set_widths(ws, [('A', 12), ('B', 12), ('C', 12)])
+    ws.append(_styled_row(ws, [f"Days Active in Last 7 / 28 Days (as of {data['dates'][-1]})"], "report_title"))
+    ws.merged_cells.add('A1:C1')
+    ws.append([])
+    ws.append(_styled_row(ws, DAYS_ACTIVE_HEADERS, "report_header"))
+    for values in days_active_rows(data):
+        ws.append(_styled_row(ws, values, "report_cell"))
+
+def write_cut_sheet(ws, title, table):
+    """단면 표 시트 (write-only)"""
+    headers = ["Date"] + table["columns"]
+    _set_widths(ws, [('A', 15)] + [(get_column_letter(i), 18) for i in range(2, len(headers) + 1)])
+    ws.append(_styled_row(ws, [title], "report_title"))
+    ws.merged_cells.add(f'A1:{get_column_letter(len(headers))}1')
+    ws.append([])
+    ws.append(_styled_row(ws, headers, "report_header"))
+    for values in table["rows"]:
+        ws.append(_styled_row(ws, values, "report_cell"))
+
+def write_mrr_sheet(ws, title, data):
+    """멤버십 MRR 시트 (write-only)"""
+    _set_widths(ws, MRR_WIDTHS)
+    ws.append(_styled_row(ws, [title], "report_title"))
+    ws.merged_cells.add('A1:H1')
+    ws.append([])
+    ws.append(_styled_row(ws, MRR_HEADERS, "report_header"))
+    for values in mrr_rows(data):
+        ws.append(_styled_row(ws, values, "report_cell"))
+
+def parse_args(argv):
+    """커맨드라인 옵션 파싱
+
+    --events PATH...  Amplitude 원본 export 파일/디렉터리 (지정 시 하드코딩 데이터 대신 직접 집계)
+    --dashboard PATH  scripts/amplitude_fetch.py 로 받은 dashboard.json (하드코딩 데이터 대신 사용)
+    --snapshot PATH  이전에 저장한 스냅샷(.snap)을 다시 그림 (집계 없이 Excel / HTML만 생성,
+        --events / --store / --state / --dashboard 와 함께 쓸 수 없음)
+    --until YYYY-MM-DD  이 날짜가 속한 주부터는 집계 제외 (기본: 수집 중인 이번 주 제외)
+    --store DIR  주 파티션 이벤트 저장소 (--events 는 여기에 적재 후, 저장소에서 집계 / 멤버십 전환 코호트 포함)
+        구독 MRR 상태는 DIR/subscription_state.json, 주 × 국가 × 플랫폼 × 신규/기존 큐브는 DIR/cube.json 에 두고
+        새로 들어온 날 / 주만 반영 (WAU / 지역별 WAU / NAU / WAU 단면은 큐브에서 조회)
+    --read-only  --store / --state 의 상태 파일(적재 목록, 큐브, MRR, 증분 상태)을 고쳐 쓰지 않고 집계만
+        (조회 서버처럼 다른 적재 작업과 같은 저장소를 함께 읽을 때, --events 적재도 하지 않음)
+    --state PATH  증분 집계 상태 파일 (이미 반영한 주는 건너뛰고 새 주만 집계해 덧붙임)
+    --workers N  export shard 병렬 집계 프로세스 수 (0 = CPU 코어 수, 기본 1)
+    --html  집계한 지표를 Excel을 거치지 않고 바로 HTML 리포트로 생성
+    --no-excel  Excel 파일은 만들지 않음 (--html 과 함께 사용)
+    --title TITLE  HTML 리포트 타이틀 (없으면 자동 생성)
+    --offline  HTML 리포트에 Chart.js / 서브셋 폰트를 포함 (열 때 네트워크 요청 없음)
+    --profile  단계별 시간 / CPU / 최대 메모리를 reports/profile_<날짜>.json 으로 저장
+    --profile-folded PATH  --profile 결과를 flame graph 입력(collapsed stacks)으로도 저장
+    --write-only  Excel을 행 단위 스트리밍 + 공유 스타일로 생성 (긴 기간 / 많은 코호트용)
+    """
+    options = {
+        "events": [], "dashboard": None, "snapshot": None, "until": None, "store": None, "state": None, "workers": 1,
+        "html": False, "excel": True, "title": None, "write_only": False, "read_only": False,
+        "offline": False, "profile": False, "profile_folded": None,
+    }
+    i = 0
+    while i < len(argv):
+        if argv[i] == "--events":
+            while i + 1 < len(argv) and not argv[i + 1].startswith("--"):
+                options["events"].append(argv[i + 1])
+                i += 1
+        elif argv[i] == "--store" and i + 1 < len(argv):
+            options["store"] = argv[i + 1]
+            i += 1
+        elif argv[i] == "--dashboard" and i + 1 < len(argv):
+            options["dashboard"] = argv[i + 1]
+            i += 1
+        elif argv[i] == "--snapshot" and i + 1 < len(argv):
+            options["snapshot"] = argv[i + 1]
+            i += 1
+        elif argv[i] == "--html":
+            options["html"] = True
+        elif argv[i] == "--offline":
+            options["offline"] = True
+        elif argv[i] == "--profile":
+            options["profile"] = True
+        elif argv[i] == "--profile-folded" and i + 1 < len(argv):
+            options["profile"] = True
+            options["profile_folded"] = argv[i + 1]
+            i += 1
+        elif argv[i] == "--write-only":
+            options["write_only"] = True
+        elif argv[i] == "--read-only":
+            options["read_only"] = True
+        elif argv[i] == "--no-excel":
+            options["excel"] = False
+        elif argv[i] == "--title" and i + 1 < len(argv):
+            options["title"] = argv[i + 1]
+            i += 1
+        elif argv[i] == "--workers" and i + 1 < len(argv):
+            options["workers"] = int(argv[i + 1])
+            i += 1
+        elif argv[i] == "--state" and i + 1 < len(argv):
+            options["state"] = argv[i + 1]
+            i += 1
+        elif argv[i] == "--until" and i + 1 < len(argv):
+            options["until"] = argv[i + 1]
+            i += 1
+        i += 1
+
+    # 스냅샷은 집계 없이 저장된 지표를 다시 그리므로 다른 데이터 원본과 함께 주면 한쪽이 조용히 무시된다
+    if options["snapshot"]:
+        sources = {"--events": "events", "--store": "store", "--state": "state", "--dashboard": "dashboard"}
+        conflicts = [flag for flag, key in sources.items() if options[key]]
+        if conflicts:
+            print(f"--snapshot cannot be combined with {', '.join(conflicts)}", file=sys.stderr)
+            sys.exit(1)
+    return options
+
+def load_metrics(options):
+    """옵션에 따라 지표 묶음 준비 (저장소 / export 스트리밍 집계 / API 수집 결과, 아니면 하드코딩 데이터)"""
+    if not options["events"] and not options["store"]:
+        if options["snapshot"]:
+            return read_snapshot(options["snapshot"])
+        if options["dashboard"]:
+            with open(options["dashboard"], encoding="utf-8") as f:
+                fetched = json.load(f)
+            print(f"Loaded Amplitude metrics fetched at {fetched['fetched_at']} ({fetched['start']} ~ {fetched['end']})")
+            return fetched["metrics"]
+        return default_metrics()
+
+    from amplitude_ingest import aggregate_exports_parallel, current_week_start, week_start
+
+    if options["until"]:
+        end_week = week_start(datetime.strptime(options["until"], "%Y-%m-%d").date())
+    else:
+        end_week = current_week_start()
+    state = None
+    start_week = None
+    if options["state"]:
+        from incremental_state import IncrementalState
+
+        state = IncrementalState(options["state"])
+        if state.last_week is not None:
+            start_week = state.last_week + 7
+
+    conversion = None
+    revenue = None
+    cube = None
+    if options["store"]:
+        from event_store import EventStore, aggregate_store
+        from membership_conversion import membership_conversion
+        from metrics_cube import build_cube
+        from subscription_state import SUBSCRIPTION_STATE_FILE, SubscriptionState
+
+        store = EventStore(options["store"])
+        if options["events"] and not options["read_only"]:
+            with stage("ingest"):
+                print(f"Stored {store.ingest(options['events']):,} new events")
+        with stage("aggregate"):
+            aggregator = aggregate_store(store, start_week=start_week, end_week=end_week)
+        with stage("cube"):
+            cube = build_cube(store, end_week=end_week, save=not options["read_only"])
+        # 첫 방문 주는 전체 이력 기준이라 증분 상태와 상관없이 저장소 전체에서 계산
+        with stage("membership_conversion"):
+            conversion = membership_conversion(store, end_week=end_week)
+        with stage("subscriptions"):
+            subscriptions = SubscriptionState(os.path.join(options["store"], SUBSCRIPTION_STATE_FILE))
+            applied_days = subscriptions.apply_store(store, end_day=end_week)
+            if not options["read_only"]:
+                subscriptions.save()
+        print(f"Applied {len(applied_days)} new day(s) of subscription events (MRR {subscriptions.mrr:,})")
+        # 상태가 --until 이후 날까지 반영돼 있어도 리포트는 end_week 전날까지
+        revenue = subscriptions.report_data(end_day=end_week)
+    else:
+        with stage("aggregate"):
+            aggregator = aggregate_exports_parallel(options["events"], end_week=end_week, workers=options["workers"])
+    print(f"Ingested {aggregator.event_count:,} events ({len(aggregator.first_seen):,} users)")
+
+    if state is None:
+        metrics = aggregator.report_data()
+    else:
+        with stage("apply_state"):
+            applied = state.apply(aggregator)
+            if not options["read_only"]:
+                state.save()
+        print(f"Applied {len(applied)} new week(s) to {options['state']}")
+        metrics = state.report_data()
+    if cube is not None and cube.cells:
+        from metrics_cube import report_series
+
+        with stage("cube_query"):
+            metrics.update(report_series(cube, end_week=end_week))
+    if conversion:
+        metrics["conversion"] = conversion
+    if revenue:
+        metrics["revenue"] = revenue
+    return metrics
+
+def write_html_report(metrics, source, title=None, offline=False, report_date=None):
+    """지표 묶음을 generate_html()에 바로 넘겨 HTML 리포트 저장 (Excel 저장/재파싱 없음)
+
+    Args:
+        report_date: 파일 이름의 날짜 (없으면 오늘)
+    """
+    from generate_html_report import generate_html, get_week_title, report_data_from_metrics
+
+    data = report_data_from_metrics(metrics, source=source)
+    if title is None:
+        title = get_week_title()
+    with stage("generate_html"):
+        html = generate_html(data, title=title, offline=offline)
+
+    if report_date is None:
+        report_date = datetime.now().strftime('%Y-%m-%d')
+    filepath = os.path.join(EXPORT_DIR, f'analysis_report_{report_date}.html')
+    with stage("html_write"), open(filepath, "w", encoding="utf-8") as f:
+        f.write(html)
+    print(f"Report saved: {filepath}")
+    return filepath
+
 def main():
-    wb = create_workbook()
+    options = parse_args(sys.argv[1:])
+    if options["profile"]:
+        PROFILER.enable()
+    with stage("load_metrics"):
+        metrics = load_metrics(options)
 
     # 폴더 생성 (없으면)
     os.makedirs(EXPORT_DIR, exist_ok=True)
 
     # 파일 저장
     today = datetime.now().strftime('%Y-%m-%d')
-    filename = f'amplitude_report_{today}.xlsx'
-    filepath = os.path.join(EXPORT_DIR, filename)
-    wb.save(filepath)
-    print(f"Excel file created: {filepath}")
+    if options["snapshot"]:
+        # 이전 스냅샷 다시 그리기 - 오늘 스냅샷 / 워크북을 덮어쓰지 않도록 입력 스냅샷 이름을 따른다
+        snapshot_file = Path(options["snapshot"])
+        report_date = snapshot_file.stem.removeprefix("amplitude_report_")
+        filename = f'{snapshot_file.stem}.xlsx'
+    else:
+        # 스냅샷이 이 달 데이터의 기준 - Excel / HTML은 저장한 스냅샷을 다시 읽어 그린다
+        report_date = today
+        filename = f'amplitude_report_{today}.xlsx'
+        snapshot_file = snapshot_path(os.path.join(EXPORT_DIR, filename))
+        with stage("write_snapshot"):
+            write_snapshot(metrics, snapshot_file, source=filename)
+        with stage("read_snapshot"):
+            metrics = read_snapshot(snapshot_file)
+        print(f"Snapshot saved: {snapshot_file}")
+
+    if options["excel"] or not options["html"]:
+        with stage("create_workbook"):
+            wb = create_workbook(metrics, write_only=options["write_only"])
+        filepath = os.path.join(EXPORT_DIR, filename)
+        with stage("save"):
+            wb.save(filepath)
+        print(f"Excel file created: {filepath}")
+
+    if options["html"]:
+        source = filename if options["excel"] else snapshot_file.name
+        with stage("html"):
+            write_html_report(metrics, source=source, title=options["title"], offline=options["offline"],
+                              report_date=report_date)
+
+    if options["profile"]:
+        profile_path = os.path.join(EXPORT_DIR, f"profile_{today}.json")
+        PROFILER.write(profile_path, options["profile_folded"])
+        print(PROFILER.summary())
+        print(f"Profile saved: {profile_path}")
 
 if __name__ == "__main__":
     main()
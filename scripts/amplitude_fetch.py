@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""Amplitude Dashboard REST / Export API 병렬 수집
+
+UI에서 옮겨 적던 WAU / 지역별 WAU / NAU / 리텐션 / 플랫폼별 WAU 시계열과 원본 이벤트 export를
+asyncio로 동시에 받는다. HTTP는 표준 라이브러리(urllib)를 스레드에서 돌리고,
+
+    - 동시 요청 수는 세마포어로 제한 (--concurrency)
+    - 요청 시작 속도는 토큰 버킷으로 제한 (--rate 초당 요청 수, --burst 순간 최대) - 429 응답은 Retry-After 만큼 쉬고 재시도
+    - export는 하루 단위로 나눠 받고, 받던 파일(.part)은 끊긴 바이트 위치부터 Range 요청으로 이어 받는다
+      (처음 받을 때의 ETag / Last-Modified 를 If-Range 로 보내, 서버 파일이 바뀌었거나 Range를 무시하면
+      200을 받아 처음부터 다시 받는다. 검증값이 없는 서버는 지난 날(내용이 바뀌지 않는 날)만 이어 받는다)
+    - Dashboard 응답은 디스크 캐시(response_cache.py)를 먼저 본다 - 지난 주만 걸친 쿼리는 영구, 이번 주가 걸치면 짧은 TTL
+      export도 지난 날은 한 번 풀어 두면 다시 받지 않고, 이번 주 날짜만 매번 새로 받는다
+
+결과:
+    OUT/dashboard.json   generate_amplitude_report.py --dashboard 로 읽는 지표 묶음 (WAU_DATA 등과 같은 형식)
+    OUT/export/YYYYMMDD/  하루치 export 파일(*.json.gz) - --events / --store 입력으로 그대로 사용
+
+API 키는 환경 변수 AMPLITUDE_API_KEY / AMPLITUDE_SECRET_KEY 에서 읽는다.
+--base-url 로 로컬 대역 서버를 가리키면 실제 API 없이 수집 경로 전체를 시험할 수 있다.
+
+사용법:
+    python scripts/amplitude_fetch.py [--start YYYY-MM-DD] [--end YYYY-MM-DD] [--out DIR] [--no-export]
+        [--concurrency N] [--rate R] [--burst B] [--base-url URL] [--no-cache] [--cache-max-mb MB]
+    (기본 기간: 수집 중인 이번 주를 뺀 최근 REPORT_WEEKS주)
+"""
+
+import asyncio
+import base64
+import email.utils
+import http.client
+import json
+import os
+import shutil
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import zipfile
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from amplitude_ingest import (
+    KOREA_COUNTRY,
+    REPORT_WEEKS,
+    RETENTION_WEEKS,
+    build_retention_table,
+    current_week_start,
+)
+from response_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, ResponseCache, cache_namespace, is_closed_day
+
+DEFAULT_BASE_URL = "https://amplitude.com"
+DEFAULT_OUT_DIR = Path(__file__).parent.parent / "reports" / "amplitude_fetch"
+
+# Dashboard REST API 동시 요청 한도(5)보다 하나 적게
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RATE = 2.0
+DEFAULT_BURST = 4
+
+MAX_RETRIES = 5
+TIMEOUT = 300
+CHUNK_SIZE = 1 << 20
+
+# 재시도할 HTTP 상태 (요청 한도 초과 / 서버 일시 오류)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# 주간 지표 (i=7: 주 단위, 프로젝트 주 시작 요일 기준)
+WEEKLY = 7
+
+# 플랫폼별 WAU (리포트 WAU 단면 시트의 Platform 묶음과 같은 이름)
+PLATFORM_GROUPS = ("iOS", "Android", "Web")
+
+
+class TokenBucket:
+    """초당 rate개씩 차는 토큰 버킷 (최대 burst개) - 토큰이 없으면 찰 때까지 기다린다"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, cost=1):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= cost:
+                    self.tokens -= cost
+                    return
+                await asyncio.sleep((cost - self.tokens) / self.rate)
+
+
+def retry_after(value, default):
+    """Retry-After 헤더 (초 또는 HTTP 날짜) -> 기다릴 초 (해석할 수 없으면 default)"""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    return max(0.0, when.timestamp() - time.time())
+
+
+class AmplitudeClient:
+    """Basic 인증 + 동시 요청 제한 + 토큰 버킷 + 재시도 (+ 선택: 응답 캐시)를 묶은 API 클라이언트"""
+
+    def __init__(self, api_key, secret_key, base_url=DEFAULT_BASE_URL,
+                 concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE, burst=DEFAULT_BURST, cache=None):
+        self.base_url = base_url.rstrip("/")
+        token = base64.b64encode(f"{api_key}:{secret_key}".encode()).decode()
+        self.headers = {"Authorization": f"Basic {token}"}
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.bucket = TokenBucket(rate, burst)
+        self.cache = cache
+        self.request_count = 0
+
+    def url(self, path, params):
+        return f"{self.base_url}{path}?{urllib.parse.urlencode(params)}"
+
+    async def _retrying(self, label, call):
+        """call()을 세마포어 / 토큰 버킷 안에서 실행, 일시 오류는 지수 백오프(429는 Retry-After)로 재시도"""
+        for attempt in range(MAX_RETRIES + 1):
+            await self.bucket.acquire()
+            delay = 2 ** attempt
+            async with self.semaphore:
+                self.request_count += 1
+                try:
+                    return await asyncio.to_thread(call)
+                except urllib.error.HTTPError as e:
+                    if e.code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                        raise
+                    delay = retry_after(e.headers.get("Retry-After"), delay)
+                    reason = f"HTTP {e.code}"
+                except (urllib.error.URLError, http.client.HTTPException, ConnectionError, TimeoutError) as e:
+                    if attempt == MAX_RETRIES:
+                        raise
+                    reason = str(e)
+            print(f"  retry {label} in {delay:g}s ({reason})", file=sys.stderr)
+            await asyncio.sleep(delay)
+
+    async def get_json(self, path, params):
+        # 캐시 히트는 토큰 / 동시 요청 슬롯을 쓰지 않는다
+        if self.cache is not None:
+            cached = await asyncio.to_thread(self.cache.get, path, params)
+            if cached is not None:
+                return cached
+        request = urllib.request.Request(self.url(path, params), headers=self.headers)
+
+        def call():
+            with urllib.request.urlopen(request, timeout=TIMEOUT) as response:
+                return json.loads(response.read())
+
+        value = await self._retrying(path, call)
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.put, path, params, value)
+        return value
+
+    async def download(self, path, params, dest, resume=True):
+        """이어 받기 가능한 다운로드 - dest.part 크기를 시작 위치로 Range 요청, 다 받으면 dest로 이름 변경
+
+        .part 를 처음 받을 때 응답의 ETag(없으면 Last-Modified)를 dest.part.validator 에 적어 두고
+        이어 받을 때 If-Range 로 보낸다 - 서버 쪽 내용이 바뀌었으면 200(전체)이 와서 처음부터 다시 쓴다.
+
+        Args:
+            resume: False면 남아 있는 .part 를 버리고 처음부터 (내용이 바뀌는 진행 중 구간)
+
+        Returns:
+            이번 실행에서 받은 바이트 수
+        """
+        dest = Path(dest)
+        part = dest.with_name(dest.name + ".part")
+        validator_file = dest.with_name(dest.name + ".part.validator")
+        if not resume:
+            part.unlink(missing_ok=True)
+            validator_file.unlink(missing_ok=True)
+        url = self.url(path, params)
+        received = 0
+
+        def call():
+            nonlocal received
+            offset = part.stat().st_size if part.exists() else 0
+            headers = dict(self.headers)
+            if offset:
+                headers["Range"] = f"bytes={offset}-"
+                if validator_file.exists():
+                    headers["If-Range"] = validator_file.read_text(encoding="utf-8")
+            try:
+                response = urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=TIMEOUT)
+            except urllib.error.HTTPError as e:
+                if e.code == 416 and offset:
+                    return  # 이미 끝까지 받았다
+                raise
+            with response:
+                if offset and response.status != 206:
+                    offset = 0  # Range 미지원 / 서버 내용 변경 - 처음부터
+                if not offset:
+                    validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+                    if validator:
+                        validator_file.write_text(validator, encoding="utf-8")
+                    else:
+                        validator_file.unlink(missing_ok=True)
+                expected = response.headers.get("Content-Length")
+                written = 0
+                with open(part, "ab" if offset else "wb") as f:
+                    # 끊기면 여기까지 쓴 바이트가 .part에 남고, 재시도가 그 위치부터 이어 받는다
+                    while chunk := response.read(CHUNK_SIZE):
+                        f.write(chunk)
+                        written += len(chunk)
+                received += written
+                # 연결이 중간에 닫혀도 read()는 오류 없이 빈 값을 돌려주므로 길이로 확인
+                if expected is not None and written < int(expected):
+                    raise http.client.IncompleteRead(b"", int(expected) - written)
+
+        await self._retrying(dest.name, call)
+        part.replace(dest)
+        validator_file.unlink(missing_ok=True)
+        return received
+
+
+# ---- Dashboard REST API ----
+
+def _segment(prop, op, values):
+    return json.dumps([{"prop": prop, "op": op, "values": values}])
+
+
+def _ymd(d):
+    return d.strftime("%Y%m%d")
+
+
+def users_series(response):
+    """/api/2/users 응답 -> {"dates", "values"} (첫 번째 시리즈)"""
+    data = response["data"]
+    return {"dates": data["xValues"], "values": data["series"][0]}
+
+
+def _series_label(label):
+    # group by 응답의 seriesLabels 는 "값" 또는 [세그먼트 인덱스, "값"]
+    return label[-1] if isinstance(label, list) else label
+
+
+def grouped_series(response, names):
+    """/api/2/users group by 응답 -> {"dates", 이름: [...]} (응답에 없는 이름은 0, 나머지 값은 "Other"로 합산)"""
+    data = response["data"]
+    dates = data["xValues"]
+    result = {"dates": dates}
+    result.update({name: [0] * len(dates) for name in (*names, "Other")})
+    for label, values in zip(data.get("seriesLabels", []), data["series"]):
+        name = _series_label(label)
+        target = result[name if name in names else "Other"]
+        for i, value in enumerate(values):
+            target[i] += value
+    return result
+
+
+def retention_counts(response):
+    """/api/2/retention 응답 -> {코호트 주 ordinal: [Week 0, Week 1, ...]} (아직 끝나지 않은 주는 제외)"""
+    counts = {}
+    for day, cells in response["data"]["series"][0]["values"].items():
+        row = [cell["count"] for cell in cells if not cell.get("incomplete")]
+        if row:
+            counts[date.fromisoformat(day).toordinal()] = row
+    return counts
+
+
+async def fetch_dashboard(client, start, end):
+    """WAU / 지역별 WAU / NAU / 리텐션 / 플랫폼별 WAU를 동시에 요청 -> 지표 묶음"""
+    period = {"start": _ymd(start), "end": _ymd(end), "i": WEEKLY}
+    requests = {
+        "wau": ("/api/2/users", {**period, "m": "active"}),
+        "nau": ("/api/2/users", {**period, "m": "new"}),
+        "korea": ("/api/2/users", {**period, "m": "active", "s": _segment("country", "is", [KOREA_COUNTRY])}),
+        "non_korea": ("/api/2/users", {**period, "m": "active", "s": _segment("country", "is not", [KOREA_COUNTRY])}),
+        "platform": ("/api/2/users", {**period, "m": "active", "g": "platform"}),
+        "retention": ("/api/2/retention", {
+            # 리텐션 코호트는 리포트 끝 주부터 RETENTION_WEEKS주
+            "start": _ymd(max(start, end - timedelta(weeks=RETENTION_WEEKS) + timedelta(days=1))),
+            "end": _ymd(end),
+            "i": WEEKLY,
+            "se": json.dumps({"event_type": "_new"}),
+            "re": json.dumps({"event_type": "_active"}),
+        }),
+    }
+    responses = await asyncio.gather(*(client.get_json(path, params) for path, params in requests.values()))
+    raw = dict(zip(requests, responses))
+
+    wau = users_series(raw["wau"])
+    platform = grouped_series(raw["platform"], PLATFORM_GROUPS)
+    columns = [f"Platform: {name}" for name in (*PLATFORM_GROUPS, "Other")]
+    return {
+        "wau": wau,
+        "wau_by_region": {
+            "dates": wau["dates"],
+            "korea": users_series(raw["korea"])["values"],
+            "non_korea": users_series(raw["non_korea"])["values"],
+            "total": wau["values"],
+        },
+        "nau": users_series(raw["nau"]),
+        "retention": build_retention_table(retention_counts(raw["retention"])),
+        "segments": {
+            "dates": platform["dates"],
+            "columns": columns,
+            "rows": [[d, *values] for d, *values in
+                     zip(platform["dates"], *(platform[name] for name in (*PLATFORM_GROUPS, "Other")))],
+        },
+    }
+
+
+# ---- Export API ----
+
+def export_days(start, end):
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def unpack_export(archive, target):
+    """export zip 안의 시간 단위 *.json.gz 파일을 target 폴더로 풀고 zip 삭제"""
+    tmp = target.with_name(target.name + ".tmp")
+    tmp.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(archive) as zf:
+        for member in zf.infolist():
+            if member.is_dir():
+                continue
+            (tmp / Path(member.filename).name).write_bytes(zf.read(member))
+    tmp.replace(target)
+    archive.unlink()
+
+
+async def fetch_export_day(client, day, export_dir):
+    """하루치 export (UTC 00시 ~ 23시) - 이미 풀어 둔 지난 날은 건너뛴다 -> 받은 바이트 수"""
+    target = export_dir / _ymd(day)
+    closed = is_closed_day(day)
+    if target.exists():
+        if closed:
+            return 0
+        shutil.rmtree(target)  # 이번 주 날짜는 이벤트가 계속 들어오므로 새로 받는다
+    archive = export_dir / f"{_ymd(day)}.zip"
+    params = {"start": f"{_ymd(day)}T00", "end": f"{_ymd(day)}T23"}
+    try:
+        # 이번 주 날짜는 지난 실행에서 받다 만 .part 와 내용이 다를 수 있으므로 이어 받지 않는다
+        received = await client.download("/api/2/export", params, archive, resume=closed)
+    except urllib.error.HTTPError as e:
+        if e.code == 404:  # 그날 이벤트 없음
+            target.mkdir(parents=True)
+            return 0
+        raise
+    await asyncio.to_thread(unpack_export, archive, target)
+    return received
+
+
+async def fetch_all(client, start, end, out_dir, export=True):
+    """지표와 export를 동시에 수집 -> (지표 묶음, export 바이트 수)"""
+    export_dir = out_dir / "export"
+    export_dir.mkdir(parents=True, exist_ok=True)
+    tasks = [fetch_dashboard(client, start, end)]
+    if export:
+        tasks += [fetch_export_day(client, day, export_dir) for day in export_days(start, end)]
+    metrics, *sizes = await asyncio.gather(*tasks)
+    return metrics, sum(sizes)
+
+
+def default_period():
+    """수집 중인 이번 주를 뺀 최근 REPORT_WEEKS주 (월요일 ~ 일요일)"""
+    end_week = current_week_start()
+    return date.fromordinal(end_week - 7 * REPORT_WEEKS), date.fromordinal(end_week - 1)
+
+
+def main():
+    start, end = default_period()
+    out_dir = DEFAULT_OUT_DIR
+    export = True
+    base_url = os.environ.get("AMPLITUDE_BASE_URL", DEFAULT_BASE_URL)
+    concurrency = DEFAULT_CONCURRENCY
+    rate = DEFAULT_RATE
+    burst = DEFAULT_BURST
+    use_cache = True
+    cache_max_bytes = DEFAULT_MAX_BYTES
+
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] == "--start" and i + 1 < len(sys.argv):
+            start = datetime.strptime(sys.argv[i + 1], "%Y-%m-%d").date()
+            i += 1
+        elif sys.argv[i] == "--end" and i + 1 < len(sys.argv):
+            end = datetime.strptime(sys.argv[i + 1], "%Y-%m-%d").date()
+            i += 1
+        elif sys.argv[i] == "--out" and i + 1 < len(sys.argv):
+            out_dir = Path(sys.argv[i + 1])
+            i += 1
+        elif sys.argv[i] == "--no-export":
+            export = False
+        elif sys.argv[i] == "--base-url" and i + 1 < len(sys.argv):
+            base_url = sys.argv[i + 1]
+            i += 1
+        elif sys.argv[i] == "--concurrency" and i + 1 < len(sys.argv):
+            concurrency = int(sys.argv[i + 1])
+            i += 1
+        elif sys.argv[i] == "--rate" and i + 1 < len(sys.argv):
+            rate = float(sys.argv[i + 1])
+            i += 1
+        elif sys.argv[i] == "--burst" and i + 1 < len(sys.argv):
+            burst = int(sys.argv[i + 1])
+            i += 1
+        elif sys.argv[i] == "--no-cache":
+            use_cache = False
+        elif sys.argv[i] == "--cache-max-mb" and i + 1 < len(sys.argv):
+            cache_max_bytes = int(float(sys.argv[i + 1]) * 1024 * 1024)
+            i += 1
+        i += 1
+
+    api_key = os.environ.get("AMPLITUDE_API_KEY")
+    secret_key = os.environ.get("AMPLITUDE_SECRET_KEY")
+    if not api_key or not secret_key:
+        print("AMPLITUDE_API_KEY / AMPLITUDE_SECRET_KEY is not set", file=sys.stderr)
+        sys.exit(1)
+
+    async def run():
+        cache = None
+        if use_cache:
+            cache = ResponseCache(DEFAULT_CACHE_DIR, cache_max_bytes, namespace=cache_namespace(base_url, api_key))
+        client = AmplitudeClient(api_key, secret_key, base_url, concurrency, rate, burst, cache=cache)
+        result = await fetch_all(client, start, end, out_dir, export=export)
+        return client, result
+
+    started = time.perf_counter()
+    client, (metrics, received) = asyncio.run(run())
+    out_dir.mkdir(parents=True, exist_ok=True)
+    path = out_dir / "dashboard.json"
+    path.write_text(json.dumps({
+        "fetched_at": datetime.now().isoformat(timespec="seconds"),
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "metrics": metrics,
+    }, ensure_ascii=False), encoding="utf-8")
+    print(f"Fetched {start} ~ {end}: {client.request_count} requests, {received / 1e6:,.1f} MB export "
+          f"in {time.perf_counter() - started:.1f}s")
+    if client.cache is not None:
+        print(f"Response cache: {client.cache.hits} hits, {client.cache.misses} misses "
+              f"({client.cache.total_bytes / 1e6:,.1f} MB in {client.cache.root})")
+    print(f"Metrics: {path}  (python generate_amplitude_report.py --dashboard {path})")
+    if export:
+        print(f"Export: {out_dir / 'export'}  (--events / --store input)")
+
+
+if __name__ == "__main__":
+    main()
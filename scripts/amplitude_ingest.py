@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""Amplitude 원본 이벤트 export(NDJSON, gzip)를 스트리밍으로 집계
+
+Amplitude Export API가 내려주는 시간 단위 파일(`*.json.gz`)을 한 줄씩 읽어
+WAU / NAU / WAU 지역별 / 주간 리텐션 / 일간 활성 지표를 한 번의 패스로 계산한다.
+이벤트 자체는 메모리에 올리지 않고, 사용자별 최초 방문 주와 주별 / 일별 활성 사용자 집합만 유지한다.
+결과는 generate_amplitude_report.py 의 WAU_DATA / WAU_BY_REGION_DATA / NAU_DATA / RETENTION_DATA 와 같은 모양이다.
+"""
+
+import gzip
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from daily_metrics import DAILY_REPORT_DAYS, build_daily_data
+from user_bitmap import group_values, union_count
+
+# 한국 / 한국 외 구분 기준 (Amplitude country 속성)
+KOREA_COUNTRY = "South Korea"
+
+# WAU 지역별 묶음 (None = 나머지 국가 전부)
+REGION_GROUPS = {"korea": [KOREA_COUNTRY], "non_korea": None}
+
+# Amplitude 프로젝트 타임존 (KST) - export의 event_time은 UTC
+TIMEZONE_OFFSET = timedelta(hours=9)
+
+# 활성 사용자로 치지 않는 이벤트 (Amplitude 기본 동작과 동일)
+NON_ACTIVE_EVENT_TYPES = frozenset({"$identify", "$groupidentify"})
+
+# 리포트 기본 범위 (WAU/NAU 24주, 리텐션 16주 코호트)
+REPORT_WEEKS = 24
+RETENTION_WEEKS = 16
+
+
+def iter_export_files(paths):
+    """export 경로 목록을 파일 단위로 펼친다 (디렉터리는 *.json / *.json.gz 재귀 탐색, 이름순)"""
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            files = [p for p in path.rglob("*") if p.name.endswith((".json", ".json.gz", ".gz"))]
+            yield from sorted(files)
+        else:
+            yield path
+
+
+def iter_events(path):
+    """export 파일 하나를 이벤트 단위로 스트리밍 (gzip 여부는 확장자로 판단)"""
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def event_user_key(event):
+    """Amplitude 고유 사용자 식별자 (amplitude_id 우선, 없으면 user_id / device_id)"""
+    return event.get("amplitude_id") or event.get("user_id") or event.get("device_id")
+
+
+def event_week(event_time):
+    """event_time(UTC 문자열) -> 프로젝트 타임존 기준 주 시작(월요일)의 ordinal"""
+    local = datetime.fromisoformat(event_time) + TIMEZONE_OFFSET
+    d = local.date()
+    return d.toordinal() - d.weekday()
+
+
+def event_day(event_time):
+    """event_time(UTC 문자열) -> 프로젝트 타임존 기준 날짜의 ordinal"""
+    return (datetime.fromisoformat(event_time) + TIMEZONE_OFFSET).date().toordinal()
+
+
+def week_start(d):
+    """임의 날짜가 속한 주의 월요일 ordinal"""
+    return d.toordinal() - d.weekday()
+
+
+def format_week(week):
+    """주 ordinal -> '2026-07-06'"""
+    return date.fromordinal(week).isoformat()
+
+
+def format_cohort(week):
+    """주 ordinal -> 'Jul 06, 2026' (Amplitude 리텐션 export 표기)"""
+    return date.fromordinal(week).strftime("%b %d, %Y")
+
+
+def format_percent(value):
+    """Amplitude 리텐션 % 표기 ('100.0%', '58.61%')"""
+    return f"{round(value, 2)}%"
+
+
+def week_range(first, last, n_weeks):
+    """first ~ last 주 중 마지막 n_weeks개 (빈 주 포함)"""
+    first = max(first, last - 7 * (n_weeks - 1))
+    return list(range(first, last + 1, 7))
+
+
+def build_group_series(source, weeks, groups):
+    """국가 묶음별 WAU 시계열 - source는 group_counts(week, groups) / wau(week)를 제공
+
+    묶음끼리 사용자가 겹칠 수 있으므로 합계 대신 합집합 기준 전체 WAU를 "total"로 함께 돌려준다.
+    """
+    data = {"dates": [format_week(w) for w in weeks]}
+    data.update({name: [] for name in groups})
+    for w in weeks:
+        for name, count in source.group_counts(w, groups).items():
+            data[name].append(count)
+    data["total"] = [source.wau(w) for w in weeks]
+    return data
+
+
+def build_retention_table(counts, retention_weeks=RETENTION_WEEKS):
+    """코호트별 재방문 수 {코호트 주: [Week 0, Week 1, ...]} -> RETENTION_DATA 형식 표"""
+    header = ["Segment", "Start Date", "Users"] + [f"Week {i}" for i in range(retention_weeks)]
+    if not counts:
+        return [header]
+
+    n_weeks = max(len(row) for row in counts.values())
+    retained = [0] * n_weeks
+    eligible = [0] * n_weeks
+    for row in counts.values():
+        for i, value in enumerate(row):
+            retained[i] += value
+            eligible[i] += row[0]
+
+    overall_pct = [format_percent(r / e * 100) if e else "0.0%" for r, e in zip(retained, eligible)]
+    data = [
+        header,
+        ["Global", "Overall", "Retained"] + retained,
+        ["Global", "Overall", "Retained %"] + overall_pct,
+    ]
+    # Amplitude export와 동일하게 Week 1이 아직 없는 최신 코호트는 Overall에만 반영
+    for cohort in sorted(counts, reverse=True):
+        row = counts[cohort]
+        if len(row) < 2:
+            continue
+        data.append(["Global", format_cohort(cohort), row[0]] + row)
+    return data
+
+
+class WeeklyAggregator:
+    """이벤트 스트림 -> 주간 지표 집계기
+
+    사용자 식별자는 내부에서 정수 인덱스로 치환해 주별 집합 크기를 줄인다.
+    최초 방문 주(first_seen)는 모든 이벤트를 본 뒤에 확정되므로
+    NAU / 리텐션은 지표를 조회하는 시점에 계산한다.
+
+    Args:
+        end_week: 이 주(월요일 ordinal)부터의 이벤트는 무시 (수집 중인 이번 주 제외용). None이면 제한 없음
+    """
+
+    def __init__(self, end_week=None):
+        self.end_week = end_week
+        self.user_index = {}
+        self.first_seen = []
+        self.active = {}
+        self.country_active = {}
+        self.daily_active = {}
+        self.event_count = 0
+
+    def add(self, event):
+        """이벤트 1건 반영"""
+        if event.get("event_type") in NON_ACTIVE_EVENT_TYPES:
+            return
+        key = event_user_key(event)
+        event_time = event.get("event_time")
+        if key is None or not event_time:
+            return
+        day = event_day(event_time)
+        self.record(key, week_start(date.fromordinal(day)), event.get("country"), day)
+
+    def record(self, key, week, country, day=None):
+        """사용자 1명의 주간 활동 1건 반영 (이벤트 파싱 없이 이미 주 단위로 나뉜 데이터용)
+
+        day(날짜 ordinal)를 주면 일간 지표용 일별 활성 사용자에도 반영한다.
+        """
+        if self.end_week is not None and week >= self.end_week:
+            return
+
+        uid = self.user_index.get(key)
+        if uid is None:
+            uid = len(self.first_seen)
+            self.user_index[key] = uid
+            self.first_seen.append(week)
+        elif week < self.first_seen[uid]:
+            self.first_seen[uid] = week
+
+        self.active.setdefault(week, set()).add(uid)
+        # 국가별 사용자 집합 - 묶음별 WAU는 합집합으로 계산 (여러 국가에 걸친 사용자도 한 번만 셈)
+        self.country_active.setdefault(week, {}).setdefault(country, set()).add(uid)
+        if day is not None:
+            self.daily_active.setdefault(day, set()).add(uid)
+        self.event_count += 1
+
+    def consume(self, events):
+        for event in events:
+            self.add(event)
+        return self
+
+    def merge(self, other):
+        """다른 집계기(다른 shard 묶음의 부분 집계)를 합친다
+
+        other의 사용자 인덱스를 식별자 기준으로 이 집계기의 인덱스로 바꿔 붙인다.
+        같은 순서로 합치면 결과(사용자 인덱스 포함)는 항상 같다.
+        """
+        first_seen = self.first_seen
+        remap = [0] * len(other.first_seen)
+        for key, other_uid in other.user_index.items():
+            week = other.first_seen[other_uid]
+            uid = self.user_index.get(key)
+            if uid is None:
+                uid = self.user_index[key] = len(first_seen)
+                first_seen.append(week)
+            elif week < first_seen[uid]:
+                first_seen[uid] = week
+            remap[other_uid] = uid
+
+        for week, uids in other.active.items():
+            self.active.setdefault(week, set()).update([remap[u] for u in uids])
+        for week, by_country in other.country_active.items():
+            target = self.country_active.setdefault(week, {})
+            for country, uids in by_country.items():
+                target.setdefault(country, set()).update([remap[u] for u in uids])
+        for day, uids in other.daily_active.items():
+            self.daily_active.setdefault(day, set()).update([remap[u] for u in uids])
+        self.event_count += other.event_count
+        return self
+
+    def weeks(self, report_weeks=REPORT_WEEKS):
+        """리포트 대상 주 목록 (데이터가 있는 마지막 주부터 거꾸로 report_weeks개, 빈 주 포함)"""
+        if not self.active:
+            return []
+        return week_range(min(self.active), max(self.active), report_weeks)
+
+    def wau(self, week):
+        return len(self.active.get(week, ()))
+
+    def new_users(self):
+        """주 ordinal -> 해당 주 최초 방문 사용자 수"""
+        counts = {}
+        for week in self.first_seen:
+            counts[week] = counts.get(week, 0) + 1
+        return counts
+
+    def wau_data(self, report_weeks=REPORT_WEEKS):
+        weeks = self.weeks(report_weeks)
+        return {
+            "dates": [format_week(w) for w in weeks],
+            "values": [self.wau(w) for w in weeks],
+        }
+
+    def group_counts(self, week, groups=REGION_GROUPS):
+        """한 주의 국가 묶음별 활성 사용자 수 {묶음 이름: 사용자 수}"""
+        by_country = self.country_active.get(week, {})
+        return {
+            name: union_count(by_country[c] for c in countries)
+            for name, countries in group_values(by_country, groups).items()
+        }
+
+    def wau_by_groups_data(self, groups, report_weeks=REPORT_WEEKS):
+        """임의 국가 묶음별 WAU {"dates", <묶음 이름>..., "total"}"""
+        return build_group_series(self, self.weeks(report_weeks), groups)
+
+    def wau_by_region_data(self, report_weeks=REPORT_WEEKS):
+        return self.wau_by_groups_data(REGION_GROUPS, report_weeks)
+
+    def nau_data(self, report_weeks=REPORT_WEEKS):
+        weeks = self.weeks(report_weeks)
+        new_users = self.new_users()
+        return {
+            "dates": [format_week(w) for w in weeks],
+            "values": [new_users.get(w, 0) for w in weeks],
+        }
+
+    def retention_counts(self, retention_weeks=RETENTION_WEEKS):
+        """코호트 주 ordinal -> [Week 0, Week 1, ...] 재방문 사용자 수 (관측된 주까지만)"""
+        cohorts = self.weeks(retention_weeks)
+        if not cohorts:
+            return {}
+        first_cohort, last_week = cohorts[0], cohorts[-1]
+        counts = {c: [0] * ((last_week - c) // 7 + 1) for c in cohorts}
+        first_seen = self.first_seen
+        for week in cohorts:
+            for uid in self.active.get(week, ()):
+                cohort = first_seen[uid]
+                if cohort >= first_cohort:
+                    counts[cohort][(week - cohort) // 7] += 1
+        return counts
+
+    def retention_data(self, retention_weeks=RETENTION_WEEKS):
+        """RETENTION_DATA 형식의 코호트 표 (헤더, Overall 2행, 최신 코호트부터)"""
+        return build_retention_table(self.retention_counts(retention_weeks), retention_weeks)
+
+    def daily_data(self, report_days=DAILY_REPORT_DAYS):
+        """DAU / 최근 7일·28일 활성 / L7·L28 (일별 데이터가 없으면 None)"""
+        return build_daily_data(self.daily_active, report_days)
+
+    def report_data(self, report_weeks=REPORT_WEEKS, retention_weeks=RETENTION_WEEKS):
+        """create_workbook()에 바로 넘길 수 있는 지표 묶음 ("daily"는 일별 데이터가 있을 때만)"""
+        data = {
+            "wau": self.wau_data(report_weeks),
+            "wau_by_region": self.wau_by_region_data(report_weeks),
+            "nau": self.nau_data(report_weeks),
+            "retention": self.retention_data(retention_weeks),
+        }
+        daily = self.daily_data()
+        if daily:
+            data["daily"] = daily
+        return data
+
+
+def aggregate_exports(paths, end_week=None):
+    """export 파일/디렉터리 목록을 스트리밍 집계한 WeeklyAggregator 반환"""
+    aggregator = WeeklyAggregator(end_week=end_week)
+    for path in iter_export_files(paths):
+        aggregator.consume(iter_events(path))
+    return aggregator
+
+
+def aggregate_exports_parallel(paths, end_week=None, workers=None):
+    """export shard들을 프로세스 풀에 나눠 집계한 뒤 파일 순서대로 병합
+
+    shard 파일 목록을 연속 구간으로 잘라 워커마다 부분 집계(WeeklyAggregator)를 만들고,
+    구간 순서대로 merge() 하므로 결과는 워커 수와 상관없이 aggregate_exports()와 같다.
+    """
+    files = list(iter_export_files(paths))
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(files) <= 1:
+        return aggregate_exports(files, end_week=end_week)
+
+    # 워커당 여러 구간을 줘서 파일 크기 편차가 있어도 놀고 있는 코어가 적도록
+    n_chunks = min(len(files), workers * 4)
+    size, extra = divmod(len(files), n_chunks)
+    chunks = []
+    start = 0
+    for i in range(n_chunks):
+        end = start + size + (1 if i < extra else 0)
+        chunks.append(files[start:end])
+        start = end
+
+    result = WeeklyAggregator(end_week=end_week)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for partial in pool.map(aggregate_exports, chunks, [end_week] * n_chunks):
+            result.merge(partial)
+    return result
+
+
+def current_week_start():
+    """이번 주(수집 중) 월요일 ordinal - 기본적으로 이 주부터는 집계에서 제외"""
+    return week_start((datetime.now(timezone.utc) + TIMEZONE_OFFSET).date())
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""리포트 파이프라인 벤치마크 (합성 데이터)
+
+고정 시드의 합성 이벤트(N주, M코호트, K이벤트, U사용자, 국가 비율)로 단계별 시간과 최대 메모리를 잰다.
+
+    aggregate        WeeklyAggregator.add - 이벤트 파싱 + 주간 집계
+    report_data      지표 묶음 (WAU / 지역별 / NAU / 리텐션) 계산
+    create_workbook  워크북 생성 + 저장 (기본 모드)
+    write_only       워크북 생성 + 저장 (write-only 모드)
+    extract_all_data 저장한 워크북 다시 읽기 (캐시 없이)
+    html_from_excel  extract_all_data() 결과로 generate_html()
+    html_direct      지표 묶음을 바로 generate_html() (Excel 왕복 없음)
+    write_snapshot   지표 묶음 -> 바이너리 스냅샷 저장
+    read_snapshot    스냅샷 다시 읽기 (extract_all_data 대신 쓰는 경로)
+
+결과는 단계마다 JSON 한 줄로 bench_output.txt (프로젝트 루트)에 쓴다.
+
+사용법:
+    python scripts/benchmark_report.py [--scales small,medium,large] [--output PATH] [--seed N]
+"""
+
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from amplitude_ingest import KOREA_COUNTRY, TIMEZONE_OFFSET, WeeklyAggregator
+from generate_html_report import PROJECT_ROOT, extract_all_data, generate_html, report_data_from_metrics
+from report_snapshot import read_snapshot, write_snapshot
+
+sys.path.insert(0, str(PROJECT_ROOT))
+from generate_amplitude_report import create_workbook  # noqa: E402
+
+BENCH_OUTPUT = PROJECT_ROOT / "bench_output.txt"
+
+# 규모별 설정: weeks(N), cohorts(M), events(K), users(U)
+SCALES = {
+    "small": {"weeks": 24, "cohorts": 16, "events": 20_000, "users": 2_000},
+    "medium": {"weeks": 52, "cohorts": 26, "events": 200_000, "users": 20_000},
+    "large": {"weeks": 156, "cohorts": 52, "events": 1_000_000, "users": 100_000},
+}
+
+# 사용자 국가 비율
+COUNTRY_MIX = {KOREA_COUNTRY: 0.93, "United States": 0.03, "Japan": 0.02, "Vietnam": 0.01, None: 0.01}
+
+# 주마다 다음 주에도 돌아올 확률 (리텐션 곡선 모양)
+WEEKLY_RETURN = 0.8
+
+
+def synthetic_events(weeks, events, users, country_mix=COUNTRY_MIX, seed=0):
+    """Amplitude export 형식의 합성 이벤트 목록 (같은 인자면 항상 같은 결과)
+
+    사용자마다 가입 주와 국가를 정하고, 가입 주부터 WEEKLY_RETURN 확률로 이어지는 활동 주 중 하나에 이벤트를 만든다.
+    """
+    rng = random.Random(seed)
+    today = date(2026, 7, 13)
+    first_week = today - timedelta(days=today.weekday() + 7 * weeks)
+    countries = list(country_mix)
+    weights = list(country_mix.values())
+
+    profiles = []
+    for i in range(users):
+        start = rng.randrange(weeks)
+        span = 1
+        while start + span < weeks and rng.random() < WEEKLY_RETURN:
+            span += 1
+        profiles.append((f"user-{i}", start, span, rng.choices(countries, weights)[0]))
+
+    out = []
+    for _ in range(events):
+        user_id, start, span, country = profiles[rng.randrange(users)]
+        local = datetime.combine(first_week, datetime.min.time()) + timedelta(
+            weeks=start + rng.randrange(span), seconds=rng.randrange(7 * 86400)
+        )
+        utc = (local - TIMEZONE_OFFSET).replace(tzinfo=timezone.utc)
+        out.append({
+            "user_id": user_id,
+            "event_time": utc.strftime("%Y-%m-%d %H:%M:%S.%f"),
+            "event_type": "PageView - Home",
+            "country": country,
+        })
+    return out
+
+
+def measure(func):
+    """(결과, 초, 최대 메모리 KB) - 시간은 tracemalloc 없이 따로 재서 추적 오버헤드를 빼고 잰다"""
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak // 1024
+
+
+def run_scale(name, params, seed, workdir):
+    """한 규모의 모든 단계 실행 -> 결과 레코드 목록"""
+    events = synthetic_events(params["weeks"], params["events"], params["users"], seed=seed)
+    xlsx_path = Path(workdir) / f"bench_{name}.xlsx"
+    wo_path = Path(workdir) / f"bench_{name}_write_only.xlsx"
+    snap_path = Path(workdir) / f"bench_{name}.snap"
+    state = {}
+
+    def aggregate():
+        return WeeklyAggregator().consume(events)
+
+    def report_data():
+        return state["aggregator"].report_data(params["weeks"], params["cohorts"])
+
+    def save_workbook(path, write_only):
+        wb = create_workbook(state["metrics"], write_only=write_only)
+        wb.save(path)
+        return path.stat().st_size
+
+    def html_from_excel():
+        return len(generate_html(extract_all_data(xlsx_path, use_cache=False), title="Benchmark"))
+
+    def html_direct():
+        return len(generate_html(report_data_from_metrics(state["metrics"]), title="Benchmark"))
+
+    stages = [
+        ("aggregate", aggregate, "aggregator"),
+        ("report_data", report_data, "metrics"),
+        ("create_workbook", lambda: save_workbook(xlsx_path, False), "xlsx_bytes"),
+        ("write_only", lambda: save_workbook(wo_path, True), "write_only_bytes"),
+        ("extract_all_data", lambda: extract_all_data(xlsx_path, use_cache=False), None),
+        ("html_from_excel", html_from_excel, "html_bytes"),
+        ("html_direct", html_direct, None),
+        ("write_snapshot", lambda: write_snapshot(state["metrics"], snap_path).stat().st_size, "snapshot_bytes"),
+        ("read_snapshot", lambda: read_snapshot(snap_path), None),
+    ]
+
+    records = []
+    for stage, func, key in stages:
+        result, seconds, peak_kb = measure(func)
+        if key:
+            state[key] = result
+        record = {"scale": name, **params, "seed": seed, "stage": stage,
+                  "seconds": round(seconds, 4), "peak_kb": peak_kb}
+        if isinstance(result, int):
+            record["output_bytes"] = result
+        records.append(record)
+        print(f"  {name:<7} {stage:<17} {seconds:8.3f}s  {peak_kb:>9,} KB")
+    return records
+
+
+def main():
+    scales = ["small", "medium"]
+    output = BENCH_OUTPUT
+    seed = 0
+
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] == "--scales" and i + 1 < len(sys.argv):
+            scales = sys.argv[i + 1].split(",")
+            i += 1
+        elif sys.argv[i] == "--output" and i + 1 < len(sys.argv):
+            output = Path(sys.argv[i + 1])
+            i += 1
+        elif sys.argv[i] == "--seed" and i + 1 < len(sys.argv):
+            seed = int(sys.argv[i + 1])
+            i += 1
+        i += 1
+
+    records = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in scales:
+            records.extend(run_scale(name, SCALES[name], seed, workdir))
+
+    with open(output, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    print(f"Results saved: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""docs/archive 월별 리포트 일괄 재생성
+
+월마다 원본 스냅샷 폴더(reports/archive/<YYYY-MM-DD>/)를 두고, 프로세스 풀에서 병렬로 HTML을 다시 만든다.
+입력 데이터 / 인사이트 / 템플릿 / 렌더러 코드의 해시가 지난 빌드와 같은 달은 건너뛰므로,
+템플릿이나 CSS를 고치면 모든 달이, 한 달치 인사이트만 고치면 그 달만 다시 만들어진다.
+
+--shared-assets 로 빌드하면 CSS / 차트 스크립트를 페이지마다 넣지 않고
+docs/assets/report.<내용 해시>.css|js 로 한 번만 저장해 모든 달과 docs/index.html 이 함께 쓴다.
+파일명이 내용 해시라 브라우저가 오래 캐시해도 되고, 페이지에는 데이터와 마크업만 남는다.
+
+--offline 은 Chart.js / Pretendard를 CDN 대신 scripts/vendor/ 의 고정 버전 파일로 넣는다 (report_vendor.py).
+--shared-assets 와 함께 쓰면 폰트는 모든 달의 글자를 합친 서브셋 하나를 공유한다.
+
+스냅샷 폴더 구성:
+    reports/archive/2026-07-13/
+        amplitude_report_*.snap / *.xlsx 또는 data.json   # 그 달 데이터 (data.json은 generate_html_report.py -j 출력)
+        insights.json                            # generate_html()의 insights (+ 선택: "title", "appendix")
+
+원본 워크북이 없는 지난 달은 --import 로 발행된 docs/archive 페이지에서 data.json / insights.json 을
+복원한다 (페이지 표에 실린 값만 남으므로 리텐션은 W14 까지). 페이지에만 있는 수기 섹션은
+insights 의 "appendix" (HTML) / "appendix_script" (차트 스크립트)로 옮겨 그대로 다시 넣는다.
+
+사용법:
+    python scripts/build_archive.py [--force] [--workers N] [--shared-assets] [--offline] [--import]
+"""
+
+import hashlib
+import json
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+from generate_html_report import PROJECT_ROOT, generate_html, load_report_data, write_static_assets
+from report_template import TEMPLATES_DIR
+from report_vendor import OFFLINE_FILES, VENDOR_LOCK, check_offline_files, vendor_path
+
+SOURCES_DIR = PROJECT_ROOT / "reports" / "archive"
+ARCHIVE_DIR = PROJECT_ROOT / "docs" / "archive"
+INDEX_PATH = PROJECT_ROOT / "docs" / "index.html"
+ASSETS_DIR = PROJECT_ROOT / "docs" / "assets"
+BUILD_MANIFEST = ARCHIVE_DIR / ".build-manifest.json"
+
+# 발행된 페이지의 인사이트 div id -> insights 키 (import_page)
+INSIGHT_IDS = {
+    "summary-insight": "summary",
+    "wau-insight": "wau",
+    "wau-region-insight": "wau_region",
+    "nau-insight": "nau",
+    "retention-insight": "retention",
+    "retention-over-time-insight": "retention_over_time",
+}
+
+
+def find_data_file(source_dir):
+    """스냅샷 폴더의 데이터 파일 (data.json 우선, 없으면 최신 .snap, 그것도 없으면 최신 xlsx)"""
+    data_json = source_dir / "data.json"
+    if data_json.exists():
+        return data_json
+    for pattern in ("*.snap", "*.xlsx"):
+        files = sorted(source_dir.glob(pattern), reverse=True)
+        if files:
+            return files[0]
+    return None
+
+
+def renderer_hash(shared_assets=False, offline=False, font_text=""):
+    """템플릿 + 렌더러 코드 + 빌드 모드 해시 (모든 달에 공통)
+
+    렌더러가 import 하는 모듈 목록을 따로 관리하면 빠뜨리기 쉬우므로 scripts/*.py 전체와
+    vendor 잠금 파일(CDN 태그의 integrity)을 해시한다.
+    """
+    h = hashlib.sha256(b"shared-assets" if shared_assets else b"inline")
+    scripts_dir = Path(__file__).parent
+    files = sorted(TEMPLATES_DIR.rglob("*")) + sorted(scripts_dir.glob("*.py")) + [VENDOR_LOCK]
+    for path in files:
+        if path.is_file():
+            h.update(str(path.relative_to(scripts_dir)).encode("utf-8"))
+            h.update(path.read_bytes())
+    if offline:
+        h.update(b"offline" + font_text.encode("utf-8"))
+        for name in OFFLINE_FILES:
+            h.update(name.encode("utf-8"))
+            h.update(vendor_path(name).read_bytes())
+    return h.hexdigest()
+
+
+def source_hash(source_dir, base_hash):
+    """한 달치 입력 해시 = 데이터 파일 + 인사이트 + 공통 렌더러 해시"""
+    h = hashlib.sha256(base_hash.encode("ascii"))
+    data_file = find_data_file(source_dir)
+    for path in (data_file, source_dir / "insights.json"):
+        if path is not None and path.exists():
+            h.update(path.name.encode("utf-8"))
+            h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def archive_font_text(source_dirs):
+    """공유 폰트 서브셋에 남길 글자 - 템플릿 + 모든 달의 인사이트 / data.json + 기본 타이틀"""
+    parts = ["월 보고서"]
+    for path in sorted(TEMPLATES_DIR.rglob("*")):
+        if path.is_file():
+            parts.append(path.read_text(encoding="utf-8"))
+    for source_dir in source_dirs:
+        for path in (source_dir / "insights.json", source_dir / "data.json"):
+            if path.exists():
+                # json.dumps 로 이스케이프된 글자도 원래 글자로
+                parts.append(json.dumps(json.loads(path.read_text(encoding="utf-8")), ensure_ascii=False))
+    return "".join(parts)
+
+
+# ---- 발행된 페이지 -> 스냅샷 폴더 ----
+
+def _element_end(html, start, tag="div"):
+    """start 위치의 <tag ...> 와 짝이 맞는 </tag> 의 끝 인덱스"""
+    depth = 0
+    for m in re.compile(rf"<{tag}[\s>]|</{tag}>").finditer(html, start):
+        depth += -1 if m.group().startswith("</") else 1
+        if depth == 0:
+            return m.end()
+    raise ValueError(f"Unclosed <{tag}> at {start}")
+
+
+def _cells(row_html):
+    return [re.sub(r"<[^>]+>", "", cell) for cell in re.findall(r"<t[dh][^>]*>(.*?)</t[dh]>", row_html, re.S)]
+
+
+def _number(text):
+    return int(text.replace(",", "")) if re.fullmatch(r"\d[\d,]*", text) else text
+
+
+def _chart_series(html, canvas_id, n):
+    """차트 스크립트에서 canvas_id 차트의 앞쪽 data 배열 n개"""
+    start = html.index(f"getElementById('{canvas_id}')")
+    return [json.loads(m) for m in re.findall(r"\bdata: (\[[^\]]*\])", html[start:])[:n]]
+
+
+def _page_timeseries(html, insight_id):
+    """인사이트 뒤 '원본 데이터' 표 (날짜 / 값)"""
+    start = html.index(f'id="{insight_id}"')
+    table = html[start:html.index("</table>", start)]
+    rows = re.findall(r"<tr><td>(\d{4}-\d{2}-\d{2})</td><td>([\d,]+)</td></tr>", table)
+    return {"dates": [d for d, _ in rows], "values": [_number(v) for _, v in rows]}
+
+
+def _page_retention(html):
+    """리텐션 원본 표 -> extract_retention() 형식 (표 위 도움말 행 제외)"""
+    start = html.index('id="retention-insight"')
+    table = html[start:html.index("</table>", start)]
+    rows = [_cells(row) for row in re.findall(r"<tr>(.*?)</tr>", table, re.S)]
+    header_at = next(i for i, row in enumerate(rows) if row and row[0] == "Segment")
+    return {
+        "headers": rows[header_at],
+        "rows": [[_number(cell) for cell in row] for row in rows[header_at + 1:]],
+        "excluded_cohort": None,
+    }
+
+
+def _page_appendix(html, known_ids):
+    """생성기에 없는 수기 섹션 (HTML, 차트 스크립트) - 없으면 ("", "")"""
+    sections = []
+    scripts = []
+    for m in re.finditer(r"\n( *<!-- [^\n]*-->\n)? *<div class=\"section\">", html):
+        body = html[m.start() + 1:_element_end(html, html.index("<div", m.start()))]
+        ids = set(re.findall(r'id="([\w-]+)"', body))
+        if ids & known_ids:
+            continue
+        sections.append(body + "\n\n")
+        for canvas in re.findall(r'<canvas id="([\w-]+)"', body):
+            call = html.index(f"new Chart(document.getElementById('{canvas}')")
+            # 바로 위 주석 줄부터 new Chart(...); 끝까지
+            line_start = html.rindex("\n", 0, call) + 1
+            comment = html.rindex("\n", 0, line_start - 1) + 1
+            if html[comment:line_start].strip().startswith("//"):
+                line_start = comment
+            end = _paren_end(html, call) + 1
+            if html[end] == ";":
+                end += 1
+            scripts.append(html[line_start:end])
+    return "".join(sections), "\n".join(scripts)
+
+
+def _paren_end(html, start):
+    """start 이후 첫 '(' 와 짝이 맞는 ')' 의 인덱스"""
+    depth = 0
+    for i in range(html.index("(", start), len(html)):
+        if html[i] == "(":
+            depth += 1
+        elif html[i] == ")":
+            depth -= 1
+            if depth == 0:
+                return i
+    raise ValueError(f"Unclosed '(' at {start}")
+
+
+def import_page(page_path):
+    """발행된 아카이브 페이지 -> (data, insights)
+
+    원본 워크북이 남아 있지 않은 달의 스냅샷 폴더를 만들 때 쓴다. 페이지에 실린 값만 복원하므로
+    리텐션은 페이지 표에 있던 주차(W14)까지, 지역별 합집합 전체는 같은 주의 WAU 이다.
+    """
+    page_path = Path(page_path)
+    html = page_path.read_text(encoding="utf-8")
+    wau = _page_timeseries(html, "wau-insight")
+    data = {
+        "file": page_path.name,
+        "generated": f"{page_path.stem} 00:00",
+        "wau": wau,
+        "wau_by_region": None,
+        "nau": _page_timeseries(html, "nau-insight"),
+        "retention": _page_retention(html),
+        "daily": None,
+        "conversion": None,
+        "revenue": None,
+        "segments": None,
+    }
+    report_data = re.search(r"const REPORT_DATA = (\{.*?\});\n", html)
+    if report_data:
+        # 이 스크립트로 다시 만든 페이지 - 차트 값은 REPORT_DATA 에 있다
+        report_data = json.loads(report_data.group(1))
+        korea, non_korea = report_data["regionKorea"], report_data["regionNonKorea"]
+    elif "getElementById('wauRegionChart')" in html:
+        korea, non_korea = _chart_series(html, "wauRegionChart", 2)
+    else:
+        korea = non_korea = []
+    if korea:
+        data["wau_by_region"] = {
+            "dates": wau["dates"][-len(korea):],
+            "korea": korea,
+            "non_korea": non_korea,
+            "total": wau["values"][-len(korea):],
+        }
+
+    insights = {}
+    for div_id, key in INSIGHT_IDS.items():
+        m = re.search(rf'<div id="{div_id}">', html)
+        if m:
+            insights[key] = html[m.end():_element_end(html, m.start()) - len("</div>")]
+    title = re.search(r"<h1>(.*?)</h1>", html).group(1)
+    if title != f"{int(page_path.stem[5:7])}월 보고서":
+        insights["title"] = title
+    known = set(INSIGHT_IDS) | {"wauChart", "wauRegionChart", "wauRegionShareChart", "nauChart",
+                                "retentionCurveChart", "retentionChart"}
+    appendix, appendix_script = _page_appendix(html, known)
+    if appendix:
+        insights["appendix"] = appendix
+        insights["appendix_script"] = appendix_script
+    return data, insights
+
+
+def import_archive(force=False):
+    """docs/archive 페이지 중 스냅샷 폴더가 없는 달을 페이지에서 복원 -> 만든 달 목록"""
+    imported = []
+    for page in sorted(ARCHIVE_DIR.glob("????-??-??.html")):
+        source_dir = SOURCES_DIR / page.stem
+        if find_data_file(source_dir) is not None and not force:
+            continue
+        data, insights = import_page(page)
+        source_dir.mkdir(parents=True, exist_ok=True)
+        for name, value in (("data.json", data), ("insights.json", insights)):
+            (source_dir / name).write_text(json.dumps(value, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        imported.append(page.stem)
+    return imported
+
+
+def build_page(source_dir, output_path, asset_base=None, offline=False, font_text=None):
+    """한 달치 리포트 생성 (워커 프로세스에서 실행)"""
+    month = source_dir.name
+    data_file = find_data_file(source_dir)
+    if data_file.suffix == ".json":
+        data = json.loads(data_file.read_text(encoding="utf-8"))
+    else:
+        data = load_report_data(data_file)
+    # 작성일은 빌드 시각이 아니라 아카이브 날짜
+    data["generated"] = f"{month} 00:00"
+
+    insights_path = source_dir / "insights.json"
+    insights = json.loads(insights_path.read_text(encoding="utf-8")) if insights_path.exists() else None
+    title = insights.pop("title", None) if insights else None
+    if title is None:
+        title = f"{datetime.strptime(month, '%Y-%m-%d').month}월 보고서"
+
+    html = generate_html(
+        data, insights=insights, title=title, asset_base=asset_base, offline=offline, font_text=font_text
+    )
+    output_path.write_text(html, encoding="utf-8")
+    return month
+
+
+def build_archive(force=False, workers=None, shared_assets=False, offline=False):
+    """바뀐 달만 병렬로 재생성
+
+    Args:
+        shared_assets: True면 CSS / 차트 스크립트를 docs/assets/ 공유 파일로 링크
+        offline: True면 Chart.js / 서브셋 폰트를 CDN 대신 로컬 vendor 파일로 포함
+
+    Returns:
+        (다시 만든 달 목록, 건너뛴 달 목록)
+    """
+    manifest = json.loads(BUILD_MANIFEST.read_text(encoding="utf-8")) if BUILD_MANIFEST.exists() else {}
+    source_dirs = sorted(p for p in SOURCES_DIR.glob("*") if p.is_dir())
+    # 공유 폰트는 모든 달이 같은 서브셋을 써야 하므로 글자를 미리 모은다 (인라인이면 페이지별 서브셋)
+    font_text = archive_font_text(source_dirs) if offline and shared_assets else None
+    base_hash = renderer_hash(shared_assets, offline, font_text or "")
+    # 아카이브 페이지 기준 상대 경로 (index.html 로 복사할 때 assets/ 로 바꾼다)
+    asset_base = f"../{ASSETS_DIR.name}" if shared_assets else None
+    if shared_assets:
+        write_static_assets(ASSETS_DIR, offline, font_text)
+
+    jobs = {}
+    skipped = []
+    for source_dir in source_dirs:
+        if find_data_file(source_dir) is None:
+            print(f"  {source_dir.name}: no data file, skipped")
+            continue
+        digest = source_hash(source_dir, base_hash)
+        output_path = ARCHIVE_DIR / f"{source_dir.name}.html"
+        if not force and manifest.get(source_dir.name) == digest and output_path.exists():
+            skipped.append(source_dir.name)
+            continue
+        jobs[source_dir.name] = (source_dir, output_path, digest)
+
+    built = []
+    failed = []
+    if jobs:
+        ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+        # 한 달이 실패하거나 중단돼도 이미 만든 달은 manifest 에 남겨 다음 빌드에서 건너뛴다
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(build_page, source_dir, output_path, asset_base, offline, font_text): month
+                    for month, (source_dir, output_path, _) in jobs.items()
+                }
+                for future in as_completed(futures):
+                    month = futures[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        print(f"  {month}: failed ({e})", file=sys.stderr)
+                        failed.append(month)
+                        continue
+                    manifest[month] = jobs[month][2]
+                    built.append(month)
+        finally:
+            BUILD_MANIFEST.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+        built.sort()
+
+    # docs/index.html 은 가장 최근 달과 같은 페이지
+    archived = sorted(ARCHIVE_DIR.glob("????-??-??.html"))
+    if archived:
+        index_html = archived[-1].read_text(encoding="utf-8")
+        if shared_assets:
+            index_html = index_html.replace(f"{asset_base}/", f"{ASSETS_DIR.name}/")
+        if not INDEX_PATH.exists() or INDEX_PATH.read_text(encoding="utf-8") != index_html:
+            INDEX_PATH.write_text(index_html, encoding="utf-8")
+            print(f"Index updated: {archived[-1].name}")
+
+    if failed:
+        raise RuntimeError(f"Failed to build: {', '.join(sorted(failed))}")
+    return built, skipped
+
+
+def parse_args(argv):
+    """명령행 인자 -> 옵션 dict (모르는 인자나 값이 빠진 --workers 는 종료)"""
+    options = {"force": False, "workers": None, "shared_assets": False, "offline": False, "import": False}
+    flags = {"--force": "force", "--shared-assets": "shared_assets", "--offline": "offline", "--import": "import"}
+
+    i = 0
+    while i < len(argv):
+        if argv[i] in flags:
+            options[flags[argv[i]]] = True
+        elif argv[i] == "--workers":
+            value = argv[i + 1] if i + 1 < len(argv) else ""
+            if not value.isdigit() or int(value) < 1:
+                print(f"--workers needs a positive integer, got {value or 'nothing'}", file=sys.stderr)
+                sys.exit(1)
+            options["workers"] = int(value)
+            i += 1
+        else:
+            print(f"Unknown argument: {argv[i]}", file=sys.stderr)
+            print(__doc__.split("사용법:")[1].strip(), file=sys.stderr)
+            sys.exit(1)
+        i += 1
+    return options
+
+
+def main(argv=None):
+    options = parse_args(sys.argv[1:] if argv is None else argv)
+    problems = check_offline_files() if options["offline"] else []
+    if problems:
+        for problem in problems:
+            print(problem, file=sys.stderr)
+        sys.exit(1)
+
+    if options["import"]:
+        for month in import_archive(force=options["force"]):
+            print(f"Imported: {SOURCES_DIR / month}")
+
+    built, skipped = build_archive(
+        force=options["force"],
+        workers=options["workers"],
+        shared_assets=options["shared_assets"],
+        offline=options["offline"],
+    )
+    for month in built:
+        print(f"Built: {ARCHIVE_DIR / (month + '.html')}")
+    print(f"{len(built)} built, {len(skipped)} unchanged")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""리텐션 코호트 표 -> NumPy 행렬
+
+extract_retention()이 돌려주는 `{"headers", "rows"}` 를 한 번만 훑어
+코호트 × 주차 수치 행렬(counts)과 관측 여부 마스크(mask)로 바꾼다.
+HTML 리포트의 Overall 곡선 / 관측 코호트 수 / 최근 1주차 리텐션 / W-n 추이는 모두 이 행렬에서 배열 연산으로 계산한다.
+"""
+
+import numpy as np
+
+# 코호트 표의 앞 3개 컬럼 (Segment, Start Date, Users) 이후부터 Week 0
+WEEK0_COL = 3
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _parse_percent(value):
+    """'58.61%' -> 58.61 (퍼센트 표기가 아니면 NaN)"""
+    if value and "%" in str(value):
+        try:
+            return float(str(value).replace("%", ""))
+        except ValueError:
+            pass
+    return np.nan
+
+
+def short_cohort_date(label):
+    """'Dec 29, 2025' -> 'Dec 29' (차트 X축 표기)"""
+    return str(label).replace(", 2025", "").replace(", 2026", "")
+
+
+class CohortMatrix:
+    """코호트 × 주차 리텐션 행렬
+
+    Attributes:
+        labels: 코호트 시작일 문자열 (표 순서 그대로, 보통 최신 코호트부터)
+        counts: (코호트, 주차) float 행렬 - 관측되지 않은 칸은 0
+        mask: (코호트, 주차) bool 행렬 - 숫자 값이 있는 칸
+        overall_pct: Overall "Retained %" 행의 주차별 % (없으면 NaN)
+    """
+
+    def __init__(self, labels, counts, mask, overall_pct):
+        self.labels = labels
+        self.counts = counts
+        self.mask = mask
+        self.overall_pct = overall_pct
+
+    @classmethod
+    def from_retention(cls, retention):
+        """extract_retention() 결과에서 행렬 생성"""
+        rows = retention["rows"] if retention else []
+        n_weeks = max([len(row) - WEEK0_COL for row in rows] + [0])
+
+        labels = []
+        cohort_cells = []
+        overall_pct = np.full(n_weeks, np.nan)
+        for row in rows:
+            start = str(row[1])
+            if "Overall" in start:
+                if "%" in str(row[2]):
+                    overall_pct[:len(row) - WEEK0_COL] = [_parse_percent(v) for v in row[WEEK0_COL:]]
+                continue
+            if "Start Date" in start or len(row) <= WEEK0_COL or not _is_number(row[WEEK0_COL]):
+                continue
+            labels.append(row[1])
+            cohort_cells.append(row[WEEK0_COL:])
+
+        counts = np.zeros((len(cohort_cells), n_weeks))
+        mask = np.zeros((len(cohort_cells), n_weeks), dtype=bool)
+        for i, cells in enumerate(cohort_cells):
+            for j, value in enumerate(cells):
+                if _is_number(value):
+                    counts[i, j] = value
+                    mask[i, j] = True
+        return cls(labels, counts, mask, overall_pct)
+
+    @property
+    def n_weeks(self):
+        return self.counts.shape[1]
+
+    def column(self, week):
+        """Week n 값과 '값이 0이 아닌 숫자' 마스크 (범위 밖이면 모두 비어 있음)"""
+        if week >= self.n_weeks:
+            empty = np.zeros(len(self.labels))
+            return empty, empty.astype(bool)
+        values = self.counts[:, week]
+        return values, self.mask[:, week] & (values != 0)
+
+    def overall_at(self, week):
+        """Overall Week n % (없으면 None)"""
+        if week < self.n_weeks and not np.isnan(self.overall_pct[week]):
+            return float(self.overall_pct[week])
+        return None
+
+    def overall_week1(self):
+        """Overall 1주차 리텐션 % (없으면 None)"""
+        return self.overall_at(1)
+
+    def overall_curve(self, max_week=12):
+        """Overall 리텐션 곡선 (W0 ~ W{max_week}) -> (labels, values)"""
+        pct = self.overall_pct[:max_week + 1]
+        weeks = np.flatnonzero(~np.isnan(pct))
+        return [f"W{i}" for i in weeks], pct[weeks].tolist()
+
+    def coverage(self, n_weeks):
+        """주차별 관측 코호트 수 (W0부터 n_weeks개)"""
+        observed = self.mask.sum(axis=0).tolist()
+        return [int(c) for c in observed[:n_weeks]] + [0] * max(0, n_weeks - len(observed))
+
+    def valid_week1(self):
+        """Week 0 / Week 1 이 모두 0이 아닌 숫자인 코호트 인덱스 (표 순서)"""
+        _, w0_ok = self.column(0)
+        _, w1_ok = self.column(1)
+        return np.flatnonzero(w0_ok & w1_ok)
+
+    def retention_pct(self, week, decimals=1):
+        """코호트별 Week n 리텐션 % -> (값 배열, 유효 마스크)"""
+        w0, w0_ok = self.column(0)
+        wn, wn_ok = self.column(week)
+        valid = w0_ok & wn_ok
+        pct = np.zeros(len(self.labels))
+        np.divide(wn, w0, out=pct, where=valid)
+        return np.round(pct * 100, decimals), valid
+
+    def week_trend(self, week):
+        """Week n 리텐션 추이 (오래된 코호트부터, 수집 중인 최신 포인트 제외)
+
+        Week 1 이 아직 없는 최신 코호트는 제외한다.
+        """
+        pct, valid = self.retention_pct(week)
+        _, w1_ok = self.column(1)
+        idx = np.flatnonzero(valid & w1_ok)[::-1]
+        trend = [{"date": short_cohort_date(self.labels[i]), "retention": float(pct[i])} for i in idx]
+        return trend[:-1]
+
+    def week_trends(self, weeks=(1, 2, 3, 4)):
+        return {week: self.week_trend(week) for week in weeks}
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""일 단위 활성 지표 - DAU, 최근 7일 / 28일 활성 사용자, L7 / L28
+
+일별 활성 사용자 집합을 하루씩 슬라이딩 윈도우에 밀어 넣어 계산한다.
+윈도우는 사용자별 '창 안 활동일 수'와 그 분포(L-n 히스토그램)를 유지하므로,
+하루 진행할 때 비용은 그날 들어온 사용자 + 창에서 빠지는 날의 사용자 수에 비례한다 (창 전체를 다시 세지 않음).
+
+    active_7d / active_28d  최근 7일 / 28일 중 하루 이상 활동한 사용자 수
+    stickiness              DAU / active_7d, DAU / active_28d
+    L7 / L28                마지막 날 기준 최근 7일 / 28일 중 k일 활동한 사용자 수 (k = 1..7 / 1..28)
+"""
+
+from collections import deque
+from datetime import date
+
+# 일간 지표 기본 범위 (12주)
+DAILY_REPORT_DAYS = 84
+
+# 슬라이딩 윈도우 크기
+WINDOWS = (7, 28)
+
+
+class SlidingWindow:
+    """최근 days일 동안 활동한 사용자 집합 (일 단위로 한 칸씩 이동)"""
+
+    def __init__(self, days):
+        self.days = days
+        self.active_days = {}
+        self.histogram = [0] * (days + 1)  # [k] = 창 안에서 k일 활동한 사용자 수
+        self._window = deque()
+
+    def _change(self, uid, delta):
+        count = self.active_days.get(uid, 0)
+        if count:
+            self.histogram[count] -= 1
+        count += delta
+        if count:
+            self.histogram[count] += 1
+            self.active_days[uid] = count
+        else:
+            del self.active_days[uid]
+
+    def push(self, users):
+        """하루 진행 - 창에서 빠지는 가장 오래된 날의 사용자를 빼고, 오늘 활동한 사용자를 더한다"""
+        if len(self._window) == self.days:
+            for uid in self._window.popleft():
+                self._change(uid, -1)
+        self._window.append(users)
+        for uid in users:
+            self._change(uid, 1)
+
+    def __len__(self):
+        return len(self.active_days)
+
+    def l_counts(self):
+        """[1일 활동 사용자 수, 2일, ..., days일]"""
+        return self.histogram[1:]
+
+
+def build_daily_data(daily_active, report_days=DAILY_REPORT_DAYS):
+    """일 ordinal -> 그날 활동 사용자 집합 에서 일간 지표 계산
+
+    리포트 첫날의 28일 창이 채워지도록 그 27일 전부터 윈도우에 넣는다 (데이터가 있는 범위 안에서).
+
+    Returns:
+        {"dates", "dau", "active_7d", "active_28d", "l7", "l28"} (데이터가 없으면 None)
+    """
+    if not daily_active:
+        return None
+    first_day, last_day = min(daily_active), max(daily_active)
+    report_start = max(first_day, last_day - report_days + 1)
+    windows = {days: SlidingWindow(days) for days in WINDOWS}
+
+    data = {"dates": [], "dau": [], "active_7d": [], "active_28d": []}
+    for day in range(max(first_day, report_start - max(WINDOWS) + 1), last_day + 1):
+        users = daily_active.get(day, ())
+        for window in windows.values():
+            window.push(users)
+        if day >= report_start:
+            data["dates"].append(date.fromordinal(day).isoformat())
+            data["dau"].append(len(users))
+            data["active_7d"].append(len(windows[7]))
+            data["active_28d"].append(len(windows[28]))
+    data["l7"] = windows[7].l_counts()
+    data["l28"] = windows[28].l_counts()
+    return data
+
+
+def stickiness(dau, active):
+    """DAU / 기간 활성 사용자 (%) 목록"""
+    return [round(d / a * 100, 2) if a else 0 for d, a in zip(dau, active)]
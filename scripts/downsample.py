@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""차트용 시계열 다운샘플링 - Largest-Triangle-Three-Buckets (LTTB)
+
+캔버스 폭(약 1200px)보다 훨씬 많은 점을 Chart.js에 넘기면 보이지도 않는 점 때문에
+페이지에 싣는 JSON이 커지고 차트 초기화가 느려진다.
+LTTB는 구간마다 앞뒤 점과 만드는 삼각형 넓이가 가장 큰 점 하나를 남겨 피크 / 급락 모양을 유지한다.
+첫 점과 마지막 점(최신 주)은 항상 남는다.
+
+원본 값은 건드리지 않고 남길 인덱스만 돌려주므로, 라벨과 여러 계열을 같은 인덱스로 자를 수 있다.
+"""
+
+
+def _value(v):
+    return v if isinstance(v, (int, float)) else 0
+
+
+def lttb_indices(values, max_points):
+    """남길 점의 인덱스 목록 (오름차순, 길이 <= max_points)"""
+    n = len(values)
+    if max_points is None or n <= max_points or n <= 2:
+        return list(range(n))
+    if max_points < 3:
+        return [0, n - 1][:max(max_points, 1)]
+
+    indices = [0]
+    # 첫 / 마지막 점을 뺀 나머지를 max_points - 2 개 구간으로 나눈다
+    bucket_size = (n - 2) / (max_points - 2)
+    a = 0
+    for i in range(max_points - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        # 다음 구간 평균점 (마지막 구간이면 마지막 점)
+        next_start = end
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        if next_start >= next_end:
+            avg_x, avg_y = n - 1, _value(values[n - 1])
+        else:
+            avg_x = (next_start + next_end - 1) / 2
+            avg_y = sum(_value(v) for v in values[next_start:next_end]) / (next_end - next_start)
+
+        ax, ay = a, _value(values[a])
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (_value(values[j]) - ay) - (ax - j) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        indices.append(best)
+        a = best
+    indices.append(n - 1)
+    return indices
+
+
+def downsample_indices(series, max_points):
+    """같은 X축을 쓰는 여러 계열의 공통 인덱스 - 계열별 LTTB 결과의 합집합
+
+    계열끼리 고르는 점이 많이 겹치므로 계열당 예산을 max_points 에서 시작해
+    합집합이 max_points 이하가 될 때까지 줄인다.
+    """
+    series = [s for s in series if s]
+    if not series:
+        return []
+    n = len(series[0])
+    if max_points is None or n <= max_points:
+        return list(range(n))
+    budget = max_points
+    while True:
+        keep = set()
+        for values in series:
+            keep.update(lttb_indices(values, budget))
+        if len(keep) <= max_points or budget <= 3:
+            return sorted(keep)
+        budget = max(min(budget - 1, budget * max_points // len(keep)), 3)
+
+
+def take(values, indices):
+    return [values[i] for i in indices]
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""주(ISO week) 단위로 파티션된 컬럼형 로컬 이벤트 저장소
+
+Amplitude export를 한 번만 파싱해 아래 구조로 저장하고, 이후 지표 계산은
+필요한 주 파티션의 필요한 컬럼 파일만 읽는다.
+
+    <root>/
+        manifest.json          # 적재 완료한 export 파일 목록 + 파티션별 확정 행 수
+        dictionaries.json      # 문자열 컬럼 사전 (event_type, country, ...)
+        users.json             # 사용자 사전 (user 컬럼 값 -> Amplitude 사용자 식별자)
+        2026-W28/
+            user.bin           # uint32 - users.json 인덱스
+            time.bin           # int64 - event_time (UTC epoch seconds)
+            event_type.bin     # uint32 - 사전 코드
+            country.bin
+            platform.bin
+            source.bin         # 이벤트 속성 (event_properties.source)
+            tier.bin
+            price.bin          # int64
+            to_tier.bin        # 티어 변경 이벤트의 변경 후 티어 / 금액
+            to_price.bin       # int64
+
+사전 코드 0은 값 없음(None)을 뜻한다. 나중에 추가된 컬럼이 없는 예전 파티션은 0으로 채워 읽는다.
+
+export 파일 하나를 다 읽을 때마다 컬럼 파일 이어 쓰기 -> 사전 / users.json -> manifest.json 순서로 기록하고,
+manifest.json 교체가 그 파일의 확정(commit)이다. 컬럼 파일 끝에 manifest 행 수를 넘는 바이트가 있으면
+확정 전에 중단된 적재이므로 읽을 때는 무시하고, 다음 적재를 시작할 때 잘라낸다.
+사전은 값을 추가만 하므로 확정되지 않은 값이 남아 있어도 기존 코드가 바뀌지 않는다.
+"""
+
+import json
+from array import array
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+from amplitude_ingest import (
+    NON_ACTIVE_EVENT_TYPES,
+    TIMEZONE_OFFSET,
+    WeeklyAggregator,
+    event_user_key,
+    iter_events,
+    iter_export_files,
+)
+
+# 컬럼 정의: 이름 -> (array typecode, 인코딩)
+# "dict" 는 문자열 사전 코드, "int" 는 정수 그대로
+COLUMNS = {
+    "user": ("I", "user"),
+    "time": ("q", "int"),
+    "event_type": ("I", "dict"),
+    "country": ("I", "dict"),
+    "platform": ("I", "dict"),
+    "source": ("I", "dict"),
+    "tier": ("I", "dict"),
+    "price": ("q", "int"),
+    "to_tier": ("I", "dict"),
+    "to_price": ("q", "int"),
+}
+
+# event_properties 에서 꺼내 컬럼으로 저장할 속성
+PROPERTY_COLUMNS = ("source", "tier", "price", "to_tier", "to_price")
+
+# 메모리에 쌓아두는 최대 행 수 (넘으면 파티션 파일에 이어 쓴다)
+FLUSH_ROWS = 200_000
+
+# 멤버십 퍼널 단계 (docs/membership-event-tracking-spec.md 4-2)
+MEMBERSHIP_FUNNEL_STEPS = (
+    "PageView - Membership",
+    "Action - Tap Membership Tier",
+    "Action - Subscribe Membership",
+)
+
+
+def partition_name(week):
+    """주 ordinal(월요일) -> '2026-W28'"""
+    year, week_num, _ = date.fromordinal(week).isocalendar()
+    return f"{year}-W{week_num:02d}"
+
+
+def partition_week(name):
+    """'2026-W28' -> 주 ordinal(월요일)"""
+    year, week_num = name.split("-W")
+    return date.fromisocalendar(int(year), int(week_num), 1).toordinal()
+
+
+def _read_json(path, default):
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8"))
+    return default
+
+
+def _write_json(path, value):
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(value, ensure_ascii=False), encoding="utf-8")
+    tmp.replace(path)
+
+
+def _legacy_partition_rows(root):
+    """파티션별 행 수를 manifest 에 두기 전 저장소 - <파티션>/meta.json 에서 읽는다"""
+    rows = {}
+    for path in root.iterdir():
+        if path.is_dir() and "-W" in path.name and (path / "meta.json").exists():
+            rows[path.name] = _read_json(path / "meta.json", {"rows": 0})["rows"]
+    return rows
+
+
+class EventStore:
+    """주 파티션 컬럼형 이벤트 저장소"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.manifest = _read_json(self.root / "manifest.json", {"files": {}})
+        self._legacy = "partitions" not in self.manifest
+        if self._legacy:
+            self.manifest["partitions"] = _legacy_partition_rows(self.root)
+        # 이어 쓴(확정 전 포함) 파티션별 행 수
+        self._rows = dict(self.manifest["partitions"])
+        self._recovered = False
+        self.dictionaries = _read_json(self.root / "dictionaries.json", {})
+        self.users = _read_json(self.root / "users.json", [])
+        self._user_codes = {u: i for i, u in enumerate(self.users)}
+        self._codes = {
+            name: {v: i for i, v in enumerate(values)}
+            for name, values in self.dictionaries.items()
+        }
+        self._buffers = {}
+
+    # ---- 사전 ----
+
+    def encode(self, column, value):
+        """문자열 값 -> 사전 코드 (처음 보는 값은 사전에 추가)"""
+        if value is None:
+            return 0
+        codes = self._codes.get(column)
+        if codes is None:
+            self.dictionaries[column] = [None]
+            codes = self._codes[column] = {None: 0}
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self.dictionaries[column])
+            self.dictionaries[column].append(value)
+        return code
+
+    def code(self, column, value):
+        """조회용: 값 -> 사전 코드 (사전에 없으면 None)"""
+        return self._codes.get(column, {}).get(value)
+
+    def decode(self, column, code):
+        return self.dictionaries.get(column, [None])[code]
+
+    def encode_user(self, key):
+        code = self._user_codes.get(key)
+        if code is None:
+            code = self._user_codes[key] = len(self.users)
+            self.users.append(key)
+        return code
+
+    # ---- 적재 ----
+
+    def append_event(self, event):
+        """이벤트 1건을 해당 주 파티션 버퍼에 추가"""
+        key = event_user_key(event)
+        event_time = event.get("event_time")
+        if key is None or not event_time:
+            return False
+        utc = datetime.fromisoformat(event_time).replace(tzinfo=timezone.utc)
+        local = (utc + TIMEZONE_OFFSET).date()
+        week = local.toordinal() - local.weekday()
+
+        buf = self._buffers.get(week)
+        if buf is None:
+            buf = self._buffers[week] = {name: array(tc) for name, (tc, _) in COLUMNS.items()}
+        props = event.get("event_properties") or {}
+        buf["user"].append(self.encode_user(key))
+        buf["time"].append(int(utc.timestamp()))
+        buf["event_type"].append(self.encode("event_type", event.get("event_type")))
+        buf["country"].append(self.encode("country", event.get("country")))
+        buf["platform"].append(self.encode("platform", event.get("platform")))
+        for name in PROPERTY_COLUMNS:
+            value = props.get(name)
+            if COLUMNS[name][1] == "int":
+                buf[name].append(int(value) if isinstance(value, (int, float)) else 0)
+            else:
+                buf[name].append(self.encode(name, None if value is None else str(value)))
+
+        if len(buf["user"]) >= FLUSH_ROWS:
+            self._flush_partition(week)
+        return True
+
+    def _recover(self):
+        """지난 적재가 확정 전에 중단됐으면 컬럼 파일을 manifest 행 수로 되돌린다 (첫 기록 전에 한 번)"""
+        if self._recovered:
+            return
+        self._recovered = True
+        if self._legacy:
+            # meta.json 을 지우기 전에 행 수를 manifest 로 옮겨 둔다
+            _write_json(self.root / "manifest.json", self.manifest)
+            self._legacy = False
+        committed = self.manifest["partitions"]
+        for part_dir in self.root.iterdir():
+            if not (part_dir.is_dir() and "-W" in part_dir.name):
+                continue
+            rows = committed.get(part_dir.name, 0)
+            for name, (typecode, _) in COLUMNS.items():
+                col_path = part_dir / f"{name}.bin"
+                size = rows * array(typecode).itemsize
+                if col_path.exists() and col_path.stat().st_size > size:
+                    with open(col_path, "r+b") as f:
+                        f.truncate(size)
+            (part_dir / "meta.json").unlink(missing_ok=True)
+            if part_dir.name not in committed:
+                for path in part_dir.iterdir():
+                    path.unlink()
+                part_dir.rmdir()
+
+    def _flush_partition(self, week):
+        """버퍼의 행을 파티션 컬럼 파일에 이어 쓴다 (manifest 에 확정하기 전까지는 읽히지 않는다)"""
+        buf = self._buffers.pop(week, None)
+        if not buf or not buf["user"]:
+            return
+        self._recover()
+        name = partition_name(week)
+        part_dir = self.root / name
+        part_dir.mkdir(exist_ok=True)
+        rows = self._rows.get(name, 0)
+        for column in COLUMNS:
+            col_path = part_dir / f"{column}.bin"
+            if rows and not col_path.exists():
+                # 새로 추가된 컬럼: 기존 행 수만큼 0으로 채운 뒤 이어 쓴다
+                with open(col_path, "wb") as f:
+                    array(COLUMNS[column][0], bytes(array(COLUMNS[column][0]).itemsize * rows)).tofile(f)
+            with open(col_path, "ab") as f:
+                buf[column].tofile(f)
+        self._rows[name] = rows + len(buf["user"])
+
+    def flush(self):
+        """버퍼에 남은 행을 쓰고 사전 -> manifest 순서로 기록해 지금까지 적재한 행을 확정"""
+        for week in list(self._buffers):
+            self._flush_partition(week)
+        _write_json(self.root / "dictionaries.json", self.dictionaries)
+        _write_json(self.root / "users.json", self.users)
+        self.manifest["partitions"] = dict(self._rows)
+        _write_json(self.root / "manifest.json", self.manifest)
+
+    def ingest(self, paths):
+        """export 파일/디렉터리 적재 (이미 적재한 파일은 이름+크기로 판단해 건너뜀)
+
+        파일마다 flush() 로 확정하므로, 중간에 중단돼도 다시 실행하면 확정되지 않은 파일부터 이어서 적재한다.
+
+        Returns:
+            새로 적재한 이벤트 수
+        """
+        count = 0
+        for path in iter_export_files(paths):
+            size = path.stat().st_size
+            if self.manifest["files"].get(path.name) == size:
+                continue
+            for event in iter_events(path):
+                count += self.append_event(event)
+            self.manifest["files"][path.name] = size
+            self.flush()
+        if not (self.root / "manifest.json").exists():
+            self.flush()
+        return count
+
+    # ---- 조회 ----
+
+    def partitions(self, start_week=None, end_week=None):
+        """확정된 주 ordinal 목록 (start_week 이상, end_week 미만)"""
+        weeks = []
+        for name in self.manifest["partitions"]:
+            week = partition_week(name)
+            if (start_week is None or week >= start_week) and (end_week is None or week < end_week):
+                weeks.append(week)
+        return sorted(weeks)
+
+    def rows(self, week):
+        """파티션의 확정된 행 수"""
+        return self.manifest["partitions"].get(partition_name(week), 0)
+
+    def read_column(self, week, column):
+        """파티션 하나의 컬럼 하나를 array로 읽기 (확정된 행까지만)"""
+        typecode = COLUMNS[column][0]
+        col_path = self.root / partition_name(week) / f"{column}.bin"
+        values = array(typecode)
+        size = values.itemsize * self.rows(week)
+        if not col_path.exists():
+            return array(typecode, bytes(size))
+        with open(col_path, "rb") as f:
+            values.frombytes(f.read(size))
+        return values
+
+    def scan(self, columns, start_week=None, end_week=None):
+        """필요한 컬럼만 주 단위로 읽기 -> (week, {column: array}) 제너레이터"""
+        for week in self.partitions(start_week, end_week):
+            yield week, {name: self.read_column(week, name) for name in columns}
+
+
+def aggregate_store(store, start_week=None, end_week=None):
+    """저장소에서 user / time / country / event_type 컬럼만 읽어 WeeklyAggregator 생성
+
+    start_week 를 주면 그 주 이후 파티션만 읽는다 (증분 집계용).
+    """
+    aggregator = WeeklyAggregator(end_week=end_week)
+    countries = store.dictionaries.get("country", [None])
+    skip = {store.code("event_type", t) for t in NON_ACTIVE_EVENT_TYPES} - {None}
+    # UTC epoch 초 -> 프로젝트 타임존 날짜 ordinal
+    offset = int(TIMEZONE_OFFSET.total_seconds())
+    epoch = date(1970, 1, 1).toordinal()
+    for week, cols in store.scan(("user", "time", "country", "event_type"), start_week, end_week):
+        for user, t, country, event_type in zip(cols["user"], cols["time"], cols["country"], cols["event_type"]):
+            if event_type not in skip:
+                aggregator.record(user, week, countries[country], epoch + (t + offset) // 86400)
+    return aggregator
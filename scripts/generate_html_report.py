@@ -1,16 +1,65 @@
 #!/usr/bin/env python3
 """Excel 데이터를 읽어 HTML 리포트 생성"""
 
+import hashlib
+import io
 import json
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta
 from openpyxl import load_workbook
 
+from cohort_matrix import CohortMatrix
+from daily_metrics import stickiness
+from subscription_state import ROW_KEYS as MRR_KEYS, net_new
+from downsample import downsample_indices, take
+from report_snapshot import SNAPSHOT_SUFFIX, Snapshot
+from report_template import TEMPLATES_DIR, render
+from stage_profiler import PROFILER, stage
+from report_vendor import (
+    cdn_block,
+    chart_js,
+    check_offline_files,
+    font_chars,
+    font_data_url,
+    font_face_css,
+    subset_font,
+)
+
 # 프로젝트 루트 경로
 PROJECT_ROOT = Path(__file__).parent.parent
 REPORTS_DIR = PROJECT_ROOT / "reports"
 
+# 파싱 결과 캐시 (같은 워크북을 다시 렌더링할 때 Excel 파싱 생략)
+EXTRACT_CACHE_DIR = REPORTS_DIR / ".cache"
+EXTRACT_CACHE_VERSION = 7
+
+# 리포트 섹션 순서 (templates/sections/<name>.html)
+REPORT_SECTIONS = ["summary", "wau", "wau_region", "segments", "daily", "nau", "retention", "retention_trend", "conversion", "revenue"]
+
+# 데이터가 있을 때만 넣는 섹션 {섹션 이름: data 키}
+OPTIONAL_SECTIONS = {
+    "wau_region": "wau_by_region", "segments": "segments", "daily": "daily", "conversion": "conversion", "revenue": "revenue"
+}
+
+# 페이지에 그 섹션 / 표 방식이 있을 때만 붙이는 CSS / 차트 스크립트 조각 (templates/optional/<이름>.css|js)
+# 섹션 이름과 같은 조각은 그 섹션이, virtual_table 은 full_retention 가상 테이블이 쓴다
+OPTIONAL_ASSETS = ("virtual_table", "daily", "conversion", "revenue", "segments")
+
+# 다운샘플링할 수 있는 시계열 차트 (max_points 딕셔너리 키)
+TIMESERIES_CHARTS = ("wau", "wau_region", "nau")
+
+# 리텐션 원본 테이블 컬럼 수 (W14까지 = Segment, Start Date, Users, W0~W14)
+MAX_RETENTION_COLS = 18
+
+# 리텐션 원본 테이블 자리 (HTML 행 / 브라우저에서 그리는 가상 테이블)
+RETENTION_TABLE_BLOCK = """                <div class="data-table">
+                    <table>
+                        {rows}
+                    </table>
+                </div>"""
+RETENTION_VIRTUAL_BLOCK = """                <div class="data-table virtual-table" id="retentionTable"></div>"""
+
 
 def get_week_title():
     """현재 월 기준으로 'X월 보고서' 타이틀 생성"""
@@ -26,6 +75,14 @@ def find_latest_excel():
     return excel_files[0]
 
 
+def find_latest_report():
+    """최신 리포트 데이터 파일 - 같은 날짜면 Excel 옆 스냅샷(.snap) 우선"""
+    files = [*REPORTS_DIR.glob("amplitude_report_*.xlsx"), *REPORTS_DIR.glob(f"amplitude_report_*{SNAPSHOT_SUFFIX}")]
+    if not files:
+        raise FileNotFoundError("No report snapshots or Excel files found in reports/")
+    return max(files, key=lambda p: (p.stem, p.suffix == SNAPSHOT_SUFFIX))
+
+
 def extract_timeseries(ws, start_row=4, exclude_last=True):
     """시계열 데이터 추출 (WAU, NAU)
 
@@ -34,7 +91,7 @@ def extract_timeseries(ws, start_row=4, exclude_last=True):
     """
     data = {"dates": [], "values": []}
     for row in ws.iter_rows(min_row=start_row, values_only=True):
-        if row[0] and row[1] is not None:
+        if row and row[0] and row[1] is not None:
             data["dates"].append(str(row[0]))
             data["values"].append(row[1])
 
@@ -53,12 +110,15 @@ def extract_retention(ws, exclude_last=True):
         exclude_last: True면 최신 코호트 제외 (이번 주는 수집 중이므로)
     """
     data = {"headers": [], "rows": [], "excluded_cohort": None}
-    for idx, row in enumerate(ws.iter_rows(min_row=3, values_only=True)):
-        if row[0]:
+    for row in ws.iter_rows(min_row=3, values_only=True):
+        if row and row[0]:
             row_data = [cell if cell is not None else "" for cell in row]
-            if idx == 0:
+            # 표 위의 도움말 텍스트는 건너뛰고 "Segment" 헤더 행부터 읽는다
+            if row_data[0] == "Segment":
                 data["headers"] = row_data
-            else:
+            elif data["headers"]:
+                # 시트 크기 정보가 없는 (write-only) 파일은 행 길이가 제각각이라 헤더 길이에 맞춘다
+                row_data += [""] * (len(data["headers"]) - len(row_data))
                 data["rows"].append(row_data)
 
     # 이번 주 코호트 제외 (Overall 행 제외하고 첫 번째 코호트가 최신)
@@ -72,20 +132,117 @@ def extract_retention(ws, exclude_last=True):
     return data
 
 
-def extract_wau_by_region(ws):
-    """WAU 지역별 데이터 추출 (한국 vs 한국 외)"""
-    data = {"dates": [], "korea": [], "non_korea": []}
+def region_totals(region, wau=None):
+    """지역별 WAU의 주별 전체 - 합집합 기준 "total" 이 있으면 그대로, 없으면 (이전 워크북) 같은 주의 전체 WAU
+
+    한국 / 한국 외 양쪽에서 활동한 사용자가 있어 두 값의 합은 전체 WAU보다 클 수 있으므로 합으로 대신하지 않는다.
+    전체 WAU에도 없는 주는 None.
+    """
+    if region.get("total"):
+        return list(region["total"])
+    by_date = {str(d): v for d, v in zip(wau["dates"], wau["values"])} if wau else {}
+    return [by_date.get(str(d)) for d in region["dates"]]
+
+
+def extract_wau_by_region(ws, wau=None):
+    """WAU 지역별 데이터 추출 (한국 vs 한국 외, 합집합 기준 전체 "total")
+
+    Args:
+        wau: WAU 시트 데이터 - Total 열이 없는 이전 워크북이면 전체로 사용
+    """
+    data = {"dates": [], "korea": [], "non_korea": [], "total": []}
     for row in ws.iter_rows(min_row=4, values_only=True):
-        if row[0] and row[1] is not None and row[2] is not None:
+        if row and row[0] and row[1] is not None and row[2] is not None:
             data["dates"].append(str(row[0]))
             data["korea"].append(row[1])
             data["non_korea"].append(row[2])
+            data["total"].append(row[4] if len(row) > 4 else None)
+    if None in data["total"]:
+        data["total"] = []  # Total 열이 없는 이전 워크북
+    data["total"] = region_totals(data, wau)
+    return data
+
+
+def extract_daily(ws, days_ws=None):
+    """일간 지표 추출 (Daily Active 시트: Date, DAU, 7-Day Active, 28-Day Active / Days Active 시트: L7, L28)"""
+    data = {"dates": [], "dau": [], "active_7d": [], "active_28d": [], "l7": [], "l28": []}
+    for row in ws.iter_rows(min_row=4, values_only=True):
+        if row and row[0] and row[1] is not None:
+            data["dates"].append(str(row[0]))
+            data["dau"].append(row[1])
+            data["active_7d"].append(row[2])
+            data["active_28d"].append(row[3])
+    if days_ws is not None:
+        for row in days_ws.iter_rows(min_row=4, values_only=True):
+            if row and row[0] is not None:
+                if row[1] is not None:
+                    data["l7"].append(row[1])
+                data["l28"].append(row[2])
+    return data
+
+
+def extract_cut_table(ws):
+    """단면 표 시트 추출 (WAU Segments: Date + "단면: 묶음" 컬럼들) -> {"dates", "columns", "rows"}"""
+    data = {"dates": [], "columns": [], "rows": []}
+    for row in ws.iter_rows(min_row=3, values_only=True):
+        if not row or not row[0]:
+            continue
+        if row[0] == "Date":
+            data["columns"] = [str(c) for c in row[1:] if c is not None]
+        elif data["columns"]:
+            values = list(row[:len(data["columns"]) + 1])
+            data["dates"].append(str(values[0]))
+            data["rows"].append([str(values[0])] + values[1:])
+    return data
+
+
+def extract_mrr(ws):
+    """멤버십 MRR 시트 추출 (Date, MRR, Subscribers, New / Expansion / Contraction / Churned MRR, Net New)"""
+    data = {"dates": []}
+    data.update({key: [] for key in MRR_KEYS})
+    for row in ws.iter_rows(min_row=4, values_only=True):
+        if row and row[0] and row[1] is not None:
+            data["dates"].append(str(row[0]))
+            for key, value in zip(MRR_KEYS, row[1:]):
+                data[key].append(value)
     return data
 
 
-def extract_all_data(excel_path):
-    """모든 시트에서 데이터 추출"""
-    wb = load_workbook(excel_path, data_only=True)
+def _extract_cache_path(excel_path):
+    """캐시 파일 경로 - 파일 경로 / 크기 / mtime / 내용 해시가 모두 같을 때만 같은 키"""
+    stat = excel_path.stat()
+    content_hash = hashlib.sha256(excel_path.read_bytes()).hexdigest()
+    key = f"{EXTRACT_CACHE_VERSION}|{excel_path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}|{content_hash}"
+    return EXTRACT_CACHE_DIR / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+
+def extract_all_data(excel_path, use_cache=True):
+    """모든 시트에서 데이터 추출
+
+    Args:
+        use_cache: True면 같은 워크북의 이전 파싱 결과를 재사용 (reports/.cache)
+    """
+    excel_path = Path(excel_path)
+    cache_path = _extract_cache_path(excel_path) if use_cache else None
+    if cache_path is not None and cache_path.exists():
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+    else:
+        data = _extract_workbook(excel_path)
+        if cache_path is not None:
+            EXTRACT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            tmp_path.replace(cache_path)
+
+    # 생성 시각은 캐시와 무관하게 매번 새로
+    data["generated"] = datetime.now().strftime("%Y-%m-%d %H:%M")
+    return data
+
+
+def _extract_workbook(excel_path):
+    """워크북을 읽기 전용(스트리밍) 모드로 열어 시트별 데이터 추출"""
+    with stage("load_workbook"):
+        wb = load_workbook(excel_path, read_only=True, data_only=True)
 
     data = {
         "file": excel_path.name,
@@ -93,31 +250,155 @@ def extract_all_data(excel_path):
         "wau": None,
         "wau_by_region": None,
         "nau": None,
-        "retention": None
+        "retention": None,
+        "daily": None,
+        "conversion": None,
+        "revenue": None,
+        "segments": None
     }
 
     if "WAU" in wb.sheetnames:
-        data["wau"] = extract_timeseries(wb["WAU"], exclude_last=False)
+        with stage("extract_wau"):
+            data["wau"] = extract_timeseries(wb["WAU"], exclude_last=False)
 
     if "WAU by Region" in wb.sheetnames:
-        data["wau_by_region"] = extract_wau_by_region(wb["WAU by Region"])
+        with stage("extract_wau_by_region"):
+            data["wau_by_region"] = extract_wau_by_region(wb["WAU by Region"], data["wau"])
 
     if "NAU" in wb.sheetnames:
-        data["nau"] = extract_timeseries(wb["NAU"], exclude_last=False)
+        with stage("extract_nau"):
+            data["nau"] = extract_timeseries(wb["NAU"], exclude_last=False)
 
     if "Weekly Retention" in wb.sheetnames:
-        data["retention"] = extract_retention(wb["Weekly Retention"], exclude_last=False)
+        with stage("extract_retention"):
+            data["retention"] = extract_retention(wb["Weekly Retention"], exclude_last=False)
+
+    if "WAU Segments" in wb.sheetnames:
+        with stage("extract_segments"):
+            data["segments"] = extract_cut_table(wb["WAU Segments"])
+
+    if "Daily Active" in wb.sheetnames:
+        with stage("extract_daily"):
+            days_ws = wb["Days Active"] if "Days Active" in wb.sheetnames else None
+            data["daily"] = extract_daily(wb["Daily Active"], days_ws)
+
+    if "Membership Conversion" in wb.sheetnames:
+        with stage("extract_conversion"):
+            data["conversion"] = extract_retention(wb["Membership Conversion"], exclude_last=False)
+
+    if "MRR" in wb.sheetnames:
+        with stage("extract_revenue"):
+            daily_ws = wb["MRR Daily"] if "MRR Daily" in wb.sheetnames else None
+            data["revenue"] = {
+                "daily": extract_mrr(daily_ws) if daily_ws is not None else None,
+                "weekly": extract_mrr(wb["MRR"]),
+            }
+
+    wb.close()
+    return data
+
+
+def report_data_from_metrics(metrics, source="(in-memory)"):
+    """generate_amplitude_report의 지표 묶음 -> extract_all_data()와 같은 형식 (Excel 왕복 없이 바로 전달)
+
+    Args:
+        metrics: {"wau", "wau_by_region", "nau", "retention"} - retention은 RETENTION_DATA 형식 표
+            + 선택: "daily", "conversion" (conversion도 RETENTION_DATA 형식 표), "revenue" ({"weekly", "daily"} MRR),
+            "segments" (큐브 단면 표 {"dates", "columns", "rows"})
+        source: 리포트에 표시할 데이터 출처 이름
+    """
+    def timeseries(series):
+        return {"dates": [str(d) for d in series["dates"]], "values": list(series["values"])}
+
+    def cohort_table(table):
+        # Excel 시트에서 읽은 것과 같도록 빈 칸은 ""로 채워 헤더 길이에 맞춘다
+        headers = list(table[0])
+        width = max(len(row) for row in table)
+        headers += [""] * (width - len(headers))
+        rows = [list(row) + [""] * (width - len(row)) for row in table[1:]]
+        return {"headers": headers, "rows": rows, "excluded_cohort": None}
+
+    data = {
+        "file": source,
+        "generated": datetime.now().strftime("%Y-%m-%d %H:%M"),
+        "wau": None,
+        "wau_by_region": None,
+        "nau": None,
+        "retention": None,
+        "daily": None,
+        "conversion": None,
+        "revenue": None,
+        "segments": None
+    }
+
+    if metrics.get("wau"):
+        data["wau"] = timeseries(metrics["wau"])
+
+    if metrics.get("wau_by_region"):
+        region = metrics["wau_by_region"]
+        data["wau_by_region"] = {
+            "dates": [str(d) for d in region["dates"]],
+            "korea": list(region["korea"]),
+            "non_korea": list(region["non_korea"]),
+            "total": region_totals(region, metrics.get("wau"))
+        }
+
+    if metrics.get("nau"):
+        data["nau"] = timeseries(metrics["nau"])
+
+    if metrics.get("retention"):
+        data["retention"] = cohort_table(metrics["retention"])
+
+    if metrics.get("daily"):
+        daily = metrics["daily"]
+        data["daily"] = {key: list(daily[key]) for key in ("dates", "dau", "active_7d", "active_28d", "l7", "l28")}
+
+    if metrics.get("conversion"):
+        data["conversion"] = cohort_table(metrics["conversion"])
+
+    if metrics.get("segments"):
+        segments = metrics["segments"]
+        data["segments"] = {
+            "dates": [str(d) for d in segments["dates"]],
+            "columns": list(segments["columns"]),
+            "rows": [[str(row[0])] + list(row[1:]) for row in segments["rows"]],
+        }
+
+    if metrics.get("revenue"):
+        data["revenue"] = {
+            period: {key: list(series[key]) for key in ("dates",) + MRR_KEYS} if series else None
+            for period, series in metrics["revenue"].items()
+        }
 
     return data
 
 
-def generate_html(data, insights=None, title=None):
+def load_report_data(path, use_cache=True):
+    """리포트 데이터 파일 -> extract_all_data() 형식 (.snap 은 스냅샷을 바로 읽고, .xlsx 는 시트 파싱)"""
+    path = Path(path)
+    if path.suffix == SNAPSHOT_SUFFIX:
+        snapshot = Snapshot(path)
+        return report_data_from_metrics(snapshot.metrics(), source=snapshot.meta.get("source") or path.name)
+    return extract_all_data(path, use_cache=use_cache)
+
+
+def generate_html(data, insights=None, title=None, asset_base=None, offline=False, font_text=None,
+                  max_points=None, full_retention=False):
     """HTML 리포트 생성 (Dark Theme)
 
     Args:
         data: 추출된 데이터
         insights: 인사이트 딕셔너리 (없으면 placeholder)
+            + 선택: "appendix" (마지막 섹션 뒤에 그대로 넣을 HTML) / "appendix_script" (그 섹션의 차트 스크립트)
+            - 한 달치 보고서에만 있는 수기 섹션용 (예: docs/archive/2026-04-15 후원 섹션)
         title: 보고서 타이틀 (없으면 자동 생성)
+        asset_base: 공유 CSS/JS 파일 경로 (예: "../assets"). 없으면 페이지에 인라인으로 포함
+        offline: True면 Chart.js / 서브셋 폰트를 CDN 대신 로컬 vendor 파일로 포함
+        font_text: 폰트 서브셋에 남길 글자 (없으면 이 페이지 글자, 여러 페이지가 폰트를 공유할 때 지정)
+        max_points: 시계열 차트 점 수 상한 (LTTB 다운샘플링). 정수면 모든 차트에 같은 값,
+            {"wau": 300, "nau": 200, ...} 면 차트별 값. 없으면 전체 점. 원본 데이터 테이블은 항상 전체
+        full_retention: True면 리텐션 원본 테이블을 W14에서 자르지 않고 전체 코호트 × 주차 행렬을
+            JSON으로 실어 브라우저에서 보이는 칸만 그린다 (가상 스크롤 + 히트맵)
     """
     # 타이틀 자동 생성
     if title is None:
@@ -133,211 +414,140 @@ def generate_html(data, insights=None, title=None):
             "retention": "<!-- RETENTION_INSIGHT -->",
             "retention_over_time": "<!-- RETENTION_OVER_TIME_INSIGHT -->"
         }
-    # 하위 호환: wau_region 키 누락 시 placeholder
+    # 하위 호환: wau_region / daily / conversion 키 누락 시 placeholder
     insights.setdefault("wau_region", "<!-- WAU_REGION_INSIGHT -->")
-
-    # WAU/NAU 차트 데이터 - 날짜 포맷 간소화
-    wau_labels_short = []
-    nau_labels_short = []
-    if data["wau"]:
-        for d in data["wau"]["dates"]:
-            # "2025-07-28" -> "Jul 28"
-            try:
-                dt = datetime.strptime(d, "%Y-%m-%d")
-                wau_labels_short.append(dt.strftime("%b %d"))
-            except:
-                wau_labels_short.append(d)
-    if data["nau"]:
-        for d in data["nau"]["dates"]:
-            try:
-                dt = datetime.strptime(d, "%Y-%m-%d")
-                nau_labels_short.append(dt.strftime("%b %d"))
-            except:
-                nau_labels_short.append(d)
-
-    wau_labels = json.dumps(wau_labels_short) if data["wau"] else "[]"
-    wau_values = json.dumps(data["wau"]["values"]) if data["wau"] else "[]"
-    nau_labels = json.dumps(nau_labels_short) if data["nau"] else "[]"
-    nau_values = json.dumps(data["nau"]["values"]) if data["nau"] else "[]"
-
-    # WAU 지역별 차트 데이터
-    region_labels_short = []
-    region_korea = []
-    region_non_korea = []
-    region_non_korea_share = []
-    if data.get("wau_by_region"):
-        for d in data["wau_by_region"]["dates"]:
-            try:
-                dt = datetime.strptime(d, "%Y-%m-%d")
-                region_labels_short.append(dt.strftime("%b %d"))
-            except Exception:
-                region_labels_short.append(d)
-        region_korea = data["wau_by_region"]["korea"]
-        region_non_korea = data["wau_by_region"]["non_korea"]
-        for k, nk in zip(region_korea, region_non_korea):
-            total = (k or 0) + (nk or 0)
-            region_non_korea_share.append(round((nk / total * 100), 2) if total else 0)
-
-    region_labels = json.dumps(region_labels_short)
-    region_korea_json = json.dumps(region_korea)
-    region_non_korea_json = json.dumps(region_non_korea)
-    region_non_korea_share_json = json.dumps(region_non_korea_share)
-
-    # 최신/이전 지역별 통계
-    if region_korea and region_non_korea:
-        latest_korea = region_korea[-1]
-        latest_non_korea = region_non_korea[-1]
-        prev_korea = region_korea[-2] if len(region_korea) >= 2 else latest_korea
-        prev_non_korea = region_non_korea[-2] if len(region_non_korea) >= 2 else latest_non_korea
-        latest_non_korea_share = region_non_korea_share[-1]
-        non_korea_wow = ((latest_non_korea - prev_non_korea) / prev_non_korea * 100) if prev_non_korea else 0
-        korea_wow = ((latest_korea - prev_korea) / prev_korea * 100) if prev_korea else 0
-    else:
-        latest_korea = latest_non_korea = prev_korea = prev_non_korea = 0
-        latest_non_korea_share = non_korea_wow = korea_wow = 0
-
-    # Summary 계산
-    if data["wau"] and len(data["wau"]["values"]) >= 2:
-        latest_wau = data["wau"]["values"][-1]
-        prev_wau = data["wau"]["values"][-2]
-        wau_change = ((latest_wau - prev_wau) / prev_wau * 100) if prev_wau else 0
-    else:
-        latest_wau = prev_wau = wau_change = 0
-
-    if data["nau"] and len(data["nau"]["values"]) >= 2:
-        latest_nau = data["nau"]["values"][-1]
-        prev_nau = data["nau"]["values"][-2]
-        nau_change = ((latest_nau - prev_nau) / prev_nau * 100) if prev_nau else 0
-    else:
-        latest_nau = prev_nau = nau_change = 0
-
-    # Retention Week 1 및 곡선 데이터
-    week1_retention = "-"
-    week1_retention_val = 0  # 평균 리텐션 값 (비교용)
-    latest_cohort_retention = "-"
-    latest_cohort_retention_val = 0  # 최근 코호트 리텐션 값 (비교용)
-    latest_cohort_diff = 0  # 평균 대비 차이 (pp)
-    retention_curve_labels = []
-    retention_curve_values = []
-    if data["retention"] and len(data["retention"]["rows"]) >= 2:
-        # "Overall" "Retained %" 행 찾기
-        for row in data["retention"]["rows"]:
-            if "Overall" in str(row[1]) and "%" in str(row[2]):
-                # 소수점 반올림하여 정수로 표시
-                if len(row) > 4 and row[4]:
-                    week1_retention_val = float(str(row[4]).replace("%", ""))
-                    week1_retention = f"{round(week1_retention_val)}%"
-                else:
-                    week1_retention = "-"
-                # 리텐션 곡선 데이터 추출 (W12까지만 — 월간 건강검진 범위.
-                # W13+ 는 16주 윈도우에서 항상 코호트 2~3개짜리 저신뢰 구간이라 월간 곡선에서 제외.
-                # 장기 안착점(asymptote) 판단은 코호트별 곡선/분기 회고에서 다룬다)
-                for i, val in enumerate(row[3:]):
-                    if i > 12:  # W12까지만 (W0 ~ W12 = 13개)
-                        break
-                    if val and "%" in str(val):
-                        retention_curve_labels.append(f"W{i}")
-                        # % 제거하고 숫자로 변환
-                        retention_curve_values.append(float(str(val).replace("%", "")))
-                break
-
-    # 주차별 관측 코호트 수 계산 — Overall 곡선의 꼬리는 오래된 소수 코호트만으로 계산되므로
-    # 코호트 수가 적은 구간(<3)은 차트에서 저신뢰(점선) 구간으로 구분 표시한다 (구성 편향 착시 방지)
-    retention_curve_coverage = []
-    if data["retention"] and retention_curve_values:
-        cohort_rows = [
-            row for row in data["retention"]["rows"]
-            if "Overall" not in str(row[1]) and "Start Date" not in str(row[1])
-            and len(row) > 3 and isinstance(row[3], (int, float))
-        ]
-        for i in range(len(retention_curve_values)):
-            col_idx = 3 + i
-            count = sum(
-                1 for row in cohort_rows
-                if len(row) > col_idx and row[col_idx] not in (None, "")
-                and isinstance(row[col_idx], (int, float))
+    insights.setdefault("daily", "<!-- DAILY_INSIGHT -->")
+    insights.setdefault("conversion", "<!-- CONVERSION_INSIGHT -->")
+    insights.setdefault("revenue", "<!-- REVENUE_INSIGHT -->")
+    insights.setdefault("segments", "<!-- SEGMENTS_INSIGHT -->")
+    segments = data.get("segments")
+    daily = data.get("daily")
+    conversion = data.get("conversion")
+    revenue = data.get("revenue")
+
+    with stage("chart_data"):
+        # WAU/NAU 차트 데이터 - 날짜 포맷 간소화
+        wau_labels_short = []
+        nau_labels_short = []
+        if data["wau"]:
+            for d in data["wau"]["dates"]:
+                # "2025-07-28" -> "Jul 28"
+                try:
+                    dt = datetime.strptime(d, "%Y-%m-%d")
+                    wau_labels_short.append(dt.strftime("%b %d"))
+                except:
+                    wau_labels_short.append(d)
+        if data["nau"]:
+            for d in data["nau"]["dates"]:
+                try:
+                    dt = datetime.strptime(d, "%Y-%m-%d")
+                    nau_labels_short.append(dt.strftime("%b %d"))
+                except:
+                    nau_labels_short.append(d)
+
+        wau_values = data["wau"]["values"] if data["wau"] else []
+        nau_values = data["nau"]["values"] if data["nau"] else []
+
+        # WAU 지역별 차트 데이터
+        region_labels_short = []
+        region_korea = []
+        region_non_korea = []
+        region_non_korea_share = []
+        if data.get("wau_by_region"):
+            for d in data["wau_by_region"]["dates"]:
+                try:
+                    dt = datetime.strptime(d, "%Y-%m-%d")
+                    region_labels_short.append(dt.strftime("%b %d"))
+                except Exception:
+                    region_labels_short.append(d)
+            region_korea = data["wau_by_region"]["korea"]
+            region_non_korea = data["wau_by_region"]["non_korea"]
+            # 한국 / 한국 외 양쪽에서 활동한 사용자가 있으므로 Excel 시트와 같이 합집합 기준 전체로 나눈다
+            # 전체를 모르는 주는 비중도 비워 둔다 (차트에서 끊김)
+            for nk, total in zip(region_non_korea, region_totals(data["wau_by_region"], data["wau"])):
+                region_non_korea_share.append(round((nk / total * 100), 2) if total else None)
+
+        # 최신/이전 지역별 통계
+        if region_korea and region_non_korea:
+            latest_korea = region_korea[-1]
+            latest_non_korea = region_non_korea[-1]
+            prev_korea = region_korea[-2] if len(region_korea) >= 2 else latest_korea
+            prev_non_korea = region_non_korea[-2] if len(region_non_korea) >= 2 else latest_non_korea
+            latest_non_korea_share = region_non_korea_share[-1]
+            non_korea_wow = ((latest_non_korea - prev_non_korea) / prev_non_korea * 100) if prev_non_korea else 0
+            korea_wow = ((latest_korea - prev_korea) / prev_korea * 100) if prev_korea else 0
+        else:
+            latest_korea = latest_non_korea = prev_korea = prev_non_korea = 0
+            latest_non_korea_share = non_korea_wow = korea_wow = 0
+
+        # Summary 계산
+        if data["wau"] and len(data["wau"]["values"]) >= 2:
+            latest_wau = data["wau"]["values"][-1]
+            prev_wau = data["wau"]["values"][-2]
+            wau_change = ((latest_wau - prev_wau) / prev_wau * 100) if prev_wau else 0
+        else:
+            latest_wau = prev_wau = wau_change = 0
+
+        if data["nau"] and len(data["nau"]["values"]) >= 2:
+            latest_nau = data["nau"]["values"][-1]
+            prev_nau = data["nau"]["values"][-2]
+            nau_change = ((latest_nau - prev_nau) / prev_nau * 100) if prev_nau else 0
+        else:
+            latest_nau = prev_nau = nau_change = 0
+
+        # Retention Week 1 및 곡선 데이터 (코호트 행렬 한 번 구성 후 배열 연산)
+        week1_retention = "-"
+        week1_retention_val = 0  # 평균 리텐션 값 (비교용)
+        latest_cohort_retention = "-"
+        latest_cohort_retention_val = 0  # 최근 코호트 리텐션 값 (비교용)
+        latest_cohort_diff = 0  # 평균 대비 차이 (pp)
+        retention_curve_labels = []
+        retention_curve_values = []
+        retention_curve_coverage = []
+        week_trends = {1: [], 2: [], 3: [], 4: []}
+        if data["retention"] and len(data["retention"]["rows"]) >= 2:
+            cohorts = CohortMatrix.from_retention(data["retention"])
+
+            # Overall "Retained %" 행 - 소수점 반올림하여 정수로 표시
+            overall_week1 = cohorts.overall_week1()
+            if overall_week1 is not None:
+                week1_retention_val = overall_week1
+                week1_retention = f"{round(week1_retention_val)}%"
+            # 리텐션 곡선 데이터 추출 (W12까지만 — 월간 건강검진 범위.
+            # W13+ 는 16주 윈도우에서 항상 코호트 2~3개짜리 저신뢰 구간이라 월간 곡선에서 제외.
+            # 장기 안착점(asymptote) 판단은 코호트별 곡선/분기 회고에서 다룬다)
+            retention_curve_labels, retention_curve_values = cohorts.overall_curve(max_week=12)
+
+            # 주차별 관측 코호트 수 계산 — Overall 곡선의 꼬리는 오래된 소수 코호트만으로 계산되므로
+            # 코호트 수가 적은 구간(<3)은 차트에서 저신뢰(점선) 구간으로 구분 표시한다 (구성 편향 착시 방지)
+            if retention_curve_values:
+                retention_curve_coverage = cohorts.coverage(len(retention_curve_values))
+
+                # 최근 코호트 중 Week 1 데이터가 valid한 것 찾기
+                # 가장 최신 코호트의 Week 1은 아직 수집 중이므로 두 번째 코호트를 사용
+                valid_week1_cohorts = cohorts.valid_week1()
+                if len(valid_week1_cohorts) >= 2:
+                    idx = valid_week1_cohorts[1]
+                    latest_cohort_retention_val = round(cohorts.counts[idx, 1] / cohorts.counts[idx, 0] * 100)
+                    latest_cohort_retention = f"{latest_cohort_retention_val}%"
+                    latest_cohort_diff = latest_cohort_retention_val - round(week1_retention_val)
+
+            # Week 1~4 리텐션 추이 (코호트별, 오래된 순서 / 수집 중인 최신 포인트 제외)
+            week_trends = cohorts.week_trends((1, 2, 3, 4))
+
+    with stage("tables"):
+        # WAU / NAU 테이블 행
+        wau_table_rows = build_timeseries_rows(data["wau"])
+        nau_table_rows = build_timeseries_rows(data["nau"])
+
+        # Retention 테이블 (W14까지 = 18개 컬럼: Segment, Start Date, Users, W0~W14)
+        # full_retention 이면 HTML 행 대신 전체 행렬을 차트 데이터에 싣고 빈 컨테이너만 둔다
+        if full_retention:
+            retention_table_block = RETENTION_VIRTUAL_BLOCK
+        else:
+            retention_table_block = RETENTION_TABLE_BLOCK.format(
+                rows=build_retention_table(data["retention"], max_cols=MAX_RETENTION_COLS)
             )
-            retention_curve_coverage.append(count)
-
-        # 최근 코호트 중 Week 1 데이터가 valid한 것 찾기
-        # 가장 최신 코호트의 Week 1은 아직 수집 중이므로 두 번째 코호트를 사용
-        valid_week1_cohorts = []
-        for row in data["retention"]["rows"]:
-            if "Overall" not in str(row[1]) and len(row) > 4 and row[4] and row[4] != "":
-                # Week 0 (row[3])과 Week 1 (row[4])이 있는 경우
-                if row[3] and row[4] and isinstance(row[3], (int, float)) and isinstance(row[4], (int, float)):
-                    valid_week1_cohorts.append(row)
-
-        # 두 번째 코호트 사용 (첫 번째는 아직 수집 중)
-        if len(valid_week1_cohorts) >= 2:
-            row = valid_week1_cohorts[1]
-            latest_cohort_retention_val = round(row[4] / row[3] * 100)
-            latest_cohort_retention = f"{latest_cohort_retention_val}%"
-            latest_cohort_diff = latest_cohort_retention_val - round(week1_retention_val)
-
-    # Week 1~4 리텐션 추이 데이터 추출 (코호트별)
-    # 각 Week별로 valid 데이터가 있는 코호트들의 리텐션 추이
-    week_trends = {1: [], 2: [], 3: [], 4: []}
-    if data["retention"] and len(data["retention"]["rows"]) >= 2:
-        for row in data["retention"]["rows"]:
-            # Overall 행 제외
-            if "Overall" in str(row[1]):
-                continue
-            # 최신 코호트 제외 (Week 1 데이터가 없으면 제외)
-            if len(row) <= 4 or not row[4]:
-                continue
-
-            date = str(row[1]).replace(", 2025", "").replace(", 2026", "")  # "Dec 29, 2025" -> "Dec 29"
-            week0 = row[3]  # Week 0 사용자 수
-
-            if not week0 or not isinstance(week0, (int, float)) or week0 == 0:
-                continue
-
-            # Week 1~4 리텐션 계산
-            for week_num in [1, 2, 3, 4]:
-                col_idx = 3 + week_num  # Week 1=4, Week 2=5, Week 3=6, Week 4=7
-                if len(row) > col_idx and row[col_idx] and isinstance(row[col_idx], (int, float)):
-                    retention_pct = round(row[col_idx] / week0 * 100, 1)
-                    week_trends[week_num].append({"date": date, "retention": retention_pct})
-
-    # 각 Week 추이를 오래된 순서로 정렬 (차트 X축)
-    # 가장 최신 데이터 포인트는 아직 수집 중이므로 제외
-    for week_num in week_trends:
-        week_trends[week_num] = list(reversed(week_trends[week_num]))
-        if len(week_trends[week_num]) > 0:
-            week_trends[week_num] = week_trends[week_num][:-1]  # 마지막(최신) 제외
-
-    # WAU 테이블 행
-    wau_table_rows = ""
-    if data["wau"]:
-        for date, value in zip(data["wau"]["dates"], data["wau"]["values"]):
-            wau_table_rows += f"<tr><td>{date}</td><td>{value:,}</td></tr>\n"
-
-    # NAU 테이블 행
-    nau_table_rows = ""
-    if data["nau"]:
-        for date, value in zip(data["nau"]["dates"], data["nau"]["values"]):
-            nau_table_rows += f"<tr><td>{date}</td><td>{value:,}</td></tr>\n"
-
-    # Retention 테이블 (W14까지 = 18개 컬럼: Segment, Start Date, Users, W0~W14)
-    MAX_RETENTION_COLS = 18  # W14까지
-    retention_table = ""
-    if data["retention"]:
-        # 헤더
-        retention_table += "<tr>"
-        for h in data["retention"]["headers"][:MAX_RETENTION_COLS]:
-            retention_table += f"<th>{h}</th>"
-        retention_table += "</tr>\n"
-
-        # 데이터 행
-        for row in data["retention"]["rows"]:
-            retention_table += "<tr>"
-            for i, cell in enumerate(row[:MAX_RETENTION_COLS]):
-                if i >= 3 and isinstance(cell, (int, float)):
-                    retention_table += f"<td class='retention-cell'>{cell:,}</td>"
-                else:
-                    retention_table += f"<td>{cell}</td>"
-            retention_table += "</tr>\n"
 
     # 날짜 포맷팅
     # 날짜를 한국어 형식으로 변환 (2026-01-13 -> 2026년 1월 13일 작성)
@@ -345,1152 +555,409 @@ def generate_html(data, insights=None, title=None):
     date_parts = date_str.split("-")
     report_date = f"{date_parts[0]}년 {int(date_parts[1])}월 {int(date_parts[2])}일 작성"
 
-    html = f'''<!DOCTYPE html>
-<html lang="ko">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title} - {report_date}</title>
-    <link rel="stylesheet" href="https://cdn.jsdelivr.net/gh/orioncactus/pretendard@v1.3.9/dist/web/static/pretendard.min.css">
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-    <style>
-        :root {{
-            --bg-primary: #0a0a0a;
-            --bg-secondary: #111111;
-            --bg-tertiary: #1a1a1a;
-            --bg-card: #141414;
-            --border-subtle: #222222;
-            --border-light: #333333;
-            --text-primary: #ffffff;
-            --text-secondary: #a0a0a0;
-            --text-muted: #666666;
-            --accent-primary: #00d4aa;
-            --accent-secondary: #00b894;
-            --accent-glow: rgba(0, 212, 170, 0.15);
-            --positive: #00d4aa;
-            --negative: #ff6b6b;
-            --chart-wau: #ffffff;
-            --chart-nau: #00d4aa;
-            --chart-retention: #a0a0a0;
-            --chart-cohort: #00d4aa;
-        }}
-
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        html {{
-            scroll-behavior: smooth;
-        }}
-
-        body {{
-            font-family: 'Pretendard', -apple-system, BlinkMacSystemFont, sans-serif;
-            background: var(--bg-primary);
-            color: var(--text-primary);
-            line-height: 1.7;
-            font-weight: 400;
-            letter-spacing: -0.01em;
-        }}
-
-        /* Subtle noise texture overlay */
-        body::before {{
-            content: '';
-            position: fixed;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-            background-image: url("data:image/svg+xml,%3Csvg viewBox='0 0 256 256' xmlns='http://www.w3.org/2000/svg'%3E%3Cfilter id='noise'%3E%3CfeTurbulence type='fractalNoise' baseFrequency='0.9' numOctaves='4' stitchTiles='stitch'/%3E%3C/filter%3E%3Crect width='100%25' height='100%25' filter='url(%23noise)'/%3E%3C/svg%3E");
-            opacity: 0.03;
-            pointer-events: none;
-            z-index: 1000;
-        }}
-
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 40px 24px;
-            position: relative;
-        }}
-
-        /* Header */
-        header {{
-            text-align: center;
-            padding: 80px 40px;
-            margin-bottom: 60px;
-            position: relative;
-            border-bottom: 1px solid var(--border-subtle);
-        }}
-
-        header::before {{
-            content: '';
-            position: absolute;
-            top: 0;
-            left: 50%;
-            transform: translateX(-50%);
-            width: 1px;
-            height: 40px;
-            background: linear-gradient(to bottom, transparent, var(--accent-primary));
-        }}
-
-        .report-label {{
-            font-size: 0.75rem;
-            font-weight: 500;
-            letter-spacing: 0.2em;
-            text-transform: uppercase;
-            color: var(--accent-primary);
-            margin-bottom: 24px;
-            display: inline-block;
-        }}
-
-        header h1 {{
-            font-size: 3rem;
-            font-weight: 700;
-            letter-spacing: -0.03em;
-            margin-bottom: 16px;
-            background: linear-gradient(135deg, var(--text-primary) 0%, var(--text-secondary) 100%);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            background-clip: text;
-        }}
-
-        header .meta {{
-            font-size: 0.875rem;
-            color: var(--text-muted);
-            font-weight: 400;
-        }}
-
-        header .meta span {{
-            margin: 0 12px;
-            opacity: 0.5;
-        }}
-
-        /* Sections */
-        .section {{
-            background: var(--bg-card);
-            border: 1px solid var(--border-subtle);
-            border-radius: 16px;
-            padding: 40px;
-            margin-bottom: 32px;
-            position: relative;
-            overflow: hidden;
-        }}
-
-        .section::before {{
-            content: '';
-            position: absolute;
-            top: 0;
-            left: 0;
-            right: 0;
-            height: 1px;
-            background: linear-gradient(90deg, transparent, var(--border-light), transparent);
-        }}
-
-        .section h2 {{
-            font-size: 1.5rem;
-            font-weight: 600;
-            letter-spacing: -0.02em;
-            color: var(--text-primary);
-            margin-bottom: 32px;
-            padding-bottom: 16px;
-            border-bottom: 1px solid var(--border-subtle);
-            display: flex;
-            align-items: center;
-            gap: 12px;
-        }}
-
-        .section h2::before {{
-            content: '';
-            width: 4px;
-            height: 20px;
-            background: var(--accent-primary);
-            border-radius: 2px;
-        }}
-
-        /* Summary Grid */
-        .summary-grid {{
-            display: grid;
-            grid-template-columns: repeat(4, 1fr);
-            gap: 24px;
-            margin-bottom: 40px;
-        }}
-
-        @media (max-width: 768px) {{
-            .summary-grid {{
-                grid-template-columns: 1fr;
-            }}
-        }}
-
-        .metric-card {{
-            background: var(--bg-tertiary);
-            border: 1px solid var(--border-subtle);
-            border-radius: 12px;
-            padding: 28px;
-            text-align: center;
-            position: relative;
-            transition: all 0.3s ease;
-        }}
-
-        .metric-card:hover {{
-            border-color: var(--border-light);
-            transform: translateY(-2px);
-        }}
-
-        .metric-card .value {{
-            font-size: 2.75rem;
-            font-weight: 700;
-            letter-spacing: -0.03em;
-            color: var(--text-primary);
-            line-height: 1.2;
-            margin-bottom: 8px;
-        }}
-
-        .metric-card .label {{
-            font-size: 0.8rem;
-            font-weight: 500;
-            letter-spacing: 0.05em;
-            text-transform: uppercase;
-            color: var(--text-muted);
-            margin-bottom: 12px;
-        }}
-
-        .metric-card .change {{
-            font-size: 0.875rem;
-            font-weight: 500;
-            padding: 4px 12px;
-            border-radius: 20px;
-            display: inline-block;
-        }}
-
-        .change.positive {{
-            color: var(--positive);
-            background: rgba(0, 212, 170, 0.1);
-        }}
-
-        .change.negative {{
-            color: var(--negative);
-            background: rgba(255, 107, 107, 0.1);
-        }}
-
-        .change.neutral {{
-            color: var(--text-secondary);
-            background: var(--bg-secondary);
-        }}
-
-        /* Insight Box */
-        .insight-box {{
-            background: var(--bg-tertiary);
-            border: 1px solid var(--accent-primary);
-            border-radius: 12px;
-            padding: 28px;
-            margin: 32px 0;
-            position: relative;
-            box-shadow: 0 0 40px var(--accent-glow);
-        }}
-
-        .insight-box::before {{
-            content: '';
-            position: absolute;
-            top: -1px;
-            left: 20%;
-            right: 20%;
-            height: 1px;
-            background: linear-gradient(90deg, transparent, var(--accent-primary), transparent);
-        }}
-
-        .insight-box h3 {{
-            font-size: 0.75rem;
-            font-weight: 600;
-            letter-spacing: 0.15em;
-            text-transform: uppercase;
-            color: var(--accent-primary);
-            margin-bottom: 20px;
-            display: flex;
-            align-items: center;
-            gap: 8px;
-        }}
-
-        .insight-box h3::before {{
-            content: '';
-            width: 8px;
-            height: 8px;
-            background: var(--accent-primary);
-            border-radius: 50%;
-            box-shadow: 0 0 12px var(--accent-primary);
-        }}
-
-        .insight-box p {{
-            color: var(--text-secondary);
-            font-size: 0.95rem;
-            line-height: 1.8;
-        }}
-
-        .insight-box strong {{
-            color: var(--text-primary);
-            font-weight: 600;
-        }}
-
-        .insight-box ul {{
-            margin: 12px 0 12px 20px;
-            color: var(--text-secondary);
-        }}
-
-        .insight-box li {{
-            margin-bottom: 8px;
-            line-height: 1.7;
-        }}
-
-        .insight-box li strong {{
-            color: var(--accent-primary);
-        }}
-
-        /* Chart Container */
-        .chart-container {{
-            position: relative;
-            height: 380px;
-            margin: 24px 0;
-            padding: 20px;
-            background: var(--bg-tertiary);
-            border: 1px solid var(--border-subtle);
-            border-radius: 12px;
-        }}
-
-        /* Region Stats (Korea vs Non-Korea) */
-        .region-stats {{
-            display: grid;
-            grid-template-columns: repeat(3, 1fr);
-            gap: 20px;
-            margin-bottom: 16px;
-        }}
-
-        @media (max-width: 768px) {{
-            .region-stats {{
-                grid-template-columns: 1fr;
-            }}
-        }}
-
-        .region-stat-card {{
-            background: var(--bg-tertiary);
-            border: 1px solid var(--border-subtle);
-            border-radius: 12px;
-            padding: 24px;
-            text-align: center;
-        }}
-
-        .region-stat-card .region-label {{
-            font-size: 0.75rem;
-            font-weight: 500;
-            letter-spacing: 0.1em;
-            text-transform: uppercase;
-            color: var(--text-muted);
-            margin-bottom: 12px;
-        }}
-
-        .region-stat-card .region-value {{
-            font-size: 2.25rem;
-            font-weight: 700;
-            color: var(--text-primary);
-            line-height: 1.2;
-            letter-spacing: -0.03em;
-        }}
-
-        .region-stat-card .region-unit {{
-            font-size: 1rem;
-            font-weight: 500;
-            color: var(--text-secondary);
-            margin-left: 4px;
-        }}
-
-        .region-stat-card .region-change {{
-            margin-top: 10px;
-            font-size: 0.8rem;
-            color: var(--text-muted);
-        }}
-
-        .region-stat-card .region-change.positive {{ color: var(--positive); }}
-        .region-stat-card .region-change.negative {{ color: var(--negative); }}
-
-        /* Tables */
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            font-size: 0.875rem;
-        }}
-
-        th, td {{
-            padding: 14px 12px;
-            text-align: left;
-            border-bottom: 1px solid var(--border-subtle);
-        }}
-
-        th {{
-            font-size: 0.75rem;
-            font-weight: 600;
-            letter-spacing: 0.05em;
-            text-transform: uppercase;
-            color: var(--text-muted);
-            background: var(--bg-secondary);
-        }}
-
-        td {{
-            color: var(--text-secondary);
-            font-variant-numeric: tabular-nums;
-        }}
-
-        tr:hover td {{
-            background: var(--bg-tertiary);
-            color: var(--text-primary);
-        }}
-
-        .retention-cell {{
-            text-align: center;
-            font-weight: 500;
-        }}
-
-        .data-table {{
-            max-height: 400px;
-            overflow-y: auto;
-            border: 1px solid var(--border-subtle);
-            border-radius: 8px;
-        }}
-
-        .data-table::-webkit-scrollbar {{
-            width: 6px;
-        }}
-
-        .data-table::-webkit-scrollbar-track {{
-            background: var(--bg-secondary);
-        }}
-
-        .data-table::-webkit-scrollbar-thumb {{
-            background: var(--border-light);
-            border-radius: 3px;
-        }}
-
-        /* Collapsible */
-        .collapsible {{
-            cursor: pointer;
-            padding: 14px 20px;
-            background: var(--bg-tertiary);
-            border: 1px solid var(--border-subtle);
-            border-radius: 8px;
-            width: 100%;
-            text-align: left;
-            font-family: 'Pretendard', sans-serif;
-            font-size: 0.875rem;
-            font-weight: 500;
-            color: var(--text-secondary);
-            margin-top: 24px;
-            transition: all 0.2s ease;
-            display: flex;
-            align-items: center;
-            gap: 10px;
-        }}
-
-        .collapsible::before {{
-            content: '+';
-            font-size: 1.1rem;
-            color: var(--accent-primary);
-            font-weight: 300;
-            transition: transform 0.2s ease;
-        }}
-
-        .collapsible:hover {{
-            background: var(--bg-secondary);
-            border-color: var(--border-light);
-            color: var(--text-primary);
-        }}
-
-        .collapsible-content {{
-            display: none;
-            padding-top: 20px;
-            animation: fadeIn 0.3s ease;
-        }}
-
-        .collapsible-content.active {{
-            display: block;
-        }}
-
-        @keyframes fadeIn {{
-            from {{ opacity: 0; transform: translateY(-10px); }}
-            to {{ opacity: 1; transform: translateY(0); }}
-        }}
-
-        /* Footer */
-        footer {{
-            text-align: center;
-            padding: 60px 40px;
-            border-top: 1px solid var(--border-subtle);
-            margin-top: 40px;
-        }}
-
-        footer p {{
-            font-size: 0.8rem;
-            color: var(--text-muted);
-            letter-spacing: 0.02em;
-        }}
-
-        footer .logo {{
-            font-weight: 700;
-            color: var(--accent-primary);
-        }}
-
-        /* Animations */
-        .section {{
-            animation: slideUp 0.6s ease forwards;
-            opacity: 0;
-        }}
-
-        .section:nth-child(1) {{ animation-delay: 0.1s; }}
-        .section:nth-child(2) {{ animation-delay: 0.2s; }}
-        .section:nth-child(3) {{ animation-delay: 0.3s; }}
-        .section:nth-child(4) {{ animation-delay: 0.4s; }}
-        .section:nth-child(5) {{ animation-delay: 0.5s; }}
-
-        @keyframes slideUp {{
-            from {{
-                opacity: 0;
-                transform: translateY(30px);
-            }}
-            to {{
-                opacity: 1;
-                transform: translateY(0);
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <header>
-            <div class="report-label">비블레시아 월간 보고서</div>
-            <h1>{title}</h1>
-            <p class="meta">{report_date}</p>
-        </header>
-
-        <!-- 핵심 요약 -->
-        <div class="section">
-            <h2>핵심 요약</h2>
-            <div class="summary-grid">
-                <div class="metric-card">
-                    <div class="value">{latest_wau:,}명</div>
-                    <div class="label">최신 WAU</div>
-                    <div class="change {"positive" if wau_change >= 0 else "negative"}">전주 대비 {wau_change:+.1f}%</div>
-                </div>
-                <div class="metric-card">
-                    <div class="value">{latest_nau:,}명</div>
-                    <div class="label">최신 NAU</div>
-                    <div class="change {"positive" if nau_change >= 0 else "negative"}">전주 대비 {nau_change:+.1f}%</div>
-                </div>
-                <div class="metric-card">
-                    <div class="value">{week1_retention}</div>
-                    <div class="label">1주차 리텐션 평균</div>
-                    <div class="change neutral">16주 평균</div>
-                </div>
-                <div class="metric-card">
-                    <div class="value">{latest_cohort_retention}</div>
-                    <div class="label">최근 1주차 리텐션</div>
-                    <div class="change {"positive" if latest_cohort_diff >= 0 else "negative"}">평균 대비 {latest_cohort_diff:+d}%p</div>
-                </div>
-            </div>
-            <div class="insight-box">
-                <h3>핵심 인사이트</h3>
-                <div id="summary-insight">{insights["summary"]}</div>
-            </div>
-        </div>
-
-        <!-- WAU 섹션 -->
-        <div class="section">
-            <h2>WAU (주간 활성 사용자)</h2>
-            <div class="chart-container">
-                <canvas id="wauChart"></canvas>
-            </div>
-            <div class="insight-box">
-                <h3>WAU 분석</h3>
-                <div id="wau-insight">{insights["wau"]}</div>
-            </div>
-            <button class="collapsible" onclick="toggleCollapsible(this)">원본 데이터 보기</button>
-            <div class="collapsible-content">
-                <div class="data-table">
-                    <table>
-                        <thead><tr><th>날짜</th><th>값</th></tr></thead>
-                        <tbody>{wau_table_rows}</tbody>
-                    </table>
-                </div>
-            </div>
-        </div>
-
-        <!-- WAU 지역별 분석 섹션 (글로벌 오픈 후) -->
-        <div class="section">
-            <h2>WAU 지역별 분석 (한국 vs 한국 외)</h2>
-            <div class="region-stats">
-                <div class="region-stat-card">
-                    <div class="region-label">한국</div>
-                    <div class="region-value">{latest_korea:,}<span class="region-unit">명</span></div>
-                    <div class="region-change {"positive" if korea_wow >= 0 else "negative"}">전주 대비 {korea_wow:+.1f}%</div>
-                </div>
-                <div class="region-stat-card">
-                    <div class="region-label">한국 외 (글로벌)</div>
-                    <div class="region-value">{latest_non_korea:,}<span class="region-unit">명</span></div>
-                    <div class="region-change {"positive" if non_korea_wow >= 0 else "negative"}">전주 대비 {non_korea_wow:+.1f}%</div>
-                </div>
-                <div class="region-stat-card">
-                    <div class="region-label">한국 외 비중</div>
-                    <div class="region-value">{latest_non_korea_share:.2f}<span class="region-unit">%</span></div>
-                    <div class="region-change">전체 WAU 중 한국 외 사용자</div>
-                </div>
-            </div>
-            <div class="chart-container">
-                <canvas id="wauRegionChart"></canvas>
-            </div>
-            <div class="chart-container" style="margin-top: 24px;">
-                <canvas id="wauRegionShareChart"></canvas>
-            </div>
-            <div class="insight-box">
-                <h3>지역별 WAU 분석</h3>
-                <div id="wau-region-insight">{insights["wau_region"]}</div>
-            </div>
-        </div>
-
-        <!-- NAU 섹션 -->
-        <div class="section">
-            <h2>NAU (주간 신규 사용자)</h2>
-            <div class="chart-container">
-                <canvas id="nauChart"></canvas>
-            </div>
-            <div class="insight-box">
-                <h3>NAU 분석</h3>
-                <div id="nau-insight">{insights["nau"]}</div>
-            </div>
-            <button class="collapsible" onclick="toggleCollapsible(this)">원본 데이터 보기</button>
-            <div class="collapsible-content">
-                <div class="data-table">
-                    <table>
-                        <thead><tr><th>날짜</th><th>값</th></tr></thead>
-                        <tbody>{nau_table_rows}</tbody>
-                    </table>
-                </div>
-            </div>
-        </div>
-
-        <!-- 주간 리텐션 섹션 -->
-        <div class="section">
-            <h2>주간 리텐션</h2>
-            <div class="chart-container">
-                <canvas id="retentionCurveChart"></canvas>
-            </div>
-            <p style="font-size: 12.5px; color: #6b6b6b; margin: 10px 4px 0;">
-                ※ 곡선은 월간 건강검진 범위인 W12(3개월)까지 표시합니다. 그 이후는 관측 코호트가 적어
-                특정 코호트의 개성이 곡선을 좌우하는 저신뢰 구간이라 제외하며(코호트 3개 미만 구간은 점선),
-                장기 안착점 판단은 코호트별 곡선과 분기 회고에서 다룹니다.
-            </p>
-            <div class="insight-box">
-                <h3>리텐션 분석</h3>
-                <div id="retention-insight">{insights["retention"]}</div>
-            </div>
-            <button class="collapsible" onclick="toggleCollapsible(this)">원본 데이터 보기</button>
-            <div class="collapsible-content">
-                <div class="data-table">
-                    <table>
-                        {retention_table}
-                    </table>
-                </div>
-            </div>
-        </div>
-
-        <!-- 코호트별 리텐션 추이 섹션 -->
-        <div class="section">
-            <h2>코호트별 리텐션 추이</h2>
-            <div class="chart-container">
-                <canvas id="retentionChart"></canvas>
-            </div>
-            <div class="insight-box">
-                <h3>리텐션 트렌드 분석</h3>
-                <div id="retention-over-time-insight">{insights["retention_over_time"]}</div>
-            </div>
-        </div>
-
-        <footer>
-            <p><span class="logo">Biblessia Analytics</span> 제작</p>
-        </footer>
-    </div>
-
-    <script>
-        // 접기/펼치기 토글
-        function toggleCollapsible(btn) {{
-            const content = btn.nextElementSibling;
-            content.classList.toggle('active');
-        }}
-
-        // Chart.js 다크 테마 설정
-        Chart.defaults.color = '#666666';
-        Chart.defaults.borderColor = '#222222';
-        Chart.defaults.font.family = "'Pretendard', sans-serif";
-
-        // WAU 차트
-        new Chart(document.getElementById('wauChart'), {{
-            type: 'line',
-            data: {{
-                labels: {wau_labels},
-                datasets: [{{
-                    label: 'WAU',
-                    data: {wau_values},
-                    borderColor: '#ffffff',
-                    backgroundColor: 'rgba(255, 255, 255, 0.05)',
-                    fill: true,
-                    tension: 0.4,
-                    borderWidth: 2,
-                    pointBackgroundColor: '#ffffff',
-                    pointBorderColor: '#0a0a0a',
-                    pointBorderWidth: 2,
-                    pointRadius: 0,
-                    pointHoverRadius: 6
-                }}]
-            }},
-            options: {{
-                responsive: true,
-                maintainAspectRatio: false,
-                interaction: {{
-                    intersect: false,
-                    mode: 'index'
-                }},
-                plugins: {{
-                    legend: {{ display: false }},
-                    tooltip: {{
-                        backgroundColor: '#1a1a1a',
-                        titleColor: '#ffffff',
-                        bodyColor: '#a0a0a0',
-                        borderColor: '#333333',
-                        borderWidth: 1,
-                        cornerRadius: 8,
-                        padding: 12
-                    }}
-                }},
-                scales: {{
-                    x: {{
-                        grid: {{ color: '#1a1a1a' }},
-                        ticks: {{ maxRotation: 45, font: {{ size: 11 }} }}
-                    }},
-                    y: {{
-                        beginAtZero: true,
-                        grid: {{ color: '#1a1a1a' }},
-                        ticks: {{ font: {{ size: 11 }} }}
-                    }}
-                }}
-            }}
-        }});
-
-        // WAU 지역별 차트 (한국 vs 한국 외) - 듀얼 Y축 (한국 외는 우측 축)
-        new Chart(document.getElementById('wauRegionChart'), {{
-            type: 'line',
-            data: {{
-                labels: {region_labels},
-                datasets: [
-                    {{
-                        label: '한국',
-                        data: {region_korea_json},
-                        borderColor: '#ffffff',
-                        backgroundColor: 'rgba(255, 255, 255, 0.05)',
-                        fill: false,
-                        tension: 0.4,
-                        borderWidth: 2,
-                        pointBackgroundColor: '#ffffff',
-                        pointBorderColor: '#0a0a0a',
-                        pointBorderWidth: 2,
-                        pointRadius: 3,
-                        pointHoverRadius: 6,
-                        yAxisID: 'y'
-                    }},
-                    {{
-                        label: '한국 외',
-                        data: {region_non_korea_json},
-                        borderColor: '#00d4aa',
-                        backgroundColor: 'rgba(0, 212, 170, 0.1)',
-                        fill: false,
-                        tension: 0.4,
-                        borderWidth: 2,
-                        borderDash: [4, 4],
-                        pointBackgroundColor: '#00d4aa',
-                        pointBorderColor: '#0a0a0a',
-                        pointBorderWidth: 2,
-                        pointRadius: 3,
-                        pointHoverRadius: 6,
-                        yAxisID: 'y1'
-                    }}
-                ]
-            }},
-            options: {{
-                responsive: true,
-                maintainAspectRatio: false,
-                interaction: {{ intersect: false, mode: 'index' }},
-                plugins: {{
-                    legend: {{
-                        display: true,
-                        labels: {{ color: '#a0a0a0', font: {{ size: 12 }} }}
-                    }},
-                    tooltip: {{
-                        backgroundColor: '#1a1a1a',
-                        titleColor: '#ffffff',
-                        bodyColor: '#a0a0a0',
-                        borderColor: '#333333',
-                        borderWidth: 1,
-                        cornerRadius: 8,
-                        padding: 12
-                    }}
-                }},
-                scales: {{
-                    x: {{
-                        grid: {{ color: '#1a1a1a' }},
-                        ticks: {{ maxRotation: 45, font: {{ size: 11 }} }}
-                    }},
-                    y: {{
-                        type: 'linear',
-                        position: 'left',
-                        beginAtZero: true,
-                        grid: {{ color: '#1a1a1a' }},
-                        ticks: {{ font: {{ size: 11 }}, color: '#ffffff' }},
-                        title: {{ display: true, text: '한국 (명)', color: '#ffffff', font: {{ size: 11 }} }}
-                    }},
-                    y1: {{
-                        type: 'linear',
-                        position: 'right',
-                        beginAtZero: true,
-                        grid: {{ drawOnChartArea: false }},
-                        ticks: {{ font: {{ size: 11 }}, color: '#00d4aa' }},
-                        title: {{ display: true, text: '한국 외 (명)', color: '#00d4aa', font: {{ size: 11 }} }}
-                    }}
-                }}
-            }}
-        }});
-
-        // WAU 한국 외 비중 추이
-        new Chart(document.getElementById('wauRegionShareChart'), {{
-            type: 'line',
-            data: {{
-                labels: {region_labels},
-                datasets: [{{
-                    label: '한국 외 비중 (%)',
-                    data: {region_non_korea_share_json},
-                    borderColor: '#00d4aa',
-                    backgroundColor: 'rgba(0, 212, 170, 0.08)',
-                    fill: true,
-                    tension: 0.4,
-                    borderWidth: 2,
-                    pointBackgroundColor: '#00d4aa',
-                    pointBorderColor: '#0a0a0a',
-                    pointBorderWidth: 2,
-                    pointRadius: 3,
-                    pointHoverRadius: 6
-                }}]
-            }},
-            options: {{
-                responsive: true,
-                maintainAspectRatio: false,
-                interaction: {{ intersect: false, mode: 'index' }},
-                plugins: {{
-                    legend: {{ display: false }},
-                    tooltip: {{
-                        backgroundColor: '#1a1a1a',
-                        titleColor: '#ffffff',
-                        bodyColor: '#a0a0a0',
-                        borderColor: '#333333',
-                        borderWidth: 1,
-                        cornerRadius: 8,
-                        padding: 12,
-                        callbacks: {{
-                            label: function(context) {{ return context.parsed.y.toFixed(2) + '%'; }}
-                        }}
-                    }}
-                }},
-                scales: {{
-                    x: {{
-                        grid: {{ color: '#1a1a1a' }},
-                        ticks: {{ maxRotation: 45, font: {{ size: 11 }} }}
-                    }},
-                    y: {{
-                        beginAtZero: true,
-                        grid: {{ color: '#1a1a1a' }},
-                        ticks: {{
-                            font: {{ size: 11 }},
-                            callback: function(value) {{ return value + '%'; }}
-                        }}
-                    }}
-                }}
-            }}
-        }});
-
-        // NAU 차트
-        new Chart(document.getElementById('nauChart'), {{
-            type: 'line',
-            data: {{
-                labels: {nau_labels},
-                datasets: [{{
-                    label: 'NAU',
-                    data: {nau_values},
-                    borderColor: '#00d4aa',
-                    backgroundColor: 'rgba(0, 212, 170, 0.08)',
-                    fill: true,
-                    tension: 0.4,
-                    borderWidth: 2,
-                    pointBackgroundColor: '#00d4aa',
-                    pointBorderColor: '#0a0a0a',
-                    pointBorderWidth: 2,
-                    pointRadius: 0,
-                    pointHoverRadius: 6
-                }}]
-            }},
-            options: {{
-                responsive: true,
-                maintainAspectRatio: false,
-                interaction: {{
-                    intersect: false,
-                    mode: 'index'
-                }},
-                plugins: {{
-                    legend: {{ display: false }},
-                    tooltip: {{
-                        backgroundColor: '#1a1a1a',
-                        titleColor: '#ffffff',
-                        bodyColor: '#a0a0a0',
-                        borderColor: '#333333',
-                        borderWidth: 1,
-                        cornerRadius: 8,
-                        padding: 12
-                    }}
-                }},
-                scales: {{
-                    x: {{
-                        grid: {{ color: '#1a1a1a' }},
-                        ticks: {{ maxRotation: 45, font: {{ size: 11 }} }}
-                    }},
-                    y: {{
-                        beginAtZero: true,
-                        grid: {{ color: '#1a1a1a' }},
-                        ticks: {{ font: {{ size: 11 }} }}
-                    }}
-                }}
-            }}
-        }});
-
-        // 주간 리텐션 곡선 (전체 주차별 리텐션)
-        // 관측 코호트 수가 적은 꼬리 구간(<3개)은 점선·흐린 색으로 구분 (구성 편향 착시 방지)
-        const retCurveCoverage = {json.dumps(retention_curve_coverage)};
-        const RET_LOW_COVERAGE = 3;
-        new Chart(document.getElementById('retentionCurveChart'), {{
-            type: 'line',
-            data: {{
-                labels: {json.dumps(retention_curve_labels)},
-                datasets: [{{
-                    label: '리텐션 %',
-                    data: {json.dumps(retention_curve_values)},
-                    borderColor: '#a0a0a0',
-                    backgroundColor: 'rgba(160, 160, 160, 0.05)',
-                    fill: true,
-                    tension: 0.4,
-                    borderWidth: 2,
-                    segment: {{
-                        borderDash: ctx => (retCurveCoverage[ctx.p1DataIndex] !== undefined && retCurveCoverage[ctx.p1DataIndex] < RET_LOW_COVERAGE) ? [5, 6] : undefined,
-                        borderColor: ctx => (retCurveCoverage[ctx.p1DataIndex] !== undefined && retCurveCoverage[ctx.p1DataIndex] < RET_LOW_COVERAGE) ? 'rgba(160, 160, 160, 0.35)' : undefined
-                    }},
-                    pointBackgroundColor: ctx => (retCurveCoverage[ctx.dataIndex] !== undefined && retCurveCoverage[ctx.dataIndex] < RET_LOW_COVERAGE) ? '#0a0a0a' : '#a0a0a0',
-                    pointBorderColor: ctx => (retCurveCoverage[ctx.dataIndex] !== undefined && retCurveCoverage[ctx.dataIndex] < RET_LOW_COVERAGE) ? 'rgba(160, 160, 160, 0.45)' : '#0a0a0a',
-                    pointBorderWidth: 2,
-                    pointRadius: 4,
-                    pointHoverRadius: 7
-                }}]
-            }},
-            options: {{
-                responsive: true,
-                maintainAspectRatio: false,
-                interaction: {{
-                    intersect: false,
-                    mode: 'index'
-                }},
-                plugins: {{
-                    legend: {{ display: false }},
-                    tooltip: {{
-                        backgroundColor: '#1a1a1a',
-                        titleColor: '#ffffff',
-                        bodyColor: '#a0a0a0',
-                        borderColor: '#333333',
-                        borderWidth: 1,
-                        cornerRadius: 8,
-                        padding: 12,
-                        callbacks: {{
-                            label: function(context) {{
-                                const cov = retCurveCoverage[context.dataIndex];
-                                let label = context.parsed.y + '%';
-                                if (cov !== undefined) {{
-                                    label += ' · 관측 코호트 ' + cov + '개';
-                                    if (cov < RET_LOW_COVERAGE) {{
-                                        label += ' (저신뢰 구간)';
-                                    }}
-                                }}
-                                return label;
-                            }}
-                        }}
-                    }}
-                }},
-                scales: {{
-                    x: {{
-                        grid: {{ color: '#1a1a1a' }}
-                    }},
-                    y: {{
-                        beginAtZero: true,
-                        max: 100,
-                        grid: {{ color: '#1a1a1a' }},
-                        ticks: {{
-                            callback: function(value) {{
-                                return value + '%';
-                            }}
-                        }}
-                    }}
-                }}
-            }}
-        }});
-
-        // 코호트별 리텐션 추이 차트 (Week 1~4 멀티라인)
-        const weekTrends = {json.dumps(week_trends)};
-
-        // X축 레이블은 Week 1 기준 (가장 많은 데이터)
-        const allLabels = weekTrends[1].map(d => d.date);
-
-        // 각 Week 데이터를 레이블에 맞춰 정렬 (없는 데이터는 null)
-        function alignData(weekData, labels) {{
-            const dataMap = new Map(weekData.map(d => [d.date, d.retention]));
-            return labels.map(label => dataMap.get(label) ?? null);
-        }}
-
-        new Chart(document.getElementById('retentionChart'), {{
-            type: 'line',
-            data: {{
-                labels: allLabels,
-                datasets: [
-                    {{
-                        label: 'Week 1',
-                        data: alignData(weekTrends[1], allLabels),
-                        borderColor: '#00d4aa',
-                        backgroundColor: 'rgba(0, 212, 170, 0.1)',
-                        borderWidth: 2,
-                        tension: 0.3,
-                        pointRadius: 4,
-                        pointHoverRadius: 6,
-                        fill: false
-                    }},
-                    {{
-                        label: 'Week 2',
-                        data: alignData(weekTrends[2], allLabels),
-                        borderColor: '#ffd700',
-                        backgroundColor: 'rgba(255, 215, 0, 0.1)',
-                        borderWidth: 2,
-                        tension: 0.3,
-                        pointRadius: 4,
-                        pointHoverRadius: 6,
-                        fill: false
-                    }},
-                    {{
-                        label: 'Week 3',
-                        data: alignData(weekTrends[3], allLabels),
-                        borderColor: '#ff6b6b',
-                        backgroundColor: 'rgba(255, 107, 107, 0.1)',
-                        borderWidth: 2,
-                        tension: 0.3,
-                        pointRadius: 4,
-                        pointHoverRadius: 6,
-                        fill: false
-                    }},
-                    {{
-                        label: 'Week 4',
-                        data: alignData(weekTrends[4], allLabels),
-                        borderColor: '#4ecdc4',
-                        backgroundColor: 'rgba(78, 205, 196, 0.1)',
-                        borderWidth: 2,
-                        tension: 0.3,
-                        pointRadius: 4,
-                        pointHoverRadius: 6,
-                        fill: false
-                    }}
-                ]
-            }},
-            options: {{
-                responsive: true,
-                maintainAspectRatio: false,
-                spanGaps: false,
-                plugins: {{
-                    legend: {{
-                        display: true,
-                        position: 'top',
-                        labels: {{
-                            color: '#a0a0a0',
-                            usePointStyle: true,
-                            pointStyle: 'circle',
-                            padding: 20
-                        }}
-                    }},
-                    tooltip: {{
-                        backgroundColor: '#1a1a1a',
-                        titleColor: '#ffffff',
-                        bodyColor: '#a0a0a0',
-                        borderColor: '#333333',
-                        borderWidth: 1,
-                        cornerRadius: 8,
-                        padding: 12,
-                        callbacks: {{
-                            label: function(context) {{
-                                if (context.parsed.y === null) return null;
-                                return context.dataset.label + ': ' + context.parsed.y + '%';
-                            }}
-                        }}
-                    }}
-                }},
-                scales: {{
-                    x: {{
-                        grid: {{ display: false }},
-                        ticks: {{ maxRotation: 45, font: {{ size: 10 }}, color: '#a0a0a0' }}
-                    }},
-                    y: {{
-                        beginAtZero: true,
-                        max: 100,
-                        grid: {{ color: '#1a1a1a' }},
-                        ticks: {{
-                            color: '#a0a0a0',
-                            callback: function(value) {{
-                                return value + '%';
-                            }}
-                        }}
-                    }}
-                }}
-            }}
-        }});
-    </script>
-</body>
-</html>
-'''
+    context = {
+        "title": title,
+        "report_date": report_date,
+        # 핵심 요약
+        "latest_wau": f"{latest_wau:,}",
+        "wau_change": f"{wau_change:+.1f}",
+        "wau_change_class": "positive" if wau_change >= 0 else "negative",
+        "latest_nau": f"{latest_nau:,}",
+        "nau_change": f"{nau_change:+.1f}",
+        "nau_change_class": "positive" if nau_change >= 0 else "negative",
+        "week1_retention": week1_retention,
+        "latest_cohort_retention": latest_cohort_retention,
+        "latest_cohort_diff": f"{latest_cohort_diff:+d}",
+        "latest_cohort_diff_class": "positive" if latest_cohort_diff >= 0 else "negative",
+        # 지역별
+        "latest_korea": f"{latest_korea:,}",
+        "korea_wow": f"{korea_wow:+.1f}",
+        "korea_wow_class": "positive" if korea_wow >= 0 else "negative",
+        "latest_non_korea": f"{latest_non_korea:,}",
+        "non_korea_wow": f"{non_korea_wow:+.1f}",
+        "non_korea_wow_class": "positive" if non_korea_wow >= 0 else "negative",
+        "latest_non_korea_share": f"{latest_non_korea_share:.2f}" if latest_non_korea_share is not None else "-",
+        # 테이블
+        "wau_table_rows": wau_table_rows,
+        "nau_table_rows": nau_table_rows,
+        "retention_table_block": retention_table_block,
+        # 인사이트
+        "summary_insight": insights["summary"],
+        "wau_insight": insights["wau"],
+        "wau_region_insight": insights["wau_region"],
+        "nau_insight": insights["nau"],
+        "retention_insight": insights["retention"],
+        "retention_over_time_insight": insights["retention_over_time"],
+        "daily_insight": insights["daily"],
+        "conversion_insight": insights["conversion"],
+        "revenue_insight": insights["revenue"],
+        "segments_insight": insights["segments"],
+        "appendix": insights.get("appendix", ""),
+        "appendix_script": insights.get("appendix_script", ""),
+        "section_names": [
+            name for name in REPORT_SECTIONS if name not in OPTIONAL_SECTIONS or data.get(OPTIONAL_SECTIONS[name])
+        ],
+    }
+    used = set(context["section_names"]) | ({"virtual_table"} if full_retention else set())
+    context["asset_modules"] = [name for name in OPTIONAL_ASSETS if name in used]
+    if daily:
+        context.update(daily_context(daily))
+    if conversion:
+        conversion_cohorts = CohortMatrix.from_retention(conversion)
+        context.update(conversion_context(conversion, conversion_cohorts))
+    if revenue:
+        context.update(revenue_context(revenue["weekly"]))
+    if segments:
+        segment_cuts = cut_series(segments)
+        context.update(segments_context(segments, segment_cuts))
+    with stage("chart_payload"):
+        # 긴 시계열은 차트에 싣는 점만 줄인다 (요약 수치 / 원본 데이터 테이블은 위에서 전체 값으로 계산)
+        if max_points is not None:
+            if not isinstance(max_points, dict):
+                max_points = dict.fromkeys(TIMESERIES_CHARTS, max_points)
+            keep = downsample_indices([wau_values], max_points.get("wau"))
+            wau_labels_short, wau_values = take(wau_labels_short, keep), take(wau_values, keep)
+            keep = downsample_indices([nau_values], max_points.get("nau"))
+            nau_labels_short, nau_values = take(nau_labels_short, keep), take(nau_values, keep)
+            keep = downsample_indices(
+                [region_korea, region_non_korea, region_non_korea_share], max_points.get("wau_region")
+            )
+            region_labels_short = take(region_labels_short, keep)
+            region_korea, region_non_korea = take(region_korea, keep), take(region_non_korea, keep)
+            region_non_korea_share = take(region_non_korea_share, keep)
+
+        # 차트 데이터 (페이지에는 데이터만 싣고, 차트 설정은 공유 스크립트 report_charts.js)
+        chart_data = {
+            "wauLabels": wau_labels_short,
+            "wauValues": wau_values,
+            "nauLabels": nau_labels_short,
+            "nauValues": nau_values,
+            "regionLabels": region_labels_short,
+            "regionKorea": region_korea,
+            "regionNonKorea": region_non_korea,
+            "regionNonKoreaShare": region_non_korea_share,
+            "retentionCurveCoverage": retention_curve_coverage,
+            "retentionCurveLabels": retention_curve_labels,
+            "retentionCurveValues": retention_curve_values,
+            "weekTrends": week_trends,
+        }
+        if full_retention:
+            chart_data["retentionTable"] = retention_matrix(data["retention"])
+        if daily:
+            chart_data["daily"] = {
+                "labels": [d[5:] for d in daily["dates"]],
+                "dau": daily["dau"],
+                "active7d": daily["active_7d"],
+                "active28d": daily["active_28d"],
+                "stickiness7d": stickiness(daily["dau"], daily["active_7d"]),
+                "stickiness28d": stickiness(daily["dau"], daily["active_28d"]),
+                "l7": daily["l7"],
+                "l28": daily["l28"],
+            }
+        if conversion:
+            labels, values = conversion_cohorts.overall_curve(max_week=12)
+            chart_data["conversion"] = {
+                "labels": labels,
+                "values": values,
+                "coverage": conversion_cohorts.coverage(len(values)),
+            }
+        if segments:
+            chart_data["segments"] = [
+                {"name": name, "labels": [d[5:] for d in segments["dates"]], "series": series}
+                for name, series in segment_cuts.items()
+            ]
+        if revenue:
+            chart_data["revenue"] = {
+                period: {
+                    "labels": [d[5:] for d in series["dates"]],
+                    "mrr": series["mrr"],
+                    "subscribers": series["subscribers"],
+                    "new": series["new"],
+                    "expansion": series["expansion"],
+                    "contraction": [-v for v in series["contraction"]],
+                    "churned": [-v for v in series["churned"]],
+                }
+                for period, series in revenue.items() if series
+            }
+        context["report_data_json"] = json.dumps(chart_data)
+    with stage("render"):
+        html = render_report(context, asset_base=asset_base, offline=offline, font_text=font_text)
     return html
 
 
-def main():
-    # 최신 Excel 파일 찾기
-    excel_path = find_latest_excel()
-    print(f"Reading: {excel_path}")
+def _hashed_name(stem, ext, content):
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}.{ext}"
 
-    # 데이터 추출
-    data = extract_all_data(excel_path)
+
+def report_asset(ext, modules=OPTIONAL_ASSETS):
+    """report.css / report_charts.js 뒤에 modules 의 선택 조각(있는 것만)을 이어 붙인 내용"""
+    parts = [render("report.css" if ext == "css" else "report_charts.js", {})]
+    for name in modules:
+        if (TEMPLATES_DIR / "optional" / f"{name}.{ext}").exists():
+            parts.append(render(f"optional/{name}.{ext}", {}))
+    return "\n".join(parts)
+
+
+def static_assets(offline=False, font_text=""):
+    """모든 리포트가 공유하는 정적 파일 {종류: (파일명, 내용)} - 파일명에 내용 해시를 넣어 장기 캐시 가능
+
+    여러 리포트가 함께 쓰므로 선택 조각은 모두 넣는다 (조각마다 데이터가 있을 때만 동작).
+    offline=True면 Chart.js와 font_text 글자만 남긴 Pretendard 서브셋도 포함한다.
+    """
+    assets = {}
+    for ext in ("css", "js"):
+        content = report_asset(ext)
+        assets[ext] = (_hashed_name("report", ext, content), content)
+    if offline:
+        assets["chart"] = (_hashed_name("chart", "js", chart_js()), chart_js())
+        font = subset_font(font_chars(font_text))
+        assets["font"] = (_hashed_name("pretendard", "woff2", font), font)
+    return assets
+
+
+def write_static_assets(assets_dir, offline=False, font_text=""):
+    """공유 정적 파일을 해시 파일명으로 저장 (이미 있으면 그대로) -> 저장한 파일명 목록"""
+    assets_dir = Path(assets_dir)
+    assets_dir.mkdir(parents=True, exist_ok=True)
+    names = []
+    for filename, content in static_assets(offline, font_text).values():
+        path = assets_dir / filename
+        if not path.exists():
+            if isinstance(content, bytes):
+                path.write_bytes(content)
+            else:
+                path.write_text(content, encoding="utf-8")
+        names.append(filename)
+    return names
+
+
+def report_text(page):
+    """폰트 서브셋용 - 페이지 본문 + 차트 스크립트 + 차트 데이터(라벨)에 쓰인 글자"""
+    chart_data = json.loads(page["report_data_json"])
+    return "".join([
+        render("report.html", dict(page, vendor_block="", styles_block="", scripts_block="")),
+        report_asset("js", page.get("asset_modules", OPTIONAL_ASSETS)),
+        page.get("appendix_script", ""),
+        json.dumps(chart_data, ensure_ascii=False),
+    ])
+
+
+def render_report(context, asset_base=None, offline=False, font_text=None):
+    """컴파일된 템플릿으로 페이지 조립 (섹션 조각 -> 본문, CSS / 차트 스크립트는 인라인 또는 공유 파일 링크)
+
+    offline=False면 Chart.js / Pretendard를 CDN(고정 버전)에서 불러오고,
+    True면 vendor 파일을 페이지에 넣거나(인라인) 공유 파일로 링크해 네트워크 없이 열린다.
+    font_text를 주지 않으면 이 페이지에 쓰인 글자로 폰트를 서브셋한다.
+    """
+    page = dict(context)
+    section_names = context.get("section_names", REPORT_SECTIONS)
+    page["sections"] = "".join(render(f"sections/{name}.html", context) for name in section_names)
+    page["sections"] += context.get("appendix", "")
+    if offline and font_text is None:
+        font_text = report_text(page)
+
+    if asset_base is None:
+        # 인라인이면 이 페이지에 있는 섹션의 조각만 넣는다
+        modules = context.get("asset_modules", OPTIONAL_ASSETS)
+        page["styles_block"] = f"    <style>\n{report_asset('css', modules)}    </style>"
+        page["scripts_block"] = f"    <script>\n{report_asset('js', modules)}    </script>"
+        if offline:
+            font_url = font_data_url(subset_font(font_chars(font_text)))
+            page["vendor_block"] = (
+                f"    <style>\n{font_face_css(font_url)}    </style>\n"
+                f"    <script>\n{chart_js()}\n    </script>"
+            )
+    else:
+        assets = static_assets(offline, font_text)
+        page["styles_block"] = f'    <link rel="stylesheet" href="{asset_base}/{assets["css"][0]}">'
+        page["scripts_block"] = f'    <script src="{asset_base}/{assets["js"][0]}"></script>'
+        if offline:
+            page["vendor_block"] = (
+                f"    <style>\n{font_face_css(asset_base + '/' + assets['font'][0])}    </style>\n"
+                f'    <script src="{asset_base}/{assets["chart"][0]}"></script>'
+            )
+    if not offline:
+        page["vendor_block"] = cdn_block()
+    if context.get("appendix_script"):
+        page["scripts_block"] += f"\n    <script>\n{context['appendix_script']}\n    </script>"
+    return render("report.html", page)
+
+
+def daily_context(daily):
+    """일간 지표 섹션 템플릿 값 (카드 + 원본 테이블)"""
+    sticky_7d = stickiness(daily["dau"], daily["active_7d"])
+    sticky_28d = stickiness(daily["dau"], daily["active_28d"])
+    # 요일 편차가 커서 카드는 최근 7일 평균 DAU로
+    recent = daily["dau"][-7:]
+    rows = []
+    for row in zip(daily["dates"], daily["dau"], daily["active_7d"], daily["active_28d"], sticky_7d, sticky_28d):
+        rows.append(f"<tr><td>{row[0]}</td><td>{row[1]:,}</td><td>{row[2]:,}</td><td>{row[3]:,}</td>"
+                    f"<td>{row[4]:.2f}%</td><td>{row[5]:.2f}%</td></tr>\n")
+    return {
+        "daily_avg_dau": f"{round(sum(recent) / len(recent)):,}",
+        "daily_active_28d": f"{daily['active_28d'][-1]:,}",
+        "daily_stickiness_28d": f"{sticky_28d[-1]:.1f}",
+        "daily_last_date": daily["dates"][-1],
+        "daily_table_rows": "".join(rows),
+    }
+
+
+def conversion_context(conversion, cohorts):
+    """멤버십 전환 섹션 템플릿 값 (Overall 누적 전환율 카드 + 원본 테이블)"""
+    def overall(week):
+        value = cohorts.overall_at(week)
+        return "-" if value is None else f"{value:.1f}"
+
+    new_users = sum(int(row[2]) for row in conversion["rows"] if "Overall" not in str(row[1]) and row[2] != "")
+    return {
+        "conversion_week0": overall(0),
+        "conversion_week4": overall(4),
+        "conversion_week12": overall(12),
+        "conversion_new_users": f"{new_users:,}",
+        "conversion_table_rows": build_retention_table(conversion, max_cols=MAX_RETENTION_COLS),
+    }
+
+
+def cut_series(segments):
+    """단면 표 컬럼("Country: Japan")을 단면별로 묶기 -> {단면: [{"label": 묶음, "values": [...]}...]}"""
+    cuts = {}
+    for i, column in enumerate(segments["columns"], 1):
+        cut, _, label = column.partition(": ")
+        cuts.setdefault(cut, []).append({"label": label or cut, "values": [row[i] for row in segments["rows"]]})
+    return cuts
+
+
+def segments_context(segments, cuts):
+    """WAU 단면 섹션 템플릿 값 (단면마다 차트 캔버스 + 원본 테이블)"""
+    canvases = []
+    for i in range(len(cuts)):
+        style = "" if i == 0 else ' style="margin-top: 24px;"'
+        canvases.append(f'            <div class="chart-container"{style}>\n'
+                        f'                <canvas id="segmentChart{i}"></canvas>\n'
+                        f'            </div>\n')
+    header = "<tr><th>주</th>" + "".join(f"<th>{c}</th>" for c in segments["columns"]) + "</tr>\n"
+    rows = "".join(
+        f"<tr><td>{row[0]}</td>" + "".join(f"<td>{v:,}</td>" for v in row[1:]) + "</tr>\n"
+        for row in segments["rows"]
+    )
+    return {
+        "segments_charts": "".join(canvases),
+        "segments_table_rows": header + rows,
+        "segments_cuts": " · ".join(cuts),
+    }
+
+
+def revenue_context(weekly):
+    """멤버십 MRR 섹션 템플릿 값 (최근 주 카드 + 주별 원본 테이블)"""
+    net = net_new(weekly)
+    rows = []
+    for row in zip(weekly["dates"], weekly["mrr"], weekly["subscribers"], weekly["new"], weekly["expansion"],
+                   weekly["contraction"], weekly["churned"], net):
+        rows.append("<tr>" + f"<td>{row[0]}</td>" + "".join(f"<td>{v:,}</td>" for v in row[1:]) + "</tr>\n")
+    return {
+        "revenue_mrr": f"{weekly['mrr'][-1]:,}",
+        "revenue_subscribers": f"{weekly['subscribers'][-1]:,}",
+        "revenue_net_new": f"{net[-1]:+,}",
+        "revenue_net_new_class": "positive" if net[-1] >= 0 else "negative",
+        "revenue_last_week": weekly["dates"][-1],
+        "revenue_table_rows": "".join(rows),
+    }
+
+
+def build_timeseries_rows(series):
+    """WAU / NAU 원본 데이터 테이블 행"""
+    if not series:
+        return ""
+    out = []
+    for date, value in zip(series["dates"], series["values"]):
+        out.append(f"<tr><td>{date}</td><td>{value:,}</td></tr>\n")
+    return "".join(out)
+
+
+def retention_matrix(retention):
+    """전체 리텐션 표 -> {"headers": [...], "rows": [[...]...]} (빈 칸은 null, JSON 용)"""
+    if not retention:
+        return {"headers": [], "rows": []}
+    return {
+        "headers": retention["headers"],
+        "rows": [[None if cell == "" else cell for cell in row] for row in retention["rows"]],
+    }
+
+
+def build_retention_table(retention, max_cols=None):
+    """리텐션 원본 데이터 테이블 (헤더 + 코호트 행, max_cols 컬럼까지)"""
+    if not retention:
+        return ""
+    out = io.StringIO()
+    out.write("<tr>")
+    for h in retention["headers"][:max_cols]:
+        out.write(f"<th>{h}</th>")
+    out.write("</tr>\n")
+
+    for row in retention["rows"]:
+        out.write("<tr>")
+        for i, cell in enumerate(row[:max_cols]):
+            if i >= 3 and isinstance(cell, (int, float)):
+                out.write(f"<td class='retention-cell'>{cell:,}</td>")
+            else:
+                out.write(f"<td>{cell}</td>")
+        out.write("</tr>\n")
+    return out.getvalue()
+
+
+def main():
+    # 최신 리포트 데이터 (스냅샷, 없으면 Excel)
+    report_path = find_latest_report()
+    print(f"Reading: {report_path}")
 
     # 커맨드라인 옵션 파싱
     title = None
     json_mode = False
+    use_cache = True
+    offline = False
+    max_points = None
+    full_retention = False
+    profile = False
+    profile_folded = None
 
     i = 1
     while i < len(sys.argv):
-        if sys.argv[i] == "-j":
+        if sys.argv[i] == "-j":  # 한 번 출력하고 종료 (계속 조회하려면 scripts/metrics_server.py)
             json_mode = True
+        elif sys.argv[i] == "--no-cache":
+            use_cache = False
+        elif sys.argv[i] == "--offline":
+            offline = True
+        elif sys.argv[i] == "--full-retention":
+            full_retention = True
+        elif sys.argv[i] == "--profile":
+            profile = True
+        elif sys.argv[i] == "--profile-folded" and i + 1 < len(sys.argv):
+            profile = True
+            profile_folded = sys.argv[i + 1]
+            i += 1
+        elif sys.argv[i] == "--max-points" and i + 1 < len(sys.argv):
+            max_points = int(sys.argv[i + 1])
+            i += 1
         elif sys.argv[i] == "--title" and i + 1 < len(sys.argv):
             title = sys.argv[i + 1]
             i += 1
         i += 1
 
+    problems = check_offline_files() if offline else []
+    if problems:
+        for problem in problems:
+            print(problem, file=sys.stderr)
+        sys.exit(1)
+
+    if profile:
+        PROFILER.enable()
+
+    # 데이터 추출
+    with stage("load_report_data"):
+        data = load_report_data(report_path, use_cache=use_cache)
+
     # JSON 모드
     if json_mode:
         print(json.dumps(data, indent=2, ensure_ascii=False))
@@ -1502,14 +969,22 @@ def main():
     print(f"Report title: {title}")
 
     # HTML 생성
-    html = generate_html(data, title=title)
+    with stage("generate_html"):
+        html = generate_html(data, title=title, offline=offline, max_points=max_points, full_retention=full_retention)
 
     # 파일 저장
     today = datetime.now().strftime("%Y-%m-%d")
     output_path = REPORTS_DIR / f"analysis_report_{today}.html"
-    output_path.write_text(html, encoding="utf-8")
+    with stage("html_write"):
+        output_path.write_text(html, encoding="utf-8")
     print(f"Report saved: {output_path}")
 
+    if profile:
+        profile_path = REPORTS_DIR / f"profile_html_{today}.json"
+        PROFILER.write(profile_path, profile_folded)
+        print(PROFILER.summary())
+        print(f"Profile saved: {profile_path}")
+
     return data
 
 
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""주간 지표 증분 집계 - 집계 상태를 디스크에 유지
+
+매번 전체 기간을 다시 집계하지 않고, 이미 닫힌 주의 결과는 상태 파일에 보관한다.
+새 주 데이터가 들어오면 그 주의 WAU/NAU 값 하나와 리텐션 삼각형의 새 대각선
+(모든 코호트의 '이번 주' 칸)만 계산해 덧붙인다.
+
+상태 파일(JSON)에 보관하는 것:
+    - 사용자 인덱스와 사용자별 최초 방문 주 (NAU / 코호트 판정용)
+    - 주별·국가별 활성 사용자 비트맵 (WAU / 지역별 WAU / 임의 국가 묶음을 합집합으로 계산)
+    - 일별 활성 사용자 비트맵 (DAU / 최근 7일·28일 활성 / L7·L28)
+    - 주별 NAU 값
+    - 코호트별 주차 재방문 수
+    - 마지막으로 반영한 주 (이 주 이전 데이터는 다시 들어와도 무시)
+
+한 번 반영한 주는 닫힌 것으로 본다. 늦게 도착한 과거 이벤트를 반영하려면 상태 파일을 지우고 다시 만든다.
+일별 비트맵이 없던 버전 2 상태 파일도 읽을 수 있다 (그 이전 기간은 일간 지표에서 빈 날로 본다).
+"""
+
+import json
+from pathlib import Path
+
+from amplitude_ingest import (
+    REGION_GROUPS,
+    REPORT_WEEKS,
+    RETENTION_WEEKS,
+    build_group_series,
+    build_retention_table,
+    format_week,
+    week_range,
+)
+from daily_metrics import DAILY_REPORT_DAYS, WINDOWS, build_daily_data
+from user_bitmap import UserBitmap, group_values, union_count
+
+STATE_VERSION = 3
+
+# 읽을 수 있는 이전 버전 (2: 일별 비트맵 없음)
+COMPATIBLE_VERSIONS = (2, STATE_VERSION)
+
+
+class IncrementalState:
+    """디스크에 저장되는 주간 집계 상태"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.last_week = None
+        self.users = []
+        self.user_index = {}
+        self.first_seen = []
+        self.countries = {}
+        self.daily = {}
+        self.nau = {}
+        self.retention = {}
+        if self.path.exists():
+            self._load()
+
+    def _load(self):
+        state = json.loads(self.path.read_text(encoding="utf-8"))
+        if state.get("version") not in COMPATIBLE_VERSIONS:
+            raise ValueError(f"Unsupported state version: {state.get('version')} ({self.path})")
+        self.last_week = state["last_week"]
+        self.users = state["users"]
+        self.user_index = {key: i for i, key in enumerate(self.users)}
+        self.first_seen = state["first_seen"]
+        self.countries = {
+            int(week): {country: UserBitmap.from_base64(bits) for country, bits in by_country}
+            for week, by_country in state["countries"].items()
+        }
+        self.daily = {int(day): UserBitmap.from_base64(bits) for day, bits in state.get("daily", {}).items()}
+        for name in ("nau", "retention"):
+            setattr(self, name, {int(week): value for week, value in state[name].items()})
+
+    def save(self):
+        state = {
+            "version": STATE_VERSION,
+            "last_week": self.last_week,
+            "users": self.users,
+            "first_seen": self.first_seen,
+            # 국가 이름이 None일 수 있어 [국가, 비트맵] 쌍 목록으로 저장
+            "countries": {
+                week: [[country, bitmap.to_base64()] for country, bitmap in by_country.items()]
+                for week, by_country in self.countries.items()
+            },
+            "daily": {day: bitmap.to_base64() for day, bitmap in self.daily.items()},
+            "nau": self.nau,
+            "retention": self.retention,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        tmp.replace(self.path)
+
+    def apply(self, aggregator):
+        """새 주(들)만 담은 WeeklyAggregator 결과를 상태에 반영
+
+        aggregator 안의 최초 방문 주는 그 배치 기준이므로 무시하고, 상태의 first_seen으로 코호트를 판정한다.
+
+        Returns:
+            새로 반영한 주 목록
+        """
+        keys = [None] * len(aggregator.user_index)
+        for key, uid in aggregator.user_index.items():
+            keys[uid] = str(key)
+
+        applied = []
+        for week in sorted(aggregator.active):
+            if self.last_week is not None and week <= self.last_week:
+                continue
+            # 건너뛴 빈 주도 0으로 채워 둔다 (시계열 / 리텐션 칸 위치 유지)
+            start = week if self.last_week is None else self.last_week + 7
+            for gap in range(start, week, 7):
+                self._apply_week(gap, {})
+            self._apply_week(
+                week,
+                {
+                    country: [keys[uid] for uid in uids]
+                    for country, uids in aggregator.country_active.get(week, {}).items()
+                },
+            )
+            # 그 주의 사용자는 _apply_week 에서 모두 인덱스를 받았으므로 일별 집합은 인덱스만 바꿔 넣는다
+            for day in range(week, week + 7):
+                uids = aggregator.daily_active.get(day)
+                if uids:
+                    self.daily[day] = UserBitmap.from_ids([self.user_index[keys[uid]] for uid in uids])
+            applied.append(week)
+        return applied
+
+    def _apply_week(self, week, country_keys):
+        """한 주 반영 - 비용은 그 주 활성 사용자 수에 비례
+
+        Args:
+            country_keys: {국가: 그 주 해당 국가에서 활동한 사용자 식별자 목록}
+        """
+        first_seen = self.first_seen
+        new_users = 0
+        diagonal = {}
+        active = set()
+        by_country = {}
+        for country, keys in country_keys.items():
+            uids = []
+            for key in keys:
+                uid = self.user_index.get(key)
+                if uid is None:
+                    uid = self.user_index[key] = len(self.users)
+                    self.users.append(key)
+                    first_seen.append(week)
+                    new_users += 1
+                uids.append(uid)
+            by_country[country] = UserBitmap.from_ids(uids)
+            active.update(uids)
+        for uid in active:
+            cohort = first_seen[uid]
+            diagonal[cohort] = diagonal.get(cohort, 0) + 1
+
+        self.retention[week] = [0]
+        for cohort, row in self.retention.items():
+            offset = (week - cohort) // 7
+            if offset > 0:
+                row.extend([0] * (offset + 1 - len(row)))
+            row[offset] = diagonal.get(cohort, 0)
+
+        self.countries[week] = by_country
+        self.nau[week] = new_users
+        self.last_week = week
+
+    def weeks(self, n_weeks):
+        if self.last_week is None:
+            return []
+        return week_range(min(self.countries), self.last_week, n_weeks)
+
+    def wau(self, week):
+        """전체 WAU = 모든 국가 비트맵의 합집합 크기"""
+        return union_count(self.countries[week].values())
+
+    def group_counts(self, week, groups=REGION_GROUPS):
+        """한 주의 국가 묶음별 활성 사용자 수 (WeeklyAggregator.group_counts와 동일)"""
+        by_country = self.countries[week]
+        return {
+            name: union_count(by_country[c] for c in countries)
+            for name, countries in group_values(by_country, groups).items()
+        }
+
+    def wau_by_groups_data(self, groups, report_weeks=REPORT_WEEKS):
+        return build_group_series(self, self.weeks(report_weeks), groups)
+
+    def daily_data(self, report_days=DAILY_REPORT_DAYS):
+        """일간 지표 - 리포트 기간과 그 앞 28일 창에 필요한 날의 비트맵만 풀어서 계산"""
+        if not self.daily:
+            return None
+        first_day = max(self.daily) - report_days - max(WINDOWS) + 2
+        return build_daily_data(
+            {day: bitmap.ids() for day, bitmap in self.daily.items() if day >= first_day}, report_days
+        )
+
+    def report_data(self, report_weeks=REPORT_WEEKS, retention_weeks=RETENTION_WEEKS):
+        """create_workbook()에 바로 넘길 수 있는 지표 묶음 (WeeklyAggregator.report_data와 동일 형식)"""
+        weeks = self.weeks(report_weeks)
+        dates = [format_week(w) for w in weeks]
+        cohorts = self.weeks(retention_weeks)
+        data = {
+            "wau": {"dates": dates, "values": [self.wau(w) for w in weeks]},
+            "wau_by_region": self.wau_by_groups_data(REGION_GROUPS, report_weeks),
+            "nau": {"dates": dates, "values": [self.nau[w] for w in weeks]},
+            "retention": build_retention_table({c: self.retention[c] for c in cohorts}, retention_weeks),
+        }
+        daily = self.daily_data()
+        if daily:
+            data["daily"] = daily
+        return data
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""코호트별 멤버십 전환 - 첫 방문 주 코호트 × 첫 방문 후 경과 주차 구독 전환 행렬
+
+docs/membership-event-tracking-spec.md 4-1 (코호트 전환율):
+    시작 이벤트 = 첫 방문 (New User), 돌아온 이벤트 = Action - Subscribe Membership,
+    Rolling (N주 이내 1회 이상), 주 단위
+
+저장소의 user / time / event_type 컬럼을 이어 붙여 (user, time) 순으로 한 번 정렬하고,
+사용자 타임라인을 앞에서부터 한 번 훑으며(sort-merge) 사용자별 첫 활동 시각과 첫 구독 시각을 같이 찾는다.
+정렬과 타임라인 경계 계산은 NumPy 배열 연산이라 수백만 이벤트도 이벤트당 파이썬 루프 없이 처리한다.
+
+결과 표는 RETENTION_DATA 와 같은 모양 (Segment, Start Date, Users, Week 0, Week 1, ...) 이고,
+Users는 코호트 신규 사용자 수, Week n은 첫 방문 후 n주 안에 구독한 누적 사용자 수다.
+"""
+
+from datetime import date
+
+import numpy as np
+
+from amplitude_ingest import (
+    NON_ACTIVE_EVENT_TYPES,
+    RETENTION_WEEKS,
+    TIMEZONE_OFFSET,
+    format_cohort,
+    format_percent,
+    week_range,
+)
+from event_store import MEMBERSHIP_FUNNEL_STEPS
+
+# 전환으로 보는 이벤트 (퍼널 마지막 단계)
+SUBSCRIBE_EVENT = MEMBERSHIP_FUNNEL_STEPS[-1]
+
+# 전환 코호트 수 (리텐션과 같은 16주)
+CONVERSION_WEEKS = RETENTION_WEEKS
+
+_COLUMN_DTYPES = {"user": np.uint32, "time": np.int64, "event_type": np.uint32}
+
+
+def _load_columns(store, end_week=None):
+    """활성 이벤트의 user / time / event_type 컬럼 (전체 파티션을 이어 붙인 NumPy 배열)"""
+    parts = {name: [] for name in _COLUMN_DTYPES}
+    for _, cols in store.scan(tuple(_COLUMN_DTYPES), end_week=end_week):
+        for name, dtype in _COLUMN_DTYPES.items():
+            parts[name].append(np.frombuffer(cols[name], dtype=dtype))
+    columns = {
+        name: np.concatenate(arrays) if arrays else np.empty(0, dtype=_COLUMN_DTYPES[name])
+        for name, arrays in parts.items()
+    }
+    skip = [store.code("event_type", t) for t in NON_ACTIVE_EVENT_TYPES]
+    active = ~np.isin(columns["event_type"], [c for c in skip if c is not None])
+    return {name: values[active] for name, values in columns.items()}
+
+
+def _week_of(epoch_seconds):
+    """UTC epoch 초 배열 -> 프로젝트 타임존 주 ordinal(월요일) 배열"""
+    day = date(1970, 1, 1).toordinal() + (epoch_seconds + int(TIMEZONE_OFFSET.total_seconds())) // 86400
+    # ordinal 1 (0001-01-01) 이 월요일
+    return day - (day - 1) % 7
+
+
+def first_seen_and_subscribe(users, times, subscribed):
+    """사용자 타임라인 sort-merge - 사용자별 (첫 활동 시각, 첫 구독 시각)
+
+    Args:
+        users / times: 이벤트별 사용자 코드 / 시각 배열
+        subscribed: 이벤트별 구독 이벤트 여부 (bool 배열)
+
+    Returns:
+        (first_time, subscribe_time) - 타임라인(사용자)별 배열, 구독하지 않은 사용자는 subscribe_time = -1
+    """
+    if not len(users):
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    order = np.lexsort((times, users))
+    users, times, subscribed = users[order], times[order], subscribed[order]
+
+    # 사용자가 바뀌는 위치 = 타임라인 시작, 시작 이벤트가 곧 첫 활동
+    starts = np.r_[True, users[1:] != users[:-1]]
+    timeline = np.cumsum(starts) - 1
+    first_time = times[starts]
+
+    # 각 타임라인에서 처음 나오는 구독 이벤트 (시각순으로 정렬돼 있으므로 타임라인 안 첫 구독이 최초 구독)
+    sub_rows = np.flatnonzero(subscribed)
+    sub_timeline = timeline[sub_rows]
+    first_sub = sub_rows[np.r_[True, sub_timeline[1:] != sub_timeline[:-1]]] if len(sub_rows) else sub_rows
+    subscribe_time = np.full(len(first_time), -1, dtype=np.int64)
+    subscribe_time[timeline[first_sub]] = times[first_sub]
+    return first_time, subscribe_time
+
+
+def conversion_counts(first_time, subscribe_time, conversion_weeks=CONVERSION_WEEKS, last_week=None):
+    """코호트 주 -> (신규 사용자 수, [Week 0, Week 1, ... 누적 구독 사용자 수]) (관측된 주까지만)"""
+    if not len(first_time):
+        return {}
+    cohort = _week_of(first_time)
+    if last_week is None:
+        last_week = int(cohort.max())
+    cohorts = week_range(int(cohort.min()), last_week, conversion_weeks)
+    in_window = cohort >= cohorts[0]
+    cohort = cohort[in_window]
+    subscribe_time = subscribe_time[in_window]
+
+    converted = subscribe_time >= 0
+    offset = (_week_of(subscribe_time[converted]) - cohort[converted]) // 7
+    sub_cohort = cohort[converted]
+
+    counts = {}
+    for c in cohorts:
+        n_weeks = (last_week - c) // 7 + 1
+        weekly = np.bincount(offset[(sub_cohort == c) & (offset < n_weeks)], minlength=n_weeks)
+        counts[c] = (int(np.count_nonzero(cohort == c)), np.cumsum(weekly).tolist())
+    return counts
+
+
+def build_conversion_table(counts, conversion_weeks=CONVERSION_WEEKS):
+    """conversion_counts() 결과 -> RETENTION_DATA 형식 표 (Overall 누적 전환 / 전환율, 최신 코호트부터)
+
+    Overall Week n 전환율의 분모는 Week n 까지 관측된 코호트의 신규 사용자 수 합이다.
+    """
+    header = ["Segment", "Start Date", "Users"] + [f"Week {i}" for i in range(conversion_weeks)]
+    if not counts:
+        return [header]
+
+    n_weeks = max(len(row) for _, row in counts.values())
+    converted = [0] * n_weeks
+    eligible = [0] * n_weeks
+    for users, row in counts.values():
+        for i, value in enumerate(row):
+            converted[i] += value
+            eligible[i] += users
+
+    overall_pct = [format_percent(c / e * 100) if e else "0.0%" for c, e in zip(converted, eligible)]
+    data = [
+        header,
+        ["Global", "Overall", "Converted"] + converted,
+        ["Global", "Overall", "Converted %"] + overall_pct,
+    ]
+    for cohort in sorted(counts, reverse=True):
+        users, row = counts[cohort]
+        data.append(["Global", format_cohort(cohort), users] + row)
+    return data
+
+
+def membership_conversion(store, end_week=None, conversion_weeks=CONVERSION_WEEKS):
+    """저장소 전체 이벤트로 코호트별 멤버십 전환 표 생성
+
+    첫 방문 주는 저장소 전체 이력 기준이다 (리포트 범위 이전에 온 사용자는 코호트에 들어가지 않는다).
+
+    Returns:
+        RETENTION_DATA 형식 표 (구독 이벤트가 한 번도 없으면 None)
+    """
+    subscribe_code = store.code("event_type", SUBSCRIBE_EVENT)
+    if subscribe_code is None:
+        return None
+    columns = _load_columns(store, end_week)
+    first_time, subscribe_time = first_seen_and_subscribe(
+        columns["user"], columns["time"], columns["event_type"] == subscribe_code
+    )
+    # 리텐션과 같이 데이터가 있는 마지막 주까지 (신규 사용자가 없는 주여도)
+    last_week = int(_week_of(columns["time"].max())) if len(first_time) else None
+    return build_conversion_table(conversion_counts(first_time, subscribe_time, conversion_weeks, last_week),
+                                  conversion_weeks)
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""주 × country × platform × 신규/기존 사전 집계 큐브
+
+이벤트 저장소를 적재할 때 한 번 만들어 두고, 국가 / 플랫폼 / 신규·기존 단면의 주별 시계열은 모두 여기서 답한다.
+셀마다 이벤트 수(더할 수 있는 값)와 사용자 집합(합집합으로 합칠 수 있는 distinct)을 두므로
+slice(where) / roll-up(by 없음) / drill-down(by 차원) 모두 원본 이벤트를 다시 읽지 않고
+그 주 셀 몇십 개의 합 / 합집합으로 끝난다.
+
+    cells[week][(country, platform, segment)] = [이벤트 수, UserBitmap | SparseUserSet]
+    segment: "new" (그 주가 첫 방문 주) / "returning"
+
+셀 대부분은 전체 사용자 코드 범위에 비해 사용자가 적으므로, 비트맵보다 작을 때는 정렬된 코드 배열로 둔다 (user_set).
+사용자 집합은 저장소 사용자 코드(users.json 인덱스) 기준이라 큐브 파일은 저장소 폴더에 둔다 (CUBE_FILE).
+새로 들어온 주 파티션만 읽어 덧붙이고, 한 번 반영한 주는 닫힌 것으로 본다 (IncrementalState와 같은 규칙).
+"""
+
+import json
+from array import array
+from pathlib import Path
+
+from amplitude_ingest import (
+    KOREA_COUNTRY,
+    NON_ACTIVE_EVENT_TYPES,
+    REGION_GROUPS,
+    REPORT_WEEKS,
+    format_week,
+    week_range,
+)
+from user_bitmap import UserBitmap, decode_user_set, encode_user_set, group_values, union_count, user_set
+
+CUBE_VERSION = 2
+
+# 저장소 폴더 안 큐브 파일 이름
+CUBE_FILE = "cube.json"
+
+DIMENSIONS = ("country", "platform", "segment")
+MEASURES = ("users", "events")
+
+# 워크북 / HTML 리포트의 WAU 단면 {단면 이름: (차원, {묶음 이름: 값 목록 | None(나머지 전부)})}
+# 새 단면은 여기에 한 줄 추가하면 시트 / 차트에 같이 나온다
+WAU_CUTS = {
+    "Country": ("country", {
+        "South Korea": [KOREA_COUNTRY],
+        "Japan": ["Japan"],
+        "United States": ["United States"],
+        "Other": None,
+    }),
+    "Platform": ("platform", {"iOS": ["iOS"], "Android": ["Android"], "Web": ["Web"], "Other": None}),
+    "User Type": ("segment", {"New": ["new"], "Returning": ["returning"]}),
+}
+
+
+class MetricsCube:
+    """주 × 차원 셀 큐브 (디스크 저장)"""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path is not None else None
+        self.last_week = None
+        self.first_seen = array("I")  # 저장소 사용자 코드 -> 첫 방문 주 (0 = 아직 안 봄)
+        self.cells = {}
+        if self.path is not None and self.path.exists():
+            self._load()
+
+    def _load(self):
+        state = json.loads(self.path.read_text(encoding="utf-8"))
+        version = state.get("version")
+        if version not in (1, CUBE_VERSION):
+            raise ValueError(f"Unsupported cube version: {version} ({self.path})")
+        # 버전 1은 모든 셀이 비트맵 base64
+        decode = UserBitmap.from_base64 if version == 1 else decode_user_set
+        self.last_week = state["last_week"]
+        self.first_seen = array("I", state["first_seen"])
+        for week, country, platform, segment, events, users in state["cells"]:
+            self.cells.setdefault(week, {})[(country, platform, segment)] = [events, decode(users)]
+
+    def save(self):
+        state = {
+            "version": CUBE_VERSION,
+            "last_week": self.last_week,
+            "first_seen": self.first_seen.tolist(),
+            # 차원 값이 None일 수 있어 셀마다 [주, 국가, 플랫폼, 구분, 이벤트 수, 사용자 집합] 목록으로 저장
+            "cells": [
+                [week, *key, events, encode_user_set(users)]
+                for week, by_key in self.cells.items()
+                for key, (events, users) in by_key.items()
+            ],
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        tmp.replace(self.path)
+
+    # ---- 적재 ----
+
+    def add_week(self, week, rows):
+        """한 주 반영 - rows: (사용자 코드, 국가, 플랫폼) 활성 이벤트 목록 (주 순서대로 호출)"""
+        first_seen = self.first_seen
+        events = {}
+        users = {}
+        for user, country, platform in rows:
+            if user >= len(first_seen):
+                first_seen.extend([0] * (user + 1 - len(first_seen)))
+            if not first_seen[user]:
+                first_seen[user] = week
+            key = (country, platform, "new" if first_seen[user] == week else "returning")
+            events[key] = events.get(key, 0) + 1
+            users.setdefault(key, set()).add(user)
+        self.cells[week] = {key: [events[key], user_set(users[key])] for key in events}
+        self.last_week = week
+
+    def add_store(self, store, end_week=None):
+        """저장소에서 큐브에 아직 없는 주 파티션만 읽어 반영 -> 새로 반영한 주 목록"""
+        decode = store.decode
+        skip = {store.code("event_type", t) for t in NON_ACTIVE_EVENT_TYPES} - {None}
+        start_week = None if self.last_week is None else self.last_week + 7
+        applied = []
+        for week, cols in store.scan(("user", "country", "platform", "event_type"), start_week, end_week):
+            countries = {}
+            platforms = {}
+            rows = []
+            for user, country, platform, event_type in zip(
+                cols["user"], cols["country"], cols["platform"], cols["event_type"]
+            ):
+                if event_type in skip:
+                    continue
+                if country not in countries:
+                    countries[country] = decode("country", country)
+                if platform not in platforms:
+                    platforms[platform] = decode("platform", platform)
+                rows.append((user, countries[country], platforms[platform]))
+            self.add_week(week, rows)
+            applied.append(week)
+        return applied
+
+    # ---- 조회 ----
+
+    def weeks(self, report_weeks=REPORT_WEEKS, end_week=None):
+        """리포트 대상 주 목록 (마지막 주부터 거꾸로 report_weeks개, 빈 주 포함)
+
+        큐브는 한 번 반영한 주를 계속 갖고 있으므로, end_week 를 주면 그 전 주까지만 (--until 이 더 이른 리포트).
+        """
+        if not self.cells:
+            return []
+        last_week = self.last_week if end_week is None else min(self.last_week, end_week - 7)
+        if last_week < min(self.cells):
+            return []
+        return week_range(min(self.cells), last_week, report_weeks)
+
+    def values(self, dimension):
+        """차원에 나오는 값 목록 (처음 나온 순서)"""
+        i = DIMENSIONS.index(dimension)
+        seen = {}
+        for by_key in self.cells.values():
+            for key in by_key:
+                seen.setdefault(key[i], None)
+        return list(seen)
+
+    def _matching(self, week, where):
+        """where 조건에 맞는 셀 목록 [(key, [이벤트 수, 사용자 집합])]"""
+        cells = self.cells.get(week, {}).items()
+        for dimension, allowed in (where or {}).items():
+            i = DIMENSIONS.index(dimension)
+            allowed = set(allowed)
+            cells = [(key, cell) for key, cell in cells if key[i] in allowed]
+        return list(cells)
+
+    @staticmethod
+    def _measure(cells, measure):
+        if measure == "events":
+            return sum(cell[0] for _, cell in cells)
+        return union_count(cell[1] for _, cell in cells)
+
+    def query(self, measure="users", by=None, groups=None, where=None, weeks=None):
+        """주별 시계열 조회
+
+        Args:
+            measure: "users" (distinct 사용자, 셀 사용자 집합 합집합) / "events" (이벤트 수 합)
+            by: 나눌 차원 ("country" / "platform" / "segment"). 없으면 전체 하나로 roll-up
+            groups: by 차원 값 묶음 {묶음 이름: 값 목록 | None(다른 묶음에 없는 나머지)}. 없으면 값마다 하나
+            where: 먼저 거를 조건 {차원: 허용 값 목록}
+            weeks: 주 ordinal 목록 (없으면 최근 REPORT_WEEKS주)
+
+        Returns:
+            by 없음: {"dates", "values"}
+            by 있음: {"dates", 묶음 이름: [...], ..., "total": [...]} - 묶음끼리 사용자가 겹칠 수 있어
+                     users의 total은 합계가 아닌 합집합 기준 (where 조건 안에서)
+        """
+        if measure not in MEASURES:
+            raise ValueError(f"Unknown measure: {measure}")
+        if weeks is None:
+            weeks = self.weeks()
+        data = {"dates": [format_week(w) for w in weeks]}
+        if by is None:
+            data["values"] = [self._measure(self._matching(w, where), measure) for w in weeks]
+            return data
+
+        i = DIMENSIONS.index(by)
+        if groups is None:
+            groups = {value: [value] for value in self.values(by)}
+        members = group_values(self.values(by), groups)
+        data.update({name: [] for name in groups})
+        data["total"] = []
+        for w in weeks:
+            cells = self._matching(w, where)
+            for name, values in members.items():
+                values = set(values)
+                data[name].append(self._measure([c for c in cells if c[0][i] in values], measure))
+            data["total"].append(self._measure(cells, measure))
+        return data
+
+    def cut_table(self, cuts=WAU_CUTS, measure="users", weeks=None):
+        """여러 단면을 한 표로 - {"dates", "columns": ["Country: Japan", ...], "rows": [[주, 값...]...]}"""
+        if weeks is None:
+            weeks = self.weeks()
+        columns = []
+        series = []
+        for cut, (dimension, groups) in cuts.items():
+            result = self.query(measure, by=dimension, groups=groups, weeks=weeks)
+            for name in groups:
+                columns.append(f"{cut}: {name}")
+                series.append(result[name])
+        dates = [format_week(w) for w in weeks]
+        return {"dates": dates, "columns": columns, "rows": [[d, *values] for d, *values in zip(dates, *series)]}
+
+
+def report_series(cube, report_weeks=REPORT_WEEKS, end_week=None):
+    """지표 묶음의 WAU / 지역별 WAU / NAU 시계열과 WAU 단면 표를 큐브 조회로 (WeeklyAggregator.report_data와 같은 형식)
+
+    end_week 가 있으면 그 전 주까지만 (WeeklyAggregator의 end_week 와 같은 뜻)
+    """
+    weeks = cube.weeks(report_weeks, end_week)
+    return {
+        "wau": cube.query(weeks=weeks),
+        "wau_by_region": cube.query(by="country", groups=REGION_GROUPS, weeks=weeks),
+        "nau": cube.query(where={"segment": ["new"]}, weeks=weeks),
+        "segments": cube.cut_table(weeks=weeks),
+    }
+
+
+def build_cube(store, end_week=None, save=True):
+    """저장소 폴더의 큐브를 열어 새 주만 반영하고 저장 (save=False면 메모리에서만 반영)"""
+    cube = MetricsCube(store.root / CUBE_FILE)
+    if cube.add_store(store, end_week=end_week) and save:
+        cube.save()
+    return cube
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""로컬 지표 조회 서버 - 리포트 데이터를 메모리에 두고 JSON 엔드포인트로 제공
+
+generate_html_report.py -j 는 extract_all_data() 결과를 한 번 출력하고 끝나지만,
+이 서버는 파싱한 지표를 메모리에 유지하고 대시보드 / 노트북이 가볍게 폴링할 수 있게 한다.
+
+    GET /api                  엔드포인트 목록
+    GET /api/data             전체 (extract_all_data() 형식)
+    GET /api/<지표>           wau, wau_by_region, nau, retention, segments, daily, conversion, revenue
+    GET /api/summary          최신 WAU / NAU 와 전주 대비 변화, Overall Week 1 리텐션
+    GET /api/retention_curve  Overall 리텐션 곡선 (W0~W12)과 주차별 관측 코호트 수
+    GET /api/week_trends      코호트별 Week 1~4 리텐션 추이
+
+응답 본문 / gzip 본문 / ETag는 데이터를 읽을 때 한 번 만들어 두고 요청마다 그대로 보낸다.
+If-None-Match 가 같으면 304, Accept-Encoding: gzip 이면 gzip 본문을 보낸다.
+
+데이터 원본은 최신 reports/amplitude_report_*.snap / .xlsx (기본) 또는 이벤트 저장소(--store)이고,
+새 리포트 / 새 주 파티션이 생기면 백그라운드에서 다시 읽어 통째로 바꿔 끼운다 (읽는 동안에도 이전 데이터로 응답).
+
+사용법:
+    python scripts/metrics_server.py [--port 8765] [--host 127.0.0.1] [--store DIR] [--interval 초]
+"""
+
+import gzip
+import hashlib
+import json
+import sys
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from cohort_matrix import CohortMatrix
+from generate_html_report import PROJECT_ROOT, find_latest_report, load_report_data, report_data_from_metrics
+
+sys.path.insert(0, str(PROJECT_ROOT))
+from generate_amplitude_report import load_metrics, parse_args  # noqa: E402
+
+DEFAULT_PORT = 8765
+
+# 원본 변경 확인 주기 (초)
+DEFAULT_INTERVAL = 5.0
+
+# 데이터 묶음에서 그대로 내보내는 지표
+METRIC_ENDPOINTS = ("wau", "wau_by_region", "nau", "retention", "segments", "daily", "conversion", "revenue")
+
+# gzip으로 보내도 이득이 없는 작은 응답 (바이트)
+GZIP_MIN_BYTES = 512
+
+
+def _change(values):
+    """최신 값, 직전 값, 변화율(%)"""
+    latest = values[-1] if values else 0
+    previous = values[-2] if len(values) >= 2 else 0
+    return {
+        "latest": latest,
+        "previous": previous,
+        "change_pct": round((latest - previous) / previous * 100, 2) if previous else 0,
+    }
+
+
+def derived_series(data):
+    """데이터 묶음에서 계산하는 파생 지표 {엔드포인트 이름: 값}"""
+    summary = {
+        "wau": _change(data["wau"]["values"] if data.get("wau") else []),
+        "nau": _change(data["nau"]["values"] if data.get("nau") else []),
+        "week1_retention": None,
+    }
+    derived = {"summary": summary, "retention_curve": None, "week_trends": None}
+    if data.get("retention") and len(data["retention"]["rows"]) >= 2:
+        cohorts = CohortMatrix.from_retention(data["retention"])
+        summary["week1_retention"] = cohorts.overall_week1()
+        labels, values = cohorts.overall_curve(max_week=12)
+        derived["retention_curve"] = {"labels": labels, "values": values, "coverage": cohorts.coverage(len(values))}
+        derived["week_trends"] = cohorts.week_trends((1, 2, 3, 4))
+    return derived
+
+
+class Response:
+    """미리 인코딩해 둔 JSON 응답 (본문, gzip 본문, ETag)"""
+
+    __slots__ = ("body", "gzipped", "etag")
+
+    def __init__(self, value):
+        self.body = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        self.gzipped = gzip.compress(self.body, mtime=0) if len(self.body) >= GZIP_MIN_BYTES else None
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:20]}"'
+
+
+class Snapshot:
+    """한 시점의 데이터 묶음과 경로별 응답 (만든 뒤에는 바꾸지 않는다)"""
+
+    def __init__(self, data, source, signature):
+        self.source = source
+        self.signature = signature
+        self.loaded_at = time.strftime("%Y-%m-%d %H:%M:%S")
+        routes = {"data": data}
+        routes.update({name: data.get(name) for name in METRIC_ENDPOINTS})
+        routes.update(derived_series(data))
+        self.responses = {f"/api/{name}": Response(value) for name, value in routes.items()}
+        self.responses["/api"] = Response({
+            "source": source,
+            "loaded_at": self.loaded_at,
+            "endpoints": sorted(self.responses) + ["/api"],
+        })
+
+
+# ---- 데이터 원본 ----
+
+class ReportSource:
+    """최신 reports/amplitude_report_* (스냅샷 우선, 없으면 xlsx)"""
+
+    def signature(self):
+        try:
+            path = find_latest_report()
+        except FileNotFoundError:
+            return None
+        stat = path.stat()
+        return (str(path), stat.st_size, stat.st_mtime_ns)
+
+    def load(self, signature):
+        path = Path(signature[0])
+        return load_report_data(path), path.name
+
+
+class StoreSource:
+    """이벤트 저장소 - 주 파티션 목록이나 적재 목록(manifest)이 바뀌면 다시 집계
+
+    적재 작업이 같은 저장소를 쓰고 있을 수 있으므로 읽기 전용(--read-only)으로 집계한다
+    (큐브 / MRR 상태 파일은 읽기만 하고 새 주는 메모리에서만 반영).
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def signature(self):
+        manifest = self.root / "manifest.json"
+        if not manifest.exists():
+            return None
+        partitions = sorted(p.name for p in self.root.iterdir() if p.is_dir() and "-W" in p.name)
+        return (tuple(partitions), manifest.stat().st_mtime_ns)
+
+    def load(self, signature):
+        metrics = load_metrics(parse_args(["--store", str(self.root), "--read-only"]))
+        source = f"{self.root} ({len(signature[0])} partitions)"
+        return report_data_from_metrics(metrics, source=source), source
+
+
+class MetricsServer(ThreadingHTTPServer):
+    """현재 Snapshot 을 들고 있는 HTTP 서버 + 원본 변경 감시 스레드"""
+
+    daemon_threads = True
+
+    def __init__(self, address, source, interval=DEFAULT_INTERVAL):
+        super().__init__(address, MetricsHandler)
+        self.source = source
+        self.interval = interval
+        self.snapshot = None
+        self._stop = threading.Event()
+        self.reload()
+
+    def reload(self):
+        """원본이 바뀌었으면 새 Snapshot 으로 교체 -> 교체했는지 여부
+
+        요청 스레드는 self.snapshot 참조 하나만 읽으므로, 다 만든 뒤 참조를 바꾸면 잠금 없이 안전하다.
+        """
+        signature = self.source.signature()
+        if signature is None or (self.snapshot is not None and signature == self.snapshot.signature):
+            return False
+        data, name = self.source.load(signature)
+        self.snapshot = Snapshot(data, name, signature)
+        print(f"Loaded: {name} ({len(self.snapshot.responses)} endpoints)")
+        return True
+
+    def watch(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.reload()
+            except Exception as e:  # 원본을 쓰는 도중에 읽었을 수 있다 - 이전 데이터로 계속 응답하고 다음 주기에 재시도
+                print(f"Reload failed: {e}", file=sys.stderr)
+
+    def start_watcher(self):
+        thread = threading.Thread(target=self.watch, daemon=True)
+        thread.start()
+        return thread
+
+    def server_close(self):
+        self._stop.set()
+        super().server_close()
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    server_version = "MetricsServer/1.0"
+
+    def do_GET(self):
+        self._respond(head=False)
+
+    def do_HEAD(self):
+        self._respond(head=True)
+
+    def _respond(self, head):
+        snapshot = self.server.snapshot
+        if snapshot is None:
+            self._error(HTTPStatus.SERVICE_UNAVAILABLE, "No report data yet")
+            return
+        path = self.path.split("?", 1)[0].rstrip("/") or "/api"
+        response = snapshot.responses.get(path)
+        if response is None:
+            self._error(HTTPStatus.NOT_FOUND, f"Unknown endpoint: {path}")
+            return
+
+        if response.etag in [tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")]:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._common_headers(response)
+            self.end_headers()
+            return
+
+        body = response.body
+        use_gzip = response.gzipped is not None and "gzip" in self.headers.get("Accept-Encoding", "")
+        if use_gzip:
+            body = response.gzipped
+        self.send_response(HTTPStatus.OK)
+        self._common_headers(response)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _common_headers(self, response):
+        self.send_header("ETag", response.etag)
+        # 매번 재검증 (바뀌지 않았으면 304라 본문 전송 없음)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Access-Control-Allow-Origin", "*")
+
+    def _error(self, status, message):
+        body = json.dumps({"error": message}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # 폴링 요청마다 찍히면 시끄러우므로 오류 응답만 출력
+        if len(args) > 1 and str(args[1]).startswith(("4", "5")):
+            super().log_message(format, *args)
+
+
+def main():
+    host = "127.0.0.1"
+    port = DEFAULT_PORT
+    store = None
+    interval = DEFAULT_INTERVAL
+
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] == "--port" and i + 1 < len(sys.argv):
+            port = int(sys.argv[i + 1])
+            i += 1
+        elif sys.argv[i] == "--host" and i + 1 < len(sys.argv):
+            host = sys.argv[i + 1]
+            i += 1
+        elif sys.argv[i] == "--store" and i + 1 < len(sys.argv):
+            store = sys.argv[i + 1]
+            i += 1
+        elif sys.argv[i] == "--interval" and i + 1 < len(sys.argv):
+            interval = float(sys.argv[i + 1])
+            i += 1
+        i += 1
+
+    source = StoreSource(store) if store else ReportSource()
+    server = MetricsServer((host, port), source, interval=interval)
+    if server.snapshot is None:
+        print("No report data yet - waiting for a report / store partitions")
+    server.start_watcher()
+    print(f"Serving on http://{host}:{server.server_address[1]}/api")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""리포트 지표 묶음 바이너리 스냅샷 (.snap)
+
+generate_amplitude_report.py 가 리포트마다 옆에 저장하는 한 달치 데이터의 기준 형식이다.
+Excel / HTML 은 스냅샷을 읽어 그리는 쪽이고, 다시 읽을 때 openpyxl 이나 시트 위치 파싱이 필요 없다.
+
+파일 구성 (리틀 엔디언):
+    MAGIC (8바이트) | 헤더 길이 (uint32) | 헤더 JSON | 0 채움 (8바이트 정렬) | 컬럼 데이터
+    헤더: {"version", "meta", "crc32", "columns": {이름: [타입, 개수, 오프셋, 바이트 수]}}
+
+컬럼은 타입이 있는 배열 하나씩이고 8바이트 정렬로 이어 붙인다 (파일 한 번 읽고 memoryview.cast 로 바로 해석).
+    i1 / i2 / i4 / i8   정수 (값 범위에 맞는 가장 작은 폭)
+    f8                  실수 (리텐션 % 행)
+    date                일 ordinal (int32) - 주 / 일 날짜, 코호트 시작일
+    str                 UTF-8 - uint32 끝 오프셋 개수만큼 + 바이트
+
+지표 묶음 -> 컬럼 (SCHEMA):
+    시계열 (wau, nau, daily, revenue.weekly ...)  <섹션>.dates (date) + <섹션>.<키> (정수)
+    코호트 표 (retention, conversion)            header / overall_labels / overall_counts / overall_pct /
+                                                  segment / start / users / lengths / values (Week n 값을 이어 붙임)
+    단면 표 (segments)                            dates / columns / values (주 × 열 행 우선)
+
+쓸 때 모든 값을 스키마에 맞춰 검사하고 (정수 자리에 실수, 다시 만들면 달라지는 날짜 / % 표기 등은 ValueError),
+읽을 때 MAGIC / 버전 / CRC / 필수 섹션을 검사한다. 읽은 결과는 쓴 지표 묶음과 같다.
+"""
+
+import json
+import struct
+import sys
+import zlib
+from array import array
+from datetime import date, datetime
+from pathlib import Path
+
+from amplitude_ingest import format_cohort, format_percent
+
+MAGIC = b"AMPSNAP\x00"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = ".snap"
+
+ALIGN = 8
+
+SERIES = "series"
+COHORT_TABLE = "cohort_table"
+CUT_TABLE = "cut_table"
+
+# 지표 묶음 키 -> 인코딩 ("revenue.daily" 는 metrics["revenue"]["daily"])
+SCHEMA = {
+    "wau": SERIES,
+    "wau_by_region": SERIES,
+    "nau": SERIES,
+    "retention": COHORT_TABLE,
+    "daily": SERIES,
+    "conversion": COHORT_TABLE,
+    "segments": CUT_TABLE,
+    "revenue.daily": SERIES,
+    "revenue.weekly": SERIES,
+}
+REQUIRED_SECTIONS = ("wau", "wau_by_region", "nau", "retention")
+
+# 정수 폭 (array 타입 코드, 범위)
+INT_TYPES = (("i1", "b", 1 << 7), ("i2", "h", 1 << 15), ("i4", "i", 1 << 31), ("i8", "q", 1 << 63))
+TYPE_CODES = {name: code for name, code, _ in INT_TYPES}
+TYPE_CODES.update({"f8": "d", "date": "i"})
+
+COHORT_DATE_FORMAT = "%b %d, %Y"
+
+
+def snapshot_path(report_path):
+    """리포트(xlsx) 옆 스냅샷 경로"""
+    return Path(report_path).with_suffix(SNAPSHOT_SUFFIX)
+
+
+# ---- 인코딩 ----
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _int_column(name, values):
+    values = list(values)
+    for value in values:
+        if not _is_int(value):
+            raise ValueError(f"Snapshot column {name}: expected int, got {value!r}")
+    low, high = (min(values), max(values)) if values else (0, 0)
+    for type_name, code, limit in INT_TYPES:
+        if -limit <= low and high < limit:
+            return type_name, array(code, values)
+    raise ValueError(f"Snapshot column {name}: value out of int64 range")
+
+
+def _date_column(name, values, parse, format):
+    ordinals = []
+    for value in values:
+        value = str(value)
+        try:
+            d = parse(value)
+        except ValueError:
+            raise ValueError(f"Snapshot column {name}: not a date {value!r}") from None
+        # 다시 만들었을 때 같은 문자열이어야 왕복이 정확하다
+        if format(d) != value:
+            raise ValueError(f"Snapshot column {name}: non-canonical date {value!r}")
+        ordinals.append(d.toordinal())
+    return "date", array("i", ordinals)
+
+
+def _iso_dates(name, values):
+    return _date_column(name, values, date.fromisoformat, date.isoformat)
+
+
+def _cohort_dates(name, values):
+    return _date_column(
+        name, values, lambda s: datetime.strptime(s, COHORT_DATE_FORMAT).date(), lambda d: format_cohort(d.toordinal())
+    )
+
+
+def _str_column(name, values):
+    ends = array("I")
+    blob = bytearray()
+    for value in values:
+        if not isinstance(value, str):
+            raise ValueError(f"Snapshot column {name}: expected str, got {value!r}")
+        blob += value.encode("utf-8")
+        ends.append(len(blob))
+    return "str", (ends, bytes(blob))
+
+
+def _percent_column(name, values):
+    numbers = []
+    for value in values:
+        text = str(value)
+        try:
+            number = float(text.rstrip("%"))
+        except ValueError:
+            raise ValueError(f"Snapshot column {name}: not a percent {value!r}") from None
+        if not text.endswith("%") or format_percent(number) != text:
+            raise ValueError(f"Snapshot column {name}: non-canonical percent {value!r}")
+        numbers.append(number)
+    return "f8", array("d", numbers)
+
+
+def _encode_series(section, series):
+    columns = {}
+    for key, values in series.items():
+        name = f"{section}.{key}"
+        columns[name] = _iso_dates(name, values) if key == "dates" else _int_column(name, values)
+    return columns
+
+
+def _encode_cohort_table(section, table):
+    """RETENTION_DATA 형식 표 - 헤더 / Overall 2행(수, %) / 코호트 행(시작일, 사용자 수, Week n 값들)"""
+    header, rows = table[0], table[1:]
+    overall = [row for row in rows if len(row) > 1 and row[1] == "Overall"]
+    cohorts = rows[len(overall):]
+    if len(overall) not in (0, 2) or any(len(row) > 1 and row[1] == "Overall" for row in cohorts):
+        raise ValueError(f"Snapshot section {section}: expected Overall count / % rows before cohorts")
+
+    p = f"{section}."
+    columns = {p + "header": _str_column(p + "header", header)}
+    if overall:
+        counts, pct = overall
+        columns[p + "overall_labels"] = _str_column(p + "overall_labels", counts[:3] + pct[:3])
+        columns[p + "overall_counts"] = _int_column(p + "overall_counts", counts[3:])
+        columns[p + "overall_pct"] = _percent_column(p + "overall_pct", pct[3:])
+    columns[p + "segment"] = _str_column(p + "segment", [row[0] for row in cohorts])
+    columns[p + "start"] = _cohort_dates(p + "start", [row[1] for row in cohorts])
+    columns[p + "users"] = _int_column(p + "users", [row[2] for row in cohorts])
+    columns[p + "lengths"] = _int_column(p + "lengths", [len(row) - 3 for row in cohorts])
+    columns[p + "values"] = _int_column(p + "values", [v for row in cohorts for v in row[3:]])
+    return columns
+
+
+def _encode_cut_table(section, table):
+    p = f"{section}."
+    n_columns = len(table["columns"])
+    for row in table["rows"]:
+        if len(row) != n_columns + 1:
+            raise ValueError(f"Snapshot section {section}: row {row[:1]} has {len(row) - 1} values, "
+                             f"expected {n_columns}")
+    return {
+        p + "dates": _iso_dates(p + "dates", table["dates"]),
+        p + "columns": _str_column(p + "columns", table["columns"]),
+        p + "values": _int_column(p + "values", [v for row in table["rows"] for v in row[1:]]),
+    }
+
+
+ENCODERS = {SERIES: _encode_series, COHORT_TABLE: _encode_cohort_table, CUT_TABLE: _encode_cut_table}
+
+
+def _sections(metrics):
+    """지표 묶음 -> [(스키마 섹션 이름, 값)] (값이 없는 선택 섹션은 제외)"""
+    unknown = set(metrics) - {name.split(".")[0] for name in SCHEMA}
+    if unknown:
+        raise ValueError(f"Snapshot: unknown metrics {sorted(unknown)}")
+    for name in REQUIRED_SECTIONS:
+        if not metrics.get(name):
+            raise ValueError(f"Snapshot: missing required section {name}")
+    sections = []
+    for name in SCHEMA:
+        parent, _, child = name.partition(".")
+        value = metrics.get(parent)
+        if value and child:
+            value = value.get(child)
+        if value:
+            sections.append((name, value))
+    return sections
+
+
+def _little_endian(values):
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def write_snapshot(metrics, path, source=None):
+    """지표 묶음을 스냅샷 파일로 저장 (임시 파일에 쓰고 교체)"""
+    columns = {}
+    for name, value in _sections(metrics):
+        columns.update(ENCODERS[SCHEMA[name]](name, value))
+
+    directory = {}
+    blobs = []
+    offset = 0
+    for name, (type_name, values) in columns.items():
+        if type_name == "str":
+            ends, text = values
+            blob = _little_endian(ends) + text
+            count = len(ends)
+        else:
+            blob = _little_endian(values)
+            count = len(values)
+        directory[name] = [type_name, count, offset, len(blob)]
+        padding = -len(blob) % ALIGN
+        blobs.append(blob + b"\x00" * padding)
+        offset += len(blob) + padding
+    body = b"".join(blobs)
+
+    header = json.dumps({
+        "version": SNAPSHOT_VERSION,
+        "meta": {"source": source, "created": datetime.now().isoformat(timespec="seconds")},
+        "crc32": zlib.crc32(body),
+        "columns": directory,
+    }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    header += b" " * (-(len(MAGIC) + 4 + len(header)) % ALIGN)
+
+    path = Path(path)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(MAGIC + struct.pack("<I", len(header)) + header + body)
+    tmp.replace(path)
+    return path
+
+
+# ---- 디코딩 ----
+
+class Snapshot:
+    """스냅샷 파일 (한 번 읽고 컬럼은 필요할 때 해석)"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        buffer = self.path.read_bytes()
+        if buffer[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a report snapshot: {self.path}")
+        (header_len,) = struct.unpack_from("<I", buffer, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(buffer[start:start + header_len])
+        if header.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {header.get('version')} ({self.path})")
+        self.meta = header["meta"]
+        self.columns = header["columns"]
+        self._body = memoryview(buffer)[start + header_len:]
+        if zlib.crc32(self._body) != header["crc32"]:
+            raise ValueError(f"Snapshot checksum mismatch: {self.path}")
+        for name in REQUIRED_SECTIONS:
+            if f"{name}.dates" not in self.columns and f"{name}.header" not in self.columns:
+                raise ValueError(f"Snapshot missing required section {name}: {self.path}")
+
+    def column(self, name):
+        """컬럼 값 목록 (date 컬럼은 ordinal)"""
+        type_name, count, offset, size = self.columns[name]
+        raw = self._body[offset:offset + size]
+        if type_name == "str":
+            ends = self._numbers(raw[:4 * count], "I")
+            text = bytes(raw[4 * count:])
+            starts = [0] + ends[:-1]
+            return [text[s:e].decode("utf-8") for s, e in zip(starts, ends)]
+        return self._numbers(raw, TYPE_CODES[type_name])
+
+    @staticmethod
+    def _numbers(raw, code):
+        if sys.byteorder != "little":
+            values = array(code, bytes(raw))
+            values.byteswap()
+            return values.tolist()
+        return raw.cast(code).tolist()
+
+    def _dates(self, name, format=lambda d: date.fromordinal(d).isoformat()):
+        return [format(d) for d in self.column(name)]
+
+    def sections(self):
+        """파일에 들어 있는 스키마 섹션 이름 (SCHEMA 순서)"""
+        present = {name.rsplit(".", 1)[0] for name in self.columns}
+        return [name for name in SCHEMA if name in present]
+
+    def section(self, name):
+        kind = SCHEMA[name]
+        p = f"{name}."
+        if kind == SERIES:
+            keys = [column[len(p):] for column in self.columns if column.startswith(p)]
+            return {key: self._dates(p + key) if key == "dates" else self.column(p + key) for key in keys}
+        if kind == CUT_TABLE:
+            dates = self._dates(p + "dates")
+            columns = self.column(p + "columns")
+            values = self.column(p + "values")
+            width = len(columns)
+            rows = [[d] + values[i * width:(i + 1) * width] for i, d in enumerate(dates)]
+            return {"dates": dates, "columns": columns, "rows": rows}
+
+        table = [self.column(p + "header")]
+        if p + "overall_labels" in self.columns:
+            labels = self.column(p + "overall_labels")
+            table.append(labels[:3] + self.column(p + "overall_counts"))
+            table.append(labels[3:] + [format_percent(v) for v in self.column(p + "overall_pct")])
+        values = self.column(p + "values")
+        i = 0
+        for segment, start, users, length in zip(
+            self.column(p + "segment"), self.column(p + "start"), self.column(p + "users"), self.column(p + "lengths")
+        ):
+            table.append([segment, format_cohort(start), users] + values[i:i + length])
+            i += length
+        return table
+
+    def metrics(self, sections=None):
+        """지표 묶음 (sections 를 주면 그 섹션만 - 예: ("wau",))"""
+        metrics = {}
+        for name in self.sections():
+            if sections is not None and name.split(".")[0] not in sections:
+                continue
+            parent, _, child = name.partition(".")
+            if child:
+                metrics.setdefault(parent, {"daily": None, "weekly": None})[child] = self.section(name)
+            else:
+                metrics[name] = self.section(name)
+        return metrics
+
+
+def read_snapshot(path, sections=None):
+    """스냅샷 파일 -> 지표 묶음 (write_snapshot 에 넘긴 것과 같은 값)"""
+    return Snapshot(path).metrics(sections)
+
+
+def load_snapshots(paths, sections=None):
+    """여러 스냅샷 -> {파일 이름: 지표 묶음} (월별 추이 분석용, 필요한 섹션만 해석)"""
+    return {Path(path).name: read_snapshot(path, sections) for path in sorted(paths)}
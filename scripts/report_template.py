@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""HTML 리포트 템플릿 - 한 번 컴파일해 두고 재사용하는 간단한 치환 템플릿
+
+템플릿 파일(scripts/templates/)의 `{{ name }}` 자리만 값으로 바꾼다.
+CSS / JS 의 중괄호는 그대로 두면 되므로 f-string처럼 `{{` `}}` 로 이스케이프할 필요가 없다.
+컴파일(문자열 조각 / 이름 분리)은 템플릿마다 프로세스당 한 번만 하고,
+렌더링은 조각 목록을 한 번에 join 하므로 여러 리포트를 연달아 만들어도 비용이 출력 크기에 비례한다.
+"""
+
+import re
+from pathlib import Path
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+_PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+_compiled = {}
+
+
+class Template:
+    """컴파일된 템플릿 - 고정 문자열 조각과 치환 이름이 번갈아 있는 목록"""
+
+    def __init__(self, source, name="<string>"):
+        self.name = name
+        parts = _PLACEHOLDER.split(source)
+        self.literals = parts[0::2]
+        self.fields = parts[1::2]
+
+    def render(self, context):
+        """context의 값으로 치환한 문자열 (값은 str()로 변환, 누락 시 KeyError)"""
+        out = [self.literals[0]]
+        for field, literal in zip(self.fields, self.literals[1:]):
+            try:
+                out.append(str(context[field]))
+            except KeyError:
+                raise KeyError(f"Template {self.name!r} needs {field!r}") from None
+            out.append(literal)
+        return "".join(out)
+
+
+def get_template(name):
+    """templates/ 아래 템플릿을 읽어 컴파일 (프로세스당 한 번, 이후 캐시)"""
+    template = _compiled.get(name)
+    if template is None:
+        source = (TEMPLATES_DIR / name).read_text(encoding="utf-8")
+        template = _compiled[name] = Template(source, name)
+    return template
+
+
+def render(name, context):
+    return get_template(name).render(context)
+
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""리포트 외부 파일(Chart.js, Pretendard) 로컬 번들
+
+기본 리포트는 보는 시점에 jsDelivr에서 Chart.js와 Pretendard CSS/폰트를 받아 온다.
+오프라인 모드(generate_html_report.py --offline)는 아래 고정 버전 파일을 scripts/vendor/ 에서 읽어
+페이지에 넣거나(인라인) 공유 asset 파일로 저장하므로, 리포트를 열 때 네트워크 요청이 없다.
+
+폰트는 리포트에 실제로 쓰인 글자만 남기도록 서브셋한다 (fontTools + brotli 필요).
+전체 Pretendard 가변 폰트는 약 2 MB지만, 리포트 한 장에 쓰이는 수백 글자만 남기면 수십 KB로 줄어든다.
+
+받는 파일은 scripts/vendor.lock.json 에 고정한 SHA-256과 맞아야 저장하고, 로컬 vendor 파일도 읽을 때 다시 확인한다.
+온라인 리포트의 CDN <script> / <link> 에는 같은 잠금 파일의 SRI(integrity) 값을 붙인다.
+
+vendor 파일 받기 (한 번만, 받은 파일을 커밋해 두면 빌드 머신도 오프라인으로 동작):
+    python scripts/report_vendor.py [--force]
+버전을 올릴 때 (받은 파일을 검토한 뒤 해시를 새로 고정, vendor.lock.json 과 vendor/ 를 함께 커밋):
+    python scripts/report_vendor.py --pin
+"""
+
+import base64
+import hashlib
+import json
+import string
+import sys
+import urllib.request
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+
+VENDOR_DIR = Path(__file__).parent / "vendor"
+VENDOR_LOCK = Path(__file__).parent / "vendor.lock.json"
+
+CHART_JS_VERSION = "4.4.1"
+PRETENDARD_VERSION = "1.3.9"
+
+# 온라인(기본) 리포트도 같은 고정 버전을 쓴다
+CHART_JS_URL = f"https://cdn.jsdelivr.net/npm/chart.js@{CHART_JS_VERSION}/dist/chart.umd.min.js"
+PRETENDARD_CSS_URL = (
+    f"https://cdn.jsdelivr.net/gh/orioncactus/pretendard@v{PRETENDARD_VERSION}/dist/web/static/pretendard.min.css"
+)
+
+CHART_JS_FILE = "chart.umd.min.js"
+PRETENDARD_FILE = "PretendardVariable.woff2"
+PRETENDARD_CSS_FILE = "pretendard.min.css"
+
+VENDOR_FILES = {
+    CHART_JS_FILE: CHART_JS_URL,
+    PRETENDARD_CSS_FILE: PRETENDARD_CSS_URL,
+    PRETENDARD_FILE: (
+        f"https://cdn.jsdelivr.net/gh/orioncactus/pretendard@v{PRETENDARD_VERSION}"
+        "/dist/web/variable/woff2/PretendardVariable.woff2"
+    ),
+}
+
+# 오프라인 리포트가 페이지에 넣는 파일 (Pretendard CSS 는 온라인 CDN 태그에만 쓴다)
+OFFLINE_FILES = (CHART_JS_FILE, PRETENDARD_FILE)
+
+# 데이터에 따라 나올 수 있는 글자는 페이지에 없어도 항상 포함 (숫자 / 영문 / 기호)
+BASE_CHARS = string.printable.strip() + " ·–—…↑↓→←▲▼%"
+
+
+@lru_cache(maxsize=None)
+def vendor_lock():
+    """{파일 이름: {"url", "sha256", "integrity"}} (잠금 파일이 없으면 빈 dict)"""
+    try:
+        return json.loads(VENDOR_LOCK.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+
+
+def lock_entry(name, url, content):
+    return {
+        "url": url,
+        "sha256": hashlib.sha256(content).hexdigest(),
+        "integrity": "sha384-" + base64.b64encode(hashlib.sha384(content).digest()).decode("ascii"),
+    }
+
+
+def verify(name, content):
+    """content 가 잠금 파일의 해시와 같은지 확인 (다르거나 고정되지 않았으면 ValueError)"""
+    entry = vendor_lock().get(name)
+    if entry is None:
+        raise ValueError(f"{name} is not pinned in {VENDOR_LOCK.name} - review it and run: python scripts/report_vendor.py --pin")
+    digest = hashlib.sha256(content).hexdigest()
+    if digest != entry["sha256"]:
+        raise ValueError(f"{name}: SHA-256 mismatch (expected {entry['sha256']}, got {digest})")
+
+
+def fetch_vendor_files(force=False, pin=False):
+    """고정 버전 vendor 파일 다운로드 (이미 있으면 건너뜀)
+
+    받은 내용은 잠금 파일의 SHA-256과 맞을 때만 저장한다.
+    pin=True면 확인 대신 받은 파일의 해시를 잠금 파일에 새로 적는다 (버전을 올릴 때).
+
+    Returns:
+        새로 받은 파일 이름 목록
+    """
+    VENDOR_DIR.mkdir(exist_ok=True)
+    lock = dict(vendor_lock())
+    fetched = []
+    for name, url in VENDOR_FILES.items():
+        path = VENDOR_DIR / name
+        if path.exists() and not force and not pin:
+            continue
+        with urllib.request.urlopen(url) as response:
+            content = response.read()
+        if pin:
+            lock[name] = lock_entry(name, url, content)
+        else:
+            verify(name, content)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(content)
+        tmp.replace(path)
+        fetched.append(name)
+    if pin:
+        VENDOR_LOCK.write_text(json.dumps(lock, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        vendor_lock.cache_clear()
+    return fetched
+
+
+@lru_cache(maxsize=None)
+def vendor_path(name):
+    """로컬 vendor 파일 경로 (잠금 파일 해시 확인 후)"""
+    path = VENDOR_DIR / name
+    if not path.exists():
+        raise FileNotFoundError(f"{path} not found - run: python scripts/report_vendor.py")
+    verify(name, path.read_bytes())
+    return path
+
+
+def check_offline_files():
+    """오프라인 빌드에 필요한 vendor 파일 확인 -> 문제 메시지 목록 (준비됐으면 빈 리스트)
+
+    렌더링 도중 예외로 멈추는 대신 CLI 가 시작할 때 무엇을 해야 하는지 알려 주려고 쓴다.
+    """
+    problems = []
+    for name in OFFLINE_FILES:
+        try:
+            vendor_path(name)
+        except (FileNotFoundError, ValueError) as e:
+            problems.append(str(e))
+    return problems
+
+
+def cdn_tag(name, template):
+    """CDN <link> / <script> 태그 - 잠금 파일에 있으면 integrity(SRI) + crossorigin 을 붙인다"""
+    entry = vendor_lock().get(name)
+    attrs = f' integrity="{entry["integrity"]}" crossorigin="anonymous"' if entry else ""
+    return template.format(url=VENDOR_FILES[name], attrs=attrs)
+
+
+def cdn_block():
+    """온라인 리포트 <head> 의 Pretendard CSS / Chart.js 태그"""
+    return (
+        cdn_tag(PRETENDARD_CSS_FILE, '    <link rel="stylesheet" href="{url}"{attrs}>') + "\n"
+        + cdn_tag(CHART_JS_FILE, '    <script src="{url}"{attrs}></script>')
+    )
+
+
+@lru_cache(maxsize=None)
+def chart_js():
+    """Chart.js (minified) 소스"""
+    return vendor_path(CHART_JS_FILE).read_text(encoding="utf-8")
+
+
+def font_chars(text):
+    """서브셋에 남길 글자 (페이지 글자 + BASE_CHARS, 정렬된 문자열)"""
+    return "".join(sorted(set(text) | set(BASE_CHARS)))
+
+
+@lru_cache(maxsize=8)
+def subset_font(chars):
+    """Pretendard 가변 폰트에서 chars의 글리프만 남긴 woff2 바이트 (굵기 축은 유지)"""
+    try:
+        from fontTools import subset
+    except ImportError:
+        raise ImportError("Font subsetting needs fontTools and brotli: pip install fonttools brotli") from None
+
+    options = subset.Options()
+    options.flavor = "woff2"
+    options.layout_features = ["*"]
+    options.name_IDs = ["*"]
+    options.notdef_outline = True
+    font = subset.load_font(str(vendor_path(PRETENDARD_FILE)), options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text=chars)
+    subsetter.subset(font)
+    out = BytesIO()
+    subset.save_font(font, out, options)
+    return out.getvalue()
+
+
+def font_face_css(url):
+    """서브셋 폰트용 @font-face (report.css 의 'Pretendard' 이름 그대로)"""
+    return (
+        "        @font-face {\n"
+        "            font-family: 'Pretendard';\n"
+        f"            src: url({url}) format('woff2');\n"
+        "            font-weight: 45 920;\n"
+        "            font-display: swap;\n"
+        "        }\n"
+    )
+
+
+def font_data_url(font_bytes):
+    return "data:font/woff2;base64," + base64.b64encode(font_bytes).decode("ascii")
+
+
+def main():
+    force = "--force" in sys.argv[1:]
+    pin = "--pin" in sys.argv[1:]
+    fetched = fetch_vendor_files(force=force, pin=pin)
+    for name in fetched:
+        print(f"Fetched: {VENDOR_DIR / name}")
+    if pin:
+        print(f"Pinned: {VENDOR_LOCK}")
+    print(f"{len(fetched)} fetched, {len(VENDOR_FILES) - len(fetched)} already present")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Amplitude API 응답 디스크 캐시 (amplitude_fetch.py 앞단)
+
+키는 (네임스페이스, API 경로, 정규화한 쿼리 파라미터)의 해시다.
+네임스페이스는 API 주소 + API 키 해시라서 로컬 대역 서버(--base-url) 응답이나 다른 프로젝트 응답이
+실제 API 응답 자리에 섞이지 않는다. 파라미터는 이름순으로 정렬하고,
+세그먼트 / 이벤트 정의처럼 JSON 문자열인 값은 키 순서·공백과 상관없이 같은 키가 되도록 다시 직렬화한다.
+
+    닫힌 기간   쿼리 end 가 수집 중인 이번 주(KST) 이전 - 결과가 더 바뀌지 않으므로 만료 없음
+    진행 중     end 가 이번 주 안 (generate_html_report 의 exclude_last 로 빼는 주) - OPEN_TTL 초 뒤 만료
+
+엔트리는 파일 하나씩(<키>.json) 저장하고, 읽을 때마다 mtime을 갱신해 LRU 순서로 쓴다.
+전체 크기가 max_bytes 를 넘으면 가장 오래 안 쓴 엔트리부터 지운다.
+"""
+
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+from amplitude_ingest import current_week_start, week_start
+
+CACHE_VERSION = 2
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / "reports" / ".cache" / "api"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# 진행 중인 주가 들어간 응답 유지 시간 (초)
+OPEN_TTL = 3600
+
+
+def normalize_params(params):
+    """쿼리 파라미터 정규화 - 이름순, 값은 문자열 (JSON 값은 키 정렬 / 공백 없는 형태로)"""
+    normalized = {}
+    for name in sorted(params):
+        value = str(params[name])
+        if value[:1] in "[{":
+            try:
+                value = json.dumps(json.loads(value), sort_keys=True, separators=(",", ":"))
+            except ValueError:
+                pass
+        normalized[name] = value
+    return normalized
+
+
+def cache_namespace(base_url, api_key):
+    """API 주소 + 프로젝트(API 키)별 네임스페이스 (키 원문은 남기지 않는다)"""
+    return hashlib.sha256(f"{base_url.rstrip('/')}|{api_key}".encode("utf-8")).hexdigest()[:16]
+
+
+def cache_key(path, params, namespace=""):
+    key = json.dumps([CACHE_VERSION, namespace, path, normalize_params(params)], ensure_ascii=False)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _end_date(params):
+    """쿼리 end ('20260712' / '20260712T23') -> date (없으면 None)"""
+    end = params.get("end")
+    if not end:
+        return None
+    return datetime.strptime(str(end)[:8], "%Y%m%d").date()
+
+
+def is_closed(params, today_week=None):
+    """쿼리 기간이 모두 지난 주인지 (end 가 이번 주 월요일 이전)"""
+    end = _end_date(params)
+    if end is None:
+        return False
+    if today_week is None:
+        today_week = current_week_start()
+    return week_start(end) < today_week
+
+
+def is_closed_day(day, today_week=None):
+    """date 가 수집 중인 이번 주 이전인지"""
+    return is_closed({"end": day.strftime("%Y%m%d")}, today_week)
+
+
+class ResponseCache:
+    """디스크 JSON 응답 캐시 (닫힌 기간 영구 / 진행 중 TTL / 크기 상한 LRU)"""
+
+    def __init__(self, root=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, open_ttl=OPEN_TTL, namespace=""):
+        self.root = Path(root)
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self.open_ttl = open_ttl
+        self.hits = 0
+        self.misses = 0
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.total_bytes = sum(p.stat().st_size for p in self.root.glob("*.json"))
+
+    def _path(self, path, params):
+        return self.root / f"{cache_key(path, params, self.namespace)}.json"
+
+    def get(self, path, params):
+        """캐시된 응답 (없거나 만료됐으면 None)"""
+        file = self._path(path, params)
+        try:
+            entry = json.loads(file.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            self.misses += 1
+            return None
+        if entry["expires"] is not None and entry["expires"] < time.time():
+            self._remove(file)
+            self.misses += 1
+            return None
+        os.utime(file)  # LRU 순서
+        self.hits += 1
+        return entry["value"]
+
+    def put(self, path, params, value):
+        expires = None if is_closed(params) else time.time() + self.open_ttl
+        entry = {"namespace": self.namespace, "path": path, "params": normalize_params(params), "expires": expires, "value": value}
+        file = self._path(path, params)
+        body = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+        previous = file.stat().st_size if file.exists() else 0
+        tmp = file.with_suffix(".tmp")
+        tmp.write_bytes(body)
+        tmp.replace(file)
+        self.total_bytes += len(body) - previous
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def _remove(self, file):
+        try:
+            size = file.stat().st_size
+            file.unlink()
+        except FileNotFoundError:
+            return
+        self.total_bytes -= size
+
+    def evict(self):
+        """max_bytes 아래로 내려갈 때까지 가장 오래 안 쓴 엔트리부터 삭제 -> 지운 개수"""
+        files = sorted(self.root.glob("*.json"), key=lambda p: p.stat().st_mtime_ns)
+        removed = 0
+        for file in files:
+            if self.total_bytes <= self.max_bytes:
+                break
+            self._remove(file)
+            removed += 1
+        return removed
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""리포트 생성 단계별 시간 / 메모리 측정 (--profile)
+
+코드 곳곳에 `with stage("save"):` 처럼 단계 이름만 표시해 두고,
+--profile 로 켰을 때만 단계마다 경과 시간(wall), CPU 시간, 최대 할당 메모리(tracemalloc)를 기록한다.
+꺼져 있으면 stage()는 아무 일도 하지 않는다.
+
+단계는 중첩할 수 있고 ("html;chart_data"), 결과는
+    - JSON: 단계별 wall / cpu / 최대 메모리
+    - folded stacks: "html;chart_data 12345" (자기 시간, 마이크로초) - flamegraph.pl / speedscope 입력
+으로 저장한다.
+"""
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class StageProfiler:
+    """중첩 가능한 단계별 측정기"""
+
+    def __init__(self):
+        self.enabled = False
+        self.records = []
+        self._stack = []
+
+    def enable(self):
+        self.enabled = True
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+        # 부모 단계의 지금까지 최대치를 기록해 두고 이 단계 기준으로 최대치를 새로 잰다
+        if self._stack:
+            parent = self._stack[-1]
+            parent["peak"] = max(parent["peak"], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        frame = {
+            "path": ";".join([f["name"] for f in self._stack] + [name]),
+            "name": name,
+            "peak": 0,
+            "children_wall": 0.0,
+            "wall": time.perf_counter(),
+            "cpu": time.process_time(),
+        }
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - frame["wall"]
+            cpu = time.process_time() - frame["cpu"]
+            peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+            self._stack.pop()
+            if self._stack:
+                parent = self._stack[-1]
+                parent["peak"] = max(parent["peak"], peak)
+                parent["children_wall"] += wall
+            tracemalloc.reset_peak()
+            self.records.append({
+                "stage": frame["path"],
+                "wall_s": round(wall, 6),
+                "cpu_s": round(cpu, 6),
+                "self_wall_s": round(wall - frame["children_wall"], 6),
+                "peak_kb": peak // 1024,
+            })
+
+    def folded(self):
+        """flame graph 입력 (collapsed stacks) - 단계별 자기 시간(마이크로초)"""
+        lines = []
+        for record in self.records:
+            micros = round(record["self_wall_s"] * 1_000_000)
+            if micros > 0:
+                lines.append(f"{record['stage']} {micros}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, json_path, folded_path=None):
+        """측정 결과 저장 (시작 순서대로가 아니라 끝난 순서 = 자식 단계가 부모보다 먼저)"""
+        json_path = Path(json_path)
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        json_path.write_text(json.dumps({"stages": self.records}, indent=2), encoding="utf-8")
+        if folded_path is not None:
+            Path(folded_path).write_text(self.folded(), encoding="utf-8")
+
+    def summary(self):
+        """콘솔 출력용 표"""
+        out = [f"{'stage':<40} {'wall(s)':>9} {'cpu(s)':>9} {'peak(KB)':>10}"]
+        for record in self.records:
+            out.append(
+                f"{record['stage']:<40} {record['wall_s']:>9.3f} {record['cpu_s']:>9.3f} {record['peak_kb']:>10,}"
+            )
+        return "\n".join(out)
+
+
+# 프로세스 전체에서 하나를 공유한다 (단계 표시를 한 코드가 인자로 측정기를 넘겨받지 않아도 되도록)
+PROFILER = StageProfiler()
+stage = PROFILER.stage
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""멤버십 구독 상태 머신 - 이벤트 소싱 MRR 집계 (docs/membership-event-tracking-spec.md 4-4)
+
+Subscribe / Change Tier / Cancel 이벤트를 시각 순서대로 사용자별 구독 상태(티어, 월 금액)에 접어 넣고,
+상태가 바뀔 때 생기는 MRR 변화를 그날의 new / expansion / contraction / churned 로 나눠 쌓는다.
+
+    Subscribe    구독 중이 아니면 new (해지 후 재구독 포함), 이미 구독 중이면 금액 차이만큼 expansion / contraction
+    Change Tier  to_price - 이전 금액만큼 expansion / contraction (구독 기록이 없으면 to_price 로 new)
+    Cancel       구독 중이면 그 금액 전부 churned (스펙 2-5: 해지 확인 시점에 끝난 것으로 본다)
+
+금액은 이벤트의 price / to_price 를 그대로 쓴다 (티어 금액이 스펙 문서마다 다르고 바뀔 수 있어 하드코딩하지 않음).
+금액이 빠진 이벤트는 그 티어의 마지막으로 본 금액을 쓴다.
+
+상태(현재 구독자 {사용자 코드: [티어, 금액]}, 티어별 금액, 일별 결과, 마지막 반영일)는 JSON 파일로 저장하고,
+다음 실행에서는 마지막 반영일 이후 이벤트만 읽어 그 날들만 덧붙인다 (이력 재생 없음).
+사용자 코드는 이벤트 저장소(users.json) 인덱스라서 상태 파일은 저장소 폴더에 둔다 (SUBSCRIPTION_STATE_FILE).
+한 번 반영한 날은 닫힌 것으로 본다. 늦게 도착한 과거 이벤트를 반영하려면 상태 파일을 지우고 다시 만든다.
+"""
+
+import json
+from datetime import date
+from pathlib import Path
+
+from amplitude_ingest import REPORT_WEEKS, TIMEZONE_OFFSET, format_week, week_range, week_start
+from daily_metrics import DAILY_REPORT_DAYS
+
+STATE_VERSION = 1
+
+# 저장소 폴더 안 상태 파일 이름
+SUBSCRIPTION_STATE_FILE = "subscription_state.json"
+
+SUBSCRIBE_EVENT = "Action - Subscribe Membership"
+CHANGE_TIER_EVENT = "Action - Change Membership Tier"
+CANCEL_EVENT = "Action - Cancel Membership"
+
+# 일별 / 주별 행: MRR, 구독자 수는 그날(주) 마지막 시점 값, 나머지는 그날(주) 동안의 MRR 변화량 (원)
+ROW_KEYS = ("mrr", "subscribers", "new", "expansion", "contraction", "churned")
+MRR, SUBSCRIBERS, NEW, EXPANSION, CONTRACTION, CHURNED = range(len(ROW_KEYS))
+
+_STORE_COLUMNS = ("user", "time", "event_type", "tier", "price", "to_tier", "to_price")
+
+
+class SubscriptionState:
+    """디스크에 저장되는 구독 상태 + 일별 MRR 결과"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.last_day = None
+        self.subscribers = {}
+        self.tier_prices = {}
+        self.days = {}
+        if self.path.exists():
+            self._load()
+
+    def _load(self):
+        state = json.loads(self.path.read_text(encoding="utf-8"))
+        if state.get("version") != STATE_VERSION:
+            raise ValueError(f"Unsupported subscription state version: {state.get('version')} ({self.path})")
+        self.last_day = state["last_day"]
+        self.subscribers = {int(user): value for user, value in state["subscribers"].items()}
+        self.tier_prices = state["tier_prices"]
+        self.days = {int(day): row for day, row in state["days"].items()}
+
+    def save(self):
+        state = {
+            "version": STATE_VERSION,
+            "last_day": self.last_day,
+            "subscribers": self.subscribers,
+            "tier_prices": self.tier_prices,
+            "days": self.days,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        tmp.replace(self.path)
+
+    @property
+    def mrr(self):
+        return sum(price for _, price in self.subscribers.values())
+
+    # ---- 상태 전이 ----
+
+    def _price(self, tier, price):
+        """이벤트 금액 (없으면 그 티어의 마지막 금액, 그것도 없으면 0)"""
+        if price:
+            if tier is not None:
+                self.tier_prices[tier] = price
+            return price
+        return self.tier_prices.get(tier, 0)
+
+    def _set(self, user, tier, price, row):
+        """구독 시작 / 금액 변경 - 변화량을 row 에 더한다"""
+        current = self.subscribers.get(user)
+        if current is None:
+            row[NEW] += price
+        elif price > current[1]:
+            row[EXPANSION] += price - current[1]
+        else:
+            row[CONTRACTION] += current[1] - price
+        self.subscribers[user] = [tier, price]
+
+    def transition(self, user, event_type, row, tier=None, price=0, to_tier=None, to_price=0):
+        """이벤트 1건을 상태에 반영 (구독 이벤트가 아니면 무시)"""
+        if event_type == SUBSCRIBE_EVENT:
+            self._set(user, tier, self._price(tier, price), row)
+        elif event_type == CHANGE_TIER_EVENT:
+            self._set(user, to_tier, self._price(to_tier, to_price), row)
+        elif event_type == CANCEL_EVENT:
+            current = self.subscribers.pop(user, None)
+            if current is not None:
+                row[CHURNED] += current[1]
+
+    def _close_day(self, day, row):
+        row[MRR] = self.mrr
+        row[SUBSCRIBERS] = len(self.subscribers)
+        self.days[day] = row
+        self.last_day = day
+
+    # ---- 증분 반영 ----
+
+    def apply_store(self, store, end_day=None):
+        """마지막 반영일 다음 날부터 end_day 전날까지의 이벤트를 저장소에서 읽어 반영
+
+        마지막 반영일이 속한 주 파티션부터 읽으므로 비용은 새 날들의 이벤트 수에 비례한다.
+        이벤트가 없는 날도 (저장소의 마지막 이벤트 날까지) MRR을 그대로 이어 채운다.
+
+        Returns:
+            새로 반영한 날 목록
+        """
+        codes = {store.code("event_type", t): t for t in (SUBSCRIBE_EVENT, CHANGE_TIER_EVENT, CANCEL_EVENT)}
+        codes.pop(None, None)
+        if not codes and self.last_day is None:
+            # 구독 이벤트가 한 번도 없는 저장소 - 0으로 채운 MRR 행을 만들지 않는다
+            return []
+        decode = store.decode
+        offset = int(TIMEZONE_OFFSET.total_seconds())
+        epoch = date(1970, 1, 1).toordinal()
+        start_week = None if self.last_day is None else week_start(date.fromordinal(self.last_day + 1))
+        end_week = None if end_day is None else week_start(date.fromordinal(end_day - 1)) + 7
+
+        events = []
+        last_seen = None
+        for _, cols in store.scan(_STORE_COLUMNS, start_week, end_week):
+            for i, (user, t, event_type) in enumerate(zip(cols["user"], cols["time"], cols["event_type"])):
+                day = epoch + (t + offset) // 86400
+                if (self.last_day is not None and day <= self.last_day) or (end_day is not None and day >= end_day):
+                    continue
+                last_seen = day if last_seen is None else max(last_seen, day)
+                if event_type in codes:
+                    events.append((t, day, user, codes[event_type], decode("tier", cols["tier"][i]),
+                                   cols["price"][i], decode("to_tier", cols["to_tier"][i]), cols["to_price"][i]))
+        if last_seen is None:
+            return []
+        events.sort(key=lambda e: e[0])
+
+        applied = []
+        day = (min(e[1] for e in events) if events else last_seen) if self.last_day is None else self.last_day + 1
+        i = 0
+        while day <= last_seen:
+            row = [0] * len(ROW_KEYS)
+            while i < len(events) and events[i][1] == day:
+                _, _, user, event_type, tier, price, to_tier, to_price = events[i]
+                self.transition(user, event_type, row, tier, price, to_tier, to_price)
+                i += 1
+            self._close_day(day, row)
+            applied.append(day)
+            day += 1
+        return applied
+
+    # ---- 조회 ----
+
+    def _report_days(self, end_day=None):
+        """반영된 날 오름차순 (end_day 가 있으면 그 전날까지)
+
+        상태는 한 번 반영한 날을 계속 갖고 있으므로, 나중 날까지 반영된 상태로 이전 기간(--until)을
+        리포트할 때도 end_day 이후 날은 빼고 보여 준다.
+        """
+        return [d for d in sorted(self.days) if end_day is None or d < end_day]
+
+    def daily_data(self, report_days=DAILY_REPORT_DAYS, end_day=None):
+        """end_day 전날까지 최근 report_days일 일별 MRR / 구독자 수 / MRR 변화량 (데이터가 없으면 None)"""
+        days = self._report_days(end_day)
+        if not days:
+            return None
+        days = [d for d in days if d > days[-1] - report_days]
+        data = {"dates": [date.fromordinal(d).isoformat() for d in days]}
+        for j, key in enumerate(ROW_KEYS):
+            data[key] = [self.days[d][j] for d in days]
+        return data
+
+    def weekly_data(self, report_weeks=REPORT_WEEKS, end_day=None):
+        """주별 - MRR / 구독자 수는 그 주 마지막 날 값, 변화량은 그 주 합계 (end_day 전날까지, 데이터가 없으면 None)"""
+        days = self._report_days(end_day)
+        if not days:
+            return None
+        included = set(days)
+        weeks = week_range(week_start(date.fromordinal(days[0])), week_start(date.fromordinal(days[-1])), report_weeks)
+        data = {"dates": [format_week(w) for w in weeks]}
+        data.update({key: [] for key in ROW_KEYS})
+        for w in weeks:
+            rows = [self.days[d] for d in range(w, w + 7) if d in included]
+            last = rows[-1] if rows else [0] * len(ROW_KEYS)
+            data["mrr"].append(last[MRR])
+            data["subscribers"].append(last[SUBSCRIBERS])
+            for j in (NEW, EXPANSION, CONTRACTION, CHURNED):
+                data[ROW_KEYS[j]].append(sum(row[j] for row in rows))
+        return data
+
+    def report_data(self, end_day=None):
+        """지표 묶음에 넣을 {"daily", "weekly"} (end_day 전날까지, 데이터가 없으면 None)"""
+        if not self._report_days(end_day):
+            return None
+        return {"daily": self.daily_data(end_day=end_day), "weekly": self.weekly_data(end_day=end_day)}
+
+def net_new(data):
+    """new + expansion - contraction - churned (= MRR 변화) 목록"""
+    return [n + e - c - ch for n, e, c, ch in zip(data["new"], data["expansion"], data["contraction"], data["churned"])]
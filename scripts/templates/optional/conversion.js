@@ -0,0 +1,58 @@
+        // 코호트별 멤버십 누적 전환 곡선 (이벤트 저장소로 집계한 리포트에만 있음)
+        // 리텐션 곡선과 같이 관측 코호트 수가 적은 꼬리 구간은 점선으로 구분
+        if (REPORT_DATA.conversion) {
+            const conversion = REPORT_DATA.conversion;
+            const lowCoverage = i => conversion.coverage[i] !== undefined && conversion.coverage[i] < RET_LOW_COVERAGE;
+            new Chart(document.getElementById('conversionCurveChart'), {
+                type: 'line',
+                data: {
+                    labels: conversion.labels,
+                    datasets: [{
+                        label: '누적 전환 %',
+                        data: conversion.values,
+                        borderColor: '#00d4aa',
+                        backgroundColor: 'rgba(0, 212, 170, 0.05)',
+                        fill: true,
+                        tension: 0.4,
+                        borderWidth: 2,
+                        segment: {
+                            borderDash: ctx => lowCoverage(ctx.p1DataIndex) ? [5, 6] : undefined,
+                            borderColor: ctx => lowCoverage(ctx.p1DataIndex) ? 'rgba(0, 212, 170, 0.35)' : undefined
+                        },
+                        pointBackgroundColor: ctx => lowCoverage(ctx.dataIndex) ? '#0a0a0a' : '#00d4aa',
+                        pointBorderColor: ctx => lowCoverage(ctx.dataIndex) ? 'rgba(0, 212, 170, 0.45)' : '#0a0a0a',
+                        pointBorderWidth: 2,
+                        pointRadius: 4,
+                        pointHoverRadius: 7
+                    }]
+                },
+                options: {
+                    responsive: true,
+                    maintainAspectRatio: false,
+                    interaction: { intersect: false, mode: 'index' },
+                    plugins: {
+                        legend: { display: false },
+                        tooltip: {
+                            backgroundColor: '#1a1a1a',
+                            titleColor: '#ffffff',
+                            bodyColor: '#a0a0a0',
+                            borderColor: '#333333',
+                            borderWidth: 1,
+                            cornerRadius: 8,
+                            padding: 12,
+                            callbacks: {
+                                label: context => context.parsed.y + '% · 관측 코호트 ' + conversion.coverage[context.dataIndex] + '개'
+                            }
+                        }
+                    },
+                    scales: {
+                        x: { grid: { color: '#1a1a1a' } },
+                        y: {
+                            beginAtZero: true,
+                            grid: { color: '#1a1a1a' },
+                            ticks: { callback: value => value + '%' }
+                        }
+                    }
+                }
+            });
+        }
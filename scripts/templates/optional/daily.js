@@ -0,0 +1,111 @@
+        // 일간 활성 지표 (원본 이벤트로 집계한 리포트에만 있음)
+        if (REPORT_DATA.daily) {
+            const daily = REPORT_DATA.daily;
+            const dailyTooltip = {
+                backgroundColor: '#1a1a1a',
+                titleColor: '#ffffff',
+                bodyColor: '#a0a0a0',
+                borderColor: '#333333',
+                borderWidth: 1,
+                cornerRadius: 8,
+                padding: 12
+            };
+            const dailyScales = (suffix) => ({
+                x: {
+                    grid: { color: '#1a1a1a' },
+                    ticks: { maxRotation: 45, autoSkip: true, maxTicksLimit: 14, font: { size: 11 } }
+                },
+                y: {
+                    beginAtZero: true,
+                    grid: { color: '#1a1a1a' },
+                    ticks: { font: { size: 11 }, callback: value => value.toLocaleString() + suffix }
+                }
+            });
+            const dailyLine = (label, data, color, dashed) => ({
+                label: label,
+                data: data,
+                borderColor: color,
+                backgroundColor: 'transparent',
+                borderDash: dashed ? [6, 4] : [],
+                tension: 0.3,
+                borderWidth: 2,
+                pointRadius: 0,
+                pointHoverRadius: 5
+            });
+
+            // DAU / 최근 7일 / 28일 활성
+            new Chart(document.getElementById('dailyActiveChart'), {
+                type: 'line',
+                data: {
+                    labels: daily.labels,
+                    datasets: [
+                        dailyLine('DAU', daily.dau, '#ffffff', false),
+                        dailyLine('최근 7일 활성', daily.active7d, '#00d4aa', false),
+                        dailyLine('최근 28일 활성', daily.active28d, '#a0a0a0', true)
+                    ]
+                },
+                options: {
+                    responsive: true,
+                    maintainAspectRatio: false,
+                    interaction: { intersect: false, mode: 'index' },
+                    plugins: {
+                        legend: { display: true, labels: { color: '#a0a0a0', font: { size: 12 } } },
+                        tooltip: dailyTooltip
+                    },
+                    scales: dailyScales('')
+                }
+            });
+
+            // Stickiness (DAU / 7일, DAU / 28일)
+            new Chart(document.getElementById('stickinessChart'), {
+                type: 'line',
+                data: {
+                    labels: daily.labels,
+                    datasets: [
+                        dailyLine('DAU / 7일 활성 (%)', daily.stickiness7d, '#00d4aa', false),
+                        dailyLine('DAU / 28일 활성 (%)', daily.stickiness28d, '#a0a0a0', true)
+                    ]
+                },
+                options: {
+                    responsive: true,
+                    maintainAspectRatio: false,
+                    interaction: { intersect: false, mode: 'index' },
+                    plugins: {
+                        legend: { display: true, labels: { color: '#a0a0a0', font: { size: 12 } } },
+                        tooltip: dailyTooltip
+                    },
+                    scales: dailyScales('%')
+                }
+            });
+
+            // L7 / L28 - 최근 7일 / 28일 중 활동일 수별 사용자 수
+            new Chart(document.getElementById('daysActiveChart'), {
+                type: 'bar',
+                data: {
+                    labels: daily.l28.map((_, i) => (i + 1) + '일'),
+                    datasets: [
+                        {
+                            label: 'L7 (최근 7일 중 활동일)',
+                            data: daily.l7,
+                            backgroundColor: 'rgba(0, 212, 170, 0.7)',
+                            borderRadius: 4
+                        },
+                        {
+                            label: 'L28 (최근 28일 중 활동일)',
+                            data: daily.l28,
+                            backgroundColor: 'rgba(160, 160, 160, 0.5)',
+                            borderRadius: 4
+                        }
+                    ]
+                },
+                options: {
+                    responsive: true,
+                    maintainAspectRatio: false,
+                    plugins: {
+                        legend: { display: true, labels: { color: '#a0a0a0', font: { size: 12 } } },
+                        tooltip: dailyTooltip
+                    },
+                    scales: dailyScales('')
+                }
+            });
+        }
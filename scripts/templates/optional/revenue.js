@@ -0,0 +1,108 @@
+        // 멤버십 MRR (이벤트 저장소로 집계한 리포트에만 있음) - 일별 데이터가 있으면 MRR 선은 일별로
+        if (REPORT_DATA.revenue) {
+            const revenue = REPORT_DATA.revenue;
+            const mrrSeries = revenue.daily || revenue.weekly;
+            const won = value => value.toLocaleString() + '원';
+            const revenueTooltip = {
+                backgroundColor: '#1a1a1a',
+                titleColor: '#ffffff',
+                bodyColor: '#a0a0a0',
+                borderColor: '#333333',
+                borderWidth: 1,
+                cornerRadius: 8,
+                padding: 12,
+                callbacks: {
+                    label: context => context.dataset.label + ': ' + (context.dataset.yAxisID === 'y1'
+                        ? context.parsed.y.toLocaleString() + '명' : won(context.parsed.y))
+                }
+            };
+
+            // MRR + 구독자 수
+            new Chart(document.getElementById('mrrChart'), {
+                type: 'line',
+                data: {
+                    labels: mrrSeries.labels,
+                    datasets: [
+                        {
+                            label: 'MRR',
+                            data: mrrSeries.mrr,
+                            borderColor: '#00d4aa',
+                            backgroundColor: 'rgba(0, 212, 170, 0.05)',
+                            fill: true,
+                            tension: 0.3,
+                            borderWidth: 2,
+                            pointRadius: 0,
+                            pointHoverRadius: 5,
+                            yAxisID: 'y'
+                        },
+                        {
+                            label: '구독자',
+                            data: mrrSeries.subscribers,
+                            borderColor: '#a0a0a0',
+                            backgroundColor: 'transparent',
+                            borderDash: [6, 4],
+                            tension: 0.3,
+                            borderWidth: 2,
+                            pointRadius: 0,
+                            pointHoverRadius: 5,
+                            yAxisID: 'y1'
+                        }
+                    ]
+                },
+                options: {
+                    responsive: true,
+                    maintainAspectRatio: false,
+                    interaction: { intersect: false, mode: 'index' },
+                    plugins: {
+                        legend: { display: true, labels: { color: '#a0a0a0', font: { size: 12 } } },
+                        tooltip: revenueTooltip
+                    },
+                    scales: {
+                        x: {
+                            grid: { color: '#1a1a1a' },
+                            ticks: { maxRotation: 45, autoSkip: true, maxTicksLimit: 14, font: { size: 11 } }
+                        },
+                        y: {
+                            beginAtZero: true,
+                            grid: { color: '#1a1a1a' },
+                            ticks: { font: { size: 11 }, callback: won }
+                        },
+                        y1: {
+                            beginAtZero: true,
+                            position: 'right',
+                            grid: { display: false },
+                            ticks: { font: { size: 11 }, callback: value => value.toLocaleString() + '명' }
+                        }
+                    }
+                }
+            });
+
+            // 주별 MRR 변화 (new / expansion 은 위로, contraction / churned 는 아래로 쌓는다)
+            const weekly = revenue.weekly;
+            const movement = (label, data, color) => ({ label: label, data: data, backgroundColor: color, borderRadius: 4 });
+            new Chart(document.getElementById('mrrMovementChart'), {
+                type: 'bar',
+                data: {
+                    labels: weekly.labels,
+                    datasets: [
+                        movement('New', weekly.new, 'rgba(0, 212, 170, 0.8)'),
+                        movement('Expansion', weekly.expansion, 'rgba(0, 212, 170, 0.4)'),
+                        movement('Contraction', weekly.contraction, 'rgba(255, 107, 107, 0.4)'),
+                        movement('Churned', weekly.churned, 'rgba(255, 107, 107, 0.8)')
+                    ]
+                },
+                options: {
+                    responsive: true,
+                    maintainAspectRatio: false,
+                    interaction: { intersect: false, mode: 'index' },
+                    plugins: {
+                        legend: { display: true, labels: { color: '#a0a0a0', font: { size: 12 } } },
+                        tooltip: revenueTooltip
+                    },
+                    scales: {
+                        x: { stacked: true, grid: { color: '#1a1a1a' } },
+                        y: { stacked: true, grid: { color: '#1a1a1a' }, ticks: { font: { size: 11 }, callback: won } }
+                    }
+                }
+            });
+        }
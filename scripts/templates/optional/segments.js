@@ -0,0 +1,48 @@
+        // WAU 단면 (이벤트 저장소 큐브로 집계한 리포트에만 있음) - 단면마다 묶음별 멀티라인
+        if (REPORT_DATA.segments) {
+            const SEGMENT_COLORS = ['#00d4aa', '#ffffff', '#a0a0a0', '#ff6b6b', '#6b8afd', '#ffc857'];
+            REPORT_DATA.segments.forEach((cut, i) => {
+                new Chart(document.getElementById('segmentChart' + i), {
+                    type: 'line',
+                    data: {
+                        labels: cut.labels,
+                        datasets: cut.series.map((series, j) => ({
+                            label: series.label,
+                            data: series.values,
+                            borderColor: SEGMENT_COLORS[j % SEGMENT_COLORS.length],
+                            backgroundColor: 'transparent',
+                            tension: 0.3,
+                            borderWidth: 2,
+                            pointRadius: 0,
+                            pointHoverRadius: 5
+                        }))
+                    },
+                    options: {
+                        responsive: true,
+                        maintainAspectRatio: false,
+                        interaction: { intersect: false, mode: 'index' },
+                        plugins: {
+                            title: { display: true, text: cut.name, color: '#a0a0a0', font: { size: 13 } },
+                            legend: { display: true, labels: { color: '#a0a0a0', font: { size: 12 } } },
+                            tooltip: {
+                                backgroundColor: '#1a1a1a',
+                                titleColor: '#ffffff',
+                                bodyColor: '#a0a0a0',
+                                borderColor: '#333333',
+                                borderWidth: 1,
+                                cornerRadius: 8,
+                                padding: 12
+                            }
+                        },
+                        scales: {
+                            x: { grid: { color: '#1a1a1a' }, ticks: { font: { size: 11 } } },
+                            y: {
+                                beginAtZero: true,
+                                grid: { color: '#1a1a1a' },
+                                ticks: { font: { size: 11 }, callback: value => value.toLocaleString() }
+                            }
+                        }
+                    }
+                });
+            });
+        }
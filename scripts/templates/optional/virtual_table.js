@@ -0,0 +1,87 @@
+        // 전체 기간 리텐션 테이블 - 보이는 행/열 칸만 그리고, 히트맵 색도 그릴 때 계산
+        function createVirtualRetentionTable(container, table) {
+            const ROW_HEIGHT = 40;
+            const OVERSCAN = 4;
+            const colWidths = table.headers.map((h, i) => i === 0 ? 110 : i === 1 ? 130 : 84);
+            const colLefts = [0];
+            colWidths.forEach(w => colLefts.push(colLefts[colLefts.length - 1] + w));
+            const frozenCols = 2;  // Segment, Start Date 는 가로 스크롤해도 고정
+            const frozenWidth = colLefts[frozenCols];
+
+            const sizer = document.createElement('div');
+            sizer.className = 'virtual-sizer';
+            sizer.style.width = colLefts[colLefts.length - 1] + 'px';
+            sizer.style.height = (table.rows.length + 1) * ROW_HEIGHT + 'px';
+            container.appendChild(sizer);
+
+            function cellValue(value) {
+                if (value === null) return '';
+                return typeof value === 'number' ? value.toLocaleString() : String(value);
+            }
+
+            // Week 0 대비 비율 (퍼센트 행은 값 그대로)
+            function heatColor(row, col) {
+                const value = row[col];
+                let pct = null;
+                if (typeof value === 'number' && typeof row[3] === 'number' && row[3] > 0) {
+                    pct = value / row[3] * 100;
+                } else if (typeof value === 'string' && value.endsWith('%')) {
+                    pct = parseFloat(value);
+                }
+                if (pct === null || isNaN(pct)) return '';
+                const alpha = Math.min(pct, 100) / 100 * 0.55 + 0.04;
+                return 'background: rgba(0, 212, 170, ' + alpha.toFixed(3) + ');';
+            }
+
+            function cell(text, top, col, left, extraClass, style) {
+                return '<div class="virtual-cell' + extraClass + '" style="top:' + top + 'px;left:' + left +
+                    'px;width:' + colWidths[col] + 'px;height:' + ROW_HEIGHT + 'px;' + style + '">' + text + '</div>';
+            }
+
+            let pending = false;
+            function renderVisible() {
+                pending = false;
+                const width = container.clientWidth, height = container.clientHeight;
+                if (!width || !height) return;
+                const top = container.scrollTop, left = container.scrollLeft;
+                const r0 = Math.max(0, Math.floor(top / ROW_HEIGHT) - OVERSCAN);
+                const r1 = Math.min(table.rows.length, Math.ceil((top + height) / ROW_HEIGHT) + OVERSCAN);
+                let c0 = frozenCols;
+                while (c0 < colWidths.length && colLefts[c0 + 1] <= left + frozenWidth) c0++;
+                let c1 = c0;
+                while (c1 < colWidths.length && colLefts[c1] < left + width) c1++;
+
+                const html = [];
+                for (let r = r0; r < r1; r++) {
+                    const row = table.rows[r];
+                    const y = (r + 1) * ROW_HEIGHT;
+                    for (let c = c0; c < c1; c++) {
+                        const style = c >= 3 ? heatColor(row, c) : '';
+                        html.push(cell(cellValue(row[c]), y, c, colLefts[c], c >= 3 ? ' retention-cell' : '', style));
+                    }
+                    for (let c = 0; c < frozenCols; c++) {
+                        html.push(cell(cellValue(row[c]), y, c, left + colLefts[c], ' frozen', ''));
+                    }
+                }
+                for (let c = c0; c < c1; c++) {
+                    html.push(cell(table.headers[c], top, c, colLefts[c], ' header', ''));
+                }
+                for (let c = 0; c < frozenCols; c++) {
+                    html.push(cell(table.headers[c], top, c, left + colLefts[c], ' header frozen', ''));
+                }
+                sizer.innerHTML = html.join('');
+            }
+
+            container.renderVisible = renderVisible;
+            container.addEventListener('scroll', () => {
+                if (!pending) {
+                    pending = true;
+                    requestAnimationFrame(renderVisible);
+                }
+            });
+            renderVisible();
+        }
+
+        if (REPORT_DATA.retentionTable) {
+            createVirtualRetentionTable(document.getElementById('retentionTable'), REPORT_DATA.retentionTable);
+        }
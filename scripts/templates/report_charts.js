@@ -0,0 +1,451 @@
+        // 접기/펼치기 토글
+        function toggleCollapsible(btn) {
+            const content = btn.nextElementSibling;
+            content.classList.toggle('active');
+            // 접혀 있을 때는 크기가 0이라 그리지 못한 가상 테이블을 펼친 뒤 그린다
+            content.querySelectorAll('.virtual-table').forEach(el => el.renderVisible && el.renderVisible());
+        }
+
+        // Chart.js 다크 테마 설정
+        Chart.defaults.color = '#666666';
+        Chart.defaults.borderColor = '#222222';
+        Chart.defaults.font.family = "'Pretendard', sans-serif";
+
+        // WAU 차트
+        new Chart(document.getElementById('wauChart'), {
+            type: 'line',
+            data: {
+                labels: REPORT_DATA.wauLabels,
+                datasets: [{
+                    label: 'WAU',
+                    data: REPORT_DATA.wauValues,
+                    borderColor: '#ffffff',
+                    backgroundColor: 'rgba(255, 255, 255, 0.05)',
+                    fill: true,
+                    tension: 0.4,
+                    borderWidth: 2,
+                    pointBackgroundColor: '#ffffff',
+                    pointBorderColor: '#0a0a0a',
+                    pointBorderWidth: 2,
+                    pointRadius: 0,
+                    pointHoverRadius: 6
+                }]
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                interaction: {
+                    intersect: false,
+                    mode: 'index'
+                },
+                plugins: {
+                    legend: { display: false },
+                    tooltip: {
+                        backgroundColor: '#1a1a1a',
+                        titleColor: '#ffffff',
+                        bodyColor: '#a0a0a0',
+                        borderColor: '#333333',
+                        borderWidth: 1,
+                        cornerRadius: 8,
+                        padding: 12
+                    }
+                },
+                scales: {
+                    x: {
+                        grid: { color: '#1a1a1a' },
+                        ticks: { maxRotation: 45, font: { size: 11 } }
+                    },
+                    y: {
+                        beginAtZero: true,
+                        grid: { color: '#1a1a1a' },
+                        ticks: { font: { size: 11 } }
+                    }
+                }
+            }
+        });
+
+        // 지역별 WAU (WAU by Region 시트가 있는 리포트에만 있음)
+        if (REPORT_DATA.regionLabels.length) {
+            // WAU 지역별 차트 (한국 vs 한국 외) - 듀얼 Y축 (한국 외는 우측 축)
+            new Chart(document.getElementById('wauRegionChart'), {
+                type: 'line',
+                data: {
+                    labels: REPORT_DATA.regionLabels,
+                    datasets: [
+                        {
+                            label: '한국',
+                            data: REPORT_DATA.regionKorea,
+                            borderColor: '#ffffff',
+                            backgroundColor: 'rgba(255, 255, 255, 0.05)',
+                            fill: false,
+                            tension: 0.4,
+                            borderWidth: 2,
+                            pointBackgroundColor: '#ffffff',
+                            pointBorderColor: '#0a0a0a',
+                            pointBorderWidth: 2,
+                            pointRadius: 3,
+                            pointHoverRadius: 6,
+                            yAxisID: 'y'
+                        },
+                        {
+                            label: '한국 외',
+                            data: REPORT_DATA.regionNonKorea,
+                            borderColor: '#00d4aa',
+                            backgroundColor: 'rgba(0, 212, 170, 0.1)',
+                            fill: false,
+                            tension: 0.4,
+                            borderWidth: 2,
+                            borderDash: [4, 4],
+                            pointBackgroundColor: '#00d4aa',
+                            pointBorderColor: '#0a0a0a',
+                            pointBorderWidth: 2,
+                            pointRadius: 3,
+                            pointHoverRadius: 6,
+                            yAxisID: 'y1'
+                        }
+                    ]
+                },
+                options: {
+                    responsive: true,
+                    maintainAspectRatio: false,
+                    interaction: { intersect: false, mode: 'index' },
+                    plugins: {
+                        legend: {
+                            display: true,
+                            labels: { color: '#a0a0a0', font: { size: 12 } }
+                        },
+                        tooltip: {
+                            backgroundColor: '#1a1a1a',
+                            titleColor: '#ffffff',
+                            bodyColor: '#a0a0a0',
+                            borderColor: '#333333',
+                            borderWidth: 1,
+                            cornerRadius: 8,
+                            padding: 12
+                        }
+                    },
+                    scales: {
+                        x: {
+                            grid: { color: '#1a1a1a' },
+                            ticks: { maxRotation: 45, font: { size: 11 } }
+                        },
+                        y: {
+                            type: 'linear',
+                            position: 'left',
+                            beginAtZero: true,
+                            grid: { color: '#1a1a1a' },
+                            ticks: { font: { size: 11 }, color: '#ffffff' },
+                            title: { display: true, text: '한국 (명)', color: '#ffffff', font: { size: 11 } }
+                        },
+                        y1: {
+                            type: 'linear',
+                            position: 'right',
+                            beginAtZero: true,
+                            grid: { drawOnChartArea: false },
+                            ticks: { font: { size: 11 }, color: '#00d4aa' },
+                            title: { display: true, text: '한국 외 (명)', color: '#00d4aa', font: { size: 11 } }
+                        }
+                    }
+                }
+            });
+
+            // WAU 한국 외 비중 추이
+            new Chart(document.getElementById('wauRegionShareChart'), {
+                type: 'line',
+                data: {
+                    labels: REPORT_DATA.regionLabels,
+                    datasets: [{
+                        label: '한국 외 비중 (%)',
+                        data: REPORT_DATA.regionNonKoreaShare,
+                        borderColor: '#00d4aa',
+                        backgroundColor: 'rgba(0, 212, 170, 0.08)',
+                        fill: true,
+                        tension: 0.4,
+                        borderWidth: 2,
+                        pointBackgroundColor: '#00d4aa',
+                        pointBorderColor: '#0a0a0a',
+                        pointBorderWidth: 2,
+                        pointRadius: 3,
+                        pointHoverRadius: 6
+                    }]
+                },
+                options: {
+                    responsive: true,
+                    maintainAspectRatio: false,
+                    interaction: { intersect: false, mode: 'index' },
+                    plugins: {
+                        legend: { display: false },
+                        tooltip: {
+                            backgroundColor: '#1a1a1a',
+                            titleColor: '#ffffff',
+                            bodyColor: '#a0a0a0',
+                            borderColor: '#333333',
+                            borderWidth: 1,
+                            cornerRadius: 8,
+                            padding: 12,
+                            callbacks: {
+                                label: function(context) { return context.parsed.y.toFixed(2) + '%'; }
+                            }
+                        }
+                    },
+                    scales: {
+                        x: {
+                            grid: { color: '#1a1a1a' },
+                            ticks: { maxRotation: 45, font: { size: 11 } }
+                        },
+                        y: {
+                            beginAtZero: true,
+                            grid: { color: '#1a1a1a' },
+                            ticks: {
+                                font: { size: 11 },
+                                callback: function(value) { return value + '%'; }
+                            }
+                        }
+                    }
+                }
+            });
+        }
+
+        // NAU 차트
+        new Chart(document.getElementById('nauChart'), {
+            type: 'line',
+            data: {
+                labels: REPORT_DATA.nauLabels,
+                datasets: [{
+                    label: 'NAU',
+                    data: REPORT_DATA.nauValues,
+                    borderColor: '#00d4aa',
+                    backgroundColor: 'rgba(0, 212, 170, 0.08)',
+                    fill: true,
+                    tension: 0.4,
+                    borderWidth: 2,
+                    pointBackgroundColor: '#00d4aa',
+                    pointBorderColor: '#0a0a0a',
+                    pointBorderWidth: 2,
+                    pointRadius: 0,
+                    pointHoverRadius: 6
+                }]
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                interaction: {
+                    intersect: false,
+                    mode: 'index'
+                },
+                plugins: {
+                    legend: { display: false },
+                    tooltip: {
+                        backgroundColor: '#1a1a1a',
+                        titleColor: '#ffffff',
+                        bodyColor: '#a0a0a0',
+                        borderColor: '#333333',
+                        borderWidth: 1,
+                        cornerRadius: 8,
+                        padding: 12
+                    }
+                },
+                scales: {
+                    x: {
+                        grid: { color: '#1a1a1a' },
+                        ticks: { maxRotation: 45, font: { size: 11 } }
+                    },
+                    y: {
+                        beginAtZero: true,
+                        grid: { color: '#1a1a1a' },
+                        ticks: { font: { size: 11 } }
+                    }
+                }
+            }
+        });
+
+        // 주간 리텐션 곡선 (전체 주차별 리텐션)
+        // 관측 코호트 수가 적은 꼬리 구간(<3개)은 점선·흐린 색으로 구분 (구성 편향 착시 방지)
+        const retCurveCoverage = REPORT_DATA.retentionCurveCoverage;
+        const RET_LOW_COVERAGE = 3;
+        new Chart(document.getElementById('retentionCurveChart'), {
+            type: 'line',
+            data: {
+                labels: REPORT_DATA.retentionCurveLabels,
+                datasets: [{
+                    label: '리텐션 %',
+                    data: REPORT_DATA.retentionCurveValues,
+                    borderColor: '#a0a0a0',
+                    backgroundColor: 'rgba(160, 160, 160, 0.05)',
+                    fill: true,
+                    tension: 0.4,
+                    borderWidth: 2,
+                    segment: {
+                        borderDash: ctx => (retCurveCoverage[ctx.p1DataIndex] !== undefined && retCurveCoverage[ctx.p1DataIndex] < RET_LOW_COVERAGE) ? [5, 6] : undefined,
+                        borderColor: ctx => (retCurveCoverage[ctx.p1DataIndex] !== undefined && retCurveCoverage[ctx.p1DataIndex] < RET_LOW_COVERAGE) ? 'rgba(160, 160, 160, 0.35)' : undefined
+                    },
+                    pointBackgroundColor: ctx => (retCurveCoverage[ctx.dataIndex] !== undefined && retCurveCoverage[ctx.dataIndex] < RET_LOW_COVERAGE) ? '#0a0a0a' : '#a0a0a0',
+                    pointBorderColor: ctx => (retCurveCoverage[ctx.dataIndex] !== undefined && retCurveCoverage[ctx.dataIndex] < RET_LOW_COVERAGE) ? 'rgba(160, 160, 160, 0.45)' : '#0a0a0a',
+                    pointBorderWidth: 2,
+                    pointRadius: 4,
+                    pointHoverRadius: 7
+                }]
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                interaction: {
+                    intersect: false,
+                    mode: 'index'
+                },
+                plugins: {
+                    legend: { display: false },
+                    tooltip: {
+                        backgroundColor: '#1a1a1a',
+                        titleColor: '#ffffff',
+                        bodyColor: '#a0a0a0',
+                        borderColor: '#333333',
+                        borderWidth: 1,
+                        cornerRadius: 8,
+                        padding: 12,
+                        callbacks: {
+                            label: function(context) {
+                                const cov = retCurveCoverage[context.dataIndex];
+                                let label = context.parsed.y + '%';
+                                if (cov !== undefined) {
+                                    label += ' · 관측 코호트 ' + cov + '개';
+                                    if (cov < RET_LOW_COVERAGE) {
+                                        label += ' (저신뢰 구간)';
+                                    }
+                                }
+                                return label;
+                            }
+                        }
+                    }
+                },
+                scales: {
+                    x: {
+                        grid: { color: '#1a1a1a' }
+                    },
+                    y: {
+                        beginAtZero: true,
+                        max: 100,
+                        grid: { color: '#1a1a1a' },
+                        ticks: {
+                            callback: function(value) {
+                                return value + '%';
+                            }
+                        }
+                    }
+                }
+            }
+        });
+
+        // 코호트별 리텐션 추이 차트 (Week 1~4 멀티라인)
+        const weekTrends = REPORT_DATA.weekTrends;
+
+        // X축 레이블은 Week 1 기준 (가장 많은 데이터)
+        const allLabels = weekTrends[1].map(d => d.date);
+
+        // 각 Week 데이터를 레이블에 맞춰 정렬 (없는 데이터는 null)
+        function alignData(weekData, labels) {
+            const dataMap = new Map(weekData.map(d => [d.date, d.retention]));
+            return labels.map(label => dataMap.get(label) ?? null);
+        }
+
+        new Chart(document.getElementById('retentionChart'), {
+            type: 'line',
+            data: {
+                labels: allLabels,
+                datasets: [
+                    {
+                        label: 'Week 1',
+                        data: alignData(weekTrends[1], allLabels),
+                        borderColor: '#00d4aa',
+                        backgroundColor: 'rgba(0, 212, 170, 0.1)',
+                        borderWidth: 2,
+                        tension: 0.3,
+                        pointRadius: 4,
+                        pointHoverRadius: 6,
+                        fill: false
+                    },
+                    {
+                        label: 'Week 2',
+                        data: alignData(weekTrends[2], allLabels),
+                        borderColor: '#ffd700',
+                        backgroundColor: 'rgba(255, 215, 0, 0.1)',
+                        borderWidth: 2,
+                        tension: 0.3,
+                        pointRadius: 4,
+                        pointHoverRadius: 6,
+                        fill: false
+                    },
+                    {
+                        label: 'Week 3',
+                        data: alignData(weekTrends[3], allLabels),
+                        borderColor: '#ff6b6b',
+                        backgroundColor: 'rgba(255, 107, 107, 0.1)',
+                        borderWidth: 2,
+                        tension: 0.3,
+                        pointRadius: 4,
+                        pointHoverRadius: 6,
+                        fill: false
+                    },
+                    {
+                        label: 'Week 4',
+                        data: alignData(weekTrends[4], allLabels),
+                        borderColor: '#4ecdc4',
+                        backgroundColor: 'rgba(78, 205, 196, 0.1)',
+                        borderWidth: 2,
+                        tension: 0.3,
+                        pointRadius: 4,
+                        pointHoverRadius: 6,
+                        fill: false
+                    }
+                ]
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                spanGaps: false,
+                plugins: {
+                    legend: {
+                        display: true,
+                        position: 'top',
+                        labels: {
+                            color: '#a0a0a0',
+                            usePointStyle: true,
+                            pointStyle: 'circle',
+                            padding: 20
+                        }
+                    },
+                    tooltip: {
+                        backgroundColor: '#1a1a1a',
+                        titleColor: '#ffffff',
+                        bodyColor: '#a0a0a0',
+                        borderColor: '#333333',
+                        borderWidth: 1,
+                        cornerRadius: 8,
+                        padding: 12,
+                        callbacks: {
+                            label: function(context) {
+                                if (context.parsed.y === null) return null;
+                                return context.dataset.label + ': ' + context.parsed.y + '%';
+                            }
+                        }
+                    }
+                },
+                scales: {
+                    x: {
+                        grid: { display: false },
+                        ticks: { maxRotation: 45, font: { size: 10 }, color: '#a0a0a0' }
+                    },
+                    y: {
+                        beginAtZero: true,
+                        max: 100,
+                        grid: { color: '#1a1a1a' },
+                        ticks: {
+                            color: '#a0a0a0',
+                            callback: function(value) {
+                                return value + '%';
+                            }
+                        }
+                    }
+                }
+            }
+        });
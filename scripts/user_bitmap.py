@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""사용자 집합 비트맵 - 합칠 수 있는(mergeable) 정확한 distinct count
+
+주별·국가별 활성 사용자를 정수 인덱스 비트맵으로 보관하면
+전체 WAU, 한국 / 한국 외, 임의 국가 묶음의 사용자 수를 원본을 다시 읽지 않고 합집합(OR)만으로 구할 수 있다.
+한 사용자가 같은 주에 여러 국가에서 이벤트를 남겨도 합집합에서는 한 번만 센다.
+
+비트맵은 가장 큰 사용자 인덱스만큼 자리를 차지하므로, 사용자 수에 비해 인덱스 범위가 넓은 작은 집합
+(큐브의 국가 × 플랫폼 셀 대부분)은 정렬된 인덱스 배열(SparseUserSet)로 둔다. user_set()이 더 작은 쪽을 고른다.
+"""
+
+import base64
+from array import array
+from bisect import bisect_left
+from functools import reduce
+
+
+class UserBitmap:
+    """정수 사용자 인덱스 집합 (Python 정수를 비트열로 사용)"""
+
+    __slots__ = ("bits",)
+
+    def __init__(self, bits=0):
+        self.bits = bits
+
+    @classmethod
+    def from_ids(cls, ids):
+        """사용자 인덱스 목록 -> 비트맵 (O(n), 인덱스마다 큰 정수를 새로 만들지 않음)"""
+        ids = ids if isinstance(ids, (set, frozenset, list, tuple)) else list(ids)
+        if not ids:
+            return cls()
+        buf = bytearray(max(ids) // 8 + 1)
+        for uid in ids:
+            buf[uid >> 3] |= 1 << (uid & 7)
+        return cls(int.from_bytes(buf, "little"))
+
+    @classmethod
+    def from_base64(cls, text):
+        return cls(int.from_bytes(base64.b64decode(text), "little"))
+
+    def to_base64(self):
+        return base64.b64encode(self.bits.to_bytes((self.bits.bit_length() + 7) // 8, "little")).decode("ascii")
+
+    def __or__(self, other):
+        if isinstance(other, SparseUserSet):
+            other = other.to_bitmap()
+        return UserBitmap(self.bits | other.bits)
+
+    def __and__(self, other):
+        if isinstance(other, SparseUserSet):
+            other = other.to_bitmap()
+        return UserBitmap(self.bits & other.bits)
+
+    def __len__(self):
+        return self.bits.bit_count()
+
+    def ids(self):
+        """비트맵의 사용자 인덱스 (오름차순)"""
+        data = self.bits.to_bytes((self.bits.bit_length() + 7) // 8, "little")
+        return [i * 8 + j for i, byte in enumerate(data) if byte for j in range(8) if byte >> j & 1]
+
+    def __contains__(self, uid):
+        return bool(self.bits >> uid & 1)
+
+    def __eq__(self, other):
+        return isinstance(other, UserBitmap) and self.bits == other.bits
+
+    def __repr__(self):
+        return f"UserBitmap({len(self)} users)"
+
+
+class SparseUserSet:
+    """정렬된 사용자 인덱스 배열 (uint32) - 인덱스 범위에 비해 사용자가 적은 집합용"""
+
+    __slots__ = ("values",)
+
+    def __init__(self, values=None):
+        self.values = values if values is not None else array("I")
+
+    @classmethod
+    def from_ids(cls, ids):
+        return cls(array("I", sorted(set(ids))))
+
+    @classmethod
+    def from_base64(cls, text):
+        values = array("I")
+        values.frombytes(base64.b64decode(text))
+        return cls(values)
+
+    def to_base64(self):
+        return base64.b64encode(self.values.tobytes()).decode("ascii")
+
+    def to_bitmap(self):
+        return UserBitmap.from_ids(self.values)
+
+    def __or__(self, other):
+        if isinstance(other, UserBitmap):
+            return other | self
+        return SparseUserSet.from_ids(set(self.values).union(other.values))
+
+    def __and__(self, other):
+        if isinstance(other, UserBitmap):
+            return SparseUserSet(array("I", [uid for uid in self.values if uid in other]))
+        return SparseUserSet.from_ids(set(self.values).intersection(other.values))
+
+    def __len__(self):
+        return len(self.values)
+
+    def ids(self):
+        return self.values.tolist()
+
+    def __contains__(self, uid):
+        i = bisect_left(self.values, uid)
+        return i < len(self.values) and self.values[i] == uid
+
+    def __eq__(self, other):
+        return isinstance(other, SparseUserSet) and self.values == other.values
+
+    def __repr__(self):
+        return f"SparseUserSet({len(self)} users)"
+
+
+def user_set(ids):
+    """사용자 인덱스 목록 -> 더 작게 저장되는 쪽 (정렬 배열 4바이트/명 vs 비트맵 최대 인덱스/8 바이트)"""
+    ids = ids if isinstance(ids, (set, frozenset)) else set(ids)
+    if ids and len(ids) * 4 < max(ids) // 8 + 1:
+        return SparseUserSet.from_ids(ids)
+    return UserBitmap.from_ids(ids)
+
+
+def encode_user_set(users):
+    """UserBitmap / SparseUserSet -> 저장용 문자열 ("b:" / "s:" + base64)"""
+    return ("s:" if isinstance(users, SparseUserSet) else "b:") + users.to_base64()
+
+
+def decode_user_set(text):
+    kind, _, data = text.partition(":")
+    return SparseUserSet.from_base64(data) if kind == "s" else UserBitmap.from_base64(data)
+
+
+def union_count(members):
+    """집합(set / UserBitmap / SparseUserSet) 여러 개의 합집합 크기"""
+    members = list(members)
+    if not members:
+        return 0
+    sparse = [m for m in members if isinstance(m, SparseUserSet)]
+    if not sparse:
+        return len(reduce(lambda a, b: a | b, members))
+    # 정렬 배열끼리는 한 번에 합치고, 비트맵이 섞여 있으면 합친 결과를 비트맵 하나로 바꿔 OR
+    ids = set().union(*(m.values for m in sparse))
+    dense = [m for m in members if not isinstance(m, SparseUserSet)]
+    if not dense:
+        return len(ids)
+    return len(reduce(lambda a, b: a | b, dense, UserBitmap.from_ids(ids)))
+
+
+def group_values(values, groups):
+    """차원 값(국가, 플랫폼, ...) 목록을 묶음별로 분류
+
+    Args:
+        values: 데이터에 있는 값들
+        groups: {묶음 이름: 값 목록} - 값이 None인 묶음은 '다른 묶음에 없는 나머지 값'
+
+    Returns:
+        {묶음 이름: 해당 값 목록}
+    """
+    listed = set()
+    for members in groups.values():
+        if members is not None:
+            listed.update(members)
+    return {
+        name: [v for v in values if (v not in listed if members is None else v in members)]
+        for name, members in groups.items()
+    }
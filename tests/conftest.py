@@ -0,0 +1,59 @@
+"""공용 fixture - scripts/ 모듈 import 경로와 작은 합성 Amplitude export"""
+
+import gzip
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# 합성 export 기간: 2026-03-02(월) KST 부터 10주, 집계는 UNTIL 이 속한 주 전까지
+EXPORT_START = datetime(2026, 3, 2)
+EXPORT_WEEKS = 10
+UNTIL = "2026-05-04"
+MIDPOINT = "2026-04-06"
+
+COUNTRIES = ["South Korea"] * 6 + ["Japan", "United States", None]
+PLATFORMS = ["iOS", "Android", "Web"]
+EVENT_TYPES = ["session_start", "PageView - Home", "$identify", "PageView - Membership"]
+TIERS = {"basic": 5000, "plus": 15000, "premium": 30000}
+
+
+def write_exports(root, seed=7):
+    """하루 한 파일짜리 export (점점 늘어나는 사용자 풀, 가끔 멤버십 이벤트)"""
+    rng = random.Random(seed)
+    root.mkdir(parents=True, exist_ok=True)
+    for day in range(EXPORT_WEEKS * 7):
+        start = EXPORT_START + timedelta(days=day)
+        lines = []
+        for _ in range(rng.randint(30, 60)):
+            user = rng.randint(1, 40 + day * 4)
+            event = {
+                "amplitude_id": user,
+                "event_time": (start + timedelta(minutes=rng.randint(0, 1439))).strftime("%Y-%m-%d %H:%M:%S.%f"),
+                "event_type": rng.choice(EVENT_TYPES),
+                # 일부 사용자는 같은 주에 한국 / 한국 외 양쪽에서 나온다
+                "country": rng.choice(COUNTRIES) if user % 5 else "Japan",
+                "platform": PLATFORMS[user % 3],
+                "event_properties": {},
+            }
+            lines.append(event)
+            if rng.random() < 0.03:
+                tier = rng.choice(list(TIERS))
+                lines.append(dict(event, event_type="Action - Subscribe Membership",
+                                  event_properties={"tier": tier, "price": TIERS[tier]}))
+        path = root / f"123_{start:%Y-%m-%d}_0#0.json.gz"
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.writelines(json.dumps(event) + "\n" for event in lines)
+    return root
+
+
+@pytest.fixture(scope="session")
+def exports(tmp_path_factory):
+    return write_exports(tmp_path_factory.mktemp("exports"))
@@ -0,0 +1,67 @@
+"""직렬 / 병렬 / 저장소 / 증분 집계가 같은 지표를 내는지"""
+
+import pytest
+
+from conftest import MIDPOINT, UNTIL
+from generate_amplitude_report import load_metrics, parse_args
+
+SHARED_KEYS = ("wau", "wau_by_region", "nau", "retention", "daily")
+
+
+def metrics(*argv):
+    return load_metrics(parse_args(["--until", UNTIL, *argv]))
+
+
+@pytest.fixture(scope="module")
+def serial(exports):
+    return metrics("--events", str(exports))
+
+
+def assert_same(expected, actual):
+    for key in SHARED_KEYS:
+        assert actual[key] == expected[key], key
+
+
+def test_serial_covers_report(serial):
+    assert serial["wau"]["dates"][-1] == "2026-04-27"
+    assert len(serial["wau"]["values"]) == 9
+    assert all(serial["wau"]["values"])
+
+
+def test_store_matches_serial(exports, serial, tmp_path):
+    store = tmp_path / "store"
+    assert_same(serial, metrics("--events", str(exports), "--store", str(store)))
+    # 다시 읽으면 (새 파일 없음, 저장된 큐브 / MRR 상태 사용) 같은 결과
+    assert_same(serial, metrics("--store", str(store)))
+
+
+def test_incremental_matches_serial(exports, serial, tmp_path):
+    state = tmp_path / "state.json"
+    metrics("--events", str(exports), "--state", str(state), "--until", MIDPOINT)
+    assert_same(serial, metrics("--events", str(exports), "--state", str(state)))
+
+
+def test_incremental_store_matches_serial(exports, serial, tmp_path):
+    store = tmp_path / "store"
+    state = tmp_path / "state.json"
+    metrics("--events", str(exports), "--store", str(store), "--state", str(state), "--until", MIDPOINT)
+    assert_same(serial, metrics("--store", str(store), "--state", str(state)))
+
+
+def test_region_total_is_union(serial):
+    region = serial["wau_by_region"]
+    assert region["total"] == serial["wau"]["values"]
+    # 양쪽 지역에서 활동한 사용자가 있으므로 합계가 합집합보다 크다
+    assert any(k + nk > t for k, nk, t in zip(region["korea"], region["non_korea"], region["total"]))
+
+
+def test_parallel_matches_serial(exports, serial):
+    assert_same(serial, metrics("--events", str(exports), "--workers", "3"))
+
+
+def test_store_read_only_does_not_write_state(exports, serial, tmp_path):
+    store = tmp_path / "store"
+    metrics("--events", str(exports), "--store", str(store), "--until", MIDPOINT)
+    cube = (store / "cube.json").read_bytes()
+    assert_same(serial, metrics("--store", str(store), "--read-only"))
+    assert (store / "cube.json").read_bytes() == cube
@@ -0,0 +1,144 @@
+"""API 수집기 - 재시도 / Retry-After, 이어 받기(Range + If-Range), 진행 중인 날 다시 받기, 응답 캐시"""
+
+import asyncio
+import email.utils
+import io
+import json
+import threading
+import time
+import zipfile
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from amplitude_fetch import AmplitudeClient, fetch_export_day, retry_after
+from response_cache import ResponseCache
+
+
+class StandIn(BaseHTTPRequestHandler):
+    """테스트용 API 대역 - server.body / server.etag 를 내려주고, 요청 헤더를 server.seen 에 남긴다"""
+
+    def do_GET(self):
+        server = self.server
+        server.seen.append((self.path, self.headers.get("Range"), self.headers.get("If-Range")))
+        if server.throttle:
+            server.throttle -= 1
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            return
+        if self.path.startswith("/api/2/users"):
+            body = json.dumps({"data": {"xValues": ["2026-07-06"], "series": [[5]]}}).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        body = server.body
+        requested = self.headers.get("Range")
+        if requested and self.headers.get("If-Range") in (None, server.etag):
+            offset = int(requested[len("bytes="):-1])
+            self.send_response(206)
+        else:
+            offset = 0
+            self.send_response(200)
+        part = body[offset:]
+        self.send_header("ETag", server.etag)
+        self.send_header("Content-Length", str(len(part)))
+        self.end_headers()
+        if server.truncate:
+            # 연결이 중간에 끊긴 응답
+            server.truncate -= 1
+            self.wfile.write(part[:len(part) // 2])
+            return
+        self.wfile.write(part)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    httpd.seen = []
+    httpd.throttle = 0
+    httpd.truncate = 0
+    httpd.body = bytes(range(256)) * 64
+    httpd.etag = '"v1"'
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    # 재시도 대기 없이
+    real_sleep = asyncio.sleep
+    monkeypatch.setattr(asyncio, "sleep", lambda delay: real_sleep(0))
+
+
+def client_for(server, cache=None):
+    return AmplitudeClient("key", "secret", base_url=f"http://127.0.0.1:{server.server_address[1]}", rate=1000,
+                           burst=1000, cache=cache)
+
+
+def test_retry_after_accepts_seconds_and_http_date():
+    assert retry_after("3", 1) == 3.0
+    assert retry_after(None, 7) == 7
+    assert retry_after("garbage", 7) == 7
+    assert retry_after("Wed, 21 Oct 2015 07:28:00 GMT", 1) == 0.0
+    future = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert 25 <= retry_after(future, 1) <= 30
+
+
+def test_get_json_retries_on_429(server):
+    server.throttle = 2
+    client = client_for(server)
+    result = asyncio.run(client.get_json("/api/2/users", {"start": "20260706", "end": "20260712"}))
+    assert result["data"]["series"] == [[5]]
+    assert client.request_count == 3
+
+
+def test_cached_response_skips_upstream(server, tmp_path):
+    params = {"start": "20200106", "end": "20200112"}
+    first = client_for(server, ResponseCache(tmp_path, namespace="test"))
+    asyncio.run(first.get_json("/api/2/users", params))
+    second = client_for(server, ResponseCache(tmp_path, namespace="test"))
+    asyncio.run(second.get_json("/api/2/users", params))
+    assert (first.request_count, second.request_count) == (1, 0)
+
+
+def test_download_resumes_after_truncated_response(server, tmp_path):
+    server.truncate = 1
+    dest = tmp_path / "day.zip"
+    asyncio.run(client_for(server).download("/api/2/export", {}, dest))
+    assert dest.read_bytes() == server.body
+    assert server.seen[1][1:] == (f"bytes={len(server.body) // 2}-", '"v1"')
+    assert not (tmp_path / "day.zip.part.validator").exists()
+
+
+def test_download_restarts_when_upstream_changed(server, tmp_path):
+    dest = tmp_path / "day.zip"
+    (tmp_path / "day.zip.part").write_bytes(b"old content")
+    (tmp_path / "day.zip.part.validator").write_text('"v0"')
+    asyncio.run(client_for(server).download("/api/2/export", {}, dest))
+    # If-Range 가 맞지 않아 200 전체 응답 -> 처음부터 다시 쓴다
+    assert dest.read_bytes() == server.body
+
+
+def test_open_day_discards_stale_part(server, tmp_path):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("123/123_2026-10-17_0#0.json.gz", b"events")
+    server.body = buffer.getvalue()
+
+    today = date.today()
+    (tmp_path / f"{today:%Y%m%d}.zip.part").write_bytes(server.body[:10])
+    (tmp_path / f"{today:%Y%m%d}.zip.part.validator").write_text('"v1"')
+    asyncio.run(fetch_export_day(client_for(server), today, tmp_path))
+    assert server.seen[-1][1] is None
+    assert (tmp_path / f"{today:%Y%m%d}" / "123_2026-10-17_0#0.json.gz").read_bytes() == b"events"
@@ -0,0 +1,81 @@
+"""export 스트리밍 집계 - KST 주 경계, 비활성 이벤트, 수집 중인 주 제외, shard 부분 집계 병합"""
+
+from datetime import date
+
+from amplitude_ingest import (
+    WeeklyAggregator,
+    aggregate_exports,
+    aggregate_exports_parallel,
+    event_week,
+    iter_export_files,
+    week_start,
+)
+
+MONDAY = week_start(date(2026, 3, 9))
+
+
+def event(user, event_time, event_type="session_start", country="South Korea"):
+    return {"amplitude_id": user, "event_time": event_time, "event_type": event_type, "country": country}
+
+
+def test_week_boundary_is_kst():
+    # 일요일 15:00 UTC = 월요일 00:00 KST
+    assert event_week("2026-03-08 14:59:59.000000") == MONDAY - 7
+    assert event_week("2026-03-08 15:00:00.000000") == MONDAY
+
+
+def test_identify_and_anonymous_events_are_not_active():
+    aggregator = WeeklyAggregator().consume([
+        event(1, "2026-03-09 01:00:00"),
+        event(2, "2026-03-09 01:00:00", event_type="$identify"),
+        {"event_time": "2026-03-09 01:00:00", "event_type": "session_start"},
+    ])
+    assert aggregator.wau(MONDAY) == 1
+    assert aggregator.event_count == 1
+
+
+def test_end_week_excludes_open_week():
+    aggregator = WeeklyAggregator(end_week=MONDAY).consume([
+        event(1, "2026-03-02 01:00:00"),
+        event(2, "2026-03-09 01:00:00"),
+    ])
+    assert list(aggregator.active) == [MONDAY - 7]
+
+
+def test_report_counts_new_users_and_retention():
+    aggregator = WeeklyAggregator().consume([
+        event(1, "2026-03-02 01:00:00"),
+        event(2, "2026-03-02 01:00:00"),
+        event(1, "2026-03-10 01:00:00"),
+        event(3, "2026-03-10 01:00:00"),
+    ])
+    data = aggregator.report_data()
+    assert data["wau"] == {"dates": ["2026-03-02", "2026-03-09"], "values": [2, 2]}
+    assert data["nau"]["values"] == [2, 1]
+    assert data["retention"][1][3:] == [3, 1]
+    assert data["retention"][3][:5] == ["Global", "Mar 02, 2026", 2, 2, 1]
+
+
+def test_export_files_stream_in_name_order(exports):
+    files = list(iter_export_files([exports]))
+    assert files == sorted(files)
+    assert aggregate_exports([exports]).event_count > 0
+
+
+def state(aggregator):
+    return (aggregator.user_index, aggregator.first_seen, aggregator.active, aggregator.country_active,
+            aggregator.daily_active, aggregator.event_count)
+
+
+def test_merge_in_file_order_equals_single_pass(exports):
+    files = list(iter_export_files([exports]))
+    merged = WeeklyAggregator()
+    for chunk in (files[:7], files[7:8], files[8:40], files[40:]):
+        merged.merge(aggregate_exports(chunk))
+    assert state(merged) == state(aggregate_exports(files))
+
+
+def test_parallel_equals_serial(exports):
+    serial = aggregate_exports([exports], end_week=MONDAY + 7 * 6)
+    for workers in (1, 2, 5):
+        assert state(aggregate_exports_parallel([exports], end_week=MONDAY + 7 * 6, workers=workers)) == state(serial)
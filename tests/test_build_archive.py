@@ -0,0 +1,57 @@
+"""아카이브 재생성 - 커밋된 월별 스냅샷이 발행된 페이지와 같은 값인지, 다시 만든 페이지의 값, 인자 검사"""
+
+import json
+
+import pytest
+
+import build_archive
+from build_archive import ARCHIVE_DIR, SOURCES_DIR, build_page, import_page, parse_args
+
+MONTHS = sorted(p.stem for p in ARCHIVE_DIR.glob("????-??-??.html"))
+
+
+def load_source(month):
+    source_dir = SOURCES_DIR / month
+    return tuple(json.loads((source_dir / name).read_text(encoding="utf-8")) for name in ("data.json", "insights.json"))
+
+
+@pytest.mark.parametrize("month", MONTHS)
+def test_source_matches_published_page(month):
+    assert import_page(ARCHIVE_DIR / f"{month}.html") == load_source(month)
+
+
+@pytest.mark.parametrize("month", MONTHS)
+def test_rebuilt_page_carries_the_same_values(month, tmp_path):
+    output_path = tmp_path / f"{month}.html"
+    build_page(SOURCES_DIR / month, output_path)
+    assert import_page(output_path) == load_source(month)
+
+
+def test_region_section_only_where_published():
+    for month in MONTHS:
+        data, _ = load_source(month)
+        published = (ARCHIVE_DIR / f"{month}.html").read_text(encoding="utf-8")
+        assert (data["wau_by_region"] is not None) == ('id="wauRegionChart"' in published)
+
+
+def test_second_build_skips_every_month(tmp_path, monkeypatch):
+    for name, value in (("ARCHIVE_DIR", tmp_path / "archive"), ("INDEX_PATH", tmp_path / "index.html"),
+                        ("BUILD_MANIFEST", tmp_path / "archive" / ".build-manifest.json")):
+        monkeypatch.setattr(build_archive, name, value)
+    built, skipped = build_archive.build_archive(workers=2)
+    assert built == MONTHS and skipped == []
+    assert (tmp_path / "index.html").read_text(encoding="utf-8") == (tmp_path / "archive" / f"{MONTHS[-1]}.html").read_text(encoding="utf-8")
+    assert build_archive.build_archive(workers=2) == ([], MONTHS)
+
+
+def test_parse_args():
+    options = parse_args(["--force", "--workers", "3", "--shared-assets"])
+    assert options == {"force": True, "workers": 3, "shared_assets": True, "offline": False, "import": False}
+
+
+@pytest.mark.parametrize("argv", [["--workers"], ["--workers", "--force"], ["--workers", "0"], ["--froce"]])
+def test_bad_arguments_exit(argv, capsys):
+    with pytest.raises(SystemExit) as exc:
+        parse_args(argv)
+    assert exc.value.code == 1
+    assert capsys.readouterr().err
@@ -0,0 +1,83 @@
+"""리텐션 코호트 행렬 - 행을 직접 훑어 계산한 값과 같은지"""
+
+import random
+
+import pytest
+
+from cohort_matrix import CohortMatrix
+from generate_amplitude_report import default_metrics
+
+
+def retention_table(seed):
+    """최신 코호트부터, 관측되지 않은 칸은 "" 인 표 (가끔 Week 0 = 0 인 코호트)"""
+    rng = random.Random(seed)
+    n_weeks = 16
+    header = ["Segment", "Start Date", "Users"] + [f"Week {i}" for i in range(n_weeks)]
+    rows = [
+        ["Global", "Overall", "Retained"] + [rng.randint(100, 900) for _ in range(n_weeks)],
+        ["Global", "Overall", "Retained %"] + [f"{round(rng.uniform(5, 100), 2)}%" for _ in range(n_weeks)],
+    ]
+    for age in range(n_weeks):
+        users = rng.choice([0, rng.randint(20, 200)])
+        cells = [users] + [rng.randint(0, users) for _ in range(age)]
+        rows.append(["Global", f"Mar {age + 1:02d}, 2026", users] + cells + [""] * (n_weeks - len(cells)))
+    return {"headers": header, "rows": rows}
+
+
+def naive_trends(rows):
+    trends = {week: [] for week in (1, 2, 3, 4)}
+    for row in rows:
+        if "Overall" in str(row[1]) or len(row) <= 4 or not row[4]:
+            continue
+        week0 = row[3]
+        if not week0 or not isinstance(week0, (int, float)):
+            continue
+        for week in trends:
+            value = row[3 + week] if len(row) > 3 + week else None
+            if value and isinstance(value, (int, float)):
+                date = str(row[1]).replace(", 2025", "").replace(", 2026", "")
+                trends[week].append({"date": date, "retention": round(value / week0 * 100, 1)})
+    return {week: list(reversed(points))[:-1] for week, points in trends.items()}
+
+
+def naive_coverage(rows, n_weeks):
+    cohorts = [row for row in rows if "Overall" not in str(row[1]) and isinstance(row[3], (int, float))]
+    return [sum(1 for row in cohorts if isinstance(row[3 + i], (int, float))) for i in range(n_weeks)]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_row_walk(seed):
+    table = retention_table(seed)
+    matrix = CohortMatrix.from_retention(table)
+    assert matrix.week_trends() == naive_trends(table["rows"])
+    assert matrix.coverage(13) == naive_coverage(table["rows"], 13)
+
+    overall = table["rows"][1][3:]
+    labels, values = matrix.overall_curve()
+    assert labels == [f"W{i}" for i in range(13)]
+    assert values == [float(v.rstrip("%")) for v in overall[:13]]
+    assert matrix.overall_week1() == float(overall[1].rstrip("%"))
+
+
+def test_valid_week1_skips_empty_and_zero_cohorts():
+    table = retention_table(1)
+    matrix = CohortMatrix.from_retention(table)
+    cohorts = table["rows"][2:]
+    expected = [i for i, row in enumerate(cohorts)
+                if isinstance(row[4], int) and row[3] and row[4]]
+    assert matrix.valid_week1().tolist() == expected
+
+
+def test_default_retention_table():
+    rows = default_metrics()["retention"]
+    matrix = CohortMatrix.from_retention({"headers": rows[0], "rows": rows[1:]})
+    assert matrix.week_trends() == naive_trends(rows[1:])
+    assert len(matrix.labels) == len(rows) - 3
+
+
+def test_empty_table():
+    matrix = CohortMatrix.from_retention(None)
+    assert matrix.overall_curve() == ([], [])
+    assert matrix.overall_week1() is None
+    assert matrix.week_trend(1) == []
+    assert matrix.coverage(3) == [0, 0, 0]
@@ -0,0 +1,63 @@
+"""LTTB 다운샘플링 - 첫 / 마지막 점 유지, 점 수 상한, 피크 보존, 차트 데이터에 적용"""
+
+import json
+import random
+import re
+
+import pytest
+
+from downsample import downsample_indices, lttb_indices, take
+from generate_amplitude_report import default_metrics
+from generate_html_report import generate_html, report_data_from_metrics
+
+
+def walk(seed, n):
+    rng = random.Random(seed)
+    values = [1000]
+    for _ in range(n - 1):
+        values.append(max(values[-1] + rng.randint(-80, 80), 0))
+    return values
+
+
+@pytest.mark.parametrize("n, max_points", [(500, 100), (101, 100), (1000, 3), (37, 10)])
+def test_keeps_endpoints_and_point_count(n, max_points):
+    indices = lttb_indices(walk(n, n), max_points)
+    assert len(indices) == max_points
+    assert indices[0] == 0 and indices[-1] == n - 1
+    assert indices == sorted(set(indices))
+
+
+def test_short_series_and_no_limit_are_unchanged():
+    assert lttb_indices([3, 1, 2], 10) == [0, 1, 2]
+    assert lttb_indices(walk(0, 50), None) == list(range(50))
+    assert lttb_indices([5, None, 7, 1], 2) == [0, 3]
+
+
+def test_spike_survives():
+    values = [100] * 400
+    values[123] = 5000
+    assert 123 in lttb_indices(values, 20)
+
+
+def test_shared_indices_stay_within_limit():
+    series = [walk(seed, 400) for seed in range(3)]
+    keep = downsample_indices(series, 60)
+    assert len(keep) <= 60
+    assert keep[0] == 0 and keep[-1] == 399
+    for values in series:
+        assert len(take(values, keep)) == len(keep)
+    assert downsample_indices(series, 400) == list(range(400))
+    assert downsample_indices([[], None], 10) == []
+
+
+def test_report_charts_are_downsampled():
+    data = report_data_from_metrics(default_metrics())
+    html = generate_html(data, max_points=5)
+    chart = json.loads(re.search(r"const REPORT_DATA = (\{.*?\});\n", html).group(1))
+    wau = data["wau"]
+    assert len(chart["wauValues"]) == 5 < len(wau["values"])
+    assert chart["wauValues"][0] == wau["values"][0]
+    assert chart["wauValues"][-1] == wau["values"][-1]
+    # 원본 데이터 표는 줄이지 않는다
+    cell = f"<td>{wau['dates'][1]}</td>"
+    assert html.count(cell) == generate_html(data).count(cell) > 0
@@ -0,0 +1,84 @@
+"""이벤트 저장소 - 컬럼 왕복, 중단된 적재 복구, 이전 형식(meta.json) 저장소"""
+
+import json
+
+import pytest
+
+import event_store
+from amplitude_ingest import iter_events, iter_export_files
+from event_store import COLUMNS, EventStore, partition_name, partition_week
+
+
+def columns(store):
+    return {(w, c): store.read_column(w, c).tolist() for w in store.partitions() for c in COLUMNS}
+
+
+def test_partition_names_round_trip():
+    week = partition_week("2026-W10")
+    assert partition_name(week) == "2026-W10"
+
+
+def test_ingest_round_trip(exports, tmp_path):
+    store = EventStore(tmp_path / "store")
+    count = store.ingest([exports])
+    assert count == sum(1 for path in iter_export_files([exports]) for _ in iter_events(path))
+
+    reopened = EventStore(tmp_path / "store")
+    assert sum(reopened.rows(w) for w in reopened.partitions()) == count
+    assert columns(reopened) == columns(store)
+    # 이미 적재한 파일은 건너뛴다
+    assert reopened.ingest([exports]) == 0
+    assert columns(EventStore(tmp_path / "store")) == columns(store)
+
+
+def test_interrupted_ingest_resumes_without_duplicates(exports, tmp_path, monkeypatch):
+    clean = EventStore(tmp_path / "clean")
+    clean.ingest([exports])
+
+    # 작은 FLUSH_ROWS 로 부분 기록이 여러 번 일어난 뒤 20번째 파일 중간에 중단
+    monkeypatch.setattr(event_store, "FLUSH_ROWS", 5)
+    read_files = []
+
+    def crashing(path):
+        read_files.append(path)
+        for i, event in enumerate(iter_events(path)):
+            if len(read_files) == 20 and i == 12:
+                raise KeyboardInterrupt
+            yield event
+
+    monkeypatch.setattr(event_store, "iter_events", crashing)
+    with pytest.raises(KeyboardInterrupt):
+        EventStore(tmp_path / "resumed").ingest([exports])
+    monkeypatch.setattr(event_store, "iter_events", iter_events)
+
+    partial = EventStore(tmp_path / "resumed")
+    assert len(partial.manifest["files"]) == 19
+    # 확정되지 않은 행은 읽히지 않는다
+    for week in partial.partitions():
+        assert len(partial.read_column(week, "user")) == partial.rows(week)
+
+    partial.ingest([exports])
+    resumed = EventStore(tmp_path / "resumed")
+    assert resumed.manifest == clean.manifest
+    assert columns(resumed) == columns(clean)
+
+
+def test_legacy_store_migrates_row_counts(exports, tmp_path):
+    files = list(iter_export_files([exports]))
+    root = tmp_path / "legacy"
+    store = EventStore(root)
+    store.ingest(files[:30])
+    # 이전 형식: 파티션별 meta.json, manifest 에는 적재 파일 목록만
+    manifest = json.loads((root / "manifest.json").read_text())
+    for name, rows in manifest.pop("partitions").items():
+        (root / name / "meta.json").write_text(json.dumps({"rows": rows}))
+    (root / "manifest.json").write_text(json.dumps(manifest))
+
+    legacy = EventStore(root)
+    assert columns(legacy) == columns(store)
+    legacy.ingest(files)
+    assert not list(root.glob("*/meta.json"))
+
+    fresh = EventStore(tmp_path / "fresh")
+    fresh.ingest(files)
+    assert columns(EventStore(root)) == columns(fresh)
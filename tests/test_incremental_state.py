@@ -0,0 +1,58 @@
+"""증분 상태 - 주 단위 반영이 한 번에 집계한 결과와 같은지, 이미 반영한 주 / 빈 주, 저장 왕복"""
+
+import random
+from datetime import date
+
+from amplitude_ingest import WeeklyAggregator, week_start
+from incremental_state import IncrementalState
+
+FIRST_WEEK = week_start(date(2026, 3, 2))
+
+
+def activity(seed=11, weeks=8):
+    """(사용자, 주, 국가, 날) 목록 - 4번째 주는 비워 둔다"""
+    rng = random.Random(seed)
+    rows = []
+    for n in range(weeks):
+        if n == 3:
+            continue
+        week = FIRST_WEEK + 7 * n
+        for _ in range(60):
+            user = rng.randint(1, 30 + n * 10)
+            rows.append((f"u{user}", week, rng.choice(["South Korea", "Japan", "Brazil", None]), week + rng.randrange(7)))
+    return rows
+
+
+def aggregate(rows, weeks=None):
+    aggregator = WeeklyAggregator()
+    for key, week, country, day in rows:
+        if weeks is None or week in weeks:
+            aggregator.record(key, week, country, day)
+    return aggregator
+
+
+def test_week_by_week_matches_full_aggregation(tmp_path):
+    rows = activity()
+    state = IncrementalState(tmp_path / "state.json")
+    for week in sorted({row[1] for row in rows}):
+        state.apply(aggregate(rows, {week}))
+        state.save()
+        state = IncrementalState(tmp_path / "state.json")
+    assert state.report_data() == aggregate(rows).report_data()
+
+
+def test_applied_weeks_are_ignored(tmp_path):
+    rows = activity()
+    state = IncrementalState(tmp_path / "state.json")
+    assert state.apply(aggregate(rows)) == sorted({row[1] for row in rows})
+    before = state.report_data()
+    assert state.apply(aggregate(rows)) == []
+    assert state.report_data() == before
+
+
+def test_skipped_week_is_filled_with_zero(tmp_path):
+    state = IncrementalState(tmp_path / "state.json")
+    state.apply(aggregate(activity()))
+    empty = FIRST_WEEK + 7 * 3
+    assert state.wau(empty) == 0
+    assert state.nau[empty] == 0
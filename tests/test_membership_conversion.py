@@ -0,0 +1,94 @@
+"""코호트별 멤버십 전환 - sort-merge 결과가 사용자별로 직접 훑은 값과 같은지"""
+
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+from amplitude_ingest import NON_ACTIVE_EVENT_TYPES, event_week, iter_events, iter_export_files, week_range, week_start
+from conftest import UNTIL
+from event_store import EventStore
+from membership_conversion import (
+    CONVERSION_WEEKS,
+    SUBSCRIBE_EVENT,
+    build_conversion_table,
+    first_seen_and_subscribe,
+    membership_conversion,
+)
+
+
+def naive_first_seen(users, times, subscribed):
+    """사용자별 {user: (첫 활동 시각, 첫 구독 시각 또는 -1)}"""
+    first = {}
+    for user, time, sub in zip(users.tolist(), times.tolist(), subscribed.tolist()):
+        seen, sub_time = first.get(user, (time, -1))
+        if sub and (sub_time < 0 or time < sub_time):
+            sub_time = time
+        first[user] = (min(seen, time), sub_time)
+    return first
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_first_seen_and_subscribe_matches_per_user_walk(seed):
+    rng = np.random.default_rng(seed)
+    n = 5000
+    users = rng.integers(0, 300, n).astype(np.uint32)
+    times = rng.integers(1_770_000_000, 1_780_000_000, n).astype(np.int64)
+    subscribed = rng.random(n) < 0.05
+    first_time, subscribe_time = first_seen_and_subscribe(users, times, subscribed)
+
+    expected = naive_first_seen(users, times, subscribed)
+    # 타임라인은 사용자 코드 순
+    assert list(zip(first_time.tolist(), subscribe_time.tolist())) == [expected[u] for u in sorted(expected)]
+
+
+def test_no_events():
+    empty = np.empty(0, dtype=np.int64)
+    first_time, subscribe_time = first_seen_and_subscribe(empty.astype(np.uint32), empty, empty.astype(bool))
+    assert len(first_time) == len(subscribe_time) == 0
+    assert build_conversion_table({}) == [build_conversion_table({})[0]]
+
+
+def naive_counts(exports, end_week):
+    """export 이벤트를 사용자별로 직접 훑은 코호트 -> (신규 사용자 수, 누적 구독 사용자 수)"""
+    first, subscribe = {}, {}
+    last_week = None
+    for path in iter_export_files([exports]):
+        for event in iter_events(path):
+            user = event.get("amplitude_id")
+            week = event_week(event["event_time"])
+            if user is None or event["event_type"] in NON_ACTIVE_EVENT_TYPES or week >= end_week:
+                continue
+            time = event["event_time"]
+            first[user] = min(first.get(user, time), time)
+            if event["event_type"] == SUBSCRIBE_EVENT:
+                subscribe[user] = min(subscribe.get(user, time), time)
+            last_week = week if last_week is None else max(last_week, week)
+
+    cohort_of = {user: event_week(time) for user, time in first.items()}
+    counts = {}
+    for cohort in week_range(min(cohort_of.values()), last_week, CONVERSION_WEEKS):
+        users = [user for user, c in cohort_of.items() if c == cohort]
+        offsets = [(event_week(subscribe[user]) - cohort) // 7 for user in users if user in subscribe]
+        n_weeks = (last_week - cohort) // 7 + 1
+        counts[cohort] = (len(users), [sum(1 for o in offsets if o <= week) for week in range(n_weeks)])
+    return counts
+
+
+def test_store_conversion_matches_naive(exports, tmp_path):
+    store = EventStore(tmp_path / "store")
+    store.ingest([exports])
+    end_week = week_start(date.fromisoformat(UNTIL))
+    table = membership_conversion(store, end_week=end_week)
+    assert table == build_conversion_table(naive_counts(exports, end_week))
+    # 최신 코호트부터, 전환 수는 주차가 갈수록 줄지 않는다
+    cohorts = table[3:]
+    starts = [datetime.strptime(row[1], "%b %d, %Y") for row in cohorts]
+    assert starts == sorted(starts, reverse=True)
+    assert all(row[3:] == sorted(row[3:]) for row in cohorts)
+    assert any(row[-1] for row in cohorts)
+
+
+def test_store_without_subscriptions(tmp_path):
+    store = EventStore(tmp_path / "store")
+    assert membership_conversion(store) is None
@@ -0,0 +1,65 @@
+"""지표 큐브 - 저장 왕복, 국가 묶음 전체는 합집합, 나중 주까지 반영된 큐브로 이른 --until 리포트"""
+
+import random
+
+from conftest import MIDPOINT, UNTIL
+from generate_amplitude_report import load_metrics, parse_args
+from metrics_cube import MetricsCube, report_series
+from user_bitmap import SparseUserSet
+
+
+def test_cube_save_load_round_trip(tmp_path):
+    rng = random.Random(3)
+    cube = MetricsCube(tmp_path / "cube.json")
+    for week in range(739_000, 739_000 + 7 * 6, 7):
+        cube.add_week(week, [
+            (rng.randint(0, 5000), rng.choice(["South Korea", "Japan", None]), rng.choice(["iOS", "Web"]))
+            for _ in range(200)
+        ])
+    cube.save()
+    loaded = MetricsCube(tmp_path / "cube.json")
+    assert report_series(loaded) == report_series(cube)
+    kinds = {type(cell[1]) for cells in loaded.cells.values() for cell in cells.values()}
+    assert SparseUserSet in kinds
+
+
+def test_cube_by_total_is_union():
+    cube = MetricsCube()
+    week = 739_000
+    # 사용자 1은 두 국가에서 활동
+    cube.add_week(week, [(1, "South Korea", "iOS"), (1, "Japan", "iOS"), (2, "Japan", "Web")])
+    result = cube.query(by="country", weeks=[week])
+    assert result["South Korea"] == [1]
+    assert result["Japan"] == [2]
+    assert result["total"] == [2]
+    assert cube.query(measure="events", weeks=[week])["values"] == [3]
+
+
+def test_weeks_stop_before_end_week():
+    cube = MetricsCube()
+    weeks = list(range(739_000, 739_000 + 7 * 5, 7))
+    for week in weeks:
+        cube.add_week(week, [(week % 13, "Japan", "Web")])
+    assert cube.weeks() == weeks
+    assert cube.weeks(end_week=weeks[3]) == weeks[:3]
+    assert cube.weeks(2, end_week=weeks[3]) == weeks[1:3]
+    assert cube.weeks(end_week=weeks[-1] + 70) == weeks
+    assert cube.weeks(end_week=weeks[0]) == []
+    assert report_series(cube, end_week=weeks[2])["wau"]["values"] == [1, 1]
+
+
+def test_until_before_stored_cube(exports, tmp_path):
+    """큐브가 UNTIL 까지 반영된 저장소로 그보다 이른 --until 리포트 = 처음부터 그 주까지 만든 리포트"""
+    store = tmp_path / "store"
+    later = load_metrics(parse_args(["--events", str(exports), "--store", str(store), "--until", UNTIL]))
+    earlier = load_metrics(parse_args(["--store", str(store), "--until", MIDPOINT]))
+
+    fresh = tmp_path / "fresh"
+    expected = load_metrics(parse_args(["--events", str(exports), "--store", str(fresh), "--until", MIDPOINT]))
+    serial = load_metrics(parse_args(["--events", str(exports), "--until", MIDPOINT]))
+    for key in ("wau", "wau_by_region", "nau", "segments"):
+        assert earlier[key] == expected[key], key
+    for key in ("wau", "wau_by_region", "nau"):
+        assert earlier[key] == serial[key], key
+    assert earlier["wau"]["dates"][-1] < MIDPOINT
+    assert len(later["wau"]["dates"]) > len(earlier["wau"]["dates"])
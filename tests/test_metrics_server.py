@@ -0,0 +1,101 @@
+"""지표 서버 - 엔드포인트, ETag / 304, gzip, 원본 변경 시 교체"""
+
+import gzip
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from generate_amplitude_report import default_metrics
+from generate_html_report import report_data_from_metrics
+from metrics_server import MetricsServer
+
+
+class FakeSource:
+    """signature 가 바뀌면 새 데이터를 내주는 원본"""
+
+    def __init__(self):
+        self.version = 1
+        self.loads = 0
+
+    def signature(self):
+        return self.version
+
+    def load(self, signature):
+        self.loads += 1
+        metrics = default_metrics()
+        metrics["wau"] = dict(metrics["wau"], values=[v + signature for v in metrics["wau"]["values"]])
+        return report_data_from_metrics(metrics, source=f"v{signature}"), f"v{signature}"
+
+
+@pytest.fixture
+def server():
+    httpd = MetricsServer(("127.0.0.1", 0), FakeSource())
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def get(server, path, **headers):
+    request = urllib.request.Request(f"http://127.0.0.1:{server.server_address[1]}{path}", headers=headers)
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def test_endpoints(server):
+    status, _, body = get(server, "/api")
+    assert status == 200
+    assert "/api/summary" in json.loads(body)["endpoints"]
+
+    _, _, body = get(server, "/api/wau/")
+    assert json.loads(body)["values"] == [v + 1 for v in default_metrics()["wau"]["values"]]
+    assert get(server, "/api/nope")[0] == 404
+
+
+def test_etag_not_modified(server):
+    status, headers, _ = get(server, "/api/data")
+    assert status == 200
+    status, _, body = get(server, "/api/data", **{"If-None-Match": headers["ETag"]})
+    assert (status, body) == (304, b"")
+
+
+def test_gzip_only_when_accepted(server):
+    _, headers, body = get(server, "/api/data", **{"Accept-Encoding": "gzip"})
+    assert headers["Content-Encoding"] == "gzip"
+    _, plain_headers, plain = get(server, "/api/data")
+    assert "Content-Encoding" not in plain_headers
+    assert gzip.decompress(body) == plain
+    assert headers["ETag"] == plain_headers["ETag"]
+
+
+def test_reload_swaps_snapshot_on_change(server):
+    _, headers, _ = get(server, "/api/wau")
+    assert server.reload() is False
+    assert server.source.loads == 1
+
+    server.source.version = 2
+    assert server.reload() is True
+    status, new_headers, body = get(server, "/api/wau", **{"If-None-Match": headers["ETag"]})
+    assert status == 200
+    assert new_headers["ETag"] != headers["ETag"]
+    assert json.loads(body)["values"] == [v + 2 for v in default_metrics()["wau"]["values"]]
+
+
+def test_unavailable_without_data():
+    source = FakeSource()
+    source.signature = lambda: None
+    httpd = MetricsServer(("127.0.0.1", 0), source)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        assert get(httpd, "/api/data")[0] == 503
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
@@ -0,0 +1,89 @@
+"""리포트 조립 - 가상 리텐션 테이블 데이터, 선택 CSS / JS 조각은 렌더링된 섹션 것만 인라인"""
+
+import json
+import re
+
+import pytest
+
+from conftest import UNTIL
+from generate_amplitude_report import default_metrics, load_metrics, parse_args
+from generate_html_report import (
+    OPTIONAL_ASSETS,
+    TEMPLATES_DIR,
+    generate_html,
+    report_data_from_metrics,
+    retention_matrix,
+    static_assets,
+)
+
+
+def chart_data(html):
+    return json.loads(re.search(r"const REPORT_DATA = (\{.*?\});\n", html).group(1))
+
+
+def fragment(name, ext):
+    """선택 조각의 첫 줄 (페이지에 들어갔는지 확인용)"""
+    path = TEMPLATES_DIR / "optional" / f"{name}.{ext}"
+    return path.read_text(encoding="utf-8").strip().splitlines()[0].strip() if path.exists() else None
+
+
+def inlined(html, name):
+    return [ext for ext in ("css", "js") if fragment(name, ext) and fragment(name, ext) in html]
+
+
+@pytest.fixture(scope="module")
+def default_report():
+    return report_data_from_metrics(default_metrics())
+
+
+@pytest.fixture(scope="module")
+def store_report(exports, tmp_path_factory):
+    store = tmp_path_factory.mktemp("store")
+    metrics = load_metrics(parse_args(["--events", str(exports), "--store", str(store), "--until", UNTIL]))
+    return report_data_from_metrics(metrics)
+
+
+def test_full_retention_ships_the_whole_matrix(default_report):
+    html = generate_html(default_report, full_retention=True)
+    table = chart_data(html)["retentionTable"]
+    assert table == retention_matrix(default_report["retention"])
+    assert len(table["headers"]) > 18
+    assert "" not in [cell for row in table["rows"] for cell in row]
+    # 행은 스크립트가 그리므로 HTML 에는 빈 컨테이너만
+    assert 'id="retentionTable"></div>' in html
+    assert "class='retention-cell'" not in html
+    assert inlined(html, "virtual_table") == ["css", "js"]
+
+
+def test_default_report_inlines_no_optional_fragments(default_report):
+    html = generate_html(default_report)
+    assert "retentionTable" not in chart_data(html)
+    assert "class='retention-cell'" in html
+    for name in OPTIONAL_ASSETS:
+        assert inlined(html, name) == [], name
+
+
+def test_store_report_inlines_only_its_sections(store_report):
+    html = generate_html(store_report)
+    sections = {name for name in ("daily", "conversion", "revenue", "segments") if store_report.get(name)}
+    assert sections == {"daily", "conversion", "revenue", "segments"}
+    for name in OPTIONAL_ASSETS:
+        assert bool(inlined(html, name)) == (name in sections), name
+
+    partial = dict(store_report, daily=None, revenue=None)
+    html = generate_html(partial)
+    for name in OPTIONAL_ASSETS:
+        assert bool(inlined(html, name)) == (name in {"conversion", "segments"}), name
+
+
+def test_shared_assets_carry_every_fragment(default_report):
+    html = generate_html(default_report, asset_base="assets")
+    for name in OPTIONAL_ASSETS:
+        assert inlined(html, name) == [], name
+    assets = static_assets()
+    assert f'<script src="assets/{assets["js"][0]}">' in html
+    # 공유 파일은 여러 리포트가 함께 쓰므로 모든 조각을 담는다
+    for name in OPTIONAL_ASSETS:
+        for ext in ("css", "js"):
+            if fragment(name, ext):
+                assert fragment(name, ext) in assets[ext][1], (name, ext)
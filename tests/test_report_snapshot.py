@@ -0,0 +1,84 @@
+"""스냅샷 - 지표 묶음 왕복, 손상 / 잘못된 값 검사, Excel 과 같은 HTML 데이터, 다른 데이터 원본과 함께 쓰기 거부"""
+
+import pytest
+
+from conftest import UNTIL
+from generate_amplitude_report import create_workbook, default_metrics, load_metrics, parse_args
+from generate_html_report import extract_all_data, load_report_data
+from report_snapshot import Snapshot, read_snapshot, write_snapshot
+
+
+@pytest.fixture(scope="module")
+def store_metrics(exports, tmp_path_factory):
+    store = tmp_path_factory.mktemp("store")
+    return load_metrics(parse_args(["--events", str(exports), "--store", str(store), "--until", UNTIL]))
+
+
+def test_default_metrics_round_trip(tmp_path):
+    metrics = default_metrics()
+    path = write_snapshot(metrics, tmp_path / "report.snap", source="test")
+    assert read_snapshot(path) == metrics
+    assert Snapshot(path).meta["source"] == "test"
+
+
+def test_store_metrics_round_trip(store_metrics, tmp_path):
+    # 저장소 집계는 일간 / 단면 / 멤버십 전환 / MRR 섹션까지 있다
+    assert {"daily", "segments", "conversion", "revenue"} <= set(store_metrics)
+    path = write_snapshot(store_metrics, tmp_path / "store.snap")
+    assert read_snapshot(path) == store_metrics
+
+
+def test_read_selected_sections(store_metrics, tmp_path):
+    path = write_snapshot(store_metrics, tmp_path / "store.snap")
+    assert read_snapshot(path, sections=("wau",)) == {"wau": store_metrics["wau"]}
+
+
+def test_corrupt_snapshot_is_rejected(tmp_path):
+    path = write_snapshot(default_metrics(), tmp_path / "report.snap")
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="checksum"):
+        Snapshot(path)
+
+    path.write_bytes(b"not a snapshot")
+    with pytest.raises(ValueError, match="Not a report snapshot"):
+        Snapshot(path)
+
+
+def test_non_integer_value_is_rejected(tmp_path):
+    metrics = default_metrics()
+    metrics["wau"] = dict(metrics["wau"], values=[1.5] + metrics["wau"]["values"][1:])
+    with pytest.raises(ValueError, match="expected int"):
+        write_snapshot(metrics, tmp_path / "bad.snap")
+    assert not (tmp_path / "bad.snap").exists()
+
+
+def test_snapshot_report_data_matches_workbook(store_metrics, tmp_path):
+    workbook = tmp_path / "amplitude_report.xlsx"
+    create_workbook(store_metrics).save(workbook)
+    snap = write_snapshot(store_metrics, tmp_path / "amplitude_report.snap", source=workbook.name)
+
+    from_excel = extract_all_data(workbook, use_cache=False)
+    from_snapshot = load_report_data(snap)
+    for data in (from_excel, from_snapshot):
+        data.pop("generated")
+    assert from_snapshot == from_excel
+
+
+def test_snapshot_reloads_without_aggregation(tmp_path):
+    path = write_snapshot(default_metrics(), tmp_path / "report.snap")
+    assert load_metrics(parse_args(["--snapshot", str(path), "--html"])) == default_metrics()
+
+
+@pytest.mark.parametrize("extra", [
+    ["--events", "exports/"],
+    ["--store", "store/"],
+    ["--state", "state.json"],
+    ["--dashboard", "dashboard.json"],
+])
+def test_snapshot_rejects_other_sources(extra, capsys):
+    with pytest.raises(SystemExit) as exc:
+        parse_args(["--snapshot", "reports/amplitude_report_2026-07-13.snap", *extra])
+    assert exc.value.code == 1
+    assert extra[0] in capsys.readouterr().err
@@ -0,0 +1,38 @@
+"""HTML 템플릿 - {{ name }} 치환, CSS / JS 중괄호 보존, 컴파일 캐시"""
+
+import pytest
+
+from report_template import _PLACEHOLDER, TEMPLATES_DIR, Template, get_template, render
+
+
+def test_render_replaces_only_placeholders():
+    template = Template("body { color: red; } {{ a }}-{{b}} {x} {{ a }}")
+    assert template.render({"a": 1, "b": "two"}) == "body { color: red; } 1-two {x} 1"
+    assert template.fields == ["a", "b", "a"]
+
+
+def test_missing_value_names_template_and_field():
+    with pytest.raises(KeyError, match="'page.html' needs 'title'"):
+        Template("<h1>{{ title }}</h1>", "page.html").render({})
+
+
+def test_templates_compile_once():
+    assert get_template("report.html") is get_template("report.html")
+
+
+def test_section_templates_render():
+    for path in sorted((TEMPLATES_DIR / "sections").glob("*.html")):
+        name = f"sections/{path.name}"
+        fields = set(get_template(name).fields)
+        html = render(name, {field: f"<{field}>" for field in fields})
+        assert not _PLACEHOLDER.search(html)
+        assert all(f"<{field}>" in html for field in fields)
+
+
+def test_report_has_no_unfilled_placeholders():
+    from generate_amplitude_report import default_metrics
+    from generate_html_report import generate_html, report_data_from_metrics
+
+    html = generate_html(report_data_from_metrics(default_metrics()))
+    assert not _PLACEHOLDER.search(html)
+    assert html.startswith("<!DOCTYPE html>")
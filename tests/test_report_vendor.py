@@ -0,0 +1,123 @@
+"""vendor 파일 - 잠금 해시 확인, CDN 태그 SRI, 오프라인 리포트에 외부 요청이 없는지"""
+
+import json
+import re
+from io import BytesIO
+
+import pytest
+
+import report_vendor
+from generate_amplitude_report import default_metrics
+from generate_html_report import generate_html, report_data_from_metrics
+from report_vendor import (
+    CHART_JS_FILE,
+    PRETENDARD_CSS_FILE,
+    PRETENDARD_FILE,
+    VENDOR_FILES,
+    cdn_block,
+    check_offline_files,
+    lock_entry,
+    vendor_path,
+)
+
+# 페이지가 네트워크에서 받아 오는 참조 (링크 텍스트가 아니라 src / href / url())
+REMOTE_REF = re.compile(r"""(?:src|href)\s*=\s*["']?https?:|url\(\s*["']?https?:""")
+
+CACHED = ("vendor_lock", "vendor_path", "chart_js", "subset_font")
+
+
+def tiny_font():
+    """글리프 몇 개짜리 TrueType 폰트 (서브셋 입력용)"""
+    from fontTools.fontBuilder import FontBuilder
+    from fontTools.pens.ttGlyphPen import TTGlyphPen
+
+    chars = "0123456789주월보고서"
+    glyph_names = [".notdef"] + [f"uni{ord(c):04X}" for c in chars]
+    pen = TTGlyphPen(None)
+    pen.moveTo((0, 0))
+    pen.lineTo((0, 500))
+    pen.lineTo((400, 500))
+    pen.closePath()
+    glyph = pen.glyph()
+
+    builder = FontBuilder(1000, isTTF=True)
+    builder.setupGlyphOrder(glyph_names)
+    builder.setupCharacterMap({ord(c): f"uni{ord(c):04X}" for c in chars})
+    builder.setupGlyf({name: glyph for name in glyph_names})
+    builder.setupHorizontalMetrics({name: (500, 0) for name in glyph_names})
+    builder.setupHorizontalHeader(ascent=800, descent=-200)
+    builder.setupNameTable({"familyName": "Pretendard", "styleName": "Regular"})
+    builder.setupOS2()
+    builder.setupPost()
+    out = BytesIO()
+    builder.save(out)
+    return out.getvalue()
+
+
+@pytest.fixture
+def vendor(tmp_path, monkeypatch):
+    """tmp 에 받은 것처럼 vendor 파일과 잠금 파일을 만든다"""
+    pytest.importorskip("fontTools")
+    pytest.importorskip("brotli")
+    files = {
+        CHART_JS_FILE: b"window.Chart = function () {};\n",
+        PRETENDARD_CSS_FILE: b"@font-face{font-family:Pretendard}\n",
+        PRETENDARD_FILE: tiny_font(),
+    }
+    vendor_dir = tmp_path / "vendor"
+    vendor_dir.mkdir()
+    lock = {}
+    for name, content in files.items():
+        (vendor_dir / name).write_bytes(content)
+        lock[name] = lock_entry(name, VENDOR_FILES[name], content)
+    lock_path = tmp_path / "vendor.lock.json"
+    lock_path.write_text(json.dumps(lock), encoding="utf-8")
+
+    monkeypatch.setattr(report_vendor, "VENDOR_DIR", vendor_dir)
+    monkeypatch.setattr(report_vendor, "VENDOR_LOCK", lock_path)
+    for name in CACHED:
+        getattr(report_vendor, name).cache_clear()
+    yield lock
+    for name in CACHED:
+        getattr(report_vendor, name).cache_clear()
+
+
+@pytest.fixture
+def report():
+    return report_data_from_metrics(default_metrics())
+
+
+def test_offline_inline_report_has_no_remote_references(vendor, report):
+    html = generate_html(report, offline=True)
+    assert not REMOTE_REF.search(html)
+    assert "data:font/woff2;base64," in html
+    assert "window.Chart = function" in html
+
+
+def test_offline_shared_assets_have_no_remote_references(vendor, report):
+    html = generate_html(report, asset_base="../assets", offline=True)
+    assert not REMOTE_REF.search(html)
+    assert re.search(r'<script src="\.\./assets/chart\.[0-9a-f]+\.js">', html)
+
+
+def test_online_report_tags_carry_sri(vendor, report):
+    block = cdn_block()
+    for name in (PRETENDARD_CSS_FILE, CHART_JS_FILE):
+        assert f'{VENDOR_FILES[name]}" integrity="{vendor[name]["integrity"]}" crossorigin="anonymous"' in block
+    assert block in generate_html(report)
+
+
+def test_unpinned_or_changed_file_is_rejected(vendor):
+    assert check_offline_files() == []
+    (report_vendor.VENDOR_DIR / CHART_JS_FILE).write_bytes(b"tampered")
+    vendor_path.cache_clear()
+    with pytest.raises(ValueError, match="SHA-256 mismatch"):
+        vendor_path(CHART_JS_FILE)
+    assert len(check_offline_files()) == 1
+
+    report_vendor.VENDOR_LOCK.write_text("{}", encoding="utf-8")
+    report_vendor.vendor_lock.cache_clear()
+    vendor_path.cache_clear()
+    with pytest.raises(ValueError, match="not pinned"):
+        vendor_path(PRETENDARD_FILE)
+    assert "integrity" not in cdn_block()
@@ -0,0 +1,64 @@
+"""API 응답 캐시 - 키 정규화, 네임스페이스, 닫힌 기간 / TTL, LRU 크기 상한"""
+
+import os
+import time
+from datetime import date
+
+from response_cache import ResponseCache, cache_key, cache_namespace, is_closed, is_closed_day
+
+THIS_WEEK = date(2026, 10, 12).toordinal()
+
+
+def test_key_ignores_param_order_and_json_spacing():
+    a = cache_key("/api/2/users", {"m": "active", "s": '[{"prop": "country", "op": "is"}]'})
+    b = cache_key("/api/2/users", {"s": '[{"op":"is","prop":"country"}]', "m": "active"})
+    assert a == b
+    assert a != cache_key("/api/2/users", {"m": "new"})
+
+
+def test_namespace_separates_base_url_and_project():
+    default = cache_namespace("https://amplitude.com/", "key-a")
+    assert default == cache_namespace("https://amplitude.com", "key-a")
+    assert default != cache_namespace("http://127.0.0.1:8000", "key-a")
+    assert default != cache_namespace("https://amplitude.com", "key-b")
+
+
+def test_closed_period():
+    assert is_closed({"end": "20261011T23"}, THIS_WEEK)
+    assert not is_closed({"end": "20261012"}, THIS_WEEK)
+    assert not is_closed({}, THIS_WEEK)
+    assert is_closed_day(date(2026, 10, 11), THIS_WEEK)
+
+
+def test_closed_entries_never_expire(tmp_path):
+    cache = ResponseCache(tmp_path, open_ttl=0)
+    cache.put("/p", {"end": "20200105"}, {"v": 1})
+    cache.put("/p", {"end": "29991231"}, {"v": 2})
+    time.sleep(0.01)
+    assert cache.get("/p", {"end": "20200105"}) == {"v": 1}
+    assert cache.get("/p", {"end": "29991231"}) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_namespaces_do_not_share_entries(tmp_path):
+    ResponseCache(tmp_path, namespace="standin").put("/p", {"end": "20200105"}, {"v": "fake"})
+    assert ResponseCache(tmp_path, namespace="real").get("/p", {"end": "20200105"}) is None
+    assert ResponseCache(tmp_path, namespace="standin").get("/p", {"end": "20200105"}) == {"v": "fake"}
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(tmp_path)
+    for i in range(3):
+        cache.put("/p", {"end": "20200105", "i": i}, {"payload": "x" * 100})
+    entries = sorted(tmp_path.glob("*.json"), key=lambda p: p.stat().st_mtime_ns)
+    # 가장 먼저 쓴 엔트리를 최근에 읽은 것으로 만든다
+    old = time.time() - 100
+    for n, path in enumerate(entries):
+        os.utime(path, (old + n, old + n))
+    cache.get("/p", {"end": "20200105", "i": 0})
+
+    cache.max_bytes = cache.total_bytes - 1
+    assert cache.evict() == 1
+    assert cache.get("/p", {"end": "20200105", "i": 0}) is not None
+    assert cache.get("/p", {"end": "20200105", "i": 1}) is None
+    assert cache.total_bytes == sum(p.stat().st_size for p in tmp_path.glob("*.json"))
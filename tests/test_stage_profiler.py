@@ -0,0 +1,76 @@
+"""단계별 측정 - 꺼져 있으면 기록 없음, 중첩 경로, 자기 시간, 최대 메모리 전파, folded 출력"""
+
+import json
+import time
+import tracemalloc
+
+import pytest
+
+from stage_profiler import StageProfiler
+
+
+@pytest.fixture
+def profiler():
+    was_tracing = tracemalloc.is_tracing()
+    profiler = StageProfiler()
+    profiler.enable()
+    yield profiler
+    if not was_tracing:
+        tracemalloc.stop()
+
+
+def by_stage(profiler):
+    return {record["stage"]: record for record in profiler.records}
+
+
+def test_disabled_records_nothing():
+    profiler = StageProfiler()
+    with profiler.stage("load"):
+        with profiler.stage("parse"):
+            pass
+    assert profiler.records == []
+
+
+def test_nested_stages(profiler):
+    with profiler.stage("html"):
+        with profiler.stage("chart_data"):
+            time.sleep(0.02)
+        with profiler.stage("render"):
+            blob = bytearray(4 * 1024 * 1024)
+            del blob
+        time.sleep(0.01)
+
+    # 자식 단계가 부모보다 먼저 끝난다
+    assert [r["stage"] for r in profiler.records] == ["html;chart_data", "html;render", "html"]
+    records = by_stage(profiler)
+    html = records["html"]
+    children = records["html;chart_data"]["wall_s"] + records["html;render"]["wall_s"]
+    assert html["self_wall_s"] == pytest.approx(html["wall_s"] - children, abs=1e-5)
+    assert 0.005 < html["self_wall_s"] < html["wall_s"]
+    # 자식 단계의 최대 메모리는 부모에도 남는다
+    assert records["html;render"]["peak_kb"] >= 4096
+    assert html["peak_kb"] >= records["html;render"]["peak_kb"]
+    assert records["html;chart_data"]["peak_kb"] < 4096
+
+
+def test_stage_is_recorded_when_it_raises(profiler):
+    with pytest.raises(ValueError):
+        with profiler.stage("save"):
+            raise ValueError("disk full")
+    assert [r["stage"] for r in profiler.records] == ["save"]
+    assert profiler._stack == []
+
+
+def test_folded_and_json_output(profiler, tmp_path):
+    with profiler.stage("load"):
+        with profiler.stage("parse"):
+            time.sleep(0.002)
+        time.sleep(0.001)
+    lines = profiler.folded().splitlines()
+    assert [line.rsplit(" ", 1)[0] for line in lines] == ["load;parse", "load"]
+    assert all(int(line.rsplit(" ", 1)[1]) > 0 for line in lines)
+
+    profiler.write(tmp_path / "profile" / "stages.json", tmp_path / "stages.folded")
+    assert json.loads((tmp_path / "profile" / "stages.json").read_text())["stages"] == profiler.records
+    assert (tmp_path / "stages.folded").read_text() == profiler.folded()
+    assert profiler.summary().splitlines()[1].startswith("load;parse")
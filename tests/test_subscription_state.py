@@ -0,0 +1,135 @@
+"""구독 상태 머신 - MRR 전이, 증분 반영 = 한 번에 반영, --until 이전 기간 리포트"""
+
+import gzip
+import json
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from conftest import MIDPOINT, UNTIL
+from event_store import EventStore
+from generate_amplitude_report import load_metrics, parse_args
+from subscription_state import (
+    CANCEL_EVENT,
+    CHANGE_TIER_EVENT,
+    CHURNED,
+    CONTRACTION,
+    EXPANSION,
+    NEW,
+    ROW_KEYS,
+    SUBSCRIBE_EVENT,
+    SubscriptionState,
+    net_new,
+)
+
+
+def row():
+    return [0] * len(ROW_KEYS)
+
+
+def test_transitions(tmp_path):
+    state = SubscriptionState(tmp_path / "state.json")
+    first = row()
+    state.transition(1, SUBSCRIBE_EVENT, first, tier="basic", price=5000)
+    state.transition(2, SUBSCRIBE_EVENT, first, tier="plus", price=15000)
+    # 구독 기록 없는 티어 변경은 새 구독, 구독 이벤트가 아니면 무시
+    state.transition(3, CHANGE_TIER_EVENT, first, to_tier="premium", to_price=30000)
+    state.transition(4, "PageView - Home", first)
+    assert first[NEW] == 50000 and state.mrr == 50000
+
+    second = row()
+    state.transition(1, CHANGE_TIER_EVENT, second, to_tier="plus")  # 금액이 빠지면 그 티어의 마지막 금액
+    state.transition(3, SUBSCRIBE_EVENT, second, tier="basic", price=5000)
+    state.transition(2, CANCEL_EVENT, second)
+    state.transition(9, CANCEL_EVENT, second)
+    assert (second[EXPANSION], second[CONTRACTION], second[CHURNED]) == (10000, 25000, 15000)
+    assert state.subscribers == {1: ["plus", 15000], 3: ["basic", 5000]}
+
+    # 해지 후 재구독은 다시 new
+    third = row()
+    state.transition(2, SUBSCRIBE_EVENT, third, tier="plus", price=15000)
+    assert third[NEW] == 15000
+    assert state.mrr == 35000
+
+
+def write_subscription_exports(root):
+    """3주 동안 구독 / 티어 변경 / 해지 이벤트 (하루 한 파일)"""
+    start = datetime(2026, 3, 2)
+    plan = {
+        0: [(1, SUBSCRIBE_EVENT, {"tier": "basic", "price": 5000}), (2, SUBSCRIBE_EVENT, {"tier": "plus", "price": 15000})],
+        3: [(1, CHANGE_TIER_EVENT, {"to_tier": "premium", "to_price": 30000})],
+        8: [(2, CANCEL_EVENT, {}), (3, SUBSCRIBE_EVENT, {"tier": "basic", "price": 5000})],
+        12: [(1, CHANGE_TIER_EVENT, {"to_tier": "basic"})],
+        16: [(2, SUBSCRIBE_EVENT, {"tier": "premium", "price": 30000})],
+        20: [(3, CANCEL_EVENT, {})],
+    }
+    root.mkdir(parents=True, exist_ok=True)
+    for day in range(21):
+        events = [{"amplitude_id": 9, "event_time": f"{start + timedelta(days=day):%Y-%m-%d} 03:00:00.000000",
+                   "event_type": "session_start", "country": "South Korea", "event_properties": {}}]
+        for user, event_type, props in plan.get(day, []):
+            events.append(dict(events[0], amplitude_id=user, event_type=event_type, event_properties=props))
+        with gzip.open(root / f"123_{start + timedelta(days=day):%Y-%m-%d}_0#0.json.gz", "wt", encoding="utf-8") as f:
+            f.writelines(json.dumps(event) + "\n" for event in events)
+    return root
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = EventStore(tmp_path / "store")
+    store.ingest([write_subscription_exports(tmp_path / "exports")])
+    return store
+
+
+def test_daily_rows(store, tmp_path):
+    state = SubscriptionState(tmp_path / "state.json")
+    assert len(state.apply_store(store)) == 21
+    daily = state.daily_data()
+    assert daily["dates"][0] == "2026-03-02" and daily["dates"][-1] == "2026-03-22"
+    assert daily["mrr"][0] == 20000 and daily["mrr"][3] == 45000
+    assert daily["mrr"][8] == 35000 and daily["subscribers"][8] == 2
+    assert daily["mrr"][-1] == 35000
+    # 하루 MRR 변화 = new + expansion - contraction - churned
+    changes = net_new(daily)
+    assert [b - a for a, b in zip(daily["mrr"], daily["mrr"][1:])] == changes[1:]
+    weekly = state.weekly_data()
+    assert weekly["dates"] == ["2026-03-02", "2026-03-09", "2026-03-16"]
+    assert weekly["mrr"] == [daily["mrr"][6], daily["mrr"][13], daily["mrr"][20]]
+    assert sum(net_new(weekly)) == daily["mrr"][-1]
+
+
+def test_incremental_apply_matches_single_pass(store, tmp_path):
+    whole = SubscriptionState(tmp_path / "whole.json")
+    whole.apply_store(store)
+    path = tmp_path / "steps.json"
+    for end_day in (date(2026, 3, 5), date(2026, 3, 12), date(2026, 3, 19), None):
+        state = SubscriptionState(path)
+        state.apply_store(store, end_day=end_day and end_day.toordinal())
+        state.save()
+    assert SubscriptionState(path).report_data() == whole.report_data()
+
+
+def test_report_stops_before_end_day_when_state_is_ahead(store, tmp_path):
+    cutoff = date(2026, 3, 16).toordinal()
+    ahead = SubscriptionState(tmp_path / "ahead.json")
+    ahead.apply_store(store)
+    upto = SubscriptionState(tmp_path / "upto.json")
+    upto.apply_store(store, end_day=cutoff)
+
+    report = ahead.report_data(end_day=cutoff)
+    assert report == upto.report_data()
+    assert report["daily"]["dates"][-1] == "2026-03-15"
+    assert report["weekly"]["dates"][-1] == "2026-03-09"
+    assert ahead.report_data(end_day=date(2026, 3, 1).toordinal()) is None
+
+
+def test_until_before_stored_state(exports, tmp_path):
+    """저장소 상태가 UNTIL 까지 반영된 뒤 그보다 이른 --until 로 리포트"""
+    store = tmp_path / "store"
+    load_metrics(parse_args(["--events", str(exports), "--store", str(store), "--until", UNTIL]))
+    earlier = load_metrics(parse_args(["--store", str(store), "--until", MIDPOINT]))["revenue"]
+
+    fresh = tmp_path / "fresh"
+    expected = load_metrics(parse_args(["--events", str(exports), "--store", str(fresh), "--until", MIDPOINT]))["revenue"]
+    assert earlier == expected
+    assert earlier["daily"]["dates"][-1] < MIDPOINT
@@ -0,0 +1,61 @@
+"""사용자 집합 - 비트맵 / 정렬 배열 연산과 직렬화"""
+
+import random
+
+import pytest
+
+from user_bitmap import (
+    SparseUserSet,
+    UserBitmap,
+    decode_user_set,
+    encode_user_set,
+    group_values,
+    union_count,
+    user_set,
+)
+
+
+def random_sets(rng, n):
+    return [set(rng.sample(range(rng.choice([64, 100_000])), rng.randint(0, 50))) for _ in range(n)]
+
+
+def test_user_set_picks_smaller_representation():
+    assert isinstance(user_set(range(64)), UserBitmap)
+    assert isinstance(user_set([3, 90_000]), SparseUserSet)
+    assert isinstance(user_set([]), UserBitmap)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_operations_match_python_sets(seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        sets = random_sets(rng, rng.randint(1, 5))
+        members = [user_set(s) for s in sets]
+        assert union_count(members) == len(set().union(*sets))
+        a, b = members[0], members[-1]
+        assert sorted((a | b).ids()) == sorted(sets[0] | sets[-1])
+        assert sorted((a & b).ids()) == sorted(sets[0] & sets[-1])
+        assert all((uid in a) == (uid in sets[0]) for uid in range(70))
+
+
+def test_encode_round_trip():
+    for ids in ([], [0, 7, 8], [5, 200_000]):
+        users = user_set(ids)
+        decoded = decode_user_set(encode_user_set(users))
+        assert type(decoded) is type(users)
+        assert decoded.ids() == sorted(ids)
+    assert UserBitmap.from_base64(UserBitmap.from_ids([1, 9]).to_base64()) == UserBitmap.from_ids([1, 9])
+
+
+def test_union_count_accepts_plain_sets():
+    assert union_count([{1, 2}, {2, 3}]) == 3
+    assert union_count([]) == 0
+
+
+def test_group_values():
+    groups = {"korea": ["South Korea"], "japan": ["Japan"], "other": None}
+    assert group_values(["South Korea", "Japan", "France", None], groups) == {
+        "korea": ["South Korea"],
+        "japan": ["Japan"],
+        "other": ["France", None],
+    }
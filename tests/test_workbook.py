@@ -0,0 +1,147 @@
+"""리포트 워크북 - 지역별 WAU 시트의 합집합 기준 전체, 메모리 전달 / Excel 추출 일치, 파싱 결과 캐시, write-only 생성"""
+
+import pytest
+from openpyxl import load_workbook
+
+from conftest import UNTIL
+from generate_amplitude_report import (
+    WAU_BY_REGION_DATA,
+    WAU_DATA,
+    create_workbook,
+    default_metrics,
+    load_metrics,
+    parse_args,
+)
+from generate_html_report import extract_all_data, generate_html, report_data_from_metrics
+
+
+def sheet_rows(ws, min_row=3):
+    return [list(row) for row in ws.iter_rows(min_row=min_row, values_only=True)]
+
+
+def trimmed_rows(ws):
+    """시트 값 - write-only 시트는 행 끝의 빈 칸을 쓰지 않으므로 끝의 None 은 뺀다"""
+    rows = []
+    for row in ws.iter_rows(values_only=True):
+        row = list(row)
+        while row and row[-1] is None:
+            row.pop()
+        rows.append(row)
+    while rows and not rows[-1]:
+        rows.pop()
+    return rows
+
+
+@pytest.mark.parametrize("write_only", [False, True])
+def test_region_total_is_wau(write_only, tmp_path):
+    path = tmp_path / "report.xlsx"
+    create_workbook(default_metrics(), write_only=write_only).save(path)
+    data = extract_all_data(path, use_cache=False)
+    region = data["wau_by_region"]
+    assert region["total"] == WAU_DATA["values"]
+    assert region["total"][0] < region["korea"][0] + region["non_korea"][0]
+
+
+@pytest.mark.parametrize("write_only", [False, True])
+def test_region_sheet_without_total_omits_share(write_only, tmp_path):
+    metrics = default_metrics()
+    metrics["wau_by_region"] = {k: v for k, v in metrics["wau_by_region"].items() if k != "total"}
+    path = tmp_path / "report.xlsx"
+    create_workbook(metrics, write_only=write_only).save(path)
+    rows = sheet_rows(load_workbook(path)["WAU by Region"])
+    assert rows[0][:4] == ["Date", "South Korea", "Non-Korea", None]
+    # 이전 워크북처럼 Total 열이 없으면 같은 주의 전체 WAU 로 나눈다
+    region = extract_all_data(path, use_cache=False)["wau_by_region"]
+    assert region["total"] == WAU_DATA["values"]
+
+
+def test_html_share_uses_union_total():
+    data = report_data_from_metrics(default_metrics())
+    html = generate_html(data)
+    share = WAU_BY_REGION_DATA["non_korea"][-1] / WAU_DATA["values"][-1] * 100
+    assert f"{share:.2f}" in html
+
+
+def test_missing_total_is_not_the_sum():
+    region = {"dates": ["2026-07-06"], "korea": [10], "non_korea": [3]}
+    data = report_data_from_metrics({"wau_by_region": region})
+    assert data["wau_by_region"]["total"] == [None]
+    assert 'class="region-value">-<' in generate_html(data)
+
+
+@pytest.fixture(scope="module")
+def serial_metrics(exports):
+    return load_metrics(parse_args(["--events", str(exports), "--until", UNTIL]))
+
+
+@pytest.mark.parametrize("source", ["default", "events"])
+def test_in_memory_handoff_matches_workbook(source, serial_metrics, tmp_path):
+    metrics = default_metrics() if source == "default" else serial_metrics
+    path = tmp_path / "amplitude_report.xlsx"
+    create_workbook(metrics).save(path)
+    from_excel = extract_all_data(path, use_cache=False)
+    in_memory = report_data_from_metrics(metrics, source=path.name)
+    for data in (from_excel, in_memory):
+        data.pop("generated")
+    assert in_memory == from_excel
+    for data in (from_excel, in_memory):
+        data["generated"] = "2026-07-13 09:00"
+    assert generate_html(in_memory) == generate_html(from_excel)
+
+
+def test_parsed_workbook_is_cached_until_it_changes(tmp_path, monkeypatch):
+    import generate_html_report
+
+    monkeypatch.setattr(generate_html_report, "EXTRACT_CACHE_DIR", tmp_path / "cache")
+    path = tmp_path / "amplitude_report.xlsx"
+    create_workbook(default_metrics()).save(path)
+    first = extract_all_data(path)
+    assert len(list((tmp_path / "cache").glob("*.json"))) == 1
+
+    def no_parse(excel_path):
+        raise AssertionError("parsed again")
+
+    monkeypatch.setattr(generate_html_report, "_extract_workbook", no_parse)
+    assert extract_all_data(path)["wau"] == first["wau"]
+
+    metrics = default_metrics()
+    metrics["wau"] = dict(metrics["wau"], values=[v + 1 for v in metrics["wau"]["values"]])
+    create_workbook(metrics).save(path)
+    monkeypatch.undo()
+    monkeypatch.setattr(generate_html_report, "EXTRACT_CACHE_DIR", tmp_path / "cache")
+    assert extract_all_data(path)["wau"]["values"] == metrics["wau"]["values"]
+
+
+@pytest.fixture(scope="module")
+def store_metrics(exports, tmp_path_factory):
+    store = tmp_path_factory.mktemp("store")
+    return load_metrics(parse_args(["--events", str(exports), "--store", str(store), "--until", UNTIL]))
+
+
+def test_write_only_matches_regular_workbook(store_metrics, tmp_path):
+    regular, streamed = tmp_path / "regular.xlsx", tmp_path / "streamed.xlsx"
+    create_workbook(store_metrics).save(regular)
+    create_workbook(store_metrics, write_only=True).save(streamed)
+
+    a, b = load_workbook(regular), load_workbook(streamed)
+    assert b.sheetnames == a.sheetnames
+    assert {"Daily Active", "Membership Conversion", "MRR", "WAU Segments"} <= set(b.sheetnames)
+    for name in a.sheetnames:
+        assert trimmed_rows(b[name]) == trimmed_rows(a[name]), name
+
+    from_regular = extract_all_data(regular, use_cache=False)
+    from_streamed = extract_all_data(streamed, use_cache=False)
+    for data in (from_regular, from_streamed):
+        data.pop("file")
+        data.pop("generated")
+    assert from_streamed == from_regular
+
+
+def test_write_only_cells_share_named_styles(store_metrics, tmp_path):
+    path = tmp_path / "streamed.xlsx"
+    create_workbook(store_metrics, write_only=True).save(path)
+    wb = load_workbook(path)
+    ws = wb["WAU"]
+    assert ws["A3"].style == "report_header"
+    assert ws["A4"].style == "report_cell"
+    assert {s if isinstance(s, str) else s.name for s in wb.named_styles} >= {"report_header", "report_cell"}